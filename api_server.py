@@ -3,10 +3,11 @@
 import os
 import logging
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
@@ -23,6 +24,8 @@ logger = logging.getLogger(__name__)
 try:
     from src.workflows.comment_generation_workflow import run_comment_generation
     from src.ui.streamlit_utils import load_locations, load_history, save_to_history
+    from src.ui.utils.history_utils import load_history_page
+    from src.workflows.workflow_registry import warm_up_workflows
     logger.info("Successfully imported backend modules")
 except ImportError as e:
     logger.error(f"Failed to import backend modules: {e}")
@@ -33,10 +36,63 @@ except ImportError as e:
         return ["東京", "神戸", "大阪", "名古屋", "福岡"]
     def load_history():
         return []
+    def load_history_page(limit, offset=0):
+        return []
     def save_to_history(*args, **kwargs):
         pass
+    def warm_up_workflows():
+        return {}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """サーバーのライフサイクル管理"""
+    # LangGraphワークフローを起動時に一度だけコンパイルし、全リクエストで共有する
+    try:
+        stats = await asyncio.to_thread(warm_up_workflows)
+        logger.info(f"Workflow registry warmed up: {stats}")
+    except Exception as e:
+        # ウォームアップに失敗しても初回リクエスト時に遅延コンパイルされる
+        logger.warning(f"Workflow warm-up failed: {e}")
+    # 外部API用の接続プールをサーバーのイベントループ上に作成し、全リクエストで共有する
+    try:
+        from src.apis.http_clients import start_http_clients
+        await start_http_clients()
+    except ImportError:
+        pass
+    # アクセスの多い地点の予報をTTL切れ・日付境界の前に取得し直す
+    try:
+        from src.data.forecast_cache import start_cache_warming_scheduler
+        await start_cache_warming_scheduler()
+    except ImportError:
+        pass
+    yield
+    try:
+        from src.data.forecast_cache import shutdown_cache_warming_scheduler
+        await shutdown_cache_warming_scheduler()
+    except ImportError:
+        pass
+    # 共有しているHTTPセッションのキープアライブ接続を閉じる
+    try:
+        from src.apis.http_clients import shutdown_http_clients
+        await shutdown_http_clients()
+    except ImportError:
+        pass
+    # 共有しているLLMクライアントのキープアライブ接続を閉じる
+    try:
+        from src.llm.client_pool import reset_llm_client_pool
+        reset_llm_client_pool()
+    except ImportError:
+        pass
+    # 予報キャッシュの書き込みキューに残っているデータを書き出す
+    try:
+        from src.data.forecast_cache import shutdown_forecast_cache
+        shutdown_forecast_cache()
+    except ImportError:
+        pass
 
-app = FastAPI(title="Mobile Comment Generator API", version="1.0.0")
+
+app = FastAPI(title="Mobile Comment Generator API", version="1.0.0", lifespan=lifespan)
 
 # CORS設定
 if config.env == "production":
@@ -92,6 +148,9 @@ class BulkGenerationResponse(BaseModel):
     results: List[CommentGenerationResponse]
     total: int
     success_count: int
+    # 予報メッシュの共有によって省略できたWxTech API呼び出し数
+    upstream_calls_saved: int = 0
+    weather_fetch_stats: Optional[Dict[str, Any]] = None
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
@@ -113,10 +172,19 @@ async def get_locations() -> LocationResponse:
         return LocationResponse(locations=fallback_locations)
 
 @app.get("/api/history", response_model=HistoryResponse)
-async def get_history() -> HistoryResponse:
-    """Get generation history"""
+async def get_history(
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+) -> HistoryResponse:
+    """Get generation history
+
+    With ``limit``, returns one page ordered newest first; otherwise the full history (oldest first).
+    """
     try:
-        history = await asyncio.to_thread(load_history)
+        if limit is None:
+            history = await asyncio.to_thread(load_history)
+        else:
+            history = await asyncio.to_thread(load_history_page, limit, offset)
         logger.info(f"Loaded {len(history)} history items")
         return HistoryResponse(history=history)
     except Exception as e:
@@ -214,10 +282,23 @@ async def generate_comments_bulk(request: BulkGenerationRequest) -> BulkGenerati
     try:
         # Import here to avoid circular dependency
         from app_controller import CommentGenerationController
+        from src.apis.wxtech.grid import diff_grid_stats, get_grid_forecast_cache, is_grid_sharing_enabled
+        from src.config import get_config as get_settings
         
         # Initialize controller
         controller = CommentGenerationController()
         
+        grid_sharing = is_grid_sharing_enabled()
+        grid_stats_before = get_grid_forecast_cache().get_stats() if grid_sharing else {}
+        
+        # 地域全体の予報を先にメッシュ単位でまとめて取得し、各バッチではキャッシュを再利用する
+        if grid_sharing and get_settings().app.use_async_weather:
+            from src.controllers.async_batch_processor import AsyncBatchProcessor
+            try:
+                await AsyncBatchProcessor().prefetch_weather_async(request.locations)
+            except Exception as e:
+                logger.warning(f"Region-wide weather prefetch failed: {e}")
+        
         # Process locations in parallel (configurable batch size)
         results = []
         weather_config = load_config('weather_thresholds', validate=False)
@@ -261,10 +342,14 @@ async def generate_comments_bulk(request: BulkGenerationRequest) -> BulkGenerati
         # Calculate success count
         success_count = sum(1 for r in results if r.success)
         
+        grid_stats = diff_grid_stats(grid_stats_before, get_grid_forecast_cache().get_stats()) if grid_sharing else {}
+        
         return BulkGenerationResponse(
             results=results,
             total=len(results),
-            success_count=success_count
+            success_count=success_count,
+            upstream_calls_saved=grid_stats.get("saved_upstream_calls", 0),
+            weather_fetch_stats=grid_stats or None
         )
         
     except Exception as e:
@@ -0,0 +1,15 @@
+"""
+オフラインで再現可能なベンチマーク
+
+WxTech API はローカルのスタブサーバー（fake_wxtech）、LLM は遅延を設定できる
+FakeLLMProvider（fake_llm）に置き換え、ネットワークに接続せずに計測する。
+
+- ``micro``: フィルター・バリデーター・選択・解析・キャッシュの関数単位の計測
+- ``macro``: run_unified_comment_generation と /api/generate/bulk の 1 / 10 / 142 地点での計測
+
+結果は ``baseline.json`` と比較し、中央値が閾値以上遅くなったものを回帰として報告する。
+
+    python -m benchmarks                       # すべて計測してベースラインと比較
+    python -m benchmarks --suite micro -k caches
+    python -m benchmarks --update-baseline     # 計測結果をベースラインとして保存
+"""
@@ -0,0 +1,99 @@
+"""
+ベンチマークの実行
+
+    python -m benchmarks [--suite micro|macro|all] [-k パターン] [--update-baseline]
+
+ベースラインより遅くなったベンチマークがあれば終了コード 1 で終了する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+
+from benchmarks.harness import (
+    BASELINE_PATH,
+    DEFAULT_THRESHOLD,
+    REGRESSION,
+    compare,
+    get_benchmarks,
+    load_baseline,
+    print_results,
+    run_benchmark,
+    save_baseline,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="外部サービスに接続せずにベンチマークを実行する")
+    parser.add_argument("--suite", choices=("micro", "macro", "all"), default="all", help="実行するベンチマーク")
+    parser.add_argument("-k", dest="pattern", help="名前にこの文字列を含むベンチマークのみ実行する")
+    parser.add_argument("--update-baseline", action="store_true", help="計測結果をベースラインとして保存する")
+    parser.add_argument("--no-compare", action="store_true", help="ベースラインと比較しない")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"回帰とみなす中央値の増加割合（デフォルト: {DEFAULT_THRESHOLD}）")
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0, help="macro での LLM の平均応答遅延")
+    parser.add_argument("--llm-jitter-ms", type=float, default=10.0, help="macro での LLM の応答遅延のばらつき")
+    parser.add_argument("--wxtech-latency-ms", type=float, default=5.0, help="macro での WxTech の応答遅延")
+    parser.add_argument("--seed", type=int, default=0, help="LLM の遅延・応答を決めるシード")
+    parser.add_argument("-v", "--verbose", action="store_true", help="アプリケーションのログを表示する")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    if not args.verbose:
+        # 計測中のログ出力で結果がぶれないようにする
+        logging.disable(logging.WARNING)
+
+    # 環境変数を設定してから src の設定を読み込むため、ベンチマークの登録は offline_environment より後に行う
+    from benchmarks.macro import offline_environment
+
+    suites = ("micro", "macro") if args.suite == "all" else (args.suite,)
+    results = []
+    for suite in suites:
+        # micro は LLM・WxTech の遅延なし、macro は設定した遅延で計測する
+        latency = (
+            {"llm_latency_ms": args.llm_latency_ms, "llm_jitter_ms": args.llm_jitter_ms,
+             "wxtech_latency_ms": args.wxtech_latency_ms}
+            if suite == "macro" else {}
+        )
+        with offline_environment(seed=args.seed, **latency):
+            __import__(f"benchmarks.{suite}")
+            for bench in get_benchmarks(args.pattern):
+                if bench.group.split(".")[0] != suite:
+                    continue
+                print(f"{bench.name} ...", file=sys.stderr, flush=True)
+                results.append(run_benchmark(bench))
+
+    if not results:
+        print("該当するベンチマークがありません", file=sys.stderr)
+        return 1
+
+    settings = {
+        "llm_latency_ms": args.llm_latency_ms,
+        "llm_jitter_ms": args.llm_jitter_ms,
+        "wxtech_latency_ms": args.wxtech_latency_ms,
+        "seed": args.seed,
+    }
+    baseline = None if args.no_compare else load_baseline()
+    if baseline is not None and baseline.get("settings", settings) != settings:
+        print(f"注意: ベースラインと計測条件が異なります（ベースライン: {baseline['settings']}）", file=sys.stderr)
+    comparisons = compare(results, baseline, args.threshold) if baseline is not None else None
+    print_results(results, comparisons)
+
+    if args.update_baseline:
+        save_baseline(results, settings=settings)
+        print(f"ベースラインを更新しました: {BASELINE_PATH}")
+        return 0
+
+    regressions = [c for c in comparisons or [] if c.status == REGRESSION]
+    if regressions:
+        print(f"\n回帰を検出しました（閾値 +{args.threshold:.0%}）:")
+        for c in regressions:
+            print(f"  {c.name}: {c.ratio:.2f}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
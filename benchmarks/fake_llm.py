@@ -0,0 +1,136 @@
+"""
+ベンチマーク用の LLM プロバイダー
+
+外部APIを呼ばずに、設定した遅延（平均 + ジッター）だけ待ってから応答を返す。ジッターは
+プロンプトのハッシュとシードから決まるため、同じプロンプトには常に同じ遅延・同じ応答を返す。
+
+応答はプロンプトの種類に合わせて作る。
+
+- 統合生成（天気コメント候補・アドバイスコメント候補を含む）: 候補から1件ずつ選んだ JSON
+- それ以外（候補選択など）: 候補番号 ``"1"``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from src.data.comment_pair import CommentPair
+from src.data.weather_data import WeatherForecast
+from src.llm.providers.base_provider import LLMProvider
+
+WEATHER_CANDIDATES_HEADER = "### 天気コメント候補:"
+ADVICE_CANDIDATES_HEADER = "### アドバイスコメント候補:"
+
+# 差し替えるプロバイダー名（API の LLMProvider 型で受け付ける名前のいずれか）
+FAKE_PROVIDER_NAME = "openai"
+
+
+def _parse_candidates(prompt: str, header: str) -> list[str]:
+    """プロンプトから「番号. 本文」形式の候補を取り出す"""
+    start = prompt.find(header)
+    if start == -1:
+        return []
+    candidates = []
+    for line in prompt[start + len(header):].splitlines():
+        line = line.strip()
+        if line.startswith("###"):
+            break
+        number, sep, text = line.partition(". ")
+        if sep and number.isdigit():
+            candidates.append(text)
+    return candidates
+
+
+class FakeLLMProvider(LLMProvider):
+    """遅延を設定できる LLM プロバイダーのスタブ
+
+    クラス属性の ``latency_ms`` / ``jitter_ms`` / ``seed`` で全インスタンスの応答遅延を設定する
+    （LLMManager はクライアントプール経由でインスタンスを作るため、コンストラクタ引数では渡せない）。
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    seed: int = 0
+
+    def __init__(self, api_key: str = "", model: str = "fake", http_client: Any | None = None):
+        self.api_key = api_key
+        self.model = model
+        self.call_count = 0
+        self._count_lock = threading.Lock()
+
+    def _delay_seconds(self, prompt: str) -> float:
+        if not self.latency_ms and not self.jitter_ms:
+            return 0.0
+        rng = random.Random(zlib.crc32(prompt.encode("utf-8")) ^ self.seed)
+        return max(0.0, self.latency_ms + rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+    def _respond(self, prompt: str) -> str:
+        with self._count_lock:
+            self.call_count += 1
+        weather = _parse_candidates(prompt, WEATHER_CANDIDATES_HEADER)
+        advice = _parse_candidates(prompt, ADVICE_CANDIDATES_HEADER)
+        if not weather or not advice:
+            return "1"
+        rng = random.Random(zlib.crc32(prompt.encode("utf-8")) ^ self.seed)
+        weather_index = rng.randrange(len(weather))
+        advice_index = rng.randrange(len(advice))
+        # 統合生成ノードは番号を 0 始まりのインデックスとして扱う
+        return json.dumps({
+            "selected_weather_index": weather_index,
+            "selected_advice_index": advice_index,
+            "weather_comment": weather[weather_index],
+            "advice_comment": advice[advice_index],
+            "selection_reason": "ベンチマーク用の固定選択",
+        }, ensure_ascii=False)
+
+    def generate(self, prompt: str) -> str:
+        time.sleep(self._delay_seconds(prompt))
+        return self._respond(prompt)
+
+    async def agenerate(self, prompt: str) -> str:
+        await asyncio.sleep(self._delay_seconds(prompt))
+        return self._respond(prompt)
+
+    def generate_comment(
+        self, weather_data: WeatherForecast, past_comments: CommentPair, constraints: dict[str, Any]
+    ) -> str:
+        prompt = f"{weather_data.weather_description}:{past_comments.weather_comment.comment_text}"
+        time.sleep(self._delay_seconds(prompt))
+        with self._count_lock:
+            self.call_count += 1
+        comment = past_comments.weather_comment.comment_text
+        return comment[:constraints.get("max_length", len(comment))]
+
+
+@contextmanager
+def install_fake_llm(latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0) -> Iterator[None]:
+    """LLMManager の ``openai`` プロバイダーを FakeLLMProvider に差し替える
+
+    差し替え中は APIキーが未設定でもよいように、ダミーのキーを設定する。
+    """
+    from src.llm.client_pool import reset_llm_client_pool
+    from src.llm.llm_manager import LLMManager
+
+    config = LLMManager.PROVIDER_CONFIGS[FAKE_PROVIDER_NAME]
+    previous = (config["provider_class"], FakeLLMProvider.latency_ms, FakeLLMProvider.jitter_ms, FakeLLMProvider.seed)
+    previous_key = os.environ.get(config["api_key_env"])
+    config["provider_class"] = FakeLLMProvider
+    FakeLLMProvider.latency_ms, FakeLLMProvider.jitter_ms, FakeLLMProvider.seed = latency_ms, jitter_ms, seed
+    os.environ.setdefault(config["api_key_env"], "benchmark-fake-key")
+    reset_llm_client_pool()
+    try:
+        yield
+    finally:
+        config["provider_class"], FakeLLMProvider.latency_ms, FakeLLMProvider.jitter_ms, FakeLLMProvider.seed = previous
+        if previous_key is None:
+            os.environ.pop(config["api_key_env"], None)
+        reset_llm_client_pool()
@@ -0,0 +1,264 @@
+"""
+ローカルで動作する WxTech API のスタブサーバー
+
+``/ss1wx`` へのリクエストに対して、保存済みのレスポンス（``data/wxtech/`` の JSON）を
+日時を現在時刻に合わせてずらして返す。保存済みのレスポンスがない座標では、緯度・経度から
+決まる疑似乱数で予報を合成して返す（同じ座標・同じ時刻なら常に同じ内容になる）。
+
+    with FakeWxTechServer(latency_ms=20) as server:
+        ...  # WXTECH_API_BASE_URL がスタブサーバーを指す
+
+保存済みのレスポンスは ``record_payloads`` で本番APIから取得して保存できる。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from src.data.forecast_time_index import JST
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS_DIR = Path(__file__).parent / "data" / "wxtech"
+DEFAULT_FORECAST_HOURS = 72
+MRF_DAYS = 7
+
+# 合成する予報の天気コード（晴れ・くもり・雨・雪の代表的なコード）
+_SYNTHETIC_WEATHER_CODES = ("100", "101", "200", "201", "202", "300", "301", "400")
+
+
+def recording_path(lat: float, lon: float, directory: Path = RECORDINGS_DIR) -> Path:
+    """座標に対応する保存済みレスポンスのパス"""
+    return directory / f"{lat:.4f}_{lon:.4f}.json"
+
+
+def _current_hour() -> datetime:
+    return datetime.now(JST).replace(minute=0, second=0, microsecond=0)
+
+
+def rebase_payload(payload: dict[str, Any], start: datetime) -> dict[str, Any]:
+    """保存済みレスポンスの日時を、最初の srf が start になるようにずらす
+
+    srf と mrf は同じ差分だけずらす（mrf は日単位に揃える）。
+    """
+    wxdata = payload["wxdata"][0]
+    srf = wxdata.get("srf", [])
+    if not srf:
+        return payload
+    first = datetime.fromisoformat(srf[0]["date"].replace("Z", "+00:00"))
+    if first.tzinfo is None:
+        first = first.replace(tzinfo=JST)
+    offset = start - first
+
+    def shift(rows: list[dict[str, Any]], daily: bool) -> list[dict[str, Any]]:
+        shifted = []
+        for row in rows:
+            dt = datetime.fromisoformat(row["date"].replace("Z", "+00:00"))
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=JST)
+            dt = (dt + offset).astimezone(JST)
+            if daily:
+                dt = dt.replace(hour=0)
+            shifted.append({**row, "date": dt.isoformat()})
+        return shifted
+
+    return {
+        **payload,
+        "wxdata": [{**wxdata, "srf": shift(srf, False), "mrf": shift(wxdata.get("mrf", []), True)}],
+    }
+
+
+def synthesize_payload(lat: float, lon: float, hours: int, start: datetime) -> dict[str, Any]:
+    """座標から決まる疑似乱数で srf / mrf を合成する
+
+    気温は緯度で平均を変え、日変化（15時頃に最高）を加える。天気は6時間ごとに変わる。
+    """
+    rng = random.Random(f"{lat:.4f},{lon:.4f}")
+    base_temp = 30.0 - (lat - 24.0) * 0.8 + rng.uniform(-2.0, 2.0)
+    codes = [rng.choice(_SYNTHETIC_WEATHER_CODES) for _ in range(hours // 6 + 2)]
+    srf = []
+    for i in range(hours):
+        dt = start + timedelta(hours=i)
+        code = codes[i // 6]
+        srf.append({
+            "date": dt.isoformat(),
+            "wx": int(code),
+            "temp": round(base_temp + 5.0 * math.cos((dt.hour - 15) / 24 * 2 * math.pi), 1),
+            "prec": round(rng.uniform(0.5, 6.0), 1) if code.startswith(("3", "4")) else 0.0,
+            "rhum": rng.randint(40, 95),
+            "wndspd": round(rng.uniform(0.0, 8.0), 1),
+            "wnddir": rng.randint(0, 16),
+        })
+    mrf = []
+    for day in range(MRF_DAYS):
+        dt = (start + timedelta(days=day)).replace(hour=0)
+        mrf.append({
+            "date": dt.isoformat(),
+            "wx": int(rng.choice(_SYNTHETIC_WEATHER_CODES)),
+            "maxtemp": round(base_temp + 5.0, 1),
+            "mintemp": round(base_temp - 5.0, 1),
+        })
+    return {"wxdata": [{"srf": srf, "mrf": mrf}]}
+
+
+class FakeWxTechServer:
+    """WxTech API のスタブサーバー
+
+    別スレッドで 127.0.0.1 の空きポートに HTTP サーバーを起動する。コンテキストマネージャーとして
+    使うと、実行中は環境変数 WXTECH_API_BASE_URL がこのサーバーを指す。
+
+    Args:
+        recordings_dir: 保存済みレスポンスのディレクトリ
+        latency_ms: 1リクエストあたりの応答遅延（ミリ秒）
+    """
+
+    def __init__(self, recordings_dir: Path | str = RECORDINGS_DIR, latency_ms: float = 0.0):
+        self.recordings_dir = Path(recordings_dir)
+        self.latency_ms = latency_ms
+        self.request_count = 0
+        self.replayed_count = 0
+        self._count_lock = threading.Lock()
+        self._recordings: dict[Path, dict[str, Any] | None] = {}
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        self._previous_base_url: str | None = None
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("FakeWxTechServer is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def _load_recording(self, lat: float, lon: float) -> dict[str, Any] | None:
+        path = recording_path(lat, lon, self.recordings_dir)
+        if path not in self._recordings:
+            recording = None
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    recording = json.load(f)
+            self._recordings[path] = recording
+        return self._recordings[path]
+
+    def build_payload(self, lat: float, lon: float, hours: int) -> dict[str, Any]:
+        """座標・時間数に対するレスポンス（保存済みがあれば再生、なければ合成）"""
+        start = _current_hour()
+        recording = self._load_recording(lat, lon)
+        if recording is not None:
+            with self._count_lock:
+                self.replayed_count += 1
+            return rebase_payload(recording, start)
+        return synthesize_payload(lat, lon, hours, start)
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                if not url.path.rstrip("/").endswith("/ss1wx"):
+                    self._send(404, {"error": True, "message": "not found"})
+                    return
+                query = parse_qs(url.query)
+                try:
+                    lat = float(query["lat"][0])
+                    lon = float(query["lon"][0])
+                    hours = int(query.get("hours", [DEFAULT_FORECAST_HOURS])[0])
+                except (KeyError, ValueError):
+                    self._send(400, {"error": True, "message": "invalid parameters"})
+                    return
+                with server._count_lock:
+                    server.request_count += 1
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+                self._send(200, server.build_payload(lat, lon, hours))
+
+            def _send(self, status: int, body: dict[str, Any]) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug("fake wxtech: " + format, *args)
+
+        return Handler
+
+    def start(self) -> FakeWxTechServer:
+        """サーバーを起動し、WXTECH_API_BASE_URL を設定する"""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-wxtech", daemon=True)
+        self._thread.start()
+        self._previous_base_url = os.environ.get("WXTECH_API_BASE_URL")
+        os.environ["WXTECH_API_BASE_URL"] = self.base_url
+        logger.info(f"Fake WxTech server started: {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        """サーバーを停止し、WXTECH_API_BASE_URL を元に戻す"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self._server = None
+        self._thread = None
+        if self._previous_base_url is None:
+            os.environ.pop("WXTECH_API_BASE_URL", None)
+        else:
+            os.environ["WXTECH_API_BASE_URL"] = self._previous_base_url
+
+    def __enter__(self) -> FakeWxTechServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def record_payloads(location_names: list[str], api_key: str, directory: Path = RECORDINGS_DIR,
+                    hours: int = DEFAULT_FORECAST_HOURS) -> list[Path]:
+    """本番の WxTech API からレスポンスを取得して保存する
+
+    Args:
+        location_names: 地点名のリスト
+        api_key: WxTech APIキー
+        directory: 保存先ディレクトリ
+        hours: 予報時間数
+
+    Returns:
+        保存したファイルのパス
+    """
+    from src.apis.wxtech.api import DEFAULT_BASE_URL, WxTechAPI
+    from src.data.location import LocationManagerRefactored
+
+    api = WxTechAPI(api_key)
+    api.base_url = DEFAULT_BASE_URL
+    manager = LocationManagerRefactored()
+    directory.mkdir(parents=True, exist_ok=True)
+    saved = []
+    for name in location_names:
+        location = manager.get_location(name)
+        if location is None or location.latitude is None or location.longitude is None:
+            logger.warning(f"座標が見つからない地点をスキップしました: {name}")
+            continue
+        payload = api.make_request("ss1wx", {"lat": location.latitude, "lon": location.longitude, "hours": hours})
+        path = recording_path(location.latitude, location.longitude, directory)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        saved.append(path)
+    return saved
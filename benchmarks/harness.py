@@ -0,0 +1,237 @@
+"""
+ベンチマークの計測・記録・ベースライン比較
+
+pytest-benchmark と同じ考え方で計測する。
+
+- 計測前にウォームアップを行う
+- 1ラウンドが ``round_time`` 秒程度になるように1ラウンドあたりの呼び出し回数を決める
+- ``min_rounds`` 回以上、合計 ``max_time`` 秒までラウンドを繰り返す
+- 1回あたりの時間の最小・中央値・平均・標準偏差を記録する
+
+回帰の判定には中央値を使い、ベースラインより ``threshold`` の割合以上遅くなったものを回帰とする。
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+
+# 判定結果
+OK = "ok"
+REGRESSION = "regression"
+IMPROVED = "improved"
+NEW = "new"
+
+
+@dataclass
+class Benchmark:
+    """登録済みのベンチマーク
+
+    ``setup`` は計測対象の関数（引数なし）を返す。``setup`` 自体の時間は計測しない。
+    """
+
+    name: str
+    group: str
+    setup: Callable[[], Callable[[], Any]]
+    min_rounds: int = 5
+    round_time: float = 0.01
+    max_time: float = 1.0
+    warmup: int = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """1つのベンチマークの計測結果（時間は1回あたりの秒数）"""
+
+    name: str
+    group: str
+    rounds: int
+    iterations: int
+    min: float
+    max: float
+    mean: float
+    median: float
+    stddev: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Comparison:
+    """ベースラインとの比較結果"""
+
+    name: str
+    current: float
+    baseline: float | None
+    status: str
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.baseline:
+            return None
+        return self.current / self.baseline
+
+
+_registry: dict[str, Benchmark] = {}
+
+
+def benchmark(group: str, name: str | None = None, **options: Any) -> Callable:
+    """ベンチマークを登録するデコレーター
+
+    Args:
+        group: グループ名（"micro.filters" など）
+        name: ベンチマーク名（省略時は関数名）。"グループ名.ベンチマーク名" で登録する
+        **options: Benchmark の計測設定（min_rounds, round_time, max_time, warmup）
+    """
+    def decorator(setup: Callable[[], Callable[[], Any]]) -> Callable[[], Callable[[], Any]]:
+        full_name = f"{group}.{name or setup.__name__}"
+        if full_name in _registry:
+            raise ValueError(f"Benchmark already registered: {full_name}")
+        _registry[full_name] = Benchmark(full_name, group, setup, **options)
+        return setup
+    return decorator
+
+
+def get_benchmarks(pattern: str | None = None) -> list[Benchmark]:
+    """登録済みのベンチマーク（pattern を含む名前のみ）"""
+    return [b for name, b in _registry.items() if pattern is None or pattern in name]
+
+
+def run_benchmark(bench: Benchmark) -> BenchmarkResult:
+    """1つのベンチマークを計測する"""
+    func = bench.setup()
+    for _ in range(bench.warmup):
+        func()
+
+    # 1回の時間から1ラウンドあたりの呼び出し回数を決める（round_time が0なら1回ずつ）
+    iterations = 1
+    if bench.round_time > 0:
+        start = time.perf_counter()
+        func()
+        single = time.perf_counter() - start
+        iterations = max(1, math.ceil(bench.round_time / single)) if single > 0 else 1000
+
+    timings: list[float] = []
+    deadline = time.perf_counter() + bench.max_time
+    while len(timings) < bench.min_rounds or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        timings.append((time.perf_counter() - start) / iterations)
+
+    return BenchmarkResult(
+        name=bench.name,
+        group=bench.group,
+        rounds=len(timings),
+        iterations=iterations,
+        min=min(timings),
+        max=max(timings),
+        mean=statistics.mean(timings),
+        median=statistics.median(timings),
+        stddev=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    )
+
+
+def machine_info() -> dict[str, Any]:
+    """ベースラインに記録する実行環境"""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "processor": platform.processor(),
+    }
+
+
+def save_baseline(results: list[BenchmarkResult], path: Path = BASELINE_PATH,
+                  settings: dict[str, Any] | None = None) -> None:
+    """計測結果をベースラインとして保存する（既存のベースラインの他の結果は残す）"""
+    data = load_baseline(path) or {"results": {}}
+    data["machine_info"] = machine_info()
+    data["settings"] = settings or data.get("settings", {})
+    data["updated_at"] = datetime.now().isoformat(timespec="seconds")
+    for result in results:
+        data["results"][result.name] = result.to_dict()
+    data["results"] = dict(sorted(data["results"].items()))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, Any] | None:
+    """ベースラインを読み込む（存在しない場合は None）"""
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results: list[BenchmarkResult], baseline: dict[str, Any] | None,
+            threshold: float = DEFAULT_THRESHOLD) -> list[Comparison]:
+    """計測結果をベースラインの中央値と比較する
+
+    Args:
+        results: 計測結果
+        baseline: load_baseline の戻り値
+        threshold: 回帰・改善とみなす変化の割合（0.25 なら ±25%）
+    """
+    baseline_results = (baseline or {}).get("results", {})
+    comparisons = []
+    for result in results:
+        entry = baseline_results.get(result.name)
+        if entry is None:
+            comparisons.append(Comparison(result.name, result.median, None, NEW))
+            continue
+        base = entry["median"]
+        if result.median > base * (1 + threshold):
+            status = REGRESSION
+        elif result.median < base * (1 - threshold):
+            status = IMPROVED
+        else:
+            status = OK
+        comparisons.append(Comparison(result.name, result.median, base, status))
+    return comparisons
+
+
+def format_time(seconds: float) -> str:
+    """秒を見やすい単位の文字列にする"""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def print_results(results: list[BenchmarkResult], comparisons: list[Comparison] | None = None,
+                  file: Any = sys.stdout) -> None:
+    """計測結果（とベースラインとの比較）を表形式で出力する"""
+    by_name = {c.name: c for c in comparisons or []}
+    print("\n" + "=" * 110, file=file)
+    print(f"{'ベンチマーク':<48}{'中央値':>12}{'最小':>12}{'標準偏差':>12}{'ラウンド':>8}"
+          f"{'ベースライン':>14}{'比':>8}", file=file)
+    print("=" * 110, file=file)
+    for result in results:
+        line = (f"{result.name:<48}{format_time(result.median):>12}{format_time(result.min):>12}"
+                f"{format_time(result.stddev):>12}{result.rounds:>8}")
+        comparison = by_name.get(result.name)
+        if comparison is not None:
+            if comparison.baseline is None:
+                line += f"{'-':>14}{'new':>8}"
+            else:
+                mark = {REGRESSION: " ▲", IMPROVED: " ▼"}.get(comparison.status, "")
+                line += f"{format_time(comparison.baseline):>14}{comparison.ratio:>7.2f}x{mark}"
+        print(line, file=file)
+    print("=" * 110, file=file)
+
@@ -0,0 +1,141 @@
+"""
+エンドツーエンドのベンチマーク
+
+スタブの WxTech サーバーと FakeLLMProvider を使い、外部サービスに接続せずに
+コメント生成全体を 1 / 10 / 142 地点で計測する。
+
+- ``macro.unified``: run_unified_comment_generation を地点ごとに順に実行
+- ``macro.bulk``: FastAPI アプリの /api/generate/bulk を ASGI で直接呼び出す
+
+毎ラウンドの最初に予報キャッシュ（メッシュ共有キャッシュ・予報キャッシュ）を空にし、
+全地点の予報をスタブサーバーから取得し直す。過去コメントのコーパスなど、プロセスの起動時に
+一度だけ読み込むデータは計測前に読み込み済みの状態で計測する。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any
+
+from benchmarks.fake_llm import FAKE_PROVIDER_NAME, install_fake_llm
+from benchmarks.fake_wxtech import RECORDINGS_DIR, FakeWxTechServer
+from benchmarks.harness import benchmark
+from src.config.config import reset_config
+
+LOCATION_COUNTS = (1, 10, 142)
+
+# 計測中に設定する環境変数（src の設定を読み込む前に設定する必要がある）
+OFFLINE_ENV = {
+    "WXTECH_API_KEY": "benchmark-fake-key",
+    "LLM_RESPONSE_CACHE_ENABLED": "false",
+    # 本番のレート制限（秒間5件）ではなく、処理自体の時間を計測する
+    "LLM_REQUESTS_PER_SECOND": "0",
+    "CACHE_WARMING_ENABLED": "false",
+}
+# 計測中の書き込み先を一時ディレクトリに向ける環境変数
+_CACHE_DIR_ENV = ("GENERATION_HISTORY_DIR", "WEATHER_CACHE_DIR", "FORECAST_CACHE_DIR")
+
+
+@contextmanager
+def offline_environment(llm_latency_ms: float = 0.0, llm_jitter_ms: float = 0.0,
+                        wxtech_latency_ms: float = 0.0, seed: int = 0,
+                        recordings_dir: Path = RECORDINGS_DIR) -> Iterator[FakeWxTechServer]:
+    """外部サービスの代わりにスタブを使う実行環境
+
+    環境変数の設定・スタブサーバーの起動・LLMプロバイダーの差し替えを行い、終了時に元に戻す。
+    設定は環境変数から読み込み直す。生成履歴と予報キャッシュの保存先は一時ディレクトリになる。
+    """
+    previous = {name: os.environ.get(name) for name in (*OFFLINE_ENV, *_CACHE_DIR_ENV)}
+    tmpdir = Path(tempfile.mkdtemp(prefix="benchmarks-"))
+    os.environ.update(OFFLINE_ENV)
+    for name in _CACHE_DIR_ENV:
+        os.environ[name] = str(tmpdir / name.lower())
+    reset_config()
+    try:
+        with ExitStack() as stack:
+            server = stack.enter_context(FakeWxTechServer(recordings_dir, latency_ms=wxtech_latency_ms))
+            stack.enter_context(install_fake_llm(llm_latency_ms, llm_jitter_ms, seed))
+            yield server
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        reset_config()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def reset_forecast_caches() -> None:
+    """予報のプロセス内キャッシュと保存済みの予報キャッシュを空にする"""
+    from src.apis.wxtech.grid import reset_grid_forecast_cache
+    from src.data.forecast_cache import shutdown_forecast_cache
+    from src.utils.single_flight import reset_single_flights
+
+    shutdown_forecast_cache()
+    reset_grid_forecast_cache()
+    reset_single_flights()
+    for name in ("WEATHER_CACHE_DIR", "FORECAST_CACHE_DIR"):
+        directory = Path(os.environ[name])
+        if directory.exists():
+            shutil.rmtree(directory)
+
+
+def location_names(count: int) -> list[str]:
+    """Chiten.csv の先頭から count 地点"""
+    from src.data.location import LocationManagerRefactored
+    return [location.name for location in LocationManagerRefactored().get_all_locations()[:count]]
+
+
+def _check_results(results: list[dict[str, Any]], key: str = "success") -> None:
+    failed = [r for r in results if not r.get(key)]
+    if failed:
+        raise RuntimeError(f"{len(failed)}/{len(results)} locations failed: {failed[0].get('error')}")
+
+
+def _unified(count: int):
+    from src.workflows.unified_comment_generation_workflow import run_unified_comment_generation
+
+    names = location_names(count)
+
+    def run() -> None:
+        reset_forecast_caches()
+        _check_results([run_unified_comment_generation(name, llm_provider=FAKE_PROVIDER_NAME) for name in names])
+
+    return run
+
+
+def _bulk(count: int):
+    import httpx
+
+    from api_server import app
+
+    names = location_names(count)
+
+    async def request() -> dict[str, Any]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            response = await client.post(
+                "/api/generate/bulk", json={"locations": names, "llm_provider": FAKE_PROVIDER_NAME}
+            )
+            response.raise_for_status()
+            return response.json()
+
+    def run() -> None:
+        reset_forecast_caches()
+        _check_results(asyncio.run(request())["results"])
+
+    return run
+
+
+# 142地点は1ラウンドに数秒かかるため、ラウンド数を抑える
+for _count in LOCATION_COUNTS:
+    _options = {"min_rounds": 3 if _count < 142 else 2, "round_time": 0.0, "max_time": 0.0}
+    benchmark("macro.unified", f"locations_{_count}", **_options)(lambda count=_count: _unified(count))
+    benchmark("macro.bulk", f"locations_{_count}", **_options)(lambda count=_count: _bulk(count))
@@ -0,0 +1,288 @@
+"""
+ホットパスの関数単位のベンチマーク
+
+コメント生成1回ごとに呼ばれる関数（フィルター・バリデーター・選択・解析・キャッシュ）を
+単体で計測する。入力には output/ の過去コメント（共有コーパス）と、スタブサーバーと同じ方法で
+合成した WxTech のレスポンスを使う。外部API・LLM は呼び出さない（LLM は FakeLLMProvider に
+差し替えた状態で実行する）。
+"""
+
+from __future__ import annotations
+
+import copy
+import itertools
+import json
+from datetime import datetime
+
+from benchmarks.fake_wxtech import synthesize_payload
+from benchmarks.harness import benchmark
+from src.data.forecast_time_index import JST
+from src.data.past_comment import CommentType, PastComment
+from src.data.weather_data import WeatherCondition, WeatherForecast, WindDirection
+
+# 入力データを固定するための基準日時（計測結果が実行日に依存しないようにする）
+REFERENCE_DATETIME = datetime(2025, 7, 1, 0, 0, tzinfo=JST)
+TOKYO = (35.6762, 139.6503)
+
+
+def corpus_comments(comment_type: CommentType, season: str = "夏") -> list[PastComment]:
+    """共有コーパスの過去コメント（本番と同じく列指向ストアに紐付いたオブジェクト）"""
+    from src.repositories.comment_corpus import get_comment_corpus
+    return list(get_comment_corpus().get_comments(season, comment_type))
+
+
+def make_forecast(description: str = "晴れ", condition: WeatherCondition = WeatherCondition.CLEAR,
+                  temperature: float = 31.0, precipitation: float = 0.0) -> WeatherForecast:
+    return WeatherForecast(
+        location_id="東京",
+        datetime=REFERENCE_DATETIME.replace(hour=12),
+        temperature=temperature,
+        feels_like=temperature,
+        humidity=60.0,
+        pressure=1013.0,
+        wind_speed=3.0,
+        wind_direction=WindDirection.SOUTH,
+        weather_condition=condition,
+        weather_description=description,
+        precipitation=precipitation,
+    )
+
+
+# ---------------------------------------------------------------------------
+# フィルター
+# ---------------------------------------------------------------------------
+
+@benchmark("micro.filters")
+def weather_comment_filter():
+    """共有コーパスのコメント（キーワードビットセットで判定）"""
+    from src.utils.weather_comment_filter import WeatherCommentFilter
+    comment_filter = WeatherCommentFilter()
+    comments = corpus_comments(CommentType.WEATHER_COMMENT)
+    return lambda: comment_filter.filter_comments(comments, "雨", 5.0, 24.0, 7)
+
+
+@benchmark("micro.filters")
+def weather_comment_filter_scan():
+    """コーパスに紐付かないコメント（1件ずつ文字列を走査）"""
+    from src.utils.weather_comment_filter import WeatherCommentFilter
+    comment_filter = WeatherCommentFilter()
+    comments = copy.deepcopy(corpus_comments(CommentType.WEATHER_COMMENT))
+    return lambda: comment_filter.filter_comments(comments, "雨", 5.0, 24.0, 7)
+
+
+@benchmark("micro.filters")
+def forbidden_phrases():
+    from src.nodes.unified_comment_generation.comment_filters import filter_forbidden_phrases
+    comments = corpus_comments(CommentType.ADVICE)
+    return lambda: filter_forbidden_phrases(comments)
+
+
+@benchmark("micro.filters")
+def seasonal_inappropriate():
+    from src.nodes.unified_comment_generation.comment_filters import filter_seasonal_inappropriate_comments
+    comments = corpus_comments(CommentType.WEATHER_COMMENT)
+    return lambda: filter_seasonal_inappropriate_comments(comments, 7)
+
+
+# ---------------------------------------------------------------------------
+# バリデーター
+# ---------------------------------------------------------------------------
+
+@benchmark("micro.validators")
+def temperature_validator():
+    from src.utils.validators.temperature_validator import TemperatureValidator
+    validator = TemperatureValidator()
+    comments = corpus_comments(CommentType.WEATHER_COMMENT)
+    weather = make_forecast(temperature=36.0)
+    return lambda: [validator.validate(comment, weather) for comment in comments]
+
+
+@benchmark("micro.validators")
+def weather_comment_validator():
+    from src.utils.validators.weather_comment_validator import WeatherCommentValidator
+    validator = WeatherCommentValidator()
+    comments = corpus_comments(CommentType.WEATHER_COMMENT)
+    weather = make_forecast("雨", WeatherCondition.RAIN, 24.0, 5.0)
+    return lambda: [validator.validate_comment(comment, weather) for comment in comments]
+
+
+@benchmark("micro.validators")
+def weather_appropriate_comments():
+    from src.utils.validators.weather_comment_validator import WeatherCommentValidator
+    validator = WeatherCommentValidator()
+    comments = corpus_comments(CommentType.ADVICE)
+    weather = make_forecast("雨", WeatherCondition.RAIN, 24.0, 5.0)
+    return lambda: validator.get_weather_appropriate_comments(comments, weather, CommentType.ADVICE, limit=500)
+
+
+# ---------------------------------------------------------------------------
+# コメント選択
+# ---------------------------------------------------------------------------
+
+@benchmark("micro.selector", min_rounds=5, round_time=0.05)
+def unified_comment_generation_node():
+    """統合ノードのフィルタリング・プロンプト構築・LLM応答の検証と適用（LLM の遅延なし）"""
+    from src.data.comment_generation_state import CommentGenerationState
+    from src.nodes.unified_comment_generation_node import unified_comment_generation_node as node
+
+    # 実行中は FakeLLMProvider に差し替えられている（install_fake_llm）
+    past_comments = corpus_comments(CommentType.WEATHER_COMMENT) + corpus_comments(CommentType.ADVICE)
+    weather = make_forecast()
+
+    def run() -> CommentGenerationState:
+        state = CommentGenerationState(
+            location_name="東京",
+            target_datetime=REFERENCE_DATETIME.replace(hour=12),
+            llm_provider="openai",
+        )
+        state.weather_data = weather
+        state.past_comments = past_comments
+        state = node(state)
+        if state.errors:
+            raise RuntimeError(state.errors[-1])
+        return state
+
+    return run
+
+
+# ---------------------------------------------------------------------------
+# 解析
+# ---------------------------------------------------------------------------
+
+@benchmark("micro.parser")
+def loads_response():
+    from src.apis.wxtech.parser import loads_response as loads
+    body = json.dumps(synthesize_payload(*TOKYO, 72, REFERENCE_DATETIME), ensure_ascii=False).encode("utf-8")
+    return lambda: loads(body)
+
+
+@benchmark("micro.parser")
+def parse_forecast_response():
+    from src.apis.wxtech.parser import parse_forecast_response as parse
+    payload = synthesize_payload(*TOKYO, 72, REFERENCE_DATETIME)
+    return lambda: parse(payload, "東京")
+
+
+@benchmark("micro.parser")
+def parse_forecast_response_target_hours():
+    from src.apis.wxtech.parser import parse_forecast_response as parse
+    payload = synthesize_payload(*TOKYO, 72, REFERENCE_DATETIME)
+    target_date = REFERENCE_DATETIME.date().replace(day=2)
+    return lambda: parse(payload, "東京", target_date=target_date, target_hours=(9, 12, 15, 18))
+
+
+@benchmark("micro.parser")
+def parse_unified_response():
+    from src.nodes.unified_comment_generation.response_parser import parse_unified_response as parse
+    body = json.dumps({
+        "selected_weather_index": 3,
+        "selected_advice_index": 5,
+        "weather_comment": "強い日差しが照りつけます",
+        "advice_comment": "熱中症に警戒を",
+        "selection_reason": "猛暑日で日差しが強いため",
+    }, ensure_ascii=False)
+    response = f"以下が回答です。\n```json\n{body}\n```\n"
+    return lambda: parse(response)
+
+
+@benchmark("micro.parser")
+def build_unified_prompt():
+    from src.nodes.unified_comment_generation.prompt_builder import build_unified_prompt as build
+    weather_comments = corpus_comments(CommentType.WEATHER_COMMENT)
+    advice_comments = corpus_comments(CommentType.ADVICE)
+    target = REFERENCE_DATETIME.replace(hour=12)
+    return lambda: build(weather_comments, advice_comments, "天気: 晴れ\n気温: 31.0°C", "東京", target)
+
+
+# ---------------------------------------------------------------------------
+# キャッシュ
+# ---------------------------------------------------------------------------
+
+@benchmark("micro.caches")
+def ttl_cache_get():
+    from src.utils.cache import TTLCache
+    cache = TTLCache(default_ttl=3600, max_size=10_000)
+    keys = [f"key{i}" for i in range(10_000)]
+    for key in keys:
+        cache.set(key, key)
+    lookups = itertools.cycle(keys)
+    return lambda: cache.get(next(lookups))
+
+
+@benchmark("micro.caches")
+def ttl_cache_set_evict():
+    """上限に達したキャッシュへの保存（保存のたびに1件エビクション）"""
+    from src.utils.cache import TTLCache
+    cache = TTLCache(default_ttl=3600, max_size=10_000)
+    keys = itertools.count()
+    for _ in range(10_000):
+        cache.set(f"key{next(keys)}", 0)
+    return lambda: cache.set(f"key{next(keys)}", 0)
+
+
+@benchmark("micro.caches")
+def lru_comment_cache_set_evict():
+    """バイト数の上限に達したキャッシュへの保存"""
+    from src.repositories.lru_comment_cache import LRUCommentCache
+    comments = corpus_comments(CommentType.WEATHER_COMMENT)[:5]
+    probe = LRUCommentCache()
+    entry_mb = probe._estimate_memory_usage(comments) / (1024 * 1024)
+    cache = LRUCommentCache(max_size=100_000, max_memory_mb=entry_mb * 2_000)
+    keys = itertools.count()
+    for _ in range(2_000):
+        cache.set(f"key{next(keys)}", comments)
+    return lambda: cache.set(f"key{next(keys)}", comments)
+
+
+@benchmark("micro.caches")
+def lru_comment_cache_get():
+    from src.repositories.lru_comment_cache import LRUCommentCache
+    comments = corpus_comments(CommentType.WEATHER_COMMENT)[:5]
+    cache = LRUCommentCache(max_size=2_000, max_memory_mb=1024)
+    keys = [f"key{i}" for i in range(2_000)]
+    for key in keys:
+        cache.set(key, comments)
+    lookups = itertools.cycle(keys)
+    return lambda: cache.get(next(lookups))
+
+
+@benchmark("micro.caches")
+def multilevel_comment_cache_get():
+    from src.repositories.multilevel_comment_cache import MultiLevelCommentCache
+    comments = corpus_comments(CommentType.WEATHER_COMMENT)[:5]
+    cache = MultiLevelCommentCache(max_size_per_level=5_000, max_memory_mb_per_level=1024)
+    regions = [f"地域{i:03d}" for i in range(500)]
+    for region in regions:
+        cache.set(comments, CommentType.WEATHER_COMMENT, "夏", region)
+    lookups = itertools.cycle(regions)
+    return lambda: cache.get(CommentType.WEATHER_COMMENT, "夏", next(lookups))
+
+
+@benchmark("micro.caches")
+def multilevel_comment_cache_invalidate():
+    """地域を指定した無効化（無効化した地域はすぐに保存し直す）"""
+    from src.repositories.multilevel_comment_cache import MultiLevelCommentCache
+    comments = corpus_comments(CommentType.WEATHER_COMMENT)[:5]
+    cache = MultiLevelCommentCache(max_size_per_level=20_000, max_memory_mb_per_level=1024)
+    regions = [f"地域{i:03d}" for i in range(500)]
+    for region in regions:
+        for comment_type in CommentType:
+            cache.set(comments, comment_type, "夏", region)
+    targets = itertools.cycle(regions)
+
+    def invalidate_and_refill() -> None:
+        region = next(targets)
+        cache.invalidate(region=region)
+        cache.set(comments, CommentType.WEATHER_COMMENT, "夏", region)
+
+    return invalidate_and_refill
+
+
+@benchmark("micro.caches")
+def llm_response_cache_key():
+    """統合生成プロンプトの正規化とキャッシュキーの生成"""
+    from src.llm.response_cache import make_cache_key
+    from src.nodes.unified_comment_generation.prompt_builder import build_unified_prompt as build
+    prompt = build(corpus_comments(CommentType.WEATHER_COMMENT), corpus_comments(CommentType.ADVICE),
+                   "天気: 晴れ\n気温: 31.0°C", "東京", REFERENCE_DATETIME.replace(hour=12))
+    return lambda: make_cache_key("openai", "fake", prompt)
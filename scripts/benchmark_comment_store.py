@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+過去コメントストアのメモリ・読み込み時間ベンチマーク
+
+LazyCommentRepository（行ごとに PastComment を生成）と
+ColumnarCommentStore（列指向 + 遅延変換）を比較する。
+"""
+
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.past_comment import CommentType
+from src.repositories.columnar_comment_store import ColumnarCommentStore
+from src.repositories.comment_corpus import DEFAULT_SEASONS
+from src.repositories.lazy_comment_repository import LazyCommentRepository
+
+
+def load_lazy_repository(output_dir: str) -> Any:
+    """LazyCommentRepositoryで全ファイルを読み込む"""
+    repository = LazyCommentRepository(output_dir=output_dir, max_workers=1)
+    repository._file_cache.stop_cleanup()
+    for season in repository.SEASONS:
+        for comment_type in repository.COMMENT_TYPES:
+            repository._load_file_if_needed(season, comment_type)
+    return repository
+
+
+def load_columnar_store(output_dir: str) -> Any:
+    """ColumnarCommentStoreで全ファイルを読み込む"""
+    return ColumnarCommentStore.from_csv_files(output_dir, DEFAULT_SEASONS)
+
+
+def measure_load(loader: Callable[[str], Any], output_dir: str, iterations: int) -> dict[str, float]:
+    """読み込み時間（ミリ秒）と保持メモリ（KB）を計測"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        loader(output_dir)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    retained = loader(output_dir)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+
+    return {
+        "mean_ms": statistics.mean(timings),
+        "median_ms": statistics.median(timings),
+        "retained_kb": current / 1024,
+        "peak_kb": peak / 1024,
+    }
+
+
+def main():
+    """メイン実行関数"""
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else "output"
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print("\n" + "=" * 60)
+    print("過去コメントストア ベンチマーク")
+    print("=" * 60)
+    print(f"対象ディレクトリ: {output_dir}")
+    print(f"反復回数: {iterations}")
+
+    results = {
+        "LazyCommentRepository": measure_load(load_lazy_repository, output_dir, iterations),
+        "ColumnarCommentStore": measure_load(load_columnar_store, output_dir, iterations),
+    }
+
+    for name, result in results.items():
+        print(f"\n--- {name} ---")
+        print(f"  読み込み時間: 平均 {result['mean_ms']:.2f}ms  中央値 {result['median_ms']:.2f}ms")
+        print(f"  保持メモリ: {result['retained_kb']:.1f}KB  ピーク: {result['peak_kb']:.1f}KB")
+
+    lazy = results["LazyCommentRepository"]
+    columnar = results["ColumnarCommentStore"]
+    print(f"\n読み込み時間: {lazy['mean_ms'] / columnar['mean_ms']:.1f}倍高速")
+    print(f"保持メモリ: {lazy['retained_kb'] / columnar['retained_kb']:.1f}分の1")
+
+    # 1リクエスト分（100件）の行選択と遅延変換のコスト
+    store = load_columnar_store(output_dir)
+    timings = []
+    for _ in range(iterations * 10):
+        start = time.perf_counter()
+        indices = store.select(["夏", "台風"], CommentType.WEATHER_COMMENT)[:50]
+        store.materialize_many(indices)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    print(f"\n行選択 + 50件の変換（2回目以降はキャッシュ）: 中央値 {statistics.median(timings):.1f}µs")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    main()
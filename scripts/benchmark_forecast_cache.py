@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+予報キャッシュバックエンドのベンチマーク
+
+142地点 × 30日分（1日4時刻）の予報を保存し、CSVバックエンドと
+SQLiteバックエンドの書き込み・読み込み・保持期間削除の時間を比較する。
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.forecast_cache.models import ForecastCacheEntry
+from src.data.forecast_cache.storage import ForecastCacheBackend, create_forecast_backend
+
+JST = ZoneInfo("Asia/Tokyo")
+FORECAST_HOURS = (9, 12, 15, 18)
+
+
+def build_entries(locations: int, days: int, now: datetime) -> list[list[ForecastCacheEntry]]:
+    """日ごとの保存単位（全地点 × 4時刻）でエントリを生成"""
+    rng = random.Random(0)
+    batches = []
+    for day in range(days):
+        cached_at = now - timedelta(days=days - day)
+        forecast_date = cached_at.date() + timedelta(days=1)
+        batch = []
+        for index in range(locations):
+            for hour in FORECAST_HOURS:
+                batch.append(ForecastCacheEntry(
+                    location_name=f"地点{index:03d}",
+                    forecast_datetime=datetime(forecast_date.year, forecast_date.month, forecast_date.day,
+                                               hour, tzinfo=JST),
+                    cached_at=cached_at,
+                    temperature=round(rng.uniform(-5, 35), 1),
+                    weather_condition="晴れ",
+                    weather_description="晴れ",
+                    precipitation=round(rng.uniform(0, 10), 1),
+                    humidity=60.0,
+                    wind_speed=3.0,
+                    metadata={"source": "benchmark"},
+                ))
+        batches.append(batch)
+    return batches
+
+
+def run_backend(kind: str, batches: list[list[ForecastCacheEntry]], locations: int,
+                now: datetime, retention_days: int) -> dict[str, float]:
+    """1つのバックエンドで保存・読み込み・削除の時間を計測"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        backend: ForecastCacheBackend = create_forecast_backend(kind, Path(cache_dir))
+        try:
+            start = time.perf_counter()
+            for batch in batches:
+                backend.save_entries(batch)
+            write_s = time.perf_counter() - start
+
+            # get_forecast_at_time と同じく対象日時の前後7日分を読み込む
+            target = now + timedelta(days=1)
+            read_timings = []
+            for index in range(locations):
+                start = time.perf_counter()
+                backend.load_entries(f"地点{index:03d}", target - timedelta(days=7), target + timedelta(days=7))
+                read_timings.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            deleted = backend.delete_older_than(now - timedelta(days=retention_days))
+            cleanup_s = time.perf_counter() - start
+        finally:
+            backend.close()
+
+    return {
+        "write_s": write_s,
+        "read_median_ms": statistics.median(read_timings),
+        "read_total_s": sum(read_timings) / 1000,
+        "cleanup_s": cleanup_s,
+        "deleted": deleted,
+    }
+
+
+def main():
+    """メイン実行関数"""
+    locations = int(sys.argv[1]) if len(sys.argv) > 1 else 142
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    retention_days = 7
+    now = datetime.now(JST)
+
+    print("\n" + "=" * 60)
+    print("予報キャッシュバックエンド ベンチマーク")
+    print("=" * 60)
+    print(f"地点数: {locations}  日数: {days}  保存件数: {locations * days * len(FORECAST_HOURS)}")
+
+    batches = build_entries(locations, days, now)
+    results = {kind: run_backend(kind, batches, locations, now, retention_days) for kind in ("csv", "sqlite")}
+
+    for kind, result in results.items():
+        print(f"\n--- {kind} ---")
+        print(f"  書き込み: {result['write_s']:.2f}秒")
+        print(f"  読み込み（±7日）: 中央値 {result['read_median_ms']:.2f}ms  全地点 {result['read_total_s']:.2f}秒")
+        print(f"  保持期間削除: {result['cleanup_s']:.2f}秒 ({result['deleted']}件)")
+
+    csv_result = results["csv"]
+    sqlite_result = results["sqlite"]
+    print(f"\n読み込み: {csv_result['read_total_s'] / sqlite_result['read_total_s']:.1f}倍高速")
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    main()
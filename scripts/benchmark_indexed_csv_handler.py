@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+IndexedCSVHandler のベンチマーク
+
+1. 変更検知: CSVの行数ごとに、アクセスのたびに全体のMD5を計算する旧方式と、
+   フィンガープリントで判定して内容ハッシュを再利用する方式の1回あたりの時間を計測する。
+2. インデックスの読み込み: 旧形式（PastCommentを辞書にしたJSON、索引ごとに重複して保存）と
+   pickle（プロトコル5）について、ファイルサイズと読み込み時間を計測する。
+"""
+
+import csv
+import json
+import os
+import pickle
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.past_comment import CommentType, PastComment
+from src.repositories.indexed_csv_handler import PICKLE_PROTOCOL, compute_file_hash, get_content_hash
+
+ROW_COUNTS = (1_000, 10_000, 100_000)
+WEATHERS = ("晴れ", "曇り", "雨", "雪", "雷", "霧")
+
+
+def median_ms(func: Callable[[], Any], repeat: int = 5) -> float:
+    """1回あたりの時間（ミリ秒、repeat回の中央値）"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def write_csv(path: Path, rows: int) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["weather_comment", "advice", "weather_condition", "usage_count"])
+        writer.writeheader()
+        for i in range(rows):
+            writer.writerow({
+                "weather_comment": f"{WEATHERS[i % len(WEATHERS)]}の一日になりそうです{i}",
+                "advice": f"お出かけの際はご注意ください{i}",
+                "weather_condition": WEATHERS[i % len(WEATHERS)],
+                "usage_count": i % 50,
+            })
+
+
+def build_index(rows: int) -> dict[str, Any]:
+    """IndexedCSVHandler と同じ構造のインデックス（各索引が同じPastCommentを共有する）"""
+    index: dict[str, Any] = {"by_weather": {}, "by_count": {}, "by_season": {}, "all_comments": []}
+    for i in range(rows):
+        weather = WEATHERS[i % len(WEATHERS)]
+        comment = PastComment(
+            location="",
+            datetime=datetime(2025, 7, 1, 9, 0),
+            weather_condition=weather,
+            comment_text=f"{weather}の一日になりそうです{i}",
+            comment_type=CommentType.WEATHER_COMMENT,
+            temperature=float(i % 35),
+            raw_data={"season": "夏", "usage_count": i % 50},
+        )
+        index["all_comments"].append(comment)
+        index["by_weather"].setdefault(weather, []).append(comment)
+        index["by_count"].setdefault(str(i % 50), []).append(comment)
+        index["by_season"].setdefault("夏", []).append(comment)
+    return index
+
+
+def comment_to_dict(comment: PastComment) -> dict[str, Any]:
+    return {
+        "location": comment.location,
+        "datetime": comment.datetime.isoformat(),
+        "weather_condition": comment.weather_condition,
+        "comment_text": comment.comment_text,
+        "comment_type": comment.comment_type.value,
+        "temperature": comment.temperature,
+        "raw_data": comment.raw_data,
+    }
+
+
+def dict_to_comment(data: dict[str, Any]) -> PastComment:
+    return PastComment(
+        location=data["location"],
+        datetime=datetime.fromisoformat(data["datetime"]),
+        weather_condition=data["weather_condition"],
+        comment_text=data["comment_text"],
+        comment_type=CommentType(data["comment_type"]),
+        temperature=data["temperature"],
+        raw_data=data["raw_data"],
+    )
+
+
+def save_json(path: Path, index: dict[str, Any]) -> None:
+    """旧形式と同じ保存方法（索引ごとに辞書へ変換し、indent=2 のJSONで保存）"""
+    serializable = {
+        "all_comments": [comment_to_dict(c) for c in index["all_comments"]],
+        **{key: {sub_key: [comment_to_dict(c) for c in comments] for sub_key, comments in index[key].items()}
+           for key in ("by_weather", "by_count", "by_season")},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(serializable, f, ensure_ascii=False, indent=2)
+
+
+def load_json(path: Path) -> dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        "all_comments": [dict_to_comment(d) for d in data["all_comments"]],
+        **{key: {sub_key: [dict_to_comment(d) for d in dicts] for sub_key, dicts in data[key].items()}
+           for key in ("by_weather", "by_count", "by_season")},
+    }
+
+
+def load_pickle(path: Path) -> dict[str, Any]:
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def main():
+    """メイン実行関数"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+
+        print("\n" + "=" * 72)
+        print("変更検知（インデックス付き読み込み1回あたり）")
+        print("=" * 72)
+        print(f"{'行数':>10}{'CSVサイズ KB':>14}{'全体MD5 ms':>14}{'フィンガープリント ms':>22}")
+        for rows in ROW_COUNTS:
+            csv_path = tmp / f"comments_{rows}.csv"
+            write_csv(csv_path, rows)
+            get_content_hash(csv_path)
+            full_ms = median_ms(lambda csv_path=csv_path: compute_file_hash(csv_path))
+            fingerprint_ms = median_ms(
+                lambda csv_path=csv_path: [get_content_hash(csv_path) for _ in range(1_000)]
+            ) / 1_000
+            print(f"{rows:>10,}{csv_path.stat().st_size / 1024:>14,.0f}{full_ms:>14.3f}{fingerprint_ms:>22.4f}")
+
+        print("\n" + "=" * 72)
+        print("インデックスの読み込み")
+        print("=" * 72)
+        print(f"{'行数':>10}{'JSON KB':>12}{'JSON ms':>12}{'pickle KB':>12}{'pickle ms':>12}")
+        for rows in ROW_COUNTS:
+            index = build_index(rows)
+            json_path = tmp / f"index_{rows}.json"
+            pickle_path = tmp / f"index_{rows}.pkl"
+            save_json(json_path, index)
+            with open(pickle_path, "wb") as f:
+                pickle.dump(index, f, protocol=PICKLE_PROTOCOL)
+            repeat = 3 if rows >= 100_000 else 5
+            json_ms = median_ms(lambda json_path=json_path: load_json(json_path), repeat)
+            pickle_ms = median_ms(lambda pickle_path=pickle_path: load_pickle(pickle_path), repeat)
+            print(f"{rows:>10,}{json_path.stat().st_size / 1024:>12,.0f}{json_ms:>12.1f}"
+                  f"{pickle_path.stat().st_size / 1024:>12,.0f}{pickle_ms:>12.1f}")
+
+        print("\n" + "=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+LRUCommentCache のエビクション・ストレスベンチマーク
+
+バイト数の上限が厳しいキャッシュ（上限に達した状態）へ保存し続け、保存1回あたりの時間を
+エントリ数ごとに計測する。保存のたびに1〜数件のエビクションが発生する。比較用に、旧実装と
+同じ方式（エビクションのループ1周ごとに全エントリのサイズを推定し直す）の参照実装も計測する。
+"""
+
+import itertools
+import logging
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.past_comment import CommentType, PastComment
+from src.repositories.lru_comment_cache import LRUCommentCache
+
+SIZES = (500, 2_000, 10_000)
+COMMENTS_PER_ENTRY = 5
+
+
+class RecomputingLRUCommentCache(LRUCommentCache):
+    """旧実装と同じ方式の参照実装（メモリ制限のエビクションが O(n²)）"""
+
+    def _get_total_memory_usage(self) -> int:
+        return sum(self._estimate_memory_usage(comments) for comments, _ in self._cache.values())
+
+    def _evict_if_needed(self, new_size: int) -> None:
+        while len(self._cache) >= self._max_size:
+            self._evict_oldest()
+        current_memory = self._get_total_memory_usage()
+        while current_memory + new_size > self._max_memory_bytes and self._cache:
+            self._evict_oldest()
+            current_memory = self._get_total_memory_usage()
+
+
+def make_comments(index: int, text_length: int) -> list[PastComment]:
+    """1エントリ分のコメント（本文の長さでエントリサイズを変える）"""
+    return [
+        PastComment(
+            location="東京",
+            datetime=datetime.now(),
+            weather_condition="晴れ",
+            comment_text="あ" * text_length,
+            comment_type=CommentType.WEATHER_COMMENT,
+            raw_data={"season": "夏", "count": index},
+        )
+        for _ in range(COMMENTS_PER_ENTRY)
+    ]
+
+
+def filled_cache(cache_class: type[LRUCommentCache], source: LRUCommentCache) -> LRUCommentCache:
+    """満杯まで保存済みのキャッシュを複製する（旧方式は満杯にするまでにも O(n²) かかるため）"""
+    cache = cache_class.__new__(cache_class)
+    cache.__dict__.update(source.__dict__)
+    cache._cache = source._cache.copy()
+    cache._entry_sizes = dict(source._entry_sizes)
+    return cache
+
+
+def measure(cache_class: type[LRUCommentCache], size: int, operations: int,
+            size_estimator: str = "fast") -> dict[str, float]:
+    """1つの実装・エントリ数での計測（保存1回あたりのマイクロ秒、3回の中央値）"""
+    probe = LRUCommentCache(size_estimator=size_estimator)
+    entry_bytes = probe._estimate_memory_usage(make_comments(0, 20))
+    # 標準サイズのエントリがちょうど size 件入るバイト数を上限にする
+    source = LRUCommentCache(max_size=size * 10, max_memory_mb=entry_bytes * size / (1024 * 1024),
+                             size_estimator=size_estimator)
+    for i in range(size):
+        source.set(f"key{i}", make_comments(i, 20))
+    # 本文の長さを変えて、1回の保存で複数件のエビクションが起きる場合も含める
+    payloads = [make_comments(i, (10, 20, 60)[i % 3]) for i in range(operations)]
+
+    timings = []
+    evictions = 0
+    for _ in range(3):
+        cache = filled_cache(cache_class, source)
+        keys = itertools.count()
+        start = time.perf_counter()
+        for comments in payloads:
+            cache.set(f"new{next(keys)}", comments)
+        timings.append((time.perf_counter() - start) / operations * 1_000_000)
+        stats = cache.get_stats()
+        evictions = stats["eviction_count"]
+        assert stats["memory_usage_bytes"] <= stats["max_memory_bytes"]
+    return {"set_us": statistics.median(timings), "evictions": evictions}
+
+
+def main():
+    """メイン実行関数"""
+    # 保存のたびに出る INFO ログを抑止する
+    logging.getLogger("src.repositories.lru_comment_cache").setLevel(logging.WARNING)
+
+    implementations: dict[str, tuple[type[LRUCommentCache], str]] = {
+        "増分管理(fast)": (LRUCommentCache, "fast"),
+        "増分管理(deep)": (LRUCommentCache, "deep"),
+        "全件再計算（旧方式）": (RecomputingLRUCommentCache, "fast"),
+    }
+    operations_for: dict[str, Callable[[int], int]] = {
+        "増分管理(fast)": lambda size: 5_000,
+        "増分管理(deep)": lambda size: 2_000,
+        # 旧方式はエビクションのたびに全件を走査するため、計測回数を減らす
+        "全件再計算（旧方式）": lambda size: max(20, 100_000 // size),
+    }
+
+    print("\n" + "=" * 72)
+    print("LRUCommentCache エビクション・ストレスベンチマーク")
+    print("=" * 72)
+    print(f"{'実装':<20}{'エントリ数':>10}{'保存回数':>10}{'エビクション':>14}{'保存 µs':>14}")
+
+    for size in SIZES:
+        for name, (cache_class, size_estimator) in implementations.items():
+            operations = operations_for[name](size)
+            result = measure(cache_class, size, operations, size_estimator)
+            print(f"{name:<20}{size:>10,}{operations:>10,}{result['evictions']:>14,}{result['set_us']:>14.2f}")
+
+    print("\n" + "=" * 72)
+
+
+if __name__ == "__main__":
+    main()
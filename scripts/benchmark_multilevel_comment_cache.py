@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+MultiLevelCommentCache の無効化ベンチマーク
+
+数万件のキーを保存したキャッシュで、条件指定の無効化（タイプ+季節+地域 / 地域のみ）1回あたりの
+時間と、全体の無効化（clear と世代番号の更新）の時間を計測する。比較用に、旧実装と同じ方式
+（全レベルの全キーを走査して条件と照合する）で同じ結果を返す参照実装も計測する。
+"""
+
+import logging
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.past_comment import CommentType, PastComment
+from src.repositories.multilevel_comment_cache import ALL, LEVELS, MultiLevelCommentCache
+
+COMMENT_TYPES = list(CommentType)
+SEASONS = ("春", "梅雨", "夏", "台風", "秋", "冬")
+REGION_COUNTS = (500, 2_000)
+
+
+class ScanningMultiLevelCommentCache(MultiLevelCommentCache):
+    """旧実装と同じ方式の参照実装（無効化のたびに全レベルの全キーを走査する）"""
+
+    def invalidate(self, comment_type=None, season=None, region=None) -> int:
+        conditions = {
+            dimension: value
+            for dimension, value in (("type", comment_type.value if comment_type else None),
+                                     ("season", season), ("region", region))
+            if value
+        }
+        if not conditions:
+            return 0
+        count = 0
+        with self._lock:
+            for level in LEVELS:
+                cache = self._caches[level]
+                for key in list(cache._cache.keys()):
+                    # "g{世代}:type:{タイプ}:season:{季節}:region:{地域}" を分解して照合する
+                    parts = key.split(":")[1:]
+                    tags = {"season": ALL, "region": ALL, **dict(zip(parts[::2], parts[1::2], strict=True))}
+                    if all(tags[dimension] in (value, ALL) for dimension, value in conditions.items()):
+                        self._current_index(level).discard(key)
+                        if cache.invalidate(key):
+                            count += 1
+        return count
+
+
+def filled_cache(cache_class: type[MultiLevelCommentCache], regions: list[str]) -> MultiLevelCommentCache:
+    """L1にタイプ×季節×地域、L2にタイプ×季節、L3にタイプを保存したキャッシュ"""
+    cache = cache_class(max_size_per_level=len(regions) * len(SEASONS) * len(COMMENT_TYPES),
+                        max_memory_mb_per_level=4096)
+    comments = [
+        PastComment(location="東京", datetime=datetime.now(), weather_condition="晴れ",
+                    comment_text="晴れの日です", comment_type=CommentType.WEATHER_COMMENT)
+    ]
+    for comment_type in COMMENT_TYPES:
+        cache.set(comments, comment_type)
+        for season in SEASONS:
+            cache.set(comments, comment_type, season)
+            for region in regions:
+                cache.set(comments, comment_type, season, region)
+    return cache
+
+
+def per_op_us(cache: MultiLevelCommentCache, targets: list[tuple], operations: int) -> tuple[float, int]:
+    """無効化1回あたりの時間（マイクロ秒）と無効化した合計件数"""
+    start = time.perf_counter()
+    invalidated = sum(cache.invalidate(*target) for target in targets[:operations])
+    return (time.perf_counter() - start) / operations * 1_000_000, invalidated
+
+
+def measure(cache_class: type[MultiLevelCommentCache], regions: list[str], operations: int) -> dict[str, float]:
+    """1つの実装・地域数での計測"""
+    results = {}
+
+    # タイプ+季節+地域の指定（L1の1件と、それを含むL2・L3のエントリが対象）
+    cache = filled_cache(cache_class, regions)
+    results["keys"] = sum(cache.get_stats()["indexed_keys"].values())
+    targets = [(COMMENT_TYPES[i % len(COMMENT_TYPES)], SEASONS[i % len(SEASONS)], regions[i % len(regions)])
+               for i in range(operations)]
+    results["exact_us"], results["exact_count"] = per_op_us(cache, targets, operations)
+
+    # 地域のみの指定（全タイプ・全季節の該当地域が対象）
+    cache = filled_cache(cache_class, regions)
+    targets = [(None, None, region) for region in regions]
+    results["region_us"], results["region_count"] = per_op_us(cache, targets, min(operations, len(regions)))
+
+    # 全体の無効化（clear と世代番号の更新）
+    for label, invalidate_all in (("clear_ms", lambda c: c.clear()), ("generation_ms", lambda c: c.invalidate_all())):
+        timings = []
+        for _ in range(3):
+            cache = filled_cache(cache_class, regions)
+            start = time.perf_counter()
+            invalidate_all(cache)
+            timings.append((time.perf_counter() - start) * 1000)
+        results[label] = statistics.median(timings)
+    return results
+
+
+def main():
+    """メイン実行関数"""
+    # 保存・無効化のたびに出る INFO ログを抑止する
+    logging.getLogger("src.repositories").setLevel(logging.WARNING)
+
+    implementations: dict[str, tuple[type[MultiLevelCommentCache], Callable[[int], int]]] = {
+        "タグインデックス": (MultiLevelCommentCache, lambda keys: 1_000),
+        # 旧方式は無効化のたびに全キーを走査するため、計測回数を減らす
+        "全キー走査（旧方式）": (ScanningMultiLevelCommentCache, lambda keys: max(10, 500_000 // keys)),
+    }
+
+    print("\n" + "=" * 96)
+    print("MultiLevelCommentCache 無効化ベンチマーク")
+    print("=" * 96)
+    print(f"{'実装':<20}{'キー数':>9}{'タイプ+季節+地域 µs':>18}{'地域のみ µs':>14}"
+          f"{'clear ms':>12}{'世代更新 ms':>14}")
+
+    for region_count in REGION_COUNTS:
+        regions = [f"地域{i:05d}" for i in range(region_count)]
+        keys = region_count * len(SEASONS) * len(COMMENT_TYPES)
+        for name, (cache_class, operations_for) in implementations.items():
+            operations = operations_for(keys)
+            result = measure(cache_class, regions, operations)
+            print(
+                f"{name:<20}{result['keys']:>9,}{result['exact_us']:>18.2f}{result['region_us']:>14.2f}"
+                f"{result['clear_ms']:>12.2f}{result['generation_ms']:>14.4f}"
+            )
+
+    print("\n" + "=" * 96)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+TTLCache のマイクロベンチマーク
+
+1k / 10k / 100k エントリで、満杯時の保存（LRUエビクションを伴う）・取得・期限切れの削除の
+1操作あたりの時間と、定期クリーンアップ1回分の時間を計測する。比較用に、旧実装と同じ方式（全エントリの最終アクセス時刻から
+min() で削除対象を探す）の参照実装も計測する。
+"""
+
+import itertools
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.cache import TTLCache
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+class LinearScanTTLCache:
+    """旧TTLCacheと同じ方式の参照実装（エビクション・期限切れの削除が O(n)）"""
+
+    def __init__(self, default_ttl: float = 300, max_size: int | None = None):
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self._cache: dict[str, dict[str, Any]] = {}
+
+    def get(self, key: str) -> Any | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        now = time.time()
+        if now >= entry["expire_at"]:
+            del self._cache[key]
+            return None
+        entry["last_accessed"] = now
+        return entry["value"]
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        if self.max_size and len(self._cache) >= self.max_size:
+            del self._cache[min(self._cache, key=lambda k: self._cache[k]["last_accessed"])]
+        now = time.time()
+        self._cache[key] = {"value": value, "expire_at": now + (ttl or self.default_ttl), "last_accessed": now}
+
+    def cleanup_expired(self) -> None:
+        now = time.time()
+        for key in [key for key, entry in self._cache.items() if now >= entry["expire_at"]]:
+            del self._cache[key]
+
+
+def per_op_us(func: Callable[[int], None], operations: int, repeat: int = 3) -> float:
+    """1操作あたりの時間（マイクロ秒、repeat回の中央値）"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(operations):
+            func(i)
+        timings.append((time.perf_counter() - start) / operations * 1_000_000)
+    return statistics.median(timings)
+
+
+def measure(factory: Callable[[int], Any], size: int, set_operations: int) -> dict[str, float]:
+    """1つの実装・エントリ数での計測"""
+    cache = factory(size)
+    for i in range(size):
+        cache.set(f"key{i}", i)
+
+    new_keys = itertools.count()
+    results = {
+        # 満杯の状態で新しいキーを保存する（毎回1件エビクション）
+        "set_full_us": per_op_us(lambda i: cache.set(f"new{next(new_keys)}", i), set_operations),
+        "get_hit_us": per_op_us(lambda i: cache.get(f"key{size - 1 - i % (size // 2)}"), 10_000),
+    }
+
+    # 定期クリーンアップ1回分の時間（期限切れなし / 10%が期限切れ）
+    for label, short_ttl in (("cleanup_none_ms", 300), ("cleanup_10pct_ms", 0.001)):
+        cache = factory(size)
+        for i in range(size):
+            cache.set(f"key{i}", i, ttl=short_ttl if i % 10 == 0 else 300)
+        time.sleep(0.01)
+        start = time.perf_counter()
+        cache.cleanup_expired()
+        results[label] = (time.perf_counter() - start) * 1000
+    return results
+
+
+def main():
+    """メイン実行関数"""
+    implementations = {
+        "TTLCache": lambda size: TTLCache(default_ttl=300, max_size=size, auto_cleanup=False),
+        "線形探索（旧方式）": lambda size: LinearScanTTLCache(default_ttl=300, max_size=size),
+    }
+
+    print("\n" + "=" * 88)
+    print("TTLCache ベンチマーク")
+    print("=" * 88)
+    print(f"{'実装':<16}{'エントリ数':>10}{'保存(満杯) µs':>16}{'取得 µs':>12}"
+          f"{'削除(期限切れなし) ms':>18}{'削除(10%) ms':>14}")
+
+    for size in SIZES:
+        for name, factory in implementations.items():
+            # 旧方式は保存のたびに全件を走査するため、計測回数を減らす
+            set_operations = 10_000 if name == "TTLCache" else max(20, 2_000_000 // size)
+            result = measure(factory, size, set_operations)
+            print(
+                f"{name:<16}{size:>10,}{result['set_full_us']:>16.2f}"
+                f"{result['get_hit_us']:>12.2f}{result['cleanup_none_ms']:>18.2f}{result['cleanup_10pct_ms']:>14.2f}"
+            )
+
+    print("\n" + "=" * 88)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+ワークフロー構築コストのマイクロベンチマーク
+
+リクエストごとに StateGraph を構築・コンパイルする従来方式と、
+コンパイル済みワークフローのレジストリを再利用する方式で、
+1リクエストあたりのグラフ準備コストを比較する。
+"""
+
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.workflows.comment_generation_workflow import create_comment_generation_workflow
+from src.workflows.unified_comment_generation_workflow import create_unified_comment_generation_workflow
+from src.workflows.workflow_registry import (
+    WorkflowVariant,
+    get_compiled_workflow,
+    get_workflow_registry,
+)
+
+
+def measure(func: Callable[[], Any], iterations: int) -> dict[str, float]:
+    """関数の1回あたりの実行時間を計測（マイクロ秒）"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+
+    return {
+        "mean_us": statistics.mean(timings),
+        "median_us": statistics.median(timings),
+        "p95_us": sorted(timings)[int(len(timings) * 0.95) - 1],
+    }
+
+
+def main():
+    """メイン実行関数"""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print("\n" + "=" * 60)
+    print("ワークフロー構築コスト ベンチマーク")
+    print("=" * 60)
+    print(f"反復回数: {iterations}")
+
+    cases = [
+        (WorkflowVariant.LEGACY, create_comment_generation_workflow),
+        (WorkflowVariant.UNIFIED, create_unified_comment_generation_workflow),
+    ]
+
+    for variant, factory in cases:
+        get_workflow_registry().clear()
+        before = measure(factory, iterations)
+        get_compiled_workflow(variant)  # ウォームアップ
+        after = measure(lambda variant=variant: get_compiled_workflow(variant), iterations)
+
+        print(f"\n--- {variant.value} ---")
+        print(f"  毎回コンパイル : 平均 {before['mean_us']:10.1f}µs  中央値 {before['median_us']:10.1f}µs  p95 {before['p95_us']:10.1f}µs")
+        print(f"  レジストリ再利用: 平均 {after['mean_us']:10.1f}µs  中央値 {after['median_us']:10.1f}µs  p95 {after['p95_us']:10.1f}µs")
+        print(f"  高速化率: {before['mean_us'] / after['mean_us']:.0f}倍")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    main()
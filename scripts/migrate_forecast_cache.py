@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+予報キャッシュの移行ツール
+
+地点ごとのCSVキャッシュ（forecast_cache_<地点>.csv）をSQLiteバックエンドに取り込む。
+--export-csv を指定すると、SQLiteの内容を従来形式のCSVに書き出す。
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトのルートディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.forecast_cache.storage import SQLITE_FILENAME, SQLiteForecastBackend, csv_file_path
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".cache" / "forecasts"
+
+
+def import_csv(cache_dir: Path, force: bool) -> None:
+    """CSVキャッシュをSQLiteに取り込む"""
+    csv_files = sorted(cache_dir.glob("forecast_cache_*.csv"))
+    db_path = cache_dir / SQLITE_FILENAME
+    backend = SQLiteForecastBackend(db_path)
+    try:
+        if backend.count() and not force:
+            print(f"{db_path} には既にデータがあります（重複を避けるため --force で上書き取り込み）")
+            return
+
+        start = time.perf_counter()
+        imported = backend.import_csv_files(csv_files)
+        elapsed = time.perf_counter() - start
+        print(f"取り込み完了: {len(csv_files)}ファイル, {imported}件 ({elapsed:.2f}秒) -> {db_path}")
+    finally:
+        backend.close()
+
+
+def export_csv(cache_dir: Path, output_dir: Path) -> None:
+    """SQLiteの内容を従来形式のCSVに書き出す"""
+    db_path = cache_dir / SQLITE_FILENAME
+    if not db_path.exists():
+        print(f"{db_path} が見つかりません")
+        return
+
+    backend = SQLiteForecastBackend(db_path)
+    try:
+        total = 0
+        locations = backend.location_names()
+        for location_name in locations:
+            total += backend.export_csv(location_name, csv_file_path(output_dir, location_name))
+        print(f"書き出し完了: {len(locations)}地点, {total}件 -> {output_dir}")
+    finally:
+        backend.close()
+
+
+def main():
+    """メイン実行関数"""
+    parser = argparse.ArgumentParser(description="予報キャッシュをCSVとSQLiteの間で移行する")
+    parser.add_argument("cache_dir", nargs="?", default=str(DEFAULT_CACHE_DIR), help="キャッシュディレクトリ")
+    parser.add_argument("--export-csv", metavar="OUTPUT_DIR", help="SQLiteの内容をCSVに書き出す")
+    parser.add_argument("--force", action="store_true", help="既存のSQLiteにデータがあっても取り込む")
+    args = parser.parse_args()
+
+    cache_dir = Path(args.cache_dir)
+    print("\n" + "=" * 60)
+    print("予報キャッシュ移行")
+    print("=" * 60)
+    print(f"キャッシュディレクトリ: {cache_dir}")
+
+    if args.export_csv:
+        export_csv(cache_dir, Path(args.export_csv))
+    else:
+        import_csv(cache_dir, args.force)
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
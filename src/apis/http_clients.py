@@ -0,0 +1,250 @@
+"""
+外部API呼び出し用の共有HTTPクライアント
+
+WxTech APIクライアントはリクエストやバッチのたびに作られるため、クライアントごとに
+HTTPセッションを持つと毎回TCP/TLSハンドシェイクが発生する。このモジュールは
+プロセス全体で1つの接続プール（キープアライブ・DNSキャッシュ付き）を保持し、
+各クライアントはそこからセッションを借りる。
+
+- 同期版: ``requests.Session`` を1つ共有する（スレッド間で接続を再利用）
+- 非同期版: APIサーバーのイベントループ上に ``aiohttp.ClientSession`` を1つ保持する。
+  aiohttpのセッションはイベントループに紐づくため、``asyncio.run`` などで作られた
+  別のイベントループからの利用にはループごとのセッションを貸し出し、借りている
+  クライアントがいなくなった時点で閉じる。
+
+APIサーバーでは lifespan で ``start_http_clients`` / ``shutdown_http_clients`` を呼び出す。
+"""
+
+from __future__ import annotations
+import asyncio
+import logging
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HTTPClientSettings:
+    """共有接続プールの設定
+
+    Attributes:
+        max_connections: 全体の最大接続数
+        max_connections_per_host: ホストごとの最大接続数
+        keepalive_timeout: アイドル接続を保持する時間（秒）
+        dns_cache_ttl: DNS解決結果をキャッシュする時間（秒）
+    """
+
+    max_connections: int = 100
+    max_connections_per_host: int = 20
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int = 300
+
+
+class _LoopSession:
+    """APIサーバー以外のイベントループに貸し出しているセッション"""
+
+    __slots__ = ("session", "borrowers")
+
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
+        self.borrowers = 0
+
+
+class HTTPClientRegistry:
+    """共有HTTPセッションを管理するレジストリ（スレッドセーフ）"""
+
+    def __init__(self, settings: HTTPClientSettings | None = None):
+        """
+        Args:
+            settings: 接続プールの設定
+        """
+        self.settings = settings or HTTPClientSettings()
+        self._lock = threading.Lock()
+        self._sync_session: requests.Session | None = None
+        self._app_session: aiohttp.ClientSession | None = None
+        self._app_loop: asyncio.AbstractEventLoop | None = None
+        self._loop_sessions: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopSession] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats = {
+            "sync_sessions_created": 0,
+            "async_sessions_created": 0,
+            "async_borrows": 0,
+        }
+
+    def _create_connector(self) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(
+            limit=self.settings.max_connections,
+            limit_per_host=self.settings.max_connections_per_host,
+            keepalive_timeout=self.settings.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.settings.dns_cache_ttl,
+        )
+
+    def _create_async_session(self) -> aiohttp.ClientSession:
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttpがインストールされていません。pip install aiohttpを実行してください。")
+        self._stats["async_sessions_created"] += 1
+        return aiohttp.ClientSession(connector=self._create_connector())
+
+    async def start(self) -> None:
+        """実行中のイベントループを共有セッションの持ち主として登録し、セッションを作成"""
+        if not AIOHTTP_AVAILABLE:
+            logger.warning("aiohttpがないため、非同期の共有HTTPセッションは作成しません")
+            return
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._app_session is not None and not self._app_session.closed:
+                return
+            self._app_loop = loop
+            self._app_session = self._create_async_session()
+        logger.info(
+            f"共有HTTPセッションを開始しました（最大接続数: {self.settings.max_connections}, "
+            f"ホストごと: {self.settings.max_connections_per_host}）"
+        )
+
+    async def acquire(self) -> aiohttp.ClientSession:
+        """実行中のイベントループで使える共有セッションを借りる
+
+        借りたセッションは閉じずに ``release`` で返却する。
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._stats["async_borrows"] += 1
+            if self._app_loop is loop and self._app_session is not None and not self._app_session.closed:
+                return self._app_session
+            entry = self._loop_sessions.get(loop)
+            if entry is None or entry.session.closed:
+                entry = self._loop_sessions[loop] = _LoopSession(self._create_async_session())
+            entry.borrowers += 1
+            return entry.session
+
+    async def release(self, session: aiohttp.ClientSession) -> None:
+        """借りたセッションを返却
+
+        APIサーバーのセッションはサーバー停止まで保持し、それ以外のループのセッションは
+        借りているクライアントがいなくなった時点で閉じる。
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._loop_sessions.get(loop)
+            if entry is None or entry.session is not session:
+                return
+            entry.borrowers -= 1
+            if entry.borrowers > 0:
+                return
+            del self._loop_sessions[loop]
+        await session.close()
+
+    def get_sync_session(self) -> requests.Session:
+        """同期リクエスト用の共有セッションを取得"""
+        session = self._sync_session
+        if session is None:
+            with self._lock:
+                session = self._sync_session
+                if session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.settings.max_connections_per_host,
+                        pool_maxsize=self.settings.max_connections_per_host,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._sync_session = session
+                    self._stats["sync_sessions_created"] += 1
+        return session
+
+    async def aclose(self) -> None:
+        """全ての共有セッションを閉じる"""
+        with self._lock:
+            app_session, self._app_session, self._app_loop = self._app_session, None, None
+            loop = asyncio.get_running_loop()
+            entry = self._loop_sessions.pop(loop, None)
+        for session in (app_session, entry.session if entry else None):
+            if session is not None and not session.closed:
+                await session.close()
+        self.close()
+
+    def close(self) -> None:
+        """同期セッションを閉じる（非同期セッションは ``aclose`` で閉じる）"""
+        with self._lock:
+            session, self._sync_session = self._sync_session, None
+        if session is not None:
+            session.close()
+
+    def get_stats(self) -> dict[str, Any]:
+        """統計情報を取得"""
+        with self._lock:
+            stats: dict[str, Any] = dict(self._stats)
+            stats["app_session_open"] = self._app_session is not None and not self._app_session.closed
+            stats["loop_sessions"] = len(self._loop_sessions)
+        return stats
+
+
+_registry: HTTPClientRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_http_client_registry() -> HTTPClientRegistry:
+    """グローバルな共有HTTPクライアントレジストリを取得"""
+    global _registry
+    registry = _registry
+    if registry is None:
+        with _registry_lock:
+            registry = _registry
+            if registry is None:
+                from src.config.config import get_api_config
+                api_config = get_api_config()
+                registry = HTTPClientRegistry(HTTPClientSettings(
+                    max_connections=api_config.http_max_connections,
+                    max_connections_per_host=api_config.http_max_connections_per_host,
+                    keepalive_timeout=api_config.http_keepalive_timeout,
+                    dns_cache_ttl=api_config.http_dns_cache_ttl,
+                ))
+                _registry = registry
+    return registry
+
+
+async def start_http_clients() -> None:
+    """APIサーバー起動時に共有HTTPセッションを開始"""
+    await get_http_client_registry().start()
+
+
+async def shutdown_http_clients() -> None:
+    """APIサーバー停止時に共有HTTPセッションを閉じて破棄"""
+    global _registry
+    with _registry_lock:
+        registry, _registry = _registry, None
+    if registry is not None:
+        await registry.aclose()
+
+
+def reset_http_client_registry() -> None:
+    """グローバルなレジストリを破棄（主にテスト用、同期セッションのみ閉じる）"""
+    global _registry
+    with _registry_lock:
+        registry, _registry = _registry, None
+    if registry is not None:
+        registry.close()
+
+
+__all__ = [
+    "HTTPClientRegistry",
+    "HTTPClientSettings",
+    "get_http_client_registry",
+    "reset_http_client_registry",
+    "shutdown_http_clients",
+    "start_http_clients",
+]
@@ -8,13 +8,27 @@ from __future__ import annotations
 from typing import Any
 import requests
 import json
+import os
 import time
 import logging
 
+from src.apis.http_clients import get_http_client_registry
 from src.apis.wxtech.errors import WxTechAPIError, handle_http_error
+from src.apis.wxtech.parser import loads_response
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_URL = "https://wxtech.weathernews.com/api/v1"
+
+
+def get_base_url(default: str = DEFAULT_BASE_URL) -> str:
+    """WxTech API のベースURLを取得
+    
+    環境変数 WXTECH_API_BASE_URL が設定されている場合はそちらを使う
+    （ローカルのスタブサーバーを使うベンチマークなど）。
+    """
+    return os.getenv("WXTECH_API_BASE_URL", default).rstrip("/")
+
 
 class WxTechAPI:
     """WxTech API の低レベルリクエスト処理
@@ -23,7 +37,7 @@ class WxTechAPI:
     """
     
     # API設定
-    BASE_URL = "https://wxtech.weathernews.com/api/v1"
+    BASE_URL = DEFAULT_BASE_URL
     DEFAULT_TIMEOUT = 30
     
     def __init__(self, api_key: str, timeout: int = DEFAULT_TIMEOUT):
@@ -35,17 +49,17 @@ class WxTechAPI:
         """
         self.api_key = api_key
         self.timeout = timeout
-        self.session = requests.Session()
+        self.base_url = get_base_url(self.BASE_URL)
+        # 接続はプロセス全体で共有するセッションから借りる（キープアライブ接続を再利用）
+        self.session = get_http_client_registry().get_sync_session()
         
-        # ヘッダー設定
-        self.session.headers.update(
-            {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "User-Agent": "WxTechAPIClient/1.0",
-                "X-API-Key": self.api_key,
-            }
-        )
+        # ヘッダー設定（共有セッションのためリクエストごとに指定する）
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "User-Agent": "WxTechAPIClient/1.0",
+            "X-API-Key": self.api_key,
+        }
         
         # レート制限対策（秒間10リクエストまで）
         self._last_request_time = 0
@@ -79,11 +93,11 @@ class WxTechAPI:
         self._rate_limit()
         
         # URL 構築
-        url = f"{self.BASE_URL}/{endpoint}"
+        url = f"{self.base_url}/{endpoint}"
         
         try:
             # リクエスト実行
-            response = self.session.get(url, params=params, timeout=self.timeout)
+            response = self.session.get(url, params=params, headers=self.headers, timeout=self.timeout)
             
             # ステータスコードチェック
             if response.status_code != 200:
@@ -91,7 +105,7 @@ class WxTechAPI:
             
             # JSON パース
             try:
-                data = response.json()
+                data = loads_response(response.content)
             except json.JSONDecodeError:
                 raise WxTechAPIError(
                     "レスポンスのJSONパースに失敗しました", 
@@ -135,9 +149,10 @@ class WxTechAPI:
             )
     
     def close(self):
-        """セッションを閉じる"""
-        if hasattr(self, "session"):
-            self.session.close()
+        """セッションを返却
+
+        共有セッションは閉じずに他のクライアントで再利用する（閉じるのはプロセス終了時）。
+        """
     
     def __enter__(self):
         return self
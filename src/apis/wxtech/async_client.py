@@ -14,12 +14,15 @@ from datetime import datetime, timedelta
 import aiohttp
 import pytz
 
-from src.apis.wxtech.parser import parse_forecast_response
+from src.apis.http_clients import get_http_client_registry
+from src.apis.wxtech.api import get_base_url
+from src.apis.wxtech.parser import loads_response, parse_forecast_response
 from src.apis.wxtech.errors import WxTechAPIError
 from src.data.weather_data import WeatherForecastCollection
 from src.config.config import get_config
 from src.utils.cache import TTLCache, generate_cache_key, async_cached_method
 from src.types.api_types import CachedWxTechParams
+from src.utils.single_flight import get_async_single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -29,11 +32,13 @@ class AsyncWxTechAPIClient:
     
     def __init__(self, api_key: str, enable_cache: bool = True):
         self.api_key = api_key
-        self.base_url = "https://wxtech-api.weathernews.com/api/v1"
+        self.base_url = get_base_url("https://wxtech-api.weathernews.com/api/v1")
         self.session: aiohttp.ClientSession | None = None
         self.config = get_config()
         self.max_retries = 3
         self.retry_delay = 1.0  # 初期リトライ遅延（秒）
+        # 同じ座標・時間数への同時リクエストは1回の上流呼び出しにまとめる（クライアント間で共有）
+        self._request_flight = get_async_single_flight("wxtech_api_async")
         
         # キャッシュの設定
         if enable_cache:
@@ -45,18 +50,15 @@ class AsyncWxTechAPIClient:
     
     async def __aenter__(self):
         """非同期コンテキストマネージャーの開始"""
-        # 接続数制限を設定
-        connector = aiohttp.TCPConnector(
-            limit=10,  # 全体の最大接続数
-            limit_per_host=5  # ホストごとの最大接続数
-        )
-        self.session = aiohttp.ClientSession(connector=connector)
+        # 接続プールは共有セッションから借りる（キープアライブ接続を再利用）
+        self.session = await get_http_client_registry().acquire()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """非同期コンテキストマネージャーの終了"""
         if self.session:
-            await self.session.close()
+            await get_http_client_registry().release(self.session)
+            self.session = None
     
     @async_cached_method(ttl=600)  # 10分間キャッシュ
     async def get_forecast_optimized(self, lat: float, lon: float) -> WeatherForecastCollection:
@@ -160,35 +162,20 @@ class AsyncWxTechAPIClient:
         }
         
         try:
-            logger.info(f"🔄 非同期API呼び出し: lat={lat}, lon={lon}, hours={hours}")
+            data = await self._request_flight.do(
+                (self.api_key, endpoint, lat, lon, hours),
+                self._request_json, endpoint, params, headers
+            )
+            
+            # レスポンスを解析
+            location_name = f"{lat:.2f},{lon:.2f}"
+            forecast_collection = parse_forecast_response(data, location_name)
+            
+            if not forecast_collection or not forecast_collection.forecasts:
+                raise ValueError("予報データが空です")
+            
+            return forecast_collection
             
-            async with self.session.get(
-                endpoint, 
-                params=params, 
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=self.config.api.api_timeout)
-            ) as response:
-                
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise WxTechAPIError(
-                        f"APIエラー: ステータス {response.status}",
-                        status_code=response.status,
-                        response_text=error_text
-                    )
-                
-                data = await response.json()
-                logger.info(f"✅ 非同期API応答受信: {len(data.get('hourly', []))}時間分のデータ")
-                
-                # レスポンスを解析
-                location_name = f"{lat:.2f},{lon:.2f}"
-                forecast_collection = parse_forecast_response(data, location_name)
-                
-                if not forecast_collection or not forecast_collection.forecasts:
-                    raise ValueError("予報データが空です")
-                
-                return forecast_collection
-                
         except asyncio.TimeoutError:
             raise WxTechAPIError(
                 "APIタイムアウト",
@@ -203,6 +190,30 @@ class AsyncWxTechAPIClient:
             logger.error(f"予期しないエラー: {str(e)}")
             raise
     
+    async def _request_json(self, endpoint: str, params: dict[str, Any],
+                            headers: dict[str, str]) -> dict[str, Any]:
+        """APIを呼び出してJSONレスポンスを取得"""
+        logger.info(f"🔄 非同期API呼び出し: lat={params['lat']}, lon={params['lon']}, hours={params['hours']}")
+        
+        async with self.session.get(
+            endpoint, 
+            params=params, 
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=self.config.api.api_timeout)
+        ) as response:
+            
+            if response.status != 200:
+                error_text = await response.text()
+                raise WxTechAPIError(
+                    f"APIエラー: ステータス {response.status}",
+                    status_code=response.status,
+                    response_text=error_text
+                )
+            
+            data = loads_response(await response.read())
+            logger.info(f"✅ 非同期API応答受信: {len(data.get('hourly', []))}時間分のデータ")
+            return data
+    
     def get_cache_stats(self) -> dict[str, Any | None]:
         """キャッシュの統計情報を取得
         
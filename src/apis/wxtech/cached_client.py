@@ -5,13 +5,17 @@
 """
 
 from __future__ import annotations
+from collections.abc import Iterable, Sequence
+from datetime import date
 from typing import Any
+import asyncio
 import logging
 import os
 
 from src.data.weather_data import WeatherForecastCollection
 from src.data.location.models import Location
-from src.apis.wxtech.client import WxTechAPIClient
+from src.apis.wxtech.client import NEXT_DAY_TARGET_HOURS, WxTechAPIClient
+from src.apis.wxtech.grid import GridForecastCache, get_grid_forecast_cache, is_fresh, is_grid_sharing_enabled
 from src.utils.cache import TTLCache, cached_method
 
 logger = logging.getLogger(__name__)
@@ -20,10 +24,13 @@ logger = logging.getLogger(__name__)
 class CachedWxTechAPIClient(WxTechAPIClient):
     """キャッシュ機能付きWxTech APIクライアント
     
-    WxTechAPIClientにTTLキャッシュ機能を追加
+    WxTechAPIClientにTTLキャッシュ機能を追加。上流呼び出しは座標を予報メッシュの中心に丸め、
+    プロセス全体で共有するメッシュ単位のキャッシュを経由する。メッシュキャッシュが返した
+    期限切れの予報（stale-while-revalidate / stale-if-error）はクライアントのキャッシュに保存しない。
     """
     
-    def __init__(self, api_key: str, timeout: int = 30, cache_ttl: int | None = None, cache_size: int | None = None):
+    def __init__(self, api_key: str, timeout: int = 30, cache_ttl: int | None = None, cache_size: int | None = None,
+                 grid_cache: GridForecastCache | None = None):
         """キャッシュ付きクライアントを初期化
         
         Args:
@@ -31,6 +38,8 @@ class CachedWxTechAPIClient(WxTechAPIClient):
             timeout: タイムアウト秒数（デフォルト: 30秒）
             cache_ttl: キャッシュの有効期限（秒）（デフォルト: 環境変数または300秒）
             cache_size: キャッシュサイズ（デフォルト: 環境変数または100）
+            grid_cache: メッシュ単位の共有キャッシュ（デフォルト: プロセス共有のキャッシュ。
+                環境変数 WXTECH_GRID_SNAP=false の場合は使用しない）
         
         Note:
             LRU（Least Recently Used）アルゴリズムにより、キャッシュが満杯になった場合は
@@ -53,8 +62,12 @@ class CachedWxTechAPIClient(WxTechAPIClient):
         # キャッシュを初期化
         self._cache = TTLCache(default_ttl=cache_ttl, max_size=cache_size)
         logger.info(f"キャッシュを初期化しました（TTL: {cache_ttl}秒, サイズ: {cache_size}）")
+        
+        if grid_cache is None and is_grid_sharing_enabled():
+            grid_cache = get_grid_forecast_cache()
+        self._grid_cache = grid_cache
     
-    @cached_method(cache_attr="_cache")
+    @cached_method(cache_attr="_cache", cache_if=is_fresh)
     def get_forecast(self, lat: float, lon: float, forecast_hours: int = 72) -> WeatherForecastCollection:
         """天気予報を取得（キャッシュ付き）
         
@@ -66,9 +79,53 @@ class CachedWxTechAPIClient(WxTechAPIClient):
         Returns:
             天気予報コレクション
         """
-        return super().get_forecast(lat, lon, forecast_hours)
+        if self._grid_cache is None:
+            return super().get_forecast(lat, lon, forecast_hours)
+        fetch = super().get_forecast
+        return self._grid_cache.get_or_fetch(
+            "forecast", lat, lon,
+            lambda mesh_lat, mesh_lon: fetch(mesh_lat, mesh_lon, forecast_hours),
+            forecast_hours
+        )
+    
+    def get_forecast_for_hours(self, lat: float, lon: float, forecast_hours: int,
+                               target_date: date, target_hours: Sequence[int],
+                               refresh: bool = False) -> WeatherForecastCollection:
+        """指定日の各時刻に最も近い予報だけを取得（メッシュ共有付き）
+        
+        取得範囲は常に対象時刻を含むため、メッシュキャッシュは予報時間数ではなく
+        対象日と対象時刻で共有する。引数は ``WxTechAPIClient.get_forecast_for_hours`` と同じ。
+        
+        Args:
+            refresh: Trueの場合はキャッシュを使わずに取得し直してメッシュキャッシュを更新する
+        """
+        if self._grid_cache is None:
+            return super().get_forecast_for_hours(lat, lon, forecast_hours, target_date, target_hours)
+        fetch = super().get_forecast_for_hours
+        return self._grid_cache.get_or_fetch(
+            "forecast_hours", lat, lon,
+            lambda mesh_lat, mesh_lon: fetch(mesh_lat, mesh_lon, forecast_hours, target_date, target_hours),
+            target_date.isoformat(), *target_hours, refresh=refresh
+        )
     
-    @cached_method(cache_attr="_cache")
+    def refresh_next_day_forecast(self, lat: float, lon: float,
+                                  target_date: date | None = None) -> WeatherForecastCollection:
+        """翌日予報を上流から取得し直してメッシュキャッシュを更新（キャッシュウォーマー用）
+        
+        Args:
+            lat: 緯度
+            lon: 経度
+            target_date: 対象日（Noneの場合は天気予報ノードと同じく現在時刻と日付境界時刻から計算）
+            
+        Returns:
+            翌日の天気予報コレクション
+        """
+        forecast_hours, target_date = self._next_day_window(target_date)
+        return self.get_forecast_for_hours(
+            lat, lon, forecast_hours, target_date, NEXT_DAY_TARGET_HOURS, refresh=True
+        )
+    
+    @cached_method(cache_attr="_cache", cache_if=is_fresh)
     def get_forecast_for_location(self, location: Location, forecast_hours: int = 72) -> WeatherForecastCollection:
         """地点データから天気予報を取得（キャッシュ付き）
         
@@ -81,7 +138,7 @@ class CachedWxTechAPIClient(WxTechAPIClient):
         """
         return super().get_forecast_for_location(location, forecast_hours)
     
-    @cached_method(cache_attr="_cache")
+    @cached_method(cache_attr="_cache", cache_if=is_fresh)
     def get_forecast_for_next_day_hours_optimized(self, lat: float, lon: float) -> WeatherForecastCollection:
         """翌日の9, 12, 15, 18時のデータを効率的に取得（キャッシュ付き）
         
@@ -94,6 +151,74 @@ class CachedWxTechAPIClient(WxTechAPIClient):
         """
         return super().get_forecast_for_next_day_hours_optimized(lat, lon)
     
+    async def async_get_forecast_for_hours(self, lat: float, lon: float, forecast_hours: int,
+                                           target_date: date, target_hours: Sequence[int],
+                                           location_id: str | None = None) -> WeatherForecastCollection:
+        """非同期版: 指定日の各時刻に最も近い予報だけを取得（メッシュ共有付き）
+        
+        同期版の ``get_forecast_for_hours`` と同じキーでメッシュキャッシュを共有するため、
+        非同期で先読みした予報は同期の取得でもそのまま使われる。
+        
+        Args:
+            location_id: 返す予報に設定する地点名
+        """
+        if self._grid_cache is None:
+            forecast_collection = await super().async_get_forecast_for_hours(
+                lat, lon, forecast_hours, target_date, target_hours
+            )
+            if location_id is not None:
+                forecast_collection.location_id = location_id
+                for forecast in forecast_collection.forecasts:
+                    forecast.location_id = location_id
+            return forecast_collection
+        
+        fetch = super().async_get_forecast_for_hours
+        return await self._grid_cache.aget_or_fetch(
+            "forecast_hours", lat, lon,
+            lambda mesh_lat, mesh_lon: fetch(mesh_lat, mesh_lon, forecast_hours, target_date, target_hours),
+            target_date.isoformat(), *target_hours, location_id=location_id
+        )
+    
+    async def async_get_forecast_optimized(self, lat: float, lon: float,
+                                           location_id: str | None = None) -> WeatherForecastCollection:
+        """最適化された翌日予報の非同期取得（メッシュ共有付き）
+        
+        同じメッシュに属する地点の要求は1回の上流呼び出しにまとめられる。
+        
+        Args:
+            lat: 緯度
+            lon: 経度
+            location_id: 返す予報に設定する地点名
+            
+        Returns:
+            天気予報コレクション
+        """
+        forecast_hours, target_date = self._next_day_window()
+        return await self.async_get_forecast_for_hours(
+            lat, lon, forecast_hours, target_date, NEXT_DAY_TARGET_HOURS, location_id=location_id
+        )
+    
+    async def prefetch_locations_async(
+        self, locations: Iterable[tuple[str, float, float]]
+    ) -> dict[str, WeatherForecastCollection | BaseException]:
+        """複数地点の翌日予報をまとめて非同期取得
+        
+        同じメッシュに属する地点は1回の上流呼び出しを共有し、結果は地点ごとの
+        複製として返す。
+        
+        Args:
+            locations: (地点名, 緯度, 経度) のリスト
+            
+        Returns:
+            地点名をキーとする予報コレクション（取得に失敗した地点は例外）
+        """
+        locations = list(locations)
+        results = await asyncio.gather(
+            *[self.async_get_forecast_optimized(lat, lon, location_id=name) for name, lat, lon in locations],
+            return_exceptions=True
+        )
+        return {name: result for (name, _, _), result in zip(locations, results, strict=True)}
+    
     def get_cache_stats(self) -> dict[str, Any]:
         """キャッシュの統計情報を取得
         
@@ -102,6 +227,14 @@ class CachedWxTechAPIClient(WxTechAPIClient):
         """
         return self._cache.get_stats()
     
+    def get_grid_stats(self) -> dict[str, Any]:
+        """メッシュ共有の統計情報を取得
+        
+        Returns:
+            上流呼び出し数・省略できた呼び出し数などの統計情報（メッシュ共有が無効の場合は空）
+        """
+        return self._grid_cache.get_stats() if self._grid_cache is not None else {}
+    
     def clear_cache(self):
         """キャッシュをクリア"""
         self._cache.clear()
@@ -16,6 +16,7 @@ from src.data.location.models import Location
 from src.apis.wxtech.client import WxTechAPIClient
 from src.utils.cache_decorators import smart_cache
 from src.utils.cache_manager import get_cache_manager, CacheConfig
+from src.utils.single_flight import get_single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,8 @@ class CachedWxTechAPIClientV2(WxTechAPIClient):
             cache_ttl = int(os.environ.get('WXTECH_CACHE_TTL', '600'))  # 10分
         
         self._cache_ttl = cache_ttl
+        # キャッシュに載る前の同時要求は1回の取得・解析にまとめる
+        self._forecast_flight = get_single_flight("wxtech_forecast_v2")
         
         # 専用キャッシュが存在しない場合は作成
         cache_manager = get_cache_manager()
@@ -74,7 +77,10 @@ class CachedWxTechAPIClientV2(WxTechAPIClient):
         Returns:
             天気予報コレクション
         """
-        return super().get_forecast(lat, lon, forecast_hours)
+        return self._forecast_flight.do(
+            (self.api_key, lat, lon, forecast_hours),
+            super().get_forecast, lat, lon, forecast_hours
+        )
     
     @smart_cache(
         cache_name="wxtech_api",
@@ -131,7 +137,8 @@ class CachedWxTechAPIClientV2(WxTechAPIClient):
             result["cache_info"] = {
                 "hit_rate": cache_stats.hit_rate,
                 "total_requests": cache_stats.total_requests,
-                "cache_size": cache_stats.size
+                "cache_size": cache_stats.size,
+                "coalesced": self._forecast_flight.get_stats()["coalesced"]
             }
         
         return result
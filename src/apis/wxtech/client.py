@@ -10,7 +10,8 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import logging
 import pytz
-from datetime import timedelta, datetime
+from collections.abc import Sequence
+from datetime import date, datetime
 
 try:
     import aiohttp
@@ -18,14 +19,20 @@ try:
 except ImportError:
     AIOHTTP_AVAILABLE = False
 
+from src.data.forecast_time_index import get_target_date, load_date_boundary_hour
 from src.data.weather_data import WeatherForecastCollection
 from src.data.location.models import Location
+from src.apis.http_clients import get_http_client_registry
 from src.apis.wxtech.api import WxTechAPI
-from src.apis.wxtech.parser import parse_forecast_response
+from src.apis.wxtech.parser import loads_response, parse_forecast_response
 from src.apis.wxtech.errors import WxTechAPIError
+from src.utils.single_flight import get_async_single_flight, get_single_flight
 
 logger = logging.getLogger(__name__)
 
+# 翌日予報で使用する時刻
+NEXT_DAY_TARGET_HOURS = (9, 12, 15, 18)
+
 
 class WxTechAPIClient:
     """WxTech API クライアント
@@ -46,7 +53,11 @@ class WxTechAPIClient:
         
         # 非同期セッション（必要時に初期化）
         self._async_session: aiohttp.ClientSession | None = None
-        self.base_url = "https://wxtech.weathernews.com/api/v1"
+        self.base_url = self.api.base_url
+        
+        # 同じ座標・時間数への同時リクエストは1回の上流呼び出しにまとめる（クライアント間で共有）
+        self._request_flight = get_single_flight("wxtech_api")
+        self._async_request_flight = get_async_single_flight("wxtech_api_async")
     
     def get_forecast(self, lat: float, lon: float, forecast_hours: int = 72) -> WeatherForecastCollection:
         """指定座標の天気予報を取得
@@ -62,6 +73,35 @@ class WxTechAPIClient:
         Raises:
             WxTechAPIError: API エラーが発生した場合
         """
+        raw_data = self._fetch_forecast_data(lat, lon, forecast_hours)
+        return parse_forecast_response(raw_data, f"lat:{lat},lon:{lon}")
+    
+    def get_forecast_for_hours(self, lat: float, lon: float, forecast_hours: int,
+                               target_date: date, target_hours: Sequence[int]) -> WeatherForecastCollection:
+        """指定日の各時刻に最も近い予報だけを取得
+        
+        レスポンスのうち選ばれない時刻の予報は解析しない。
+        
+        Args:
+            lat: 緯度
+            lon: 経度
+            forecast_hours: 予報時間数
+            target_date: 対象日（JST）
+            target_hours: 対象時刻のリスト
+            
+        Returns:
+            対象時刻ごとの予報を時刻順に含むコレクション
+            
+        Raises:
+            WxTechAPIError: API エラーが発生した場合
+        """
+        raw_data = self._fetch_forecast_data(lat, lon, forecast_hours)
+        return parse_forecast_response(
+            raw_data, f"lat:{lat},lon:{lon}", target_date=target_date, target_hours=target_hours
+        )
+    
+    def _fetch_forecast_data(self, lat: float, lon: float, forecast_hours: int) -> dict[str, Any]:
+        """パラメータを検証してAPIから生のレスポンスを取得（内部メソッド）"""
         # パラメータ検証
         if not (-90 <= lat <= 90):
             raise ValueError(f"緯度が範囲外です: {lat} （-90～90の範囲で指定してください）")
@@ -79,7 +119,11 @@ class WxTechAPIClient:
         
         logger.info(f"🔄 WxTech API リクエスト: endpoint=ss1wx, params={params}")
         
-        raw_data = self.api.make_request("ss1wx", params)
+        # 生のレスポンスを共有し、解析は呼び出し側ごとに行う（結果のオブジェクトは共有しない）
+        raw_data = self._request_flight.do(
+            (self.api_key, "ss1wx", lat, lon, forecast_hours),
+            self.api.make_request, "ss1wx", params
+        )
         
         # レスポンスの基本情報をログ出力
         if "wxdata" in raw_data and raw_data["wxdata"]:
@@ -88,8 +132,7 @@ class WxTechAPIClient:
             mrf_count = len(wxdata.get("mrf", []))
             logger.info(f"📊 WxTech API レスポンス: srf={srf_count}件, mrf={mrf_count}件")
         
-        # レスポンスデータの変換
-        return parse_forecast_response(raw_data, f"lat:{lat},lon:{lon}")
+        return raw_data
     
     def get_forecast_by_location(self, location: Location) -> WeatherForecastCollection:
         """Location オブジェクトから天気予報を取得
@@ -131,9 +174,33 @@ class WxTechAPIClient:
         Raises:
             WxTechAPIError: API エラーが発生した場合
         """
+        forecast_hours, target_date = self._next_day_window()
+        
+        # 翌日の9, 12, 15, 18時に最も近い予報だけを解析して取得
+        filtered_collection = self.get_forecast_for_hours(
+            lat, lon, forecast_hours, target_date, NEXT_DAY_TARGET_HOURS
+        )
+        
+        # フィルタリング結果のログ
+        logger.info(
+            f"最適化結果: {len(filtered_collection.forecasts)}件を選択 "
+            f"- 選択された時刻: {[f.datetime.strftime('%H:%M') for f in filtered_collection.forecasts]}"
+        )
+        
+        return filtered_collection
+    
+    def _next_day_window(self, target_date: date | None = None) -> tuple[int, date]:
+        """翌日の予報取得に必要な予報時間数と対象日（JST）を計算（内部メソッド）
+        
+        対象日は天気予報ノードと同じく日付境界時刻で決める（境界時刻より前は当日）。
+        
+        Args:
+            target_date: 対象日（Noneの場合は現在時刻から計算）
+        """
         jst = pytz.timezone("Asia/Tokyo")
         now_jst = datetime.now(jst)
-        target_date = now_jst.date() + timedelta(days=1)
+        if target_date is None:
+            target_date = get_target_date(now_jst, load_date_boundary_hour())
         
         # 最適化: 翌日8時から19時までの12時間分を確実に取得
         # これにより、9,12,15,18時すべてが含まれる
@@ -153,54 +220,7 @@ class WxTechAPIClient:
             forecast_hours = max(int(hours_to_7pm) + 1, 1)
             logger.info(f"最適化: 翌日19時まで{hours_to_7pm:.1f}h → {forecast_hours}時間分を取得")
         
-        # データを取得
-        forecast_collection = self.get_forecast(lat, lon, forecast_hours=forecast_hours)
-        
-        # 翌日の9, 12, 15, 18時に最も近い予報を選択
-        target_hours = [9, 12, 15, 18]
-        selected_forecasts = []
-        
-        for hour in target_hours:
-            target_time = jst.localize(datetime.combine(target_date, datetime.min.time().replace(hour=hour)))
-            closest_forecast = None
-            min_diff = float('inf')
-            
-            for forecast in forecast_collection.forecasts:
-                # forecastのdatetimeがnaiveな場合はJSTとして扱う
-                forecast_dt = forecast.datetime
-                if forecast_dt.tzinfo is None:
-                    forecast_dt = jst.localize(forecast_dt)
-                
-                # 翌日のデータのみを対象
-                if forecast_dt.date() == target_date:
-                    # 目標時刻との差を計算
-                    diff = abs((forecast_dt - target_time).total_seconds())
-                    if diff < min_diff:
-                        min_diff = diff
-                        closest_forecast = forecast
-            
-            if closest_forecast:
-                selected_forecasts.append(closest_forecast)
-                logger.debug(
-                    f"目標時刻 {hour:02d}:00 → 選択: {closest_forecast.datetime.strftime('%Y-%m-%d %H:%M')} "
-                    f"(差: {min_diff/3600:.1f}時間)"
-                )
-            else:
-                logger.warning(f"目標時刻 {hour:02d}:00 の予報が見つかりません")
-        
-        # フィルタリング結果のログ
-        logger.info(
-            f"最適化結果: {len(forecast_collection.forecasts)}件から{len(selected_forecasts)}件に絞り込み "
-            f"- 選択された時刻: {[f.datetime.strftime('%H:%M') for f in selected_forecasts]}"
-        )
-        
-        # フィルタリングしたデータを新しいコレクションとして返す
-        filtered_collection = WeatherForecastCollection(
-            location_id=forecast_collection.location_id,
-            forecasts=selected_forecasts
-        )
-        
-        return filtered_collection
+        return forecast_hours, target_date
     
     
     async def get_forecast_async(self, lat: float, lon: float, forecast_hours: int = 72) -> WeatherForecastCollection:
@@ -246,18 +266,14 @@ class WxTechAPIClient:
     async def __aenter__(self):
         """非同期コンテキストマネージャーの開始"""
         if AIOHTTP_AVAILABLE and self._async_session is None:
-            # 接続数制限を設定
-            connector = aiohttp.TCPConnector(
-                limit=10,  # 全体の最大接続数
-                limit_per_host=5  # ホストごとの最大接続数
-            )
-            self._async_session = aiohttp.ClientSession(connector=connector)
+            # 接続プールは共有セッションから借りる（キープアライブ接続を再利用）
+            self._async_session = await get_http_client_registry().acquire()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """非同期コンテキストマネージャーの終了"""
         if self._async_session:
-            await self._async_session.close()
+            await get_http_client_registry().release(self._async_session)
             self._async_session = None
     
     async def ensure_async_session(self):
@@ -266,44 +282,38 @@ class WxTechAPIClient:
             raise RuntimeError("aiohttpがインストールされていません。pip install aiohttpを実行してください。")
         
         if self._async_session is None:
-            connector = aiohttp.TCPConnector(
-                limit=10,
-                limit_per_host=5
-            )
-            self._async_session = aiohttp.ClientSession(connector=connector)
+            self._async_session = await get_http_client_registry().acquire()
     
     async def async_get_forecast_optimized(self, lat: float, lon: float) -> WeatherForecastCollection:
         """最適化された翌日予報の非同期取得（真の非同期実装）
         
+        取得範囲と対象時刻は同期版の ``get_forecast_for_next_day_hours_optimized`` と同じ。
+        
         Args:
             lat: 緯度
             lon: 経度
             
         Returns:
-            天気予報コレクション
+            翌日の天気予報コレクション（基準時刻および9,12,15,18時を含む）
         """
-        await self.ensure_async_session()
-        
-        jst = pytz.timezone("Asia/Tokyo")
-        now_jst = datetime.now(jst)
-        target_date = now_jst.date() + timedelta(days=1)
-        
-        # 翌日8時から19時までの12時間分を確実に取得
-        tomorrow_8am = jst.localize(datetime.combine(target_date, datetime.min.time().replace(hour=8)))
-        hours_to_8am = (tomorrow_8am - now_jst).total_seconds() / 3600
-        
-        if hours_to_8am > 0:
-            forecast_hours = int(hours_to_8am) + 12
-        else:
-            tomorrow_7pm = jst.localize(datetime.combine(target_date, datetime.min.time().replace(hour=19)))
-            hours_to_7pm = (tomorrow_7pm - now_jst).total_seconds() / 3600
-            forecast_hours = max(int(hours_to_7pm) + 1, 1)
+        forecast_hours, target_date = self._next_day_window()
+        return await self.async_get_forecast_for_hours(
+            lat, lon, forecast_hours, target_date, NEXT_DAY_TARGET_HOURS
+        )
+    
+    async def async_get_forecast_for_hours(self, lat: float, lon: float, forecast_hours: int,
+                                           target_date: date, target_hours: Sequence[int]) -> WeatherForecastCollection:
+        """非同期版: 指定日の各時刻に最も近い予報だけを取得
         
-        # 非同期でAPIを呼び出し
-        return await self._async_fetch_forecast(lat, lon, forecast_hours)
+        引数と戻り値は ``get_forecast_for_hours`` と同じ。
+        """
+        await self.ensure_async_session()
+        return await self._async_fetch_forecast(lat, lon, forecast_hours, target_date, target_hours)
     
-    async def _async_fetch_forecast(self, lat: float, lon: float, hours: int) -> WeatherForecastCollection:
-        """非同期で天気予報を取得（内部メソッド）"""
+    async def _async_fetch_forecast(self, lat: float, lon: float, hours: int,
+                                    target_date: date | None = None,
+                                    target_hours: Sequence[int] | None = None) -> WeatherForecastCollection:
+        """非同期で天気予報を取得（内部メソッド。対象日・対象時刻の指定は parse_forecast_response と同じ）"""
         endpoint = f"{self.base_url}/ss1wx"
         params = {
             "lat": lat,
@@ -317,35 +327,22 @@ class WxTechAPIClient:
         }
         
         try:
-            logger.info(f"🔄 非同期API呼び出し: lat={lat}, lon={lon}, hours={hours}")
+            data = await self._async_request_flight.do(
+                (self.api_key, endpoint, lat, lon, hours),
+                self._async_request_json, endpoint, params, headers
+            )
+            
+            # レスポンスを解析
+            location_name = f"{lat:.2f},{lon:.2f}"
+            forecast_collection = parse_forecast_response(
+                data, location_name, target_date=target_date, target_hours=target_hours
+            )
+            
+            if not forecast_collection or not forecast_collection.forecasts:
+                raise ValueError("予報データが空です")
+            
+            return forecast_collection
             
-            async with self._async_session.get(
-                endpoint, 
-                params=params, 
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            ) as response:
-                
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise WxTechAPIError(
-                        f"APIエラー: ステータス {response.status}",
-                        status_code=response.status,
-                        response_text=error_text
-                    )
-                
-                data = await response.json()
-                logger.info(f"✅ 非同期API応答受信: {len(data.get('hourly', []))}時間分のデータ")
-                
-                # レスポンスを解析
-                location_name = f"{lat:.2f},{lon:.2f}"
-                forecast_collection = parse_forecast_response(data, location_name)
-                
-                if not forecast_collection or not forecast_collection.forecasts:
-                    raise ValueError("予報データが空です")
-                
-                return forecast_collection
-                
         except asyncio.TimeoutError:
             raise WxTechAPIError(
                 "APIタイムアウト",
@@ -356,6 +353,30 @@ class WxTechAPIClient:
                 raise
             logger.error(f"予期しないエラー: {str(e)}")
             raise WxTechAPIError(f"予期しないエラー: {str(e)}")
+    
+    async def _async_request_json(self, endpoint: str, params: dict[str, Any],
+                                  headers: dict[str, str]) -> dict[str, Any]:
+        """非同期でAPIを呼び出してJSONレスポンスを取得（内部メソッド）"""
+        logger.info(f"🔄 非同期API呼び出し: lat={params['lat']}, lon={params['lon']}, hours={params['hours']}")
+        
+        async with self._async_session.get(
+            endpoint, 
+            params=params, 
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        ) as response:
+            
+            if response.status != 200:
+                error_text = await response.text()
+                raise WxTechAPIError(
+                    f"APIエラー: ステータス {response.status}",
+                    status_code=response.status,
+                    response_text=error_text
+                )
+            
+            data = loads_response(await response.read())
+            logger.info(f"✅ 非同期API応答受信: {len(data.get('hourly', []))}時間分のデータ")
+            return data
 
 
 # 既存の関数との互換性を保つためのラッパー関数
@@ -0,0 +1,426 @@
+"""
+WxTech 予報メッシュの共有
+
+WxTech APIは1kmメッシュ単位で予報を返すため、近接する地点は同じメッシュの予報を共有できる。
+座標をメッシュの中心に丸めてメッシュ単位でキャッシュし、同じメッシュへの同時要求は
+1回の上流呼び出しにまとめる（single-flight）。取得した予報は要求した地点ごとに複製して返す。
+
+予報は短時間ではほとんど変わらないため、TTLが切れた予報も一定期間保持し、
+バックグラウンドで1回だけ取得し直す間はそのまま返す（stale-while-revalidate）。
+上流がエラーを返した場合も保持している古い予報を返す（stale-if-error）。
+"""
+
+from __future__ import annotations
+import asyncio
+import copy
+import logging
+import math
+import os
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from src.data.weather_data import WeatherForecastCollection
+from src.utils.cache import TTLCache
+from src.utils.single_flight import AsyncSingleFlight, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# 丸め誤差でセル境界上の座標が隣のセルに入らないようにする許容値
+_CELL_EPSILON = 1e-9
+
+# 予報コレクションの metadata に設定するキャッシュの状態
+CACHE_STATUS_KEY = "cache_status"
+CACHE_STATUS_FRESH = "fresh"
+CACHE_STATUS_STALE = "stale"  # 期限切れの予報を返し、バックグラウンドで取得し直している
+CACHE_STATUS_STALE_IF_ERROR = "stale_if_error"  # 上流がエラーのため期限切れの予報を返した
+
+
+@dataclass(frozen=True)
+class MeshGrid:
+    """緯度経度メッシュ（デフォルトは3次メッシュ: 緯度30秒×経度45秒、約1km四方）"""
+
+    lat_step: float = 1 / 120
+    lon_step: float = 1 / 80
+
+    def cell(self, lat: float, lon: float) -> tuple[int, int]:
+        """座標が属するセル（行, 列）を取得"""
+        return (
+            math.floor(lat / self.lat_step + _CELL_EPSILON),
+            math.floor(lon / self.lon_step + _CELL_EPSILON),
+        )
+
+    def center(self, cell: tuple[int, int]) -> tuple[float, float]:
+        """セルの中心座標（緯度, 経度）を取得"""
+        row, col = cell
+        return round((row + 0.5) * self.lat_step, 6), round((col + 0.5) * self.lon_step, 6)
+
+    def snap(self, lat: float, lon: float) -> tuple[float, float]:
+        """座標を属するセルの中心に丸める"""
+        return self.center(self.cell(lat, lon))
+
+
+def fan_out(collection: WeatherForecastCollection, location_id: str | None = None) -> WeatherForecastCollection:
+    """共有している予報コレクションを呼び出し側ごとの複製にする
+
+    呼び出し側が地点名を書き換えても共有データに影響しないよう、コレクションと
+    各予報を浅く複製する。
+
+    Args:
+        collection: 共有している予報コレクション
+        location_id: 複製に設定する地点名（Noneの場合は元の値を使う）
+    """
+    location_id = collection.location_id if location_id is None else location_id
+    forecasts = []
+    for forecast in collection.forecasts:
+        forecast = copy.copy(forecast)
+        forecast.location_id = location_id
+        forecasts.append(forecast)
+    return WeatherForecastCollection(
+        location_id=location_id,
+        forecasts=forecasts,
+        created_at=collection.created_at,
+        metadata=dict(collection.metadata),
+    )
+
+
+def is_fresh(collection: WeatherForecastCollection) -> bool:
+    """期限内の予報かどうか（期限切れの予報を返した場合はFalse）"""
+    return collection.metadata.get(CACHE_STATUS_KEY, CACHE_STATUS_FRESH) == CACHE_STATUS_FRESH
+
+
+def describe_freshness(collection: WeatherForecastCollection, now: datetime | None = None) -> dict[str, Any]:
+    """予報の鮮度（取得時刻・経過秒数・キャッシュの状態）を生成メタデータ用にまとめる
+
+    Args:
+        collection: 予報コレクション
+        now: 現在時刻（Noneの場合は現在時刻。``created_at`` と同じくタイムゾーンなし）
+    """
+    now = now or datetime.now()
+    return {
+        "fetched_at": collection.created_at.isoformat(),
+        "age_seconds": round(max((now - collection.created_at).total_seconds(), 0.0), 1),
+        "cache_status": collection.metadata.get(CACHE_STATUS_KEY, CACHE_STATUS_FRESH),
+    }
+
+
+class GridForecastCache:
+    """メッシュ単位で予報を共有するキャッシュ（スレッドセーフ）
+
+    キャッシュはプロセス全体で共有し、バッチごとに作られるクライアントや
+    同期・非同期の両方の経路から同じメッシュの予報を再利用する。
+    """
+
+    def __init__(self, grid: MeshGrid | None = None, ttl: int = 1800, max_size: int = 5000,
+                 stale_ttl: int = 0, stale_while_revalidate: bool = True, stale_if_error: bool = True):
+        """
+        Args:
+            grid: 予報メッシュ
+            ttl: メッシュ単位の予報を保持する期間（秒）
+            max_size: 保持する最大メッシュ数
+            stale_ttl: TTL切れ後も古い予報として保持する期間（秒）。0の場合は保持しない
+            stale_while_revalidate: 古い予報を返してバックグラウンドで取得し直すか
+            stale_if_error: 上流がエラーの場合に古い予報を返すか
+        """
+        self.grid = grid or MeshGrid()
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self._cache = TTLCache(default_ttl=ttl, max_size=max_size, stale_ttl=stale_ttl)
+        self._lock = threading.Lock()
+        self._flight = SingleFlight("wxtech_grid")
+        self._async_flight = AsyncSingleFlight("wxtech_grid_async")
+        # バックグラウンドで取得し直しているキー（キーごとに1つだけ実行する）
+        self._revalidating: set[str] = set()
+        self._revalidate_tasks: set[asyncio.Task] = set()
+        self._stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "upstream_calls": 0,
+            "errors": 0,
+            "refreshes": 0,
+            "stale_served": 0,
+            "stale_if_error": 0,
+            "revalidations": 0,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def key(self, kind: str, lat: float, lon: float, *extra: Hashable) -> str:
+        """メッシュ単位のキャッシュキーを生成"""
+        row, col = self.grid.cell(lat, lon)
+        return ":".join([kind, str(row), str(col), *map(str, extra)])
+
+    def get_or_fetch(self, kind: str, lat: float, lon: float,
+                     fetch: Callable[[float, float], WeatherForecastCollection],
+                     *extra: Hashable, location_id: str | None = None,
+                     refresh: bool = False) -> WeatherForecastCollection:
+        """メッシュの予報を取得（同期版）
+
+        キャッシュにない場合は、同じメッシュを取得中の呼び出しがあればその結果を待ち、
+        なければメッシュ中心の座標で ``fetch`` を呼び出す。
+
+        Args:
+            kind: 取得方法の種類（キャッシュキーの区別に使う）
+            lat: 要求された緯度
+            lon: 要求された経度
+            fetch: メッシュ中心の（緯度, 経度）で予報を取得する関数
+            *extra: キャッシュキーに含める追加の引数（予報時間数など）
+            location_id: 返す予報に設定する地点名
+            refresh: Trueの場合はキャッシュを使わずに取得し直す（キャッシュの事前温め用）
+
+        Returns:
+            呼び出し側専用の予報コレクション
+        """
+        key = self.key(kind, lat, lon, *extra)
+        if refresh:
+            self._count("refreshes")
+            return fan_out(self._flight.do(key, self._fetch, key, fetch, lat, lon, True), location_id)
+
+        self._count("requests")
+        cached = self._lookup_with_stale(key)
+        if cached is not None:
+            value, stale = cached
+            if not stale:
+                return fan_out(value, location_id)
+            if self.stale_while_revalidate:
+                self._revalidate(key, fetch, lat, lon)
+                return self._serve_stale(value, location_id, CACHE_STATUS_STALE)
+        try:
+            result = self._flight.do(key, self._fetch, key, fetch, lat, lon)
+        except Exception as e:
+            return self._stale_on_error(key, location_id, e)
+        return fan_out(result, location_id)
+
+    def _lookup_with_stale(self, key: str) -> tuple[WeatherForecastCollection, bool] | None:
+        """キャッシュから（予報, 期限切れかどうか）を取得"""
+        entry = self._cache.get_with_age(key, allow_stale=True)
+        if entry is None:
+            return None
+        value, _, stale = entry
+        if not stale:
+            self._count("cache_hits")
+        return value, stale
+
+    def _serve_stale(self, value: WeatherForecastCollection, location_id: str | None,
+                     status: str) -> WeatherForecastCollection:
+        """期限切れの予報を状態付きの複製として返す"""
+        self._count("stale_served" if status == CACHE_STATUS_STALE else "stale_if_error")
+        result = fan_out(value, location_id)
+        result.metadata[CACHE_STATUS_KEY] = status
+        return result
+
+    def _stale_on_error(self, key: str, location_id: str | None, error: Exception) -> WeatherForecastCollection:
+        """上流のエラー時に古い予報を返す（返せない場合は ``error`` を送出）"""
+        cached = self._lookup_with_stale(key) if self.stale_if_error else None
+        if cached is None:
+            raise error
+        value, stale = cached
+        if not stale:
+            # 別の呼び出しが取得し直した後であれば新しい予報を返す
+            return fan_out(value, location_id)
+        logger.warning(f"WxTech API エラーのため期限切れの予報を返します: {key}: {error}")
+        return self._serve_stale(value, location_id, CACHE_STATUS_STALE_IF_ERROR)
+
+    def _start_revalidation(self, key: str) -> bool:
+        """バックグラウンドでの取得し直しを登録（同じキーが実行中の場合はFalse）"""
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            self._stats["revalidations"] += 1
+            return True
+
+    def _finish_revalidation(self, key: str) -> None:
+        with self._lock:
+            self._revalidating.discard(key)
+
+    def _revalidate(self, key: str, fetch: Callable[[float, float], WeatherForecastCollection],
+                    lat: float, lon: float) -> None:
+        """期限切れの予報をバックグラウンドのスレッドで取得し直す"""
+        if not self._start_revalidation(key):
+            return
+
+        def run() -> None:
+            try:
+                self._flight.do(key, self._fetch, key, fetch, lat, lon, True)
+            except Exception as e:
+                logger.warning(f"予報の再取得に失敗しました（期限切れの予報を使い続けます）: {key}: {e}")
+            finally:
+                self._finish_revalidation(key)
+
+        threading.Thread(target=run, name="wxtech-grid-revalidate", daemon=True).start()
+
+    def _lookup(self, key: str) -> WeatherForecastCollection | None:
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._count("cache_hits")
+        return cached
+
+    def _fetch(self, key: str, fetch: Callable[[float, float], WeatherForecastCollection],
+               lat: float, lon: float, refresh: bool = False) -> WeatherForecastCollection:
+        """メッシュ中心の座標で上流から取得してキャッシュに保存"""
+        # 直前に別の呼び出しが取得を終えている場合はその結果を使う
+        cached = None if refresh else self._lookup(key)
+        if cached is not None:
+            return cached
+        self._count("upstream_calls")
+        try:
+            result = fetch(*self.grid.snap(lat, lon))
+        except Exception:
+            self._count("errors")
+            raise
+        self._cache.set(key, result)
+        return result
+
+    async def aget_or_fetch(self, kind: str, lat: float, lon: float,
+                            fetch: Callable[[float, float], Awaitable[WeatherForecastCollection]],
+                            *extra: Hashable, location_id: str | None = None) -> WeatherForecastCollection:
+        """メッシュの予報を取得（非同期版）
+
+        同じイベントループ上で同じメッシュを取得中のタスクがあればその結果を待つ。
+        引数は ``get_or_fetch`` と同じ。
+        """
+        key = self.key(kind, lat, lon, *extra)
+        self._count("requests")
+        cached = self._lookup_with_stale(key)
+        if cached is not None:
+            value, stale = cached
+            if not stale:
+                return fan_out(value, location_id)
+            if self.stale_while_revalidate:
+                self._arevalidate(key, fetch, lat, lon)
+                return self._serve_stale(value, location_id, CACHE_STATUS_STALE)
+        try:
+            result = await self._async_flight.do(key, self._afetch, key, fetch, lat, lon)
+        except Exception as e:
+            return self._stale_on_error(key, location_id, e)
+        return fan_out(result, location_id)
+
+    async def _afetch(self, key: str, fetch: Callable[[float, float], Awaitable[WeatherForecastCollection]],
+                      lat: float, lon: float, refresh: bool = False) -> WeatherForecastCollection:
+        """メッシュ中心の座標で上流から取得してキャッシュに保存（非同期版）"""
+        cached = None if refresh else self._lookup(key)
+        if cached is not None:
+            return cached
+        self._count("upstream_calls")
+        try:
+            result = await fetch(*self.grid.snap(lat, lon))
+        except Exception:
+            self._count("errors")
+            raise
+        self._cache.set(key, result)
+        return result
+
+    def _arevalidate(self, key: str, fetch: Callable[[float, float], Awaitable[WeatherForecastCollection]],
+                     lat: float, lon: float) -> None:
+        """期限切れの予報を実行中のイベントループのタスクとして取得し直す"""
+        if not self._start_revalidation(key):
+            return
+        task = asyncio.get_running_loop().create_task(
+            self._async_flight.do(key, self._afetch, key, fetch, lat, lon, True)
+        )
+        self._revalidate_tasks.add(task)
+
+        def done(task: asyncio.Task) -> None:
+            self._revalidate_tasks.discard(task)
+            self._finish_revalidation(key)
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning(f"予報の再取得に失敗しました（期限切れの予報を使い続けます）: {key}: {task.exception()}")
+
+        task.add_done_callback(done)
+
+    def clear(self) -> None:
+        """キャッシュした予報を削除"""
+        self._cache.clear()
+
+    def close(self) -> None:
+        """キャッシュを削除してクリーンアップスレッドを停止"""
+        self._cache.clear()
+        self._cache.stop_cleanup()
+
+    def get_stats(self) -> dict[str, Any]:
+        """メッシュ共有の統計情報を取得
+
+        ``saved_upstream_calls`` はキャッシュヒット・期限切れの予報の提供・同時要求の合流によって
+        省略できた上流呼び出しの数（バックグラウンドでの取得し直しは ``upstream_calls`` に含む）。
+        """
+        with self._lock:
+            stats: dict[str, Any] = dict(self._stats)
+        flights = [self._flight.get_stats(), self._async_flight.get_stats()]
+        stats["coalesced"] = sum(flight["coalesced"] for flight in flights)
+        stats["in_flight"] = sum(flight["in_flight"] for flight in flights)
+        stats["saved_upstream_calls"] = stats["cache_hits"] + stats["stale_served"] + stats["coalesced"]
+        # TTLCache.get_stats はエントリ全体のメモリ量を走査するため、件数だけを参照する
+        stats["cached_cells"] = len(self._cache)
+        return stats
+
+
+_COUNTER_KEYS = ("requests", "cache_hits", "coalesced", "upstream_calls", "errors", "saved_upstream_calls",
+                 "refreshes", "stale_served", "stale_if_error", "revalidations")
+
+
+def diff_grid_stats(before: dict[str, Any], after: dict[str, Any]) -> dict[str, Any]:
+    """2つの時点の統計情報から、その間のメッシュ共有の統計を計算
+
+    Returns:
+        カウンタごとの増分（統計情報が空の場合は空の辞書）
+    """
+    if not before or not after:
+        return {}
+    return {key: after[key] - before[key] for key in _COUNTER_KEYS}
+
+
+def is_grid_sharing_enabled() -> bool:
+    """メッシュ共有が有効かどうか（環境変数 WXTECH_GRID_SNAP で無効化できる）"""
+    return os.getenv("WXTECH_GRID_SNAP", "true").lower() == "true"
+
+
+_grid_cache: GridForecastCache | None = None
+_grid_cache_lock = threading.Lock()
+
+
+def get_grid_forecast_cache() -> GridForecastCache:
+    """プロセス全体で共有するメッシュ予報キャッシュを取得"""
+    global _grid_cache
+    if _grid_cache is None:
+        with _grid_cache_lock:
+            if _grid_cache is None:
+                _grid_cache = GridForecastCache(
+                    ttl=int(os.getenv("WXTECH_GRID_CACHE_TTL", "1800")),
+                    max_size=int(os.getenv("WXTECH_GRID_CACHE_SIZE", "5000")),
+                    stale_ttl=int(os.getenv("WXTECH_GRID_STALE_TTL", "7200")),
+                    stale_while_revalidate=os.getenv("WXTECH_STALE_WHILE_REVALIDATE", "true").lower() == "true",
+                    stale_if_error=os.getenv("WXTECH_STALE_IF_ERROR", "true").lower() == "true",
+                )
+    return _grid_cache
+
+
+def reset_grid_forecast_cache() -> None:
+    """共有しているメッシュ予報キャッシュを破棄（主にテスト用）"""
+    global _grid_cache
+    with _grid_cache_lock:
+        if _grid_cache is not None:
+            _grid_cache.close()
+        _grid_cache = None
+
+
+__all__ = [
+    "CACHE_STATUS_FRESH",
+    "CACHE_STATUS_KEY",
+    "CACHE_STATUS_STALE",
+    "CACHE_STATUS_STALE_IF_ERROR",
+    "MeshGrid",
+    "GridForecastCache",
+    "describe_freshness",
+    "diff_grid_stats",
+    "fan_out",
+    "is_fresh",
+    "get_grid_forecast_cache",
+    "is_grid_sharing_enabled",
+    "reset_grid_forecast_cache",
+]
@@ -5,85 +5,152 @@ APIレスポンスをドメインモデルに変換する処理を管理
 """
 
 from __future__ import annotations
+from collections.abc import Iterator, Sequence
 from typing import Any
+import json
+import logging
 import warnings
-from datetime import datetime
+from datetime import date, datetime, time
+from operator import itemgetter
+from zoneinfo import ZoneInfo
 
-from src.data.weather_data import WeatherForecast, WeatherForecastCollection
-from src.apis.wxtech.mappings import (
-    convert_weather_code,
-    get_weather_description,
-    convert_wind_direction
-)
+from src.data.forecast_time_index import JST, ForecastTimeIndex
+from src.data.weather_data import WeatherCondition, WeatherForecast, WeatherForecastCollection, WindDirection
+from src.apis.wxtech.mappings import WEATHER_CODE_TABLE, WIND_DIRECTIONS
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_UNKNOWN_WEATHER = (WeatherCondition.UNKNOWN, "不明")
+_VARIABLE_WIND = (WindDirection.VARIABLE, 0)
+# デバッグログを出力する時刻
+_LOGGED_HOURS = frozenset((9, 12, 15, 18))
+
+
+def loads_response(body: bytes | str) -> dict[str, Any]:
+    """APIレスポンス本文をJSONとしてデコード（orjsonがあれば使用）
+    
+    Raises:
+        json.JSONDecodeError: JSONとして不正な場合（orjsonの例外もこのサブクラス）
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(body)
+    return json.loads(body)
 
 
 def parse_forecast_response(
-    raw_data: dict[str, Any], location_name: str
+    raw_data: dict[str, Any], location_name: str,
+    target_date: date | None = None, target_hours: Sequence[int] | None = None,
+    tz: ZoneInfo = JST
 ) -> WeatherForecastCollection:
     """API レスポンスを WeatherForecastCollection に変換
     
+    ``target_date`` を指定すると、その日の予報だけを解析する。さらに ``target_hours`` を
+    指定すると、時刻インデックスで各時刻に最も近い予報を選び、選ばれた予報だけを
+    解析する（選ばれない予報は日時以外を解析しない）。
+    
     Args:
         raw_data: API からの生データ
         location_name: 地点名
+        target_date: 対象日（Noneの場合は全ての予報）
+        target_hours: 対象時刻のリスト（target_date 指定時のみ有効）
+        tz: タイムゾーンを持たない日時と対象時刻に使うタイムゾーン
         
     Returns:
         天気予報コレクション
     """
     wxdata = raw_data["wxdata"][0]
-    forecasts = []
-    
-    # 短期予報（時間別）の処理
-    if "srf" in wxdata:
-        for forecast_data in wxdata["srf"]:
-            try:
-                forecast = parse_single_forecast(
-                    forecast_data, location_name, is_hourly=True
-                )
-                forecasts.append(forecast)
-            except Exception as e:
-                warnings.warn(f"時間別予報の解析に失敗: {str(e)}")
-                continue
+    log_hours = logger.isEnabledFor(logging.DEBUG)
     
-    # 中期予報（日別）の処理
-    if "mrf" in wxdata:
-        for forecast_data in wxdata["mrf"]:
+    if target_date is None:
+        forecasts = []
+        for data, is_hourly in _iter_rows(wxdata):
             try:
-                forecast = parse_single_forecast(
-                    forecast_data, location_name, is_hourly=False
-                )
-                forecasts.append(forecast)
+                forecast_datetime = _parse_datetime(data["date"])
+                forecasts.append(_build_forecast(data, forecast_datetime, location_name, is_hourly, log_hours))
             except Exception as e:
-                warnings.warn(f"日別予報の解析に失敗: {str(e)}")
-                continue
-    
+                _warn_parse_failure(is_hourly, e)
+        return WeatherForecastCollection(location_id=location_name, forecasts=forecasts)
+    
+    # 日時だけを先に解析し、対象日の予報を候補にする
+    candidates: list[tuple[datetime, datetime, dict[str, Any], bool]] = []
+    for data, is_hourly in _iter_rows(wxdata):
+        try:
+            forecast_datetime = _parse_datetime(data["date"])
+        except Exception as e:
+            _warn_parse_failure(is_hourly, e)
+            continue
+        local_datetime = forecast_datetime if forecast_datetime.tzinfo else forecast_datetime.replace(tzinfo=tz)
+        if local_datetime.date() == target_date:
+            candidates.append((local_datetime, forecast_datetime, data, is_hourly))
+    
+    def build(candidate: tuple[datetime, datetime, dict[str, Any], bool]) -> WeatherForecast | None:
+        _, forecast_datetime, data, is_hourly = candidate
+        try:
+            return _build_forecast(data, forecast_datetime, location_name, is_hourly, log_hours)
+        except Exception as e:
+            _warn_parse_failure(is_hourly, e)
+            return None
+    
+    if target_hours is None:
+        forecasts = [forecast for forecast in map(build, candidates) if forecast is not None]
+        return WeatherForecastCollection(location_id=location_name, forecasts=forecasts)
+    
+    index = ForecastTimeIndex(candidates, key=itemgetter(0), tz=tz)
+    built: dict[int, WeatherForecast | None] = {}
+    forecasts = []
+    for hour in target_hours:
+        target_time = datetime.combine(target_date, time(hour), tzinfo=tz)
+        forecast = None
+        while (candidate := index.nearest(target_time)) is not None:
+            if id(candidate) not in built:
+                built[id(candidate)] = build(candidate)
+            forecast = built[id(candidate)]
+            if forecast is not None:
+                break
+            # 解析できない予報は候補から外して次に近い予報を使う
+            index.discard(candidate)
+        if forecast is None:
+            logger.warning(f"目標時刻 {hour:02d}:00 の予報が見つかりません")
+            continue
+        forecasts.append(forecast)
+        logger.debug(f"目標時刻 {hour:02d}:00 → 選択: {forecast.datetime.strftime('%Y-%m-%d %H:%M')}")
     return WeatherForecastCollection(location_id=location_name, forecasts=forecasts)
 
 
-def parse_single_forecast(
-    data: dict[str, Any], location_name: str, is_hourly: bool = True
+def _iter_rows(wxdata: dict[str, Any]) -> Iterator[tuple[dict[str, Any], bool]]:
+    """短期予報（時間別）、中期予報（日別）の順に (予報データ, 時間別かどうか) を返す"""
+    for data in wxdata.get("srf", ()):
+        yield data, True
+    for data in wxdata.get("mrf", ()):
+        yield data, False
+
+
+def _warn_parse_failure(is_hourly: bool, error: Exception) -> None:
+    kind = "時間別" if is_hourly else "日別"
+    warnings.warn(f"{kind}予報の解析に失敗: {str(error)}")
+
+
+def _parse_datetime(date_str: str) -> datetime:
+    # Python 3.10 の fromisoformat は末尾の Z を解釈できない
+    if date_str.endswith("Z"):
+        date_str = date_str[:-1] + "+00:00"
+    return datetime.fromisoformat(date_str)
+
+
+def _build_forecast(
+    data: dict[str, Any], forecast_datetime: datetime, location_name: str,
+    is_hourly: bool, log_hours: bool = False
 ) -> WeatherForecast:
-    """単一の予報データを WeatherForecast に変換
-    
-    Args:
-        data: 予報データ
-        location_name: 地点名
-        is_hourly: 時間別予報かどうか
-        
-    Returns:
-        天気予報オブジェクト
-    """
-    # 日時の解析
-    date_str = data["date"]
-    forecast_datetime = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-    
-    # 天気コードの変換
+    """日時を解析済みの予報データから WeatherForecast を作成"""
     weather_code = str(data["wx"])
-    weather_condition = convert_weather_code(weather_code)
-    weather_description = get_weather_description(weather_code)
-    
-    # 風向きの変換
-    wind_dir_index = data.get("wnddir", 0)
-    wind_direction, wind_degrees = convert_wind_direction(wind_dir_index)
+    weather_condition, weather_description = WEATHER_CODE_TABLE.get(weather_code, _UNKNOWN_WEATHER)
+    wind_direction, _ = WIND_DIRECTIONS.get(data.get("wnddir", 0), _VARIABLE_WIND)
     
     # 気温の取得（時間別と日別で異なるフィールド）
     if is_hourly:
@@ -92,14 +159,9 @@ def parse_single_forecast(
         # 日別予報の場合は最高気温を使用
         temperature = float(data.get("maxtemp", data.get("temp", 0)))
     
-    # 降水量の取得とデバッグ
     precipitation_value = data.get("prec", 0)
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    # 常にログを出力（降水量0も含む）
-    if forecast_datetime.hour in [9, 12, 15, 18]:
-        logger.info(
+    if log_hours and forecast_datetime.hour in _LOGGED_HOURS:
+        logger.debug(
             f"APIレスポンス解析: {forecast_datetime.strftime('%Y-%m-%d %H:%M')} - "
             f"降水量: {precipitation_value}mm, 天気: {weather_description}, "
             f"天気コード: {weather_code}"
@@ -124,6 +186,25 @@ def parse_single_forecast(
     )
 
 
+def parse_single_forecast(
+    data: dict[str, Any], location_name: str, is_hourly: bool = True
+) -> WeatherForecast:
+    """単一の予報データを WeatherForecast に変換
+    
+    Args:
+        data: 予報データ
+        location_name: 地点名
+        is_hourly: 時間別予報かどうか
+        
+    Returns:
+        天気予報オブジェクト
+    """
+    return _build_forecast(
+        data, _parse_datetime(data["date"]), location_name, is_hourly,
+        logger.isEnabledFor(logging.DEBUG)
+    )
+
+
 def analyze_response_patterns(test_results: dict[str, Any]) -> dict[str, Any]:
     """レスポンスパターンを分析して特定時刻指定の効果を確認する"""
     
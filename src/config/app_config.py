@@ -14,6 +14,7 @@ from .config import (
     get_data_settings,
     get_app_settings
 )
+from .settings import APIConfig, AppSettings
 
 logger = logging.getLogger(__name__)
 
@@ -104,6 +105,16 @@ class AppConfig:
         
         return config
     
+    @property
+    def app(self) -> AppSettings:
+        """統一設定のアプリケーション設定（config.AppSettings）"""
+        return get_app_settings()
+    
+    @property
+    def api(self) -> APIConfig:
+        """統一設定のAPI設定（config.APIConfig）"""
+        return get_api_config()
+    
     def validate(self) -> dict[str, Any]:
         """設定の検証"""
         api_key_validation = self.api_keys.validate()
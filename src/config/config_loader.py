@@ -3,12 +3,15 @@
 from __future__ import annotations
 import yaml
 from pathlib import Path
+from collections.abc import Mapping
 from typing import Any
 import jsonschema
 import logging
 
+from src.config.yaml_config_store import get_yaml_config_store, thaw
+
 logger = logging.getLogger(__name__)
-_config_cache = {}
+_validated_versions: dict[str, int] = {}
 
 # 基本的な設定スキーマ
 CONFIG_SCHEMAS = {
@@ -24,8 +27,8 @@ CONFIG_SCHEMAS = {
 }
 
 
-def load_config(config_name: str, validate: bool = True) -> dict[str, Any]:
-    """YAMLファイルから設定を読み込む
+def load_config(config_name: str, validate: bool = True) -> Mapping[str, Any]:
+    """YAMLファイルから設定を読み込む（変更不可能なオブジェクトとして返す）
     
     Args:
         config_name: 設定ファイル名（拡張子なし）
@@ -39,32 +42,27 @@ def load_config(config_name: str, validate: bool = True) -> dict[str, Any]:
         yaml.YAMLError: YAML解析エラーの場合
         jsonschema.ValidationError: スキーマ検証エラーの場合
     """
-    if config_name in _config_cache:
-        return _config_cache[config_name]
-    
     config_dir = Path(__file__).parent.parent.parent / 'config'
     config_path = config_dir / f"{config_name}.yaml"
     
-    if not config_path.exists():
-        raise FileNotFoundError(f"Config file not found: {config_path}")
-    
+    # 解析済みの設定は共有ストアで管理され、ファイル変更時のみ再読み込みされる
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        version = get_yaml_config_store().get_version(config_path)
     except yaml.YAMLError as e:
         logger.error(f"YAML parsing error in {config_path}: {e}")
         raise
+    config = version.data
     
-    # スキーマ検証
-    if validate and config_name in CONFIG_SCHEMAS:
+    # スキーマ検証（バージョンごとに1回）
+    if validate and config_name in CONFIG_SCHEMAS and _validated_versions.get(config_name) != version.version:
         try:
-            jsonschema.validate(config, CONFIG_SCHEMAS[config_name])
+            jsonschema.validate(thaw(config), CONFIG_SCHEMAS[config_name])
             logger.debug(f"Config validation successful for {config_name}")
         except jsonschema.ValidationError as e:
             logger.error(f"Config validation failed for {config_name}: {e.message}")
             raise
+        _validated_versions[config_name] = version.version
     
-    _config_cache[config_name] = config
     return config
 
 
@@ -90,6 +88,6 @@ def validate_config(config_name: str, config_data: dict[str, Any]) -> bool:
         return False
 
 
-def get_weather_thresholds() -> dict[str, Any]:
+def get_weather_thresholds() -> Mapping[str, Any]:
     """天気関連の閾値設定を取得"""
     return load_config('weather_thresholds')
\ No newline at end of file
@@ -1,11 +1,13 @@
 """評価設定ローダー"""
 
 from __future__ import annotations
-import yaml
+from collections.abc import Mapping
 from typing import Any
 from pathlib import Path
 import logging
 
+from src.config.yaml_config_store import freeze, get_yaml_config_store, thaw
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,19 +26,22 @@ class EvaluationConfigLoader:
         self.config_path = Path(config_path)
         self._config = None
     
-    def load_config(self) -> dict[str, Any]:
-        """設定を読み込む"""
-        if self._config is None:
-            try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    self._config = yaml.safe_load(f)
-                logger.info(f"評価設定を読み込みました: {self.config_path}")
-            except Exception as e:
-                logger.error(f"評価設定の読み込みに失敗しました: {e}")
-                # デフォルト設定を返す
-                self._config = self._get_default_config()
+    def load_config(self) -> Mapping[str, Any]:
+        """設定を読み込む
+        
+        設定ファイルは共有ストアで一度だけ解析され、変更時は自動的に再読み込みされる。
+        返される設定は変更不可能なオブジェクト。
+        """
+        if self._config is not None:
+            return self._config
         
-        return self._config
+        try:
+            return get_yaml_config_store().get(self.config_path)
+        except Exception as e:
+            logger.error(f"評価設定の読み込みに失敗しました: {e}")
+            # デフォルト設定を返す
+            self._config = freeze(self._get_default_config())
+            return self._config
     
     def get_inappropriate_patterns(self, mode: str = "relaxed") -> list[str]:
         """不適切表現パターンを取得"""
@@ -77,7 +82,7 @@ class EvaluationConfigLoader:
         elif "obvious_contradictions" in enabled_checks:
             # 明らかな矛盾のみ
             weather_patterns = all_patterns.get("weather", [])
-            return weather_patterns[:2] if len(weather_patterns) >= 2 else weather_patterns
+            return thaw(weather_patterns[:2])
         
         return []
     
@@ -85,23 +90,23 @@ class EvaluationConfigLoader:
         """矛盾パターンをフラット化"""
         result = []
         for category, items in patterns.items():
-            result.extend(items)
+            result.extend(thaw(items))
         return result
     
     def get_mode_config(self, mode: str = "relaxed") -> dict[str, Any]:
         """モード別設定を取得"""
         config = self.load_config()
-        return config.get("evaluation_modes", {}).get(mode, {})
+        return thaw(config.get("evaluation_modes", {}).get(mode, {}))
     
     def get_positive_expressions(self) -> list[str]:
         """ポジティブ表現を取得"""
         config = self.load_config()
-        return config.get("evaluation_patterns", {}).get("positive_expressions", [])
+        return list(config.get("evaluation_patterns", {}).get("positive_expressions", []))
     
     def get_engagement_elements(self) -> list[str]:
         """エンゲージメント要素を取得"""
         config = self.load_config()
-        return config.get("evaluation_patterns", {}).get("engagement_elements", [])
+        return list(config.get("evaluation_patterns", {}).get("engagement_elements", []))
     
     def _get_default_config(self) -> dict[str, Any]:
         """デフォルト設定を返す"""
@@ -29,6 +29,12 @@ class APIConfig:
     api_timeout: int = field(default=30)  # seconds
     retry_count: int = field(default=3)
     
+    # 共有HTTP接続プール（WxTech APIなど外部APIの呼び出しで再利用する）
+    http_max_connections: int = field(default=100)
+    http_max_connections_per_host: int = field(default=20)
+    http_keepalive_timeout: float = field(default=30.0)  # seconds
+    http_dns_cache_ttl: int = field(default=300)  # seconds
+    
     def __post_init__(self):
         """環境変数から値を読み込む"""
         self.wxtech_api_key = os.getenv("WXTECH_API_KEY", self.wxtech_api_key)
@@ -36,6 +42,12 @@ class APIConfig:
         self.anthropic_api_key = os.getenv("ANTHROPIC_API_KEY", self.anthropic_api_key)
         self.gemini_api_key = os.getenv("GEMINI_API_KEY", self.gemini_api_key)
         self.api_timeout = int(os.getenv("API_TIMEOUT", str(self.api_timeout)))
+        self.http_max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", str(self.http_max_connections)))
+        self.http_max_connections_per_host = int(
+            os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", str(self.http_max_connections_per_host))
+        )
+        self.http_keepalive_timeout = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", str(self.http_keepalive_timeout)))
+        self.http_dns_cache_ttl = int(os.getenv("HTTP_DNS_CACHE_TTL", str(self.http_dns_cache_ttl)))
     
     def get_llm_key(self, provider: str) -> str | None:
         """LLMプロバイダーに対応するAPIキーを取得"""
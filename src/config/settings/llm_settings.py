@@ -34,6 +34,23 @@ class LLMConfig:
     performance_anthropic_model: str = field(default="claude-3-haiku-20240307")
     performance_gemini_model: str = field(default="gemini-1.5-flash")
     
+    # クライアントプール（プロバイダー・モデルごとに共有する接続の上限）
+    max_connections: int = field(default=20)
+    max_keepalive_connections: int = field(default=10)
+    
+    # 非同期スケジューラー（プロバイダーごとの同時実行数とレート制限）
+    async_max_concurrency: int = field(default=8)
+    requests_per_second: float = field(default=5.0)
+    rate_limit_burst: int = field(default=10)
+    
+    # 統合生成のレスポンスキャッシュ（DBパスが空の場合はメモリのみ）
+    response_cache_enabled: bool = field(default=True)
+    response_cache_max_entries: int = field(default=1000)
+    response_cache_db_path: str = field(default="")
+    
+    # 同じプロンプトの同時リクエストを1回のAPI呼び出しにまとめる
+    coalesce_requests: bool = field(default=True)
+    
     def __post_init__(self):
         """環境変数から値を読み込む"""
         self.default_provider = os.getenv("DEFAULT_LLM_PROVIDER", self.default_provider)
@@ -48,6 +65,31 @@ class LLMConfig:
         self.performance_openai_model = os.getenv("PERFORMANCE_OPENAI_MODEL", self.performance_openai_model)
         self.performance_anthropic_model = os.getenv("PERFORMANCE_ANTHROPIC_MODEL", self.performance_anthropic_model)
         self.performance_gemini_model = os.getenv("PERFORMANCE_GEMINI_MODEL", self.performance_gemini_model)
+        
+        # クライアントプールの設定
+        self.max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", str(self.max_connections)))
+        self.max_keepalive_connections = int(
+            os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", str(self.max_keepalive_connections))
+        )
+        
+        # 非同期スケジューラーの設定
+        self.async_max_concurrency = int(os.getenv("LLM_ASYNC_MAX_CONCURRENCY", str(self.async_max_concurrency)))
+        self.requests_per_second = float(os.getenv("LLM_REQUESTS_PER_SECOND", str(self.requests_per_second)))
+        self.rate_limit_burst = int(os.getenv("LLM_RATE_LIMIT_BURST", str(self.rate_limit_burst)))
+        
+        # レスポンスキャッシュの設定
+        self.response_cache_enabled = os.getenv(
+            "LLM_RESPONSE_CACHE_ENABLED", "true" if self.response_cache_enabled else "false"
+        ).lower() == "true"
+        self.response_cache_max_entries = int(
+            os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", str(self.response_cache_max_entries))
+        )
+        self.response_cache_db_path = os.getenv("LLM_RESPONSE_CACHE_DB", self.response_cache_db_path)
+        
+        # リクエスト合流の設定
+        self.coalesce_requests = os.getenv(
+            "LLM_COALESCE_REQUESTS", "true" if self.coalesce_requests else "false"
+        ).lower() == "true"
 
 
 @dataclass
@@ -170,6 +170,18 @@ class WeatherConfig:
     cache_dir: Path = field(default_factory=lambda: Path("data/forecast_cache"))
     enable_caching: bool = field(default=True)
     forecast_cache_retention_days: int = field(default=7)
+    forecast_cache_backend: str = field(default="sqlite")  # "sqlite" または "csv"
+    forecast_cache_write_behind: bool = field(default=True)  # バックグラウンドでまとめて書き込む
+    forecast_cache_write_queue_size: int = field(default=10000)  # 書き込みキューの最大エントリ数
+    forecast_cache_stale_seconds: int = field(default=3600)  # 読み込み失敗時に期限切れのメモリキャッシュを返す期間（秒）
+    
+    # キャッシュ事前温め設定（APIサーバー内でアクセスの多い地点の予報を更新）
+    cache_warming_enabled: bool = field(default=True)
+    cache_warming_top_n: int = field(default=20)  # 温める地点数
+    cache_warming_max_concurrent: int = field(default=5)  # 同時に更新する地点数
+    cache_warming_lead_seconds: int = field(default=120)  # TTL切れ・日付切り替えの何秒前に更新するか
+    cache_warming_active_hours: int = field(default=24)  # この時間内にアクセスがあった地点のみ温める
+    cache_warming_max_locations: int = field(default=1000)  # アクセス統計を保持する最大地点数
     
     # API設定
     use_optimized_forecast: bool = field(default=True)  # 最適化された翌日予報取得を使用
@@ -203,6 +215,16 @@ class WeatherConfig:
         self.enable_caching = os.getenv("WEATHER_ENABLE_CACHING", "true" if self.enable_caching else "false").lower() == "true"
         self.use_optimized_forecast = os.getenv("WEATHER_USE_OPTIMIZED_FORECAST", "true" if self.use_optimized_forecast else "false").lower() == "true"
         self.forecast_cache_retention_days = int(os.getenv("FORECAST_CACHE_RETENTION_DAYS", str(self.forecast_cache_retention_days)))
+        self.forecast_cache_backend = os.getenv("FORECAST_CACHE_BACKEND", self.forecast_cache_backend).lower()
+        self.forecast_cache_write_behind = os.getenv("FORECAST_CACHE_WRITE_BEHIND", "true" if self.forecast_cache_write_behind else "false").lower() == "true"
+        self.forecast_cache_write_queue_size = int(os.getenv("FORECAST_CACHE_WRITE_QUEUE_SIZE", str(self.forecast_cache_write_queue_size)))
+        self.forecast_cache_stale_seconds = int(os.getenv("FORECAST_CACHE_STALE_SECONDS", str(self.forecast_cache_stale_seconds)))
+        self.cache_warming_enabled = os.getenv("CACHE_WARMING_ENABLED", "true" if self.cache_warming_enabled else "false").lower() == "true"
+        self.cache_warming_top_n = int(os.getenv("CACHE_WARMING_TOP_N", str(self.cache_warming_top_n)))
+        self.cache_warming_max_concurrent = int(os.getenv("CACHE_WARMING_MAX_CONCURRENT", str(self.cache_warming_max_concurrent)))
+        self.cache_warming_lead_seconds = int(os.getenv("CACHE_WARMING_LEAD_SECONDS", str(self.cache_warming_lead_seconds)))
+        self.cache_warming_active_hours = int(os.getenv("CACHE_WARMING_ACTIVE_HOURS", str(self.cache_warming_active_hours)))
+        self.cache_warming_max_locations = int(os.getenv("CACHE_WARMING_MAX_LOCATIONS", str(self.cache_warming_max_locations)))
         
         # 温度差閾値設定の読み込み
         self.temp_diff_threshold_previous_day = float(os.getenv("TEMP_DIFF_THRESHOLD_PREVIOUS_DAY", str(self.temp_diff_threshold_previous_day)))
@@ -0,0 +1,281 @@
+"""YAML設定ファイルの共有ストア
+
+バリデータや評価器はリクエストごとに生成されるため、それぞれがYAMLを読み込むと
+毎回ファイルI/Oと解析が発生する。このストアは各ファイルを一度だけ解析し、
+変更不可能なオブジェクト（MappingProxyType / tuple）としてプロセス全体で共有する。
+
+ファイルの変更は (mtime_ns, size, inode) を check_interval 秒ごとにポーリングして検出し、
+新しいバージョンを構築してから参照を差し替える。ポーリング間隔内の呼び出しは
+ファイルシステムに一切アクセスしない。
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, NamedTuple, TypeVar
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CONFIG_DIR = Path(__file__).parent.parent.parent / "config"
+
+
+def freeze(value: Any) -> Any:
+    """YAMLから読み込んだ値を再帰的に変更不可能な型に変換
+
+    dict は MappingProxyType、list は tuple、set は frozenset に変換する。
+    """
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """freeze で変換した値を通常の dict / list に戻す（呼び出し側で変更する場合用）"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return {thaw(item) for item in value}
+    return value
+
+
+def parse_yaml_text(text: str) -> Any:
+    """YAMLテキストを解析
+
+    一部の設定ファイルは先頭にPython風の三重引用符の説明文を持つため、それを除いてから解析する。
+    """
+    if text.startswith('"""'):
+        end_index = text.find('"""', 3)
+        if end_index != -1:
+            text = text[end_index + 3:].strip()
+    return yaml.safe_load(text)
+
+
+@dataclass(frozen=True)
+class ConfigVersion:
+    """読み込まれた設定ファイルの1バージョン
+
+    Attributes:
+        path: 設定ファイルのパス
+        data: 解析済みの変更不可能なデータ
+        version: ファイルごとのバージョン番号（内容が再読み込みされるたびに増加）
+        signature: 読み込み時点の (mtime_ns, size, inode)
+        loaded_at: 読み込み時刻（UNIX時間）
+    """
+
+    path: Path
+    data: Any
+    version: int
+    signature: tuple[int, int, int]
+    loaded_at: float = field(default_factory=time.time)
+
+
+class _FileEntry(NamedTuple):
+    """ファイルごとのキャッシュ状態（参照ごと差し替えることで更新をアトミックにする）"""
+
+    current: ConfigVersion | None
+    error: Exception | None
+    signature: tuple[int, int, int] | None
+    checked_at: float
+
+
+class YamlConfigStore:
+    """YAML設定ファイルを解析済み・変更不可能な形で共有するストア
+
+    get() は設定データを、get(path, parser) は parser で変換した型付きオブジェクトを返す。
+    parser の結果はファイルのバージョンごとに1回だけ計算される。呼び出しごとに作られる
+    ラムダやクロージャを parser に渡しても増え続けないよう、結果は最大 max_parsed 件の
+    LRUとして保持する。
+    """
+
+    def __init__(self, check_interval: float = 2.0, max_parsed: int = 256):
+        """
+        Args:
+            check_interval: ファイル変更の確認間隔（秒）
+            max_parsed: 保持する parser の結果の最大数
+        """
+        self.check_interval = check_interval
+        self.max_parsed = max_parsed
+        self._files: dict[Path, _FileEntry] = {}
+        self._parsed: OrderedDict[tuple[Path, Callable[[Any], Any]], tuple[int, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"loads": 0, "reloads": 0, "errors": 0}
+
+    @staticmethod
+    def _resolve(path: str | Path) -> Path:
+        if not isinstance(path, Path):
+            path = Path(path)
+        if not path.is_absolute():
+            path = path.absolute()
+        return path
+
+    @staticmethod
+    def _stat(path: Path) -> tuple[int, int, int] | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _entry(self, path: Path) -> _FileEntry:
+        """ファイルのキャッシュ状態を取得（確認間隔を過ぎていれば変更を確認）"""
+        entry = self._files.get(path)
+        if entry is not None and time.monotonic() - entry.checked_at < self.check_interval:
+            return entry
+
+        with self._lock:
+            entry = self._files.get(path)
+            now = time.monotonic()
+            if entry is not None and now - entry.checked_at < self.check_interval:
+                return entry
+
+            signature = self._stat(path)
+            if entry is not None and signature == entry.signature:
+                entry = entry._replace(checked_at=now)
+            else:
+                entry = self._load(path, signature, entry, now)
+            self._files[path] = entry
+            return entry
+
+    def _load(self, path: Path, signature: tuple[int, int, int] | None,
+              previous: _FileEntry | None, now: float) -> _FileEntry:
+        """ファイルを読み込んで新しいキャッシュ状態を作成"""
+        current = previous.current if previous else None
+        try:
+            if signature is None:
+                raise FileNotFoundError(f"Config file not found: {path}")
+            with open(path, "r", encoding="utf-8") as f:
+                data = freeze(parse_yaml_text(f.read()))
+        except Exception as e:
+            self._stats["errors"] += 1
+            if current is not None and signature is not None:
+                # 編集途中などで解析に失敗した場合は直前の正常なバージョンを使い続ける
+                logger.error(f"設定ファイルの再読み込みに失敗しました。前のバージョンを使用します: {path}: {e}")
+                return _FileEntry(current, None, signature, now)
+            return _FileEntry(None, e, signature, now)
+
+        version = (current.version + 1) if current else 1
+        if current is None:
+            self._stats["loads"] += 1
+            logger.debug(f"設定ファイルを読み込みました: {path}")
+        else:
+            self._stats["reloads"] += 1
+            logger.info(f"設定ファイルの変更を検出し再読み込みしました: {path} (version {version})")
+        return _FileEntry(ConfigVersion(path, data, version, signature), None, signature, now)
+
+    def get_version(self, path: str | Path) -> ConfigVersion:
+        """設定ファイルの現在のバージョンを取得
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない場合
+            yaml.YAMLError: 初回の解析に失敗した場合
+        """
+        entry = self._entry(self._resolve(path))
+        if entry.error is not None:
+            raise entry.error
+        return entry.current
+
+    def get(self, path: str | Path, parser: Callable[[Any], T] | None = None) -> T | Any:
+        """設定データを取得
+
+        Args:
+            path: 設定ファイルのパス
+            parser: 解析済みデータを型付きオブジェクトに変換する関数（省略時はデータをそのまま返す）
+
+        Returns:
+            変更不可能な設定データ、または parser の戻り値
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない場合
+            yaml.YAMLError: 初回の解析に失敗した場合
+        """
+        current = self.get_version(path)
+        if parser is None:
+            return current.data
+
+        key = (current.path, parser)
+        with self._lock:
+            cached = self._parsed.get(key)
+            if cached is not None and cached[0] == current.version:
+                self._parsed.move_to_end(key)
+                return cached[1]
+        value = parser(current.data)
+        with self._lock:
+            self._parsed[key] = (current.version, value)
+            self._parsed.move_to_end(key)
+            while len(self._parsed) > self.max_parsed:
+                self._parsed.popitem(last=False)
+        return value
+
+    def version_of(self, path: str | Path) -> int | None:
+        """設定ファイルのバージョン番号を取得（読み込めない場合は None）"""
+        entry = self._entry(self._resolve(path))
+        return entry.current.version if entry.current else None
+
+    def invalidate(self, path: str | Path | None = None) -> None:
+        """キャッシュを破棄し、次回アクセス時に再確認させる
+
+        Args:
+            path: 対象のファイル（省略時は全ファイル）
+        """
+        with self._lock:
+            if path is None:
+                self._files = {
+                    p: entry._replace(checked_at=float("-inf")) for p, entry in self._files.items()
+                }
+            else:
+                resolved = self._resolve(path)
+                entry = self._files.get(resolved)
+                if entry is not None:
+                    self._files[resolved] = entry._replace(checked_at=float("-inf"))
+
+    def clear(self) -> None:
+        """全てのキャッシュを破棄"""
+        with self._lock:
+            self._files.clear()
+            self._parsed.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """統計情報を取得"""
+        return {
+            "files": {
+                str(path): entry.current.version if entry.current else None
+                for path, entry in list(self._files.items())
+            },
+            "parsed": len(self._parsed),
+            **self._stats,
+        }
+
+
+_yaml_config_store: YamlConfigStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_yaml_config_store() -> YamlConfigStore:
+    """グローバルなYAML設定ストアを取得"""
+    global _yaml_config_store
+    store = _yaml_config_store
+    if store is None:
+        with _store_lock:
+            store = _yaml_config_store
+            if store is None:
+                store = YamlConfigStore()
+                _yaml_config_store = store
+    return store
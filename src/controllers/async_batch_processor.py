@@ -1,6 +1,7 @@
 """非同期バッチ処理モジュール
 
-複数地点の天気予報を並列で非同期取得する最適化版
+複数地点の天気予報を並列で非同期取得し、フィルタリングからLLM呼び出しまでを
+同じイベントループ上で実行する最適化版
 """
 
 from __future__ import annotations
@@ -11,15 +12,15 @@ from collections.abc import Callable
 from datetime import datetime
 
 from src.apis.wxtech.cached_client import CachedWxTechAPIClient
-from src.nodes.weather_forecast.services import WeatherAPIService
+from src.apis.wxtech.grid import diff_grid_stats
 from src.nodes.weather_forecast.service_factory import WeatherForecastServiceFactory
 from src.config import get_config
 from src.config.config import get_weather_config
-from src.workflows.comment_generation_workflow import run_comment_generation
+from src.workflows.unified_comment_generation_workflow import arun_unified_comment_generation
 from src.types import LocationResult, BatchGenerationResult
 from src.utils.error_handler import ErrorHandler
 from src.data.forecast_cache import save_forecast_to_cache
-from src.controllers.parallel_comment_generator import ParallelCommentGenerator
+from src.llm.async_scheduler import get_llm_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -27,14 +28,81 @@ logger = logging.getLogger(__name__)
 class AsyncBatchProcessor:
     """非同期バッチ処理を管理するクラス"""
     
-    def __init__(self):
+    def __init__(self, timeout_per_location: int | None = None):
+        """
+        Args:
+            timeout_per_location: 地点ごとのコメント生成タイムアウト（秒）
+        """
         self.config = get_config()
         self.weather_config = get_weather_config()
-        self.parallel_generator = ParallelCommentGenerator(
-            max_workers=4,  # 4並列でコメント生成
-            timeout_per_location=30
+        self.timeout_per_location = timeout_per_location or getattr(
+            self.config.generation, 'comment_timeout_seconds', 30
         )
+        self._stats = {
+            "processed": 0,
+            "timeout_count": 0,
+            "error_count": 0,
+            "upstream_calls_saved": 0
+        }
+        
+    def _resolve_locations(self, locations: list[str]) -> dict[str, Any]:
+        """地点名から座標付きの地点情報を解決
+        
+        Args:
+            locations: 地点名のリスト
+            
+        Returns:
+            地点名をキーとする地点情報の辞書（解決できなかった地点は含まない）
+        """
+        # 地点情報サービスのみ取得（APIキーは不要）
+        location_service = WeatherForecastServiceFactory().get_location_service()
+        
+        location_map = {}
+        for location_name in locations:
+            # 地点情報の解析
+            parsed_name, lat, lon = location_service.parse_location_string(location_name)
+            try:
+                location_map[location_name] = location_service.get_location_with_coordinates(parsed_name, lat, lon)
+            except Exception as e:
+                logger.error(f"地点情報の取得に失敗: {location_name} - {e}")
+        return location_map
+    
+    async def prefetch_weather_async(self, locations: list[str]) -> dict[str, Any]:
+        """全地点の翌日予報をメッシュ単位でまとめて非同期取得
+        
+        近接する地点は同じ予報メッシュを共有するため、メッシュごとに1回だけ上流APIを呼び出し、
+        結果を各地点に配る。取得した予報はプロセス共有のメッシュキャッシュに残るため、
+        後続のバッチ処理でも再利用される。
+        
+        Args:
+            locations: 地点名のリスト
+            
+        Returns:
+            fetched: 地点名をキーとする予報コレクション（取得失敗時は例外）
+            locations: 地点名をキーとする地点情報
+            grid_stats: 今回の取得におけるメッシュ共有の統計情報
+        """
+        location_map = self._resolve_locations(locations)
+        
+        # 真の非同期クライアントを使用
+        async with CachedWxTechAPIClient(self.config.api.wxtech_api_key) as client:
+            stats_before = client.get_grid_stats()
+            logger.info(f"🚀 {len(location_map)}地点の天気予報を真の非同期で並列取得開始")
+            fetched = await client.prefetch_locations_async(
+                (name, location.latitude, location.longitude)
+                for name, location in location_map.items()
+            )
+            grid_stats = diff_grid_stats(stats_before, client.get_grid_stats())
+        
+        if grid_stats:
+            logger.info(
+                f"📡 予報メッシュ共有: 上流呼び出し={grid_stats['upstream_calls']}, "
+                f"省略={grid_stats['saved_upstream_calls']}"
+            )
+            self._stats["upstream_calls_saved"] += grid_stats["saved_upstream_calls"]
         
+        return {"fetched": fetched, "locations": location_map, "grid_stats": grid_stats}
+    
     async def fetch_all_weather_data_async(
         self, 
         locations: list[str]
@@ -47,75 +115,38 @@ class AsyncBatchProcessor:
         Returns:
             地点名をキーとする天気予報データの辞書
         """
-        api_key = self.config.api.wxtech_api_key
-        service_factory = WeatherForecastServiceFactory(
-            self.config, 
-            self.weather_config, 
-            api_key
-        )
-        
-        # 地点情報サービスのみ取得
-        location_service = service_factory.get_location_service()
+        prefetched = await self.prefetch_weather_async(locations)
+        weather_data = {}
         
-        # 真の非同期クライアントを使用
-        async with CachedWxTechAPIClient(api_key) as client:
-            # 非同期タスクのリストを作成
-            tasks = []
-            location_map = {}
-            
-            for location_name in locations:
-                # 地点情報の解析
-                parsed_name, lat, lon = location_service.parse_location_input(location_name)
+        # 結果を辞書に格納
+        for location_name, result in prefetched["fetched"].items():
+            location = prefetched["locations"][location_name]
+            if isinstance(result, BaseException):
+                error = result
+                # エラーの種類に応じた詳細な処理
+                if isinstance(error, asyncio.TimeoutError):
+                    logger.error(f"天気予報取得タイムアウト: {location_name} - APIレスポンスが遅い可能性があります")
+                elif isinstance(error, ConnectionError):
+                    logger.error(f"天気予報取得接続エラー: {location_name} - ネットワーク接続を確認してください")
+                elif hasattr(error, 'response') and hasattr(error.response, 'status_code'):
+                    logger.error(f"天気予報取得APIエラー: {location_name} - ステータスコード: {error.response.status_code}")
+                else:
+                    logger.error(f"天気予報取得エラー: {location_name} - {type(error).__name__}: {error}")
+                weather_data[location_name] = None
+            else:
+                # キャッシュに保存（書き込みキューに積むだけでディスクI/Oは待たない。
+                # キューが満杯の場合も待たずに永続化を諦め、取得処理を止めない）
                 try:
-                    location = location_service.get_location_with_coordinates(parsed_name, lat, lon)
-                    location_map[location_name] = location
-                    
-                    # 真の非同期タスクを作成
-                    task = client.async_get_forecast_optimized(
-                        location.latitude,
-                        location.longitude
-                    )
-                    tasks.append((location_name, location, task))
+                    save_forecast_to_cache(result, location_name, block=False)
                 except Exception as e:
-                    logger.error(f"地点情報の取得に失敗: {location_name} - {e}")
-                    continue
-            
-            # 全タスクを並列実行
-            logger.info(f"🚀 {len(tasks)}地点の天気予報を真の非同期で並列取得開始")
-            weather_data = {}
-            results = await asyncio.gather(
-                *[task for _, _, task in tasks],
-                return_exceptions=True
-            )
-            
-            # 結果を辞書に格納
-            for i, (location_name, location, _) in enumerate(tasks):
-                if isinstance(results[i], Exception):
-                    error = results[i]
-                    # エラーの種類に応じた詳細な処理
-                    if isinstance(error, asyncio.TimeoutError):
-                        logger.error(f"天気予報取得タイムアウト: {location_name} - APIレスポンスが遅い可能性があります")
-                    elif isinstance(error, ConnectionError):
-                        logger.error(f"天気予報取得接続エラー: {location_name} - ネットワーク接続を確認してください")
-                    elif hasattr(error, 'response') and hasattr(error.response, 'status_code'):
-                        logger.error(f"天気予報取得APIエラー: {location_name} - ステータスコード: {error.response.status_code}")
-                    else:
-                        logger.error(f"天気予報取得エラー: {location_name} - {type(error).__name__}: {error}")
-                    weather_data[location_name] = None
-                else:
-                    # キャッシュに保存
-                    try:
-                        save_forecast_to_cache(results[i], location_name)
-                    except Exception as e:
-                        logger.warning(f"キャッシュ保存エラー: {location_name} - {e}")
-                    
-                    weather_data[location_name] = {
-                        'forecast_collection': results[i],
-                        'location': location
-                    }
-            
-            logger.info(f"✅ 天気予報並列取得完了: {len([v for v in weather_data.values() if v])}地点成功")
+                    logger.warning(f"キャッシュ保存エラー: {location_name} - {e}")
                 
+                weather_data[location_name] = {
+                    'forecast_collection': result,
+                    'location': location
+                }
+        
+        logger.info(f"✅ 天気予報並列取得完了: {len([v for v in weather_data.values() if v])}地点成功")
         return weather_data
     
     async def generate_comments_batch_async(
@@ -141,31 +172,109 @@ class AsyncBatchProcessor:
         weather_data = await self.fetch_all_weather_data_async(locations)
         logger.info(f"✅ 天気予報取得完了: {len(weather_data)}地点")
         
-        # 次に各地点のコメント生成（並列処理）
-        logger.info(f"🚀 {len(locations)}地点のコメントを並列生成開始")
+        # 次に各地点のコメント生成（LLM呼び出しはスケジューラーで同時実行数・レートを制限）
+        logger.info(f"🚀 {len(locations)}地点のコメントを非同期生成開始")
         
-        # ParallelCommentGeneratorを使用して並列生成
-        batch_result = await self.parallel_generator.generate_parallel_async(
-            weather_data,
-            llm_provider=llm_provider,
-            progress_callback=progress_callback
-        )
+        total = len(weather_data)
+        completed_count = 0
+        all_results: list[LocationResult] = []
         
-        logger.info(f"✅ コメント並列生成完了: {batch_result['success_count']}地点成功")
+        tasks = [
+            asyncio.ensure_future(self._generate_single_comment_async(location, data, llm_provider))
+            for location, data in weather_data.items()
+        ]
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            all_results.append(result)
+            completed_count += 1
+            if progress_callback:
+                progress_callback(completed_count, total, result["location"])
+        
+        success_count = sum(1 for r in all_results if r["success"])
+        processing_time = (datetime.now() - start_time).total_seconds()
+        logger.info(f"✅ コメント非同期生成完了: {success_count}地点成功")
         
         # 統計情報をログ
-        generator_stats = self.parallel_generator.get_stats()
         logger.info(
             f"📊 生成統計: "
-            f"並列={generator_stats['parallel_processed']}, "
-            f"シリアル={generator_stats['serial_processed']}, "
-            f"タイムアウト={generator_stats['timeout_count']}, "
-            f"エラー={generator_stats['error_count']}"
+            f"処理={self._stats['processed']}, "
+            f"タイムアウト={self._stats['timeout_count']}, "
+            f"エラー={self._stats['error_count']}, "
+            f"上流呼び出し省略={self._stats['upstream_calls_saved']}, "
+            f"LLM={get_llm_scheduler().get_stats()}"
         )
         
-        all_results = batch_result["results"]
+        return BatchGenerationResult(
+            results=all_results,
+            total_count=total,
+            success_count=success_count,
+            failed_count=total - success_count,
+            processing_time=processing_time
+        )
+    
+    async def _generate_single_comment_async(
+        self,
+        location: str,
+        weather_data: dict[str, Any] | None,
+        llm_provider: str
+    ) -> LocationResult:
+        """単一地点のコメントをイベントループ上で生成
         
-        return batch_result
+        Args:
+            location: 地点名
+            weather_data: 事前取得した天気データ（取得失敗時はNone）
+            llm_provider: LLMプロバイダー
+            
+        Returns:
+            地点結果
+        """
+        if not weather_data:
+            self._stats["error_count"] += 1
+            return ErrorHandler.create_error_result(
+                location,
+                ValueError("天気予報データがありません")
+            )
+        
+        try:
+            result = await asyncio.wait_for(
+                arun_unified_comment_generation(
+                    location_name=location,
+                    llm_provider=llm_provider,
+                    pre_fetched_weather=weather_data
+                ),
+                timeout=self.timeout_per_location
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"タイムアウト: {location}")
+            self._stats["timeout_count"] += 1
+            return ErrorHandler.create_error_result(
+                location,
+                TimeoutError(f"コメント生成がタイムアウトしました（{self.timeout_per_location}秒）")
+            )
+        except Exception as e:
+            logger.error(f"コメント生成エラー: {location} - {e}")
+            self._stats["error_count"] += 1
+            return ErrorHandler.create_error_result(location, e)
+        
+        self._stats["processed"] += 1
+        if not result.get("success"):
+            return ErrorHandler.create_error_result(
+                location,
+                result.get("error") or "コメント生成に失敗しました"
+            )
+        
+        return LocationResult(
+            location=location,
+            success=True,
+            comment=result.get("final_comment", ""),
+            advice=result.get("advice_comment", ""),
+            weather_summary=result.get("weather_summary", ""),
+            generation_metadata=result.get("generation_metadata", {})
+        )
+    
+    def get_stats(self) -> dict[str, Any]:
+        """統計情報を取得"""
+        return dict(self._stats)
 
 
 # 既存のコントローラーから呼び出すためのラッパー関数
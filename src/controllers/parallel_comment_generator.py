@@ -246,18 +246,12 @@ class ParallelCommentGenerator:
                                     progress_callback: Optional[Callable[[int, int, Optional[str]], None]] = None) -> BatchGenerationResult:
         """非同期インターフェース（内部では同期処理）
         
-        asyncioイベントループ内から呼び出すためのラッパー
+        asyncioイベントループ内から呼び出すためのラッパー。
+        イベントループ上でLLM呼び出しまで完結させる場合は AsyncBatchProcessor を使用する。
         """
-        loop = asyncio.get_event_loop()
-        
-        # ThreadPoolExecutorで実行
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            result = await loop.run_in_executor(
-                executor,
-                self.generate_parallel,
-                locations_with_weather,
-                llm_provider,
-                progress_callback
-            )
-        
-        return result
\ No newline at end of file
+        return await asyncio.to_thread(
+            self.generate_parallel,
+            locations_with_weather,
+            llm_provider,
+            progress_callback
+        )
@@ -36,6 +36,7 @@ class CommentGenerationState:
     target_datetime: datetime
     llm_provider: str = "openai"
     exclude_previous: bool = False
+    pre_fetched_weather: dict[str, Any] | None = None  # バッチ処理で事前取得した予報（forecast_collection, location）
 
     # ===== 中間データ =====
     location: Any | None = None  # Location オブジェクト
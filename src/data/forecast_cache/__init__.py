@@ -5,10 +5,24 @@ Forecast cache package
 """
 
 from .models import ForecastCacheEntry
-from .manager import ForecastCache, get_forecast_cache
+from .manager import ForecastCache, get_forecast_cache, shutdown_forecast_cache
+from .storage import (
+    ForecastCacheBackend,
+    CSVForecastBackend,
+    SQLiteForecastBackend,
+    create_forecast_backend
+)
+from .write_behind import ForecastWriteBehindQueue
 from .memory_cache import ForecastMemoryCache
 from .spatial_cache import SpatialForecastCache, LocationCoordinate
-from .cache_warmer import CacheWarmer, PopularLocation
+from .cache_warmer import (
+    CacheWarmer,
+    CacheWarmingScheduler,
+    PopularLocation,
+    get_cache_warmer,
+    start_cache_warming_scheduler,
+    shutdown_cache_warming_scheduler
+)
 from .utils import (
     ensure_jst,
     get_temperature_differences,
@@ -18,12 +32,22 @@ from .utils import (
 __all__ = [
     'ForecastCacheEntry',
     'ForecastCache',
+    'ForecastCacheBackend',
+    'CSVForecastBackend',
+    'SQLiteForecastBackend',
+    'create_forecast_backend',
+    'ForecastWriteBehindQueue',
     'ForecastMemoryCache',
     'SpatialForecastCache',
     'LocationCoordinate',
     'CacheWarmer',
     'PopularLocation',
+    'CacheWarmingScheduler',
+    'get_cache_warmer',
+    'start_cache_warming_scheduler',
+    'shutdown_cache_warming_scheduler',
     'get_forecast_cache',
+    'shutdown_forecast_cache',
     'ensure_jst',
     'get_temperature_differences',
     'save_forecast_to_cache'
@@ -7,12 +7,17 @@ Cache warmer for popular locations
 from __future__ import annotations
 import logging
 import asyncio
+import heapq
+import os
+import threading
+import time
 from typing import List, Dict, Any, Optional, Callable, Awaitable, TYPE_CHECKING
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from pathlib import Path
 import json
-from zoneinfo import ZoneInfo
+
+from src.data.forecast_time_index import JST, get_target_date, load_date_boundary_hour
 
 if TYPE_CHECKING:
     from src.data.weather_data import WeatherForecast
@@ -20,9 +25,6 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
-# タイムゾーン定義
-JST = ZoneInfo("Asia/Tokyo")
-
 
 @dataclass
 class PopularLocation:
@@ -32,6 +34,7 @@ class PopularLocation:
     longitude: float
     priority: int = 1  # 優先度（高いほど優先）
     access_count: int = 0  # アクセス数
+    last_accessed: float = 0.0  # 最終アクセス時刻（エポック秒、0は未アクセス）
 
 
 class CacheWarmer:
@@ -43,22 +46,28 @@ class CacheWarmer:
     def __init__(self, 
                  popular_locations_file: Optional[Path] = None,
                  max_concurrent: int = 5,
-                 warm_hours_ahead: int = 48):
+                 warm_hours_ahead: int = 48,
+                 max_locations: int = 1000):
         """初期化
         
         Args:
             popular_locations_file: 人気地点リストファイル
             max_concurrent: 最大同時実行数
             warm_hours_ahead: 何時間先までキャッシュするか
+            max_locations: アクセス統計を保持する最大地点数
         """
         self.popular_locations_file = popular_locations_file
         self.max_concurrent = max_concurrent
         self.warm_hours_ahead = warm_hours_ahead
-        self._popular_locations: List[PopularLocation] = []
+        self.max_locations = max(max_locations, 1)
+        # 地点名 → 地点情報。アクセスの記録は O(1) で行い、上位地点は取得時にヒープで選ぶ
+        self._popular_locations: Dict[str, PopularLocation] = {}
+        self._lock = threading.Lock()
         self._stats = {
             "warmed_count": 0,
             "failed_count": 0,
             "skipped_count": 0,
+            "evicted_count": 0,
             "total_time_seconds": 0.0
         }
         
@@ -78,15 +87,12 @@ class CacheWarmer:
                     latitude=loc_data["latitude"],
                     longitude=loc_data["longitude"],
                     priority=loc_data.get("priority", 1),
-                    access_count=loc_data.get("access_count", 0)
+                    access_count=loc_data.get("access_count", 0),
+                    last_accessed=loc_data.get("last_accessed", 0.0)
                 )
-                self._popular_locations.append(location)
-            
-            # 優先度とアクセス数でソート
-            self._popular_locations.sort(
-                key=lambda x: (x.priority, x.access_count), 
-                reverse=True
-            )
+                self._popular_locations[location.name] = location
+            if len(self._popular_locations) > self.max_locations:
+                self._evict_locations()
             
             logger.info(f"人気地点リストを読み込み: {len(self._popular_locations)}件")
             
@@ -99,21 +105,73 @@ class CacheWarmer:
         Args:
             location: 地点情報
         """
-        # 既存の地点かチェック
-        for idx, loc in enumerate(self._popular_locations):
-            if loc.name == location.name:
+        with self._lock:
+            existing = self._popular_locations.get(location.name)
+            if existing is not None:
                 # アクセス数を更新
-                self._popular_locations[idx].access_count += 1
+                existing.access_count += 1
                 return
+            
+            # 新規追加
+            self._popular_locations[location.name] = location
+            if len(self._popular_locations) > self.max_locations:
+                self._evict_locations()
+    
+    def record_access(self, name: str, latitude: float, longitude: float) -> None:
+        """地点へのアクセスを記録（APIからの予報取得ごとに呼び出す）
+        
+        Args:
+            name: 地点名
+            latitude: 緯度
+            longitude: 経度
+        """
+        now = time.time()
+        with self._lock:
+            location = self._popular_locations.get(name)
+            if location is None:
+                location = self._popular_locations[name] = PopularLocation(name, latitude, longitude)
+            else:
+                location.latitude, location.longitude = latitude, longitude
+            location.access_count += 1
+            location.last_accessed = now
+            if len(self._popular_locations) > self.max_locations:
+                self._evict_locations(keep=name)
+    
+    def _evict_locations(self, keep: Optional[str] = None) -> None:
+        """地点数が上限を超えた場合に、優先度・アクセス数・最終アクセス時刻の下位から削除（ロック内で呼ぶ）
         
-        # 新規追加
-        self._popular_locations.append(location)
+        削除は上限の1割ずつまとめて行い、記録ごとの全件走査を避ける。
         
-        # 再ソート
-        self._popular_locations.sort(
-            key=lambda x: (x.priority, x.access_count), 
-            reverse=True
+        Args:
+            keep: 削除しない地点名（今アクセスを記録した地点）
+        """
+        target = self.max_locations - max(self.max_locations // 10, 1)
+        candidates = [loc for loc in self._popular_locations.values() if loc.name != keep]
+        evicted = heapq.nsmallest(
+            len(self._popular_locations) - target, candidates,
+            key=lambda x: (x.priority, x.access_count, x.last_accessed)
         )
+        for location in evicted:
+            del self._popular_locations[location.name]
+        self._stats["evicted_count"] += len(evicted)
+        logger.debug(f"人気地点の統計を削除: {len(evicted)}件（残り{len(self._popular_locations)}件）")
+    
+    def top_locations(self, n: int, active_within: Optional[float] = None) -> List[PopularLocation]:
+        """優先度とアクセス数の上位n地点を取得
+        
+        Args:
+            n: 取得する地点数
+            active_within: 指定した場合、この秒数以内にアクセスされた地点のみを対象にする
+            
+        Returns:
+            上位の地点（優先度・アクセス数の降順）
+        """
+        with self._lock:
+            candidates = list(self._popular_locations.values())
+        if active_within is not None:
+            cutoff = time.time() - active_within
+            candidates = [loc for loc in candidates if loc.last_accessed >= cutoff]
+        return heapq.nlargest(n, candidates, key=lambda x: (x.priority, x.access_count))
     
     def save_popular_locations(self) -> None:
         """人気地点リストを保存"""
@@ -129,9 +187,10 @@ class CacheWarmer:
                         "latitude": loc.latitude,
                         "longitude": loc.longitude,
                         "priority": loc.priority,
-                        "access_count": loc.access_count
+                        "access_count": loc.access_count,
+                        "last_accessed": loc.last_accessed
                     }
-                    for loc in self._popular_locations
+                    for loc in self.top_locations(len(self._popular_locations))
                 ]
             }
             
@@ -169,7 +228,7 @@ class CacheWarmer:
         semaphore = asyncio.Semaphore(self.max_concurrent)
         
         # 上位の人気地点のみ処理
-        top_locations = self._popular_locations[:20]  # 上位20地点
+        top_locations = self.top_locations(20)  # 上位20地点
         
         for location in top_locations:
             # 位置座標を登録
@@ -258,6 +317,301 @@ class CacheWarmer:
                     "access_count": loc.access_count,
                     "priority": loc.priority
                 }
-                for loc in self._popular_locations[:10]
+                for loc in self.top_locations(10)
             ]
-        }
\ No newline at end of file
+        }
+
+class CacheWarmingScheduler:
+    """キャッシュ事前温めのスケジューラー
+    
+    アクセスの多い上位地点の翌日予報を、メッシュキャッシュのTTLが切れる少し前と
+    日付境界時刻（既定6:00）の少し前に取得し直す。APIサーバーのイベントループ上の
+    タスクとして動作し、同時に更新する地点数はセマフォで制限する。
+    """
+    
+    def __init__(self,
+                 warmer: CacheWarmer,
+                 refresh: Callable[[PopularLocation], Awaitable[Any]],
+                 interval_seconds: float,
+                 lead_seconds: float = 120,
+                 date_boundary_hour: int = 6,
+                 top_n: int = 20,
+                 max_concurrent: int = 5,
+                 active_hours: Optional[float] = 24):
+        """初期化
+        
+        Args:
+            warmer: アクセス統計を持つキャッシュウォーマー
+            refresh: 地点の予報を取得し直してキャッシュを更新するコルーチン関数
+            interval_seconds: 定期更新の間隔（秒、通常はキャッシュTTLから lead_seconds を引いた値）
+            lead_seconds: 日付境界時刻の何秒前に更新するか
+            date_boundary_hour: 日付境界時刻（JST）
+            top_n: 温める地点数
+            max_concurrent: 同時に更新する地点数
+            active_hours: この時間内にアクセスがあった地点のみ温める（Noneの場合は制限なし）
+        """
+        self.warmer = warmer
+        self.refresh = refresh
+        self.interval_seconds = max(float(interval_seconds), 1.0)
+        self.lead_seconds = lead_seconds
+        self.date_boundary_hour = date_boundary_hour
+        self.top_n = top_n
+        self.max_concurrent = max(max_concurrent, 1)
+        self.active_hours = active_hours
+        self.last_run: float = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "runs": 0,
+            "refreshed_count": 0,
+            "failed_count": 0,
+            "last_duration_seconds": 0.0
+        }
+    
+    def next_run_at(self, now: float) -> float:
+        """次回の実行時刻（エポック秒）を計算
+        
+        Args:
+            now: 現在時刻（エポック秒）
+            
+        Returns:
+            定期更新の時刻と、直近の日付境界時刻の lead_seconds 前のうち早い方
+        """
+        periodic = self.last_run + self.interval_seconds
+        
+        current = datetime.fromtimestamp(now, JST)
+        boundary = current.replace(hour=self.date_boundary_hour, minute=0, second=0, microsecond=0)
+        if boundary.timestamp() <= now:
+            boundary += timedelta(days=1)
+        before_boundary = boundary.timestamp() - self.lead_seconds
+        if before_boundary <= self.last_run:
+            # この境界に向けた更新は実行済み
+            before_boundary += timedelta(days=1).total_seconds()
+        
+        return min(periodic, before_boundary)
+    
+    async def warm_once(self) -> Dict[str, Any]:
+        """上位地点の予報を一度だけ取得し直す
+        
+        Returns:
+            実行結果の統計情報
+        """
+        active_within = self.active_hours * 3600 if self.active_hours is not None else None
+        locations = self.warmer.top_locations(self.top_n, active_within=active_within)
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        
+        async def refresh_location(location: PopularLocation) -> None:
+            async with semaphore:
+                await self.refresh(location)
+        
+        start_time = time.monotonic()
+        results = await asyncio.gather(
+            *(refresh_location(location) for location in locations),
+            return_exceptions=True
+        )
+        duration = time.monotonic() - start_time
+        self.last_run = time.time()
+        
+        failed = 0
+        for location, result in zip(locations, results, strict=True):
+            if isinstance(result, Exception):
+                failed += 1
+                logger.warning(f"キャッシュ温めエラー {location.name}: {result}")
+        
+        self._stats["runs"] += 1
+        self._stats["refreshed_count"] += len(locations) - failed
+        self._stats["failed_count"] += failed
+        self._stats["last_duration_seconds"] = duration
+        
+        logger.info(
+            f"キャッシュ温め完了: {len(locations) - failed}/{len(locations)}地点, {duration:.2f}秒"
+        )
+        return {
+            "locations": len(locations),
+            "refreshed": len(locations) - failed,
+            "failed": failed,
+            "duration_seconds": duration
+        }
+    
+    async def _run(self) -> None:
+        """スケジューラーのメインループ"""
+        while True:
+            delay = self.next_run_at(time.time()) - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                await self.warm_once()
+            except Exception as e:
+                # 次回の予定を進めて失敗が続いてもループし続けないようにする
+                self.last_run = time.time()
+                logger.error(f"キャッシュ温めの実行エラー: {e}")
+    
+    async def start(self) -> None:
+        """実行中のイベントループでスケジューラーを開始
+        
+        起動直後はリクエストで予報が取得されるため、最初の定期更新は1間隔後に行う。
+        """
+        if self._task is not None and not self._task.done():
+            return
+        self.last_run = time.time()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(
+            f"キャッシュ温めスケジューラーを開始: 上位{self.top_n}地点, 間隔{self.interval_seconds:.0f}秒, "
+            f"同時実行数{self.max_concurrent}"
+        )
+    
+    async def stop(self) -> None:
+        """スケジューラーを停止"""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    
+    @property
+    def running(self) -> bool:
+        """スケジューラーが動作中かどうか"""
+        return self._task is not None and not self._task.done()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        return {
+            **self._stats,
+            "running": self.running,
+            "last_run": self.last_run,
+            "next_run_at": self.next_run_at(time.time()) if self.running else None
+        }
+
+
+def wxtech_refresher(api_key: str, lead_seconds: float = 0) -> Callable[[PopularLocation], Awaitable[Any]]:
+    """WxTechの翌日予報を取得し直してメッシュキャッシュを更新するリフレッシャーを作成
+    
+    対象日は天気予報ノードと同じ日付境界時刻で決める。日付境界時刻の直前の更新では
+    境界時刻以降のリクエストが使うキャッシュを温めるため、lead_seconds 後の時刻で計算する。
+    
+    Args:
+        api_key: WxTech API キー
+        lead_seconds: 日付境界時刻の何秒前に更新するか
+        
+    Returns:
+        CacheWarmingScheduler に渡すコルーチン関数
+    """
+    from src.apis.wxtech.cached_client import CachedWxTechAPIClient
+    client = CachedWxTechAPIClient(api_key)
+    
+    async def refresh(location: PopularLocation) -> None:
+        target_date = get_target_date(
+            datetime.now(JST) + timedelta(seconds=lead_seconds), load_date_boundary_hour()
+        )
+        await asyncio.to_thread(
+            client.refresh_next_day_forecast, location.latitude, location.longitude, target_date
+        )
+    
+    return refresh
+
+
+_cache_warmer_instance: Optional[CacheWarmer] = None
+_cache_warmer_lock = threading.Lock()
+_scheduler_instance: Optional[CacheWarmingScheduler] = None
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """アクセス統計を記録するCacheWarmerのシングルトンインスタンスを取得
+    
+    Returns:
+        CacheWarmerインスタンス（人気地点リストは WEATHER_CACHE_DIR に保存）
+    """
+    global _cache_warmer_instance
+    if _cache_warmer_instance is None:
+        with _cache_warmer_lock:
+            if _cache_warmer_instance is None:
+                from src.config.weather_config import get_config
+                weather_config = get_config().weather
+                _cache_warmer_instance = CacheWarmer(
+                    popular_locations_file=Path(weather_config.cache_dir) / "popular_locations.json",
+                    max_concurrent=weather_config.cache_warming_max_concurrent,
+                    max_locations=weather_config.cache_warming_max_locations
+                )
+    return _cache_warmer_instance
+
+
+def reset_cache_warmer() -> None:
+    """CacheWarmerのシングルトンを破棄（主にテスト用）"""
+    global _cache_warmer_instance
+    with _cache_warmer_lock:
+        _cache_warmer_instance = None
+
+
+async def start_cache_warming_scheduler(
+        refresh: Optional[Callable[[PopularLocation], Awaitable[Any]]] = None) -> Optional[CacheWarmingScheduler]:
+    """キャッシュ事前温めスケジューラーを開始（APIサーバー起動時）
+    
+    Args:
+        refresh: リフレッシャー（Noneの場合はWxTechの翌日予報を取得し直す）
+        
+    Returns:
+        開始したスケジューラー（無効化されている場合やAPIキーがない場合、
+        温めた予報を保持するメッシュキャッシュが無効な場合はNone）
+    """
+    global _scheduler_instance
+    from src.apis.wxtech.grid import get_grid_forecast_cache, is_grid_sharing_enabled
+    from src.config.weather_config import get_config
+    weather_config = get_config().weather
+    if not weather_config.cache_warming_enabled:
+        logger.info("キャッシュ温めは無効化されています")
+        return None
+    if not is_grid_sharing_enabled():
+        # 温めた予報はメッシュキャッシュに保存されるため、メッシュ共有が無効な場合は効果がない
+        logger.info("WXTECH_GRID_SNAP=false のためキャッシュ温めを開始しません")
+        return None
+    
+    lead_seconds = weather_config.cache_warming_lead_seconds
+    if refresh is None:
+        api_key = os.getenv("WXTECH_API_KEY")
+        if not api_key:
+            logger.info("WXTECH_API_KEY が未設定のためキャッシュ温めを開始しません")
+            return None
+        refresh = wxtech_refresher(api_key, lead_seconds)
+    
+    scheduler = CacheWarmingScheduler(
+        warmer=get_cache_warmer(),
+        refresh=refresh,
+        interval_seconds=get_grid_forecast_cache().ttl - lead_seconds,
+        lead_seconds=lead_seconds,
+        date_boundary_hour=load_date_boundary_hour(),
+        top_n=weather_config.cache_warming_top_n,
+        max_concurrent=weather_config.cache_warming_max_concurrent,
+        active_hours=weather_config.cache_warming_active_hours
+    )
+    
+    with _cache_warmer_lock:
+        previous, _scheduler_instance = _scheduler_instance, scheduler
+    if previous is not None:
+        await previous.stop()
+    await scheduler.start()
+    return scheduler
+
+
+async def shutdown_cache_warming_scheduler() -> None:
+    """スケジューラーを停止し、人気地点リストを保存（APIサーバー終了時）"""
+    global _scheduler_instance
+    with _cache_warmer_lock:
+        scheduler, _scheduler_instance = _scheduler_instance, None
+    if scheduler is not None:
+        await scheduler.stop()
+    if _cache_warmer_instance is not None:
+        _cache_warmer_instance.save_popular_locations()
+
+
+__all__ = [
+    "PopularLocation",
+    "CacheWarmer",
+    "CacheWarmingScheduler",
+    "wxtech_refresher",
+    "get_cache_warmer",
+    "reset_cache_warmer",
+    "start_cache_warming_scheduler",
+    "shutdown_cache_warming_scheduler",
+]
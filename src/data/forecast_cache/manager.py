@@ -5,14 +5,17 @@ Forecast cache manager
 """
 
 from __future__ import annotations
-import csv
-import re
 import logging
+import threading
+import time
+from collections.abc import Iterable
 from datetime import datetime, timedelta, date
+from operator import attrgetter
 from pathlib import Path
 from typing import Optional, Any
 from zoneinfo import ZoneInfo
 
+from src.data.forecast_time_index import ForecastTimeIndex, to_timestamp
 from src.data.weather_data import WeatherForecast
 from src.config.weather_config import get_config
 from src.utils.memory_monitor import MemoryMonitor
@@ -20,24 +23,31 @@ from .models import ForecastCacheEntry
 from .utils import ensure_jst
 from .memory_cache import ForecastMemoryCache
 from .spatial_cache import SpatialForecastCache
+from .storage import CSV_HEADERS, ForecastCacheBackend, create_forecast_backend, csv_file_path
+from .write_behind import ForecastWriteBehindQueue
 
 logger = logging.getLogger(__name__)
 
 # タイムゾーン定義
 JST = ZoneInfo("Asia/Tokyo")
 
+# 保持期間切れデータの削除を行う最短間隔（秒）
+RETENTION_CLEANUP_INTERVAL_SECONDS = 3600
+
 
 class ForecastCache:
     """天気予報キャッシュの管理クラス
     
-    地点ごとにCSVファイルで予報データを保存し、
+    予報データを永続化バックエンド（SQLiteまたは地点ごとのCSV）に保存し、
     前日や前回の予報との比較を可能にする
     """
     
     def __init__(self, cache_dir: Path | None = None, 
                  memory_cache_size: int = 500,
                  memory_cache_ttl: int = 300,
-                 enable_spatial_cache: bool = True):
+                 enable_spatial_cache: bool = True,
+                 backend: ForecastCacheBackend | str | None = None,
+                 write_behind: bool | None = None):
         """初期化
         
         Args:
@@ -45,6 +55,10 @@ class ForecastCache:
             memory_cache_size: インメモリキャッシュの最大サイズ
             memory_cache_ttl: インメモリキャッシュのTTL（秒）
             enable_spatial_cache: 空間キャッシュを有効にするか
+            backend: 永続化バックエンドまたはその種類（"sqlite" / "csv"）。
+                Noneの場合は設定（FORECAST_CACHE_BACKEND）に従う
+            write_behind: バックグラウンドスレッドでまとめて書き込むか。
+                Noneの場合は設定（FORECAST_CACHE_WRITE_BEHIND）に従う
         """
         if cache_dir is None:
             # デフォルトはプロジェクトルートの.cacheディレクトリ
@@ -53,10 +67,34 @@ class ForecastCache:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # 永続化バックエンドの初期化
+        weather_config = get_config().weather
+        if backend is None:
+            backend = weather_config.forecast_cache_backend
+        if isinstance(backend, str):
+            backend = create_forecast_backend(backend, self.cache_dir)
+        self._backend = backend
+        
+        # 保持期間切れデータの削除は保存のたびではなく一定間隔で行う
+        self._last_retention_cleanup = 0.0
+        self._retention_lock = threading.Lock()
+        
+        # 書き込みキューの初期化（保持期間の削除もライタースレッドで行う）
+        if write_behind is None:
+            write_behind = weather_config.forecast_cache_write_behind
+        self._writer: ForecastWriteBehindQueue | None = None
+        if write_behind:
+            self._writer = ForecastWriteBehindQueue(
+                self._backend,
+                max_queue_size=weather_config.forecast_cache_write_queue_size,
+                after_write=self._maybe_cleanup_old_data
+            )
+        
         # インメモリキャッシュの初期化
         self._memory_cache = ForecastMemoryCache(
             max_size=memory_cache_size,
-            ttl_seconds=memory_cache_ttl
+            ttl_seconds=memory_cache_ttl,
+            stale_seconds=weather_config.forecast_cache_stale_seconds
         )
         
         # 空間キャッシュの初期化
@@ -73,28 +111,17 @@ class ForecastCache:
             critical_threshold_percent=90.0
         )
         
-        # CSVのヘッダー定義
-        self.csv_headers = [
-            "location_name",
-            "forecast_datetime",
-            "cached_at",
-            "temperature",
-            "max_temperature",
-            "min_temperature",
-            "weather_condition",
-            "weather_description",
-            "precipitation",
-            "humidity", 
-            "wind_speed",
-            "metadata"
-        ]
+        # CSVのヘッダー定義（CSVエクスポート形式）
+        self.csv_headers = list(CSV_HEADERS)
+    
+    @property
+    def backend(self) -> ForecastCacheBackend:
+        """永続化バックエンド"""
+        return self._backend
     
     def get_cache_file_path(self, location_name: str) -> Path:
-        """地点名からキャッシュファイルのパスを取得"""
-        # ファイルシステムで安全な文字のみを使用
-        safe_name = re.sub(r'[^\w\s-]', '', location_name)
-        safe_name = re.sub(r'[-\s]+', '-', safe_name)
-        return self.cache_dir / f"forecast_cache_{safe_name}.csv"
+        """地点名からCSVキャッシュファイルのパスを取得"""
+        return csv_file_path(self.cache_dir, location_name)
     
     def save_forecast(self, weather_forecast: WeatherForecast, location_name: str) -> None:
         """予報データをキャッシュに保存
@@ -103,38 +130,58 @@ class ForecastCache:
             weather_forecast: 天気予報データ
             location_name: 地点名
         """
+        self.save_forecasts([weather_forecast], location_name)
+    
+    def save_forecasts(self, weather_forecasts: Iterable[WeatherForecast], location_name: str,
+                       block: bool = True) -> None:
+        """地点の複数時刻の予報データをまとめてキャッシュに保存
+        
+        書き込みキューが有効な場合、永続化はライタースレッドで行われ、
+        この呼び出しはキューが満杯でない限りディスクI/Oを待たない。
+        
+        Args:
+            weather_forecasts: 天気予報データ（WeatherForecastCollectionも可）
+            location_name: 地点名
+            block: 書き込みキューが満杯の場合に空きを待つか。Falseの場合は永続化を諦めて
+                メモリキャッシュだけを更新する（件数は書き込みキューの統計の rejected に計上）
+        """
         try:
-            cache_entry = ForecastCacheEntry.from_weather_forecast(weather_forecast, location_name)
-            cache_file = self.get_cache_file_path(location_name)
-            
-            # ファイルが存在しない場合はヘッダーを書き込み
-            write_header = not cache_file.exists()
+            weather_forecasts = list(weather_forecasts)
+            cache_entries = [
+                ForecastCacheEntry.from_weather_forecast(weather_forecast, location_name)
+                for weather_forecast in weather_forecasts
+            ]
+            if not cache_entries:
+                return
             
-            with open(cache_file, "a", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                
-                if write_header:
-                    writer.writerow(self.csv_headers)
-                
-                writer.writerow(cache_entry.to_csv_row())
+            if self._writer is not None:
+                if not self._writer.put(cache_entries, block=block):
+                    logger.warning(
+                        f"書き込みキューが満杯のため予報データを永続化しません: {location_name} ({len(cache_entries)}件)"
+                    )
+            else:
+                self._backend.save_entries(cache_entries)
             
-            logger.info(f"予報データをキャッシュに保存: {location_name} at {weather_forecast.datetime}")
+            logger.info(
+                f"予報データをキャッシュに保存: {location_name} "
+                f"({len(cache_entries)}件, {cache_entries[0].forecast_datetime}〜{cache_entries[-1].forecast_datetime})"
+            )
             
             # 複数のキャッシュへの書き込みをトランザクション的に実行
             try:
-                # メモリキャッシュにも追加
-                self._memory_cache.put(location_name, weather_forecast.datetime, cache_entry)
-                
-                # 空間キャッシュにも追加
-                if self._spatial_cache:
-                    self._spatial_cache.put(location_name, weather_forecast.datetime, cache_entry)
+                for weather_forecast, cache_entry in zip(weather_forecasts, cache_entries, strict=True):
+                    # メモリキャッシュにも追加
+                    self._memory_cache.put(location_name, weather_forecast.datetime, cache_entry)
+                    
+                    # 空間キャッシュにも追加
+                    if self._spatial_cache:
+                        self._spatial_cache.put(location_name, weather_forecast.datetime, cache_entry)
             except Exception as e:
                 logger.warning(f"キャッシュ更新エラー（データは保存済み）: {e}")
             
-            # 古いデータのクリーンアップ（設定から保持日数を取得）
-            config = get_config()
-            retention_days = config.weather.forecast_cache_retention_days
-            self._cleanup_old_data(location_name, days=retention_days)
+            # 古いデータのクリーンアップ（一定間隔で全地点分をまとめて実行）
+            if self._writer is None:
+                self._maybe_cleanup_old_data()
             
         except Exception as e:
             logger.error(f"予報データの保存に失敗: {e}")
@@ -163,35 +210,25 @@ class ForecastCache:
                 return spatial_entry
             
         try:
-            cache_file = self.get_cache_file_path(location_name)
-            
-            if not cache_file.exists():
-                return None
-            
             # パフォーマンス最適化: 対象日時の前後数日分のみ読み込み
             entries = self._load_cache_entries(location_name, date_filter=target_datetime, days_range=7)
+            if not entries:
+                return None
             
-            # 指定時刻に最も近いエントリを検索
-            # 同じ時刻の複数エントリがある場合は最新のキャッシュを優先
-            best_entry = None
-            min_time_diff = timedelta(hours=tolerance_hours + 1)  # 許容範囲外の初期値
-            latest_cached_at = None
-            
-            for entry in entries:
-                time_diff = abs(entry.forecast_datetime - target_datetime)
-                if time_diff < min_time_diff:
-                    min_time_diff = time_diff
-                    best_entry = entry
-                    latest_cached_at = entry.cached_at
-                elif time_diff == min_time_diff and latest_cached_at and entry.cached_at > latest_cached_at:
-                    # 同じ時刻の場合は、より新しいキャッシュを優先
-                    best_entry = entry
-                    latest_cached_at = entry.cached_at
+            # 指定時刻に最も近いエントリを時刻インデックスで検索
+            # 同じ時間差のエントリが複数ある場合は最新のキャッシュを優先
+            nearest_entries = ForecastTimeIndex(entries, key=attrgetter("forecast_datetime")).nearest_group(
+                target_datetime, max_distance=timedelta(hours=tolerance_hours)
+            )
             
             # 許容範囲内かチェック
-            if best_entry and min_time_diff <= timedelta(hours=tolerance_hours):
+            if nearest_entries:
+                best_entry = max(nearest_entries, key=attrgetter("cached_at"))
+                min_time_diff = timedelta(seconds=abs(
+                    to_timestamp(best_entry.forecast_datetime) - to_timestamp(target_datetime)
+                ))
                 # 同じ時刻のエントリ数をカウント
-                same_time_entries = [e for e in entries if e.forecast_datetime == best_entry.forecast_datetime]
+                same_time_entries = [e for e in nearest_entries if e.forecast_datetime == best_entry.forecast_datetime]
                 logger.info(
                     f"キャッシュから予報データを取得: {location_name} - "
                     f"要求時刻: {target_datetime.strftime('%Y-%m-%d %H:%M')}, "
@@ -217,6 +254,10 @@ class ForecastCache:
             
         except Exception as e:
             logger.error(f"予報データの取得に失敗: {e}")
+            # 読み込みに失敗した場合は有効期限切れのメモリキャッシュを返す（stale-if-error）
+            if stale_entry := self._memory_cache.get(location_name, target_datetime, allow_stale=True):
+                logger.warning(f"期限切れのメモリキャッシュから予報データを返します: {location_name} at {target_datetime}")
+                return stale_entry
             return None
     
     def get_daily_min_max(self, location_name: str, target_date: date) -> dict[str, Optional[float]]:
@@ -256,7 +297,7 @@ class ForecastCache:
     
     def _load_cache_entries(self, location_name: str, date_filter: Optional[datetime] = None, 
                           days_range: int = 30) -> list[ForecastCacheEntry]:
-        """キャッシュファイルからエントリを読み込み
+        """バックエンドからエントリを読み込み
         
         Args:
             location_name: 地点名
@@ -266,84 +307,83 @@ class ForecastCache:
         Returns:
             ForecastCacheEntryのリスト
         """
-        cache_file = self.get_cache_file_path(location_name)
-        
-        if not cache_file.exists():
-            return []
-        
-        entries = []
-        
-        # フィルタ範囲の計算
-        if date_filter:
+        start = end = None
+        if date_filter is not None:
+            # フィルタ範囲の計算
             date_filter_jst = ensure_jst(date_filter)
-            start_date = date_filter_jst - timedelta(days=days_range)
-            end_date = date_filter_jst + timedelta(days=days_range)
-        
-        with open(cache_file, "r", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            
-            # ヘッダーをスキップ
-            next(reader, None)
-            
-            for row in reader:
-                if len(row) < 6:  # 最低限必要な列数
-                    continue
-                
-                try:
-                    entry = ForecastCacheEntry.from_csv_row(row)
-                    
-                    # 日付フィルタリング
-                    if date_filter:
-                        entry_dt_jst = ensure_jst(entry.forecast_datetime)
-                        if not (start_date <= entry_dt_jst <= end_date):
-                            continue
-                    
-                    entries.append(entry)
-                    
-                except Exception as e:
-                    logger.warning(f"キャッシュエントリの読み込みエラー: {e}")
-                    continue
+            start = date_filter_jst - timedelta(days=days_range)
+            end = date_filter_jst + timedelta(days=days_range)
         
+        entries = self._backend.load_entries(location_name, start=start, end=end)
+        if self._writer is not None:
+            # まだ書き込まれていないエントリも結果に含める
+            entries.extend(self._writer.pending_entries(location_name, start=start, end=end))
         return entries
     
-    def _cleanup_old_data(self, location_name: str, days: int = 30) -> None:
+    def _maybe_cleanup_old_data(self) -> None:
+        """前回のクリーンアップから一定時間が経過していれば古いデータを削除"""
+        now = time.monotonic()
+        with self._retention_lock:
+            if self._last_retention_cleanup and now - self._last_retention_cleanup < RETENTION_CLEANUP_INTERVAL_SECONDS:
+                return
+            self._last_retention_cleanup = now
+        
+        # 設定から保持日数を取得
+        retention_days = get_config().weather.forecast_cache_retention_days
+        self._cleanup_old_data(days=retention_days)
+    
+    def _cleanup_old_data(self, location_name: str | None = None, days: int = 30) -> None:
         """古いキャッシュデータを削除
         
         Args:
-            location_name: 地点名
+            location_name: 地点名（Noneの場合は全地点）
             days: 保持日数
         """
         try:
-            cache_file = self.get_cache_file_path(location_name)
-            
-            if not cache_file.exists():
-                return
-            
             cutoff_date = datetime.now(JST) - timedelta(days=days)
-            
-            # 新しいデータのみを保持
-            entries = self._load_cache_entries(location_name)
-            recent_entries = [
-                e for e in entries 
-                if ensure_jst(e.cached_at) > cutoff_date
-            ]
+            deleted_count = self._backend.delete_older_than(cutoff_date, location_name)
             
             # 削除されるエントリ数をログ
-            deleted_count = len(entries) - len(recent_entries)
             if deleted_count > 0:
-                logger.info(f"{location_name}の古いキャッシュデータを{deleted_count}件削除")
-            
-            # ファイルを書き直し
-            with open(cache_file, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(self.csv_headers)
-                
-                for entry in recent_entries:
-                    writer.writerow(entry.to_csv_row())
+                logger.info(f"{location_name or '全地点'}の古いキャッシュデータを{deleted_count}件削除")
                     
         except Exception as e:
             logger.error(f"キャッシュクリーンアップ中にエラー: {e}")
     
+    def export_csv(self, location_name: str, path: Path | None = None) -> Path:
+        """地点の予報キャッシュを従来形式のCSVに書き出す
+        
+        Args:
+            location_name: 地点名
+            path: 出力先（Noneの場合はキャッシュディレクトリの従来のファイル名）
+            
+        Returns:
+            出力したファイルのパス
+        """
+        path = Path(path) if path is not None else self.get_cache_file_path(location_name)
+        count = self._backend.export_csv(location_name, path)
+        logger.info(f"予報キャッシュをCSVに出力: {location_name} ({count}件) -> {path}")
+        return path
+    
+    def flush(self, timeout: float | None = None) -> bool:
+        """書き込みキューの内容が全て永続化されるまで待つ
+        
+        Args:
+            timeout: 最大待ち時間（秒、Noneの場合は無制限）
+            
+        Returns:
+            全て書き込まれた場合True
+        """
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+    
+    def close(self) -> None:
+        """書き込みキューを書き出してからバックエンドを閉じる"""
+        if self._writer is not None:
+            self._writer.close()
+        self._backend.close()
+    
     def register_location_coordinate(self, name: str, latitude: float, longitude: float) -> None:
         """位置座標を登録（空間キャッシュ用）
         
@@ -363,9 +403,13 @@ class ForecastCache:
             統計情報の辞書
         """
         stats = {
+            "backend": self._backend.name,
             "memory_cache": self._memory_cache.get_stats()
         }
         
+        if self._writer is not None:
+            stats["write_queue"] = self._writer.get_stats()
+        
         if self._spatial_cache:
             stats["spatial_cache"] = self._spatial_cache.get_stats()
         
@@ -390,6 +434,7 @@ class ForecastCache:
 
 # シングルトンインスタンス
 _forecast_cache_instance = None
+_forecast_cache_lock = threading.Lock()
 
 
 def get_forecast_cache() -> ForecastCache:
@@ -400,5 +445,16 @@ def get_forecast_cache() -> ForecastCache:
     """
     global _forecast_cache_instance
     if _forecast_cache_instance is None:
-        _forecast_cache_instance = ForecastCache()
-    return _forecast_cache_instance
\ No newline at end of file
+        with _forecast_cache_lock:
+            if _forecast_cache_instance is None:
+                _forecast_cache_instance = ForecastCache()
+    return _forecast_cache_instance
+
+
+def shutdown_forecast_cache() -> None:
+    """シングルトンの書き込みキューを書き出して閉じる（サーバー終了時など）"""
+    global _forecast_cache_instance
+    with _forecast_cache_lock:
+        cache, _forecast_cache_instance = _forecast_cache_instance, None
+    if cache is not None:
+        cache.close()
\ No newline at end of file
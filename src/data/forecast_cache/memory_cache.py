@@ -21,22 +21,26 @@ class ForecastMemoryCache:
     """予報データのインメモリキャッシュ
     
     LRU方式でメモリ上にキャッシュを保持し、
-    CSVアクセスの前に高速な検索を提供
+    CSVアクセスの前に高速な検索を提供。有効期限切れのエントリも ``stale_seconds`` の間は
+    保持し、永続化バックエンドの読み込みに失敗した場合に返せるようにする（stale-if-error）
     """
     
-    def __init__(self, max_size: int = 500, ttl_seconds: int = 300):
+    def __init__(self, max_size: int = 500, ttl_seconds: int = 300, stale_seconds: int = 0):
         """初期化
         
         Args:
             max_size: 最大キャッシュエントリ数
             ttl_seconds: キャッシュの有効期限（秒）
+            stale_seconds: 有効期限切れ後も古いエントリとして保持する期間（秒）
         """
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
         self._cache: OrderedDict[str, Tuple[ForecastCacheEntry, float]] = OrderedDict()
         self._lock = RLock()
         self._hits = 0
         self._misses = 0
+        self._stale_hits = 0
         
     def _make_key(self, location_name: str, target_datetime: datetime) -> str:
         """キャッシュキーを生成
@@ -52,12 +56,14 @@ class ForecastMemoryCache:
         dt_str = target_datetime.strftime("%Y%m%d%H%M")
         return f"{location_name}:{dt_str}"
     
-    def get(self, location_name: str, target_datetime: datetime) -> Optional[ForecastCacheEntry]:
+    def get(self, location_name: str, target_datetime: datetime,
+            allow_stale: bool = False) -> Optional[ForecastCacheEntry]:
         """キャッシュからエントリを取得
         
         Args:
             location_name: 地点名
             target_datetime: 対象日時
+            allow_stale: Trueの場合は有効期限切れでも保持期間内のエントリを返す
             
         Returns:
             キャッシュエントリ（見つからない場合はNone）
@@ -67,18 +73,23 @@ class ForecastMemoryCache:
         with self._lock:
             if key in self._cache:
                 entry, timestamp = self._cache[key]
+                age = time.time() - timestamp
                 
                 # TTLチェック
-                if time.time() - timestamp <= self.ttl_seconds:
+                if age <= self.ttl_seconds:
                     # LRU: 最後に移動
                     self._cache.move_to_end(key)
                     self._hits += 1
                     logger.debug(f"Memory cache hit for {key}")
                     return entry
-                else:
+                elif age > self.ttl_seconds + self.stale_seconds:
                     # 期限切れ
                     del self._cache[key]
                     logger.debug(f"Memory cache expired for {key}")
+                elif allow_stale:
+                    self._stale_hits += 1
+                    logger.debug(f"Memory cache stale hit for {key} (age: {age:.0f}s)")
+                    return entry
             
             self._misses += 1
             return None
@@ -115,6 +126,7 @@ class ForecastMemoryCache:
             self._cache.clear()
             self._hits = 0
             self._misses = 0
+            self._stale_hits = 0
             logger.info("Memory cache cleared")
     
     def get_stats(self) -> Dict[str, Any]:
@@ -132,8 +144,10 @@ class ForecastMemoryCache:
                 "max_size": self.max_size,
                 "hits": self._hits,
                 "misses": self._misses,
+                "stale_hits": self._stale_hits,
                 "hit_rate": hit_rate,
-                "ttl_seconds": self.ttl_seconds
+                "ttl_seconds": self.ttl_seconds,
+                "stale_seconds": self.stale_seconds
             }
     
     def cleanup_expired(self) -> int:
@@ -147,7 +161,7 @@ class ForecastMemoryCache:
         
         with self._lock:
             for key, (entry, timestamp) in self._cache.items():
-                if current_time - timestamp > self.ttl_seconds:
+                if current_time - timestamp > self.ttl_seconds + self.stale_seconds:
                     expired_keys.append(key)
             
             for key in expired_keys:
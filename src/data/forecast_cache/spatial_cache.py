@@ -12,6 +12,7 @@ from datetime import datetime
 from dataclasses import dataclass
 from threading import RLock
 
+from src.utils.spatial_index import GeoGridIndex
 from .models import ForecastCacheEntry
 
 logger = logging.getLogger(__name__)
@@ -61,6 +62,8 @@ class SpatialForecastCache:
         self.max_distance_km = max_distance_km
         self.max_neighbors = max_neighbors
         self._location_coords: Dict[str, LocationCoordinate] = {}
+        # 近隣検索用の空間インデックス（セルの大きさは検索半径程度にする）
+        self._spatial_index = GeoGridIndex(cell_size_deg=max(0.05, max_distance_km / 111.0))
         self._cache: Dict[str, List[Tuple[datetime, ForecastCacheEntry]]] = {}
         self._lock = RLock()
         
@@ -82,6 +85,7 @@ class SpatialForecastCache:
         """
         with self._lock:
             self._location_coords[name] = LocationCoordinate(name, latitude, longitude)
+            self._spatial_index.insert(name, latitude, longitude)
             logger.debug(f"Registered location: {name} ({latitude}, {longitude})")
     
     def put(self, location_name: str, forecast_datetime: datetime, entry: ForecastCacheEntry) -> None:
@@ -191,21 +195,14 @@ class SpatialForecastCache:
     
     def _find_nearest_neighbors(self, target: LocationCoordinate) -> List[Tuple[LocationCoordinate, float]]:
         """最も近い近隣位置を検索"""
-        neighbors = []
-        
-        for name, coord in self._location_coords.items():
-            if coord.name == target.name:
-                continue
-            
-            distance = target.distance_to(coord)
-            if distance <= self.max_distance_km:
-                neighbors.append((coord, distance))
-        
-        # 距離でソート
-        neighbors.sort(key=lambda x: x[1])
-        
-        # 最大数で制限
-        return neighbors[:self.max_neighbors]
+        neighbors = self._spatial_index.query_radius(
+            target.latitude,
+            target.longitude,
+            self.max_distance_km,
+            k=self.max_neighbors,
+            exclude=target.name
+        )
+        return [(self._location_coords[name], distance) for name, distance in neighbors]
     
     def get_stats(self) -> Dict[str, Any]:
         """統計情報を取得"""
@@ -0,0 +1,392 @@
+"""
+Forecast cache storage backends
+
+予報キャッシュの永続化バックエンド
+
+- CSVForecastBackend: 地点ごとのCSVファイル（従来形式）
+- SQLiteForecastBackend: 全地点を1つのSQLite（WAL）に格納し、
+  (location_name, forecast_datetime, cached_at) のインデックスで範囲検索する
+"""
+
+from __future__ import annotations
+import csv
+import json
+import logging
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from .models import ForecastCacheEntry
+from .utils import ensure_jst
+
+logger = logging.getLogger(__name__)
+
+# タイムゾーン定義
+JST = ZoneInfo("Asia/Tokyo")
+
+CSV_HEADERS = [
+    "location_name",
+    "forecast_datetime",
+    "cached_at",
+    "temperature",
+    "max_temperature",
+    "min_temperature",
+    "weather_condition",
+    "weather_description",
+    "precipitation",
+    "humidity",
+    "wind_speed",
+    "metadata"
+]
+
+SQLITE_FILENAME = "forecast_cache.sqlite3"
+
+# 保持期間切れのデータを1回のDELETEで削除する最大行数
+RETENTION_DELETE_BATCH_SIZE = 5000
+
+
+def csv_file_path(cache_dir: Path, location_name: str) -> Path:
+    """地点名からCSVキャッシュファイルのパスを取得"""
+    # ファイルシステムで安全な文字のみを使用
+    safe_name = re.sub(r'[^\w\s-]', '', location_name)
+    safe_name = re.sub(r'[-\s]+', '-', safe_name)
+    return cache_dir / f"forecast_cache_{safe_name}.csv"
+
+
+class ForecastCacheBackend(ABC):
+    """予報キャッシュの永続化バックエンドの基底クラス"""
+
+    name: str = ""
+
+    @abstractmethod
+    def save_entries(self, entries: list[ForecastCacheEntry]) -> None:
+        """エントリを追記する"""
+
+    @abstractmethod
+    def load_entries(self, location_name: str, start: datetime | None = None,
+                     end: datetime | None = None) -> list[ForecastCacheEntry]:
+        """地点のエントリを読み込む（予報日時が start〜end の範囲のもの）"""
+
+    @abstractmethod
+    def delete_older_than(self, cutoff: datetime, location_name: str | None = None) -> int:
+        """cached_at が cutoff 以前のエントリを削除し、削除件数を返す"""
+
+    @abstractmethod
+    def location_names(self) -> list[str]:
+        """エントリを持つ地点名の一覧"""
+
+    def export_csv(self, location_name: str, path: Path) -> int:
+        """地点のエントリを従来形式のCSVに書き出し、書き出した件数を返す"""
+        entries = self.load_entries(location_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADERS)
+            for entry in entries:
+                writer.writerow(entry.to_csv_row())
+        return len(entries)
+
+    @abstractmethod
+    def close(self) -> None:
+        """リソースを解放する"""
+
+
+class CSVForecastBackend(ForecastCacheBackend):
+    """地点ごとのCSVファイルに保存するバックエンド（従来形式）"""
+
+    name = "csv"
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def file_path(self, location_name: str) -> Path:
+        return csv_file_path(self.cache_dir, location_name)
+
+    def save_entries(self, entries: list[ForecastCacheEntry]) -> None:
+        by_location: dict[str, list[ForecastCacheEntry]] = {}
+        for entry in entries:
+            by_location.setdefault(entry.location_name, []).append(entry)
+
+        with self._lock:
+            for location_name, location_entries in by_location.items():
+                cache_file = self.file_path(location_name)
+                # ファイルが存在しない場合はヘッダーを書き込み
+                write_header = not cache_file.exists()
+                with open(cache_file, "a", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    if write_header:
+                        writer.writerow(CSV_HEADERS)
+                    for entry in location_entries:
+                        writer.writerow(entry.to_csv_row())
+
+    def load_entries(self, location_name: str, start: datetime | None = None,
+                     end: datetime | None = None) -> list[ForecastCacheEntry]:
+        cache_file = self.file_path(location_name)
+        if not cache_file.exists():
+            return []
+
+        entries = []
+        with open(cache_file, "r", encoding="utf-8") as f:
+            reader = csv.reader(f)
+
+            # ヘッダーをスキップ
+            next(reader, None)
+
+            for row in reader:
+                if len(row) < 6:  # 最低限必要な列数
+                    continue
+
+                try:
+                    entry = ForecastCacheEntry.from_csv_row(row)
+
+                    # 日付フィルタリング
+                    if start is not None or end is not None:
+                        entry_dt_jst = ensure_jst(entry.forecast_datetime)
+                        if start is not None and entry_dt_jst < start:
+                            continue
+                        if end is not None and entry_dt_jst > end:
+                            continue
+
+                    entries.append(entry)
+
+                except Exception as e:
+                    logger.warning(f"キャッシュエントリの読み込みエラー: {e}")
+                    continue
+
+        return entries
+
+    def delete_older_than(self, cutoff: datetime, location_name: str | None = None) -> int:
+        locations = [location_name] if location_name else self.location_names()
+        deleted = 0
+        with self._lock:
+            for name in locations:
+                cache_file = self.file_path(name)
+                if not cache_file.exists():
+                    continue
+
+                entries = self.load_entries(name)
+                recent_entries = [e for e in entries if ensure_jst(e.cached_at) > cutoff]
+                if len(recent_entries) == len(entries):
+                    continue
+
+                # ファイルを書き直し
+                with open(cache_file, "w", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(CSV_HEADERS)
+                    for entry in recent_entries:
+                        writer.writerow(entry.to_csv_row())
+                deleted += len(entries) - len(recent_entries)
+        return deleted
+
+    def location_names(self) -> list[str]:
+        names = []
+        for cache_file in sorted(self.cache_dir.glob("forecast_cache_*.csv")):
+            with open(cache_file, "r", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                first_row = next(reader, None)
+            if first_row:
+                names.append(first_row[0])
+        return names
+
+    def close(self) -> None:
+        """ファイルは操作ごとに開いて閉じるため、解放するリソースはない"""
+
+
+class SQLiteForecastBackend(ForecastCacheBackend):
+    """全地点を1つのSQLiteデータベース（WALモード）に保存するバックエンド
+
+    日時はJSTのUNIX時刻として保存し、(location_name, forecast_ts, cached_ts) の
+    インデックスで地点・期間の範囲検索を行う。メタデータはJSONで保存する。
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS forecasts ("
+            " location_name TEXT NOT NULL,"
+            " forecast_ts REAL NOT NULL,"
+            " cached_ts REAL NOT NULL,"
+            " temperature REAL NOT NULL,"
+            " max_temperature REAL,"
+            " min_temperature REAL,"
+            " weather_condition TEXT NOT NULL DEFAULT '',"
+            " weather_description TEXT NOT NULL DEFAULT '',"
+            " precipitation REAL NOT NULL DEFAULT 0,"
+            " humidity REAL NOT NULL DEFAULT 0,"
+            " wind_speed REAL NOT NULL DEFAULT 0,"
+            " metadata TEXT)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_forecasts_location_time"
+            " ON forecasts (location_name, forecast_ts, cached_ts)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_forecasts_cached ON forecasts (cached_ts)")
+
+    @staticmethod
+    def _to_row(entry: ForecastCacheEntry) -> tuple:
+        return (
+            entry.location_name,
+            ensure_jst(entry.forecast_datetime).timestamp(),
+            ensure_jst(entry.cached_at).timestamp(),
+            entry.temperature,
+            entry.max_temperature,
+            entry.min_temperature,
+            entry.weather_condition,
+            entry.weather_description,
+            entry.precipitation,
+            entry.humidity,
+            entry.wind_speed,
+            json.dumps(entry.metadata, ensure_ascii=False, default=str) if entry.metadata else None,
+        )
+
+    @staticmethod
+    def _from_row(row: tuple) -> ForecastCacheEntry:
+        return ForecastCacheEntry(
+            location_name=row[0],
+            forecast_datetime=datetime.fromtimestamp(row[1], JST),
+            cached_at=datetime.fromtimestamp(row[2], JST),
+            temperature=row[3],
+            max_temperature=row[4],
+            min_temperature=row[5],
+            weather_condition=row[6],
+            weather_description=row[7],
+            precipitation=row[8],
+            humidity=row[9],
+            wind_speed=row[10],
+            metadata=json.loads(row[11]) if row[11] else {},
+        )
+
+    def save_entries(self, entries: list[ForecastCacheEntry]) -> None:
+        rows = [self._to_row(entry) for entry in entries]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO forecasts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def load_entries(self, location_name: str, start: datetime | None = None,
+                     end: datetime | None = None) -> list[ForecastCacheEntry]:
+        start_ts = ensure_jst(start).timestamp() if start is not None else float("-inf")
+        end_ts = ensure_jst(end).timestamp() if end is not None else float("inf")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM forecasts"
+                " WHERE location_name = ? AND forecast_ts BETWEEN ? AND ?"
+                " ORDER BY forecast_ts, cached_ts",
+                (location_name, start_ts, end_ts),
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def delete_older_than(self, cutoff: datetime, location_name: str | None = None) -> int:
+        cutoff_ts = ensure_jst(cutoff).timestamp()
+        if location_name is None:
+            sql = ("DELETE FROM forecasts WHERE rowid IN"
+                   " (SELECT rowid FROM forecasts WHERE cached_ts <= ? LIMIT ?)")
+            params: tuple = (cutoff_ts, RETENTION_DELETE_BATCH_SIZE)
+        else:
+            sql = ("DELETE FROM forecasts WHERE rowid IN"
+                   " (SELECT rowid FROM forecasts WHERE location_name = ? AND cached_ts <= ? LIMIT ?)")
+            params = (location_name, cutoff_ts, RETENTION_DELETE_BATCH_SIZE)
+
+        # 大量削除で書き込みロックを長時間保持しないよう、一定件数ずつ削除する
+        deleted = 0
+        while True:
+            with self._lock:
+                count = self._conn.execute(sql, params).rowcount
+            deleted += count
+            if count < RETENTION_DELETE_BATCH_SIZE:
+                return deleted
+
+    def location_names(self) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT location_name FROM forecasts ORDER BY location_name").fetchall()
+        return [row[0] for row in rows]
+
+    def count(self) -> int:
+        """保存されているエントリ数"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0]
+
+    def import_csv_files(self, csv_files: Iterable[Path]) -> int:
+        """従来形式のCSVファイルを取り込み、取り込んだ件数を返す"""
+        imported = 0
+        for cache_file in csv_files:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                entries = []
+                for row in reader:
+                    if len(row) < 6:
+                        continue
+                    try:
+                        entries.append(ForecastCacheEntry.from_csv_row(row))
+                    except Exception as e:
+                        logger.warning(f"キャッシュエントリの読み込みエラー: {cache_file.name} - {e}")
+            if entries:
+                self.save_entries(entries)
+                imported += len(entries)
+        return imported
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_forecast_backend(kind: str, cache_dir: Path) -> ForecastCacheBackend:
+    """種類を指定してバックエンドを作成
+
+    SQLiteのデータベースを新規作成した場合、同じディレクトリにある従来形式の
+    CSVキャッシュを取り込む。
+
+    Args:
+        kind: "sqlite" または "csv"
+        cache_dir: キャッシュディレクトリ
+
+    Returns:
+        バックエンド
+    """
+    cache_dir = Path(cache_dir)
+    if kind == "csv":
+        return CSVForecastBackend(cache_dir)
+    if kind != "sqlite":
+        raise ValueError(f"Unknown forecast cache backend: {kind}")
+
+    db_path = cache_dir / SQLITE_FILENAME
+    is_new = not db_path.exists()
+    backend = SQLiteForecastBackend(db_path)
+    if is_new:
+        legacy_files = sorted(cache_dir.glob("forecast_cache_*.csv"))
+        if legacy_files:
+            imported = backend.import_csv_files(legacy_files)
+            logger.info(f"CSV予報キャッシュをSQLiteに移行: {len(legacy_files)}ファイル, {imported}件")
+    return backend
+
+
+__all__ = [
+    "CSV_HEADERS",
+    "CSVForecastBackend",
+    "ForecastCacheBackend",
+    "SQLiteForecastBackend",
+    "create_forecast_backend",
+    "csv_file_path",
+]
@@ -11,7 +11,7 @@ from functools import lru_cache
 from zoneinfo import ZoneInfo
 from typing import Optional
 
-from src.data.weather_data import WeatherForecast
+from src.data.weather_data import WeatherForecast, WeatherForecastCollection
 
 logger = logging.getLogger(__name__)
 
@@ -101,13 +101,18 @@ def get_temperature_differences(current_forecast: WeatherForecast, location_name
     return differences
 
 
-def save_forecast_to_cache(weather_forecast: WeatherForecast, location_name: str) -> None:
+def save_forecast_to_cache(weather_forecast: WeatherForecast | WeatherForecastCollection,
+                           location_name: str, block: bool = True) -> None:
     """予報データをキャッシュに保存（簡易インターフェース）
     
     Args:
-        weather_forecast: 天気予報データ
+        weather_forecast: 天気予報データ（WeatherForecastCollectionの場合は全時刻を保存）
         location_name: 地点名
+        block: 書き込みキューが満杯の場合に空きを待つか（ForecastCache.save_forecasts を参照）
     """
     from .manager import get_forecast_cache
     cache = get_forecast_cache()
-    cache.save_forecast(weather_forecast, location_name)
\ No newline at end of file
+    if isinstance(weather_forecast, WeatherForecastCollection):
+        cache.save_forecasts(weather_forecast.forecasts, location_name, block=block)
+    else:
+        cache.save_forecasts([weather_forecast], location_name, block=block)
\ No newline at end of file
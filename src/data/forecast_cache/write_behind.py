@@ -0,0 +1,274 @@
+"""
+Forecast cache write-behind queue
+
+予報キャッシュの書き込みをバックグラウンドスレッドでまとめて永続化する
+
+保存要求はキューに積むだけで即座に戻り、ライタースレッドが一定件数・一定時間ごとに
+地点単位でまとめてバックエンドへ書き込む（グループコミット）。キューには上限があり、
+上限に達した場合は書き込みが追いつくまで呼び出し側を待たせる（バックプレッシャー）。
+書き込みに失敗したバッチはキューの先頭に戻し、間隔を空けて一定回数まで再試行する。
+"""
+
+from __future__ import annotations
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import Any
+
+from .models import ForecastCacheEntry
+from .storage import ForecastCacheBackend
+from .utils import ensure_jst
+
+logger = logging.getLogger(__name__)
+
+
+class ForecastWriteBehindQueue:
+    """予報キャッシュの非同期書き込みキュー（スレッドセーフ）"""
+
+    def __init__(self, backend: ForecastCacheBackend,
+                 max_queue_size: int = 10000,
+                 batch_size: int = 1000,
+                 flush_interval: float = 0.2,
+                 max_retries: int = 3,
+                 retry_backoff: float = 0.5,
+                 after_write: Callable[[], None] | None = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            backend: 書き込み先のバックエンド
+            max_queue_size: キューに保持する最大エントリ数
+            batch_size: 1回のコミットで書き込む最大エントリ数
+            flush_interval: 最初のエントリを受け取ってから書き込むまでの最大待ち時間（秒）
+            max_retries: 書き込みに失敗したバッチを再試行する最大回数
+            retry_backoff: 最初の再試行までの待ち時間（秒、再試行のたびに2倍にする）
+            after_write: 書き込み後にライタースレッドで呼ぶ処理（保持期間の削除など）
+            clock: 経過時間の計測に使う時計
+        """
+        self._backend = backend
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._after_write = after_write
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        self._pending: deque[tuple[float, ForecastCacheEntry]] = deque()
+        self._inflight: list[ForecastCacheEntry] = []
+        self._flush_waiters = 0
+        # 先頭のバッチが連続で失敗した回数
+        self._failed_attempts = 0
+        self._closed = False
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "errors": 0,
+            "retries": 0,
+            "dropped": 0,
+            "rejected": 0,
+            "backpressure_waits": 0,
+            "backpressure_seconds": 0.0,
+            "peak_depth": 0,
+            "last_commit_lag_seconds": 0.0,
+            "max_commit_lag_seconds": 0.0,
+        }
+
+        self._thread = threading.Thread(target=self._run, name="forecast-cache-writer", daemon=True)
+        self._thread.start()
+        # プロセス終了時に未書き込みのエントリを失わないようにする
+        atexit.register(self.close)
+
+    def put(self, entries: Iterable[ForecastCacheEntry], block: bool = True,
+            timeout: float | None = None) -> bool:
+        """エントリを書き込みキューに追加
+
+        Args:
+            entries: 保存するエントリ
+            block: キューが満杯の場合に空きを待つか
+            timeout: 空きを待つ最大時間（秒、Noneの場合は無制限）
+
+        Returns:
+            キューに追加できた場合True
+        """
+        entries = list(entries)
+        if not entries:
+            return True
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Forecast write-behind queue is closed")
+
+            # 1回の要求が上限を超える場合でも、キューが空になれば受け付ける
+            def has_room() -> bool:
+                return self._closed or not self._pending or len(self._pending) + len(entries) <= self.max_queue_size
+
+            if not has_room():
+                if not block:
+                    self._stats["rejected"] += len(entries)
+                    return False
+                self._stats["backpressure_waits"] += 1
+                wait_start = self._clock()
+                has_space = self._cond.wait_for(has_room, timeout)
+                self._stats["backpressure_seconds"] += self._clock() - wait_start
+                if not has_space:
+                    self._stats["rejected"] += len(entries)
+                    return False
+                if self._closed:
+                    raise RuntimeError("Forecast write-behind queue is closed")
+
+            enqueued_at = self._clock()
+            self._pending.extend((enqueued_at, entry) for entry in entries)
+            self._stats["enqueued"] += len(entries)
+            self._stats["peak_depth"] = max(self._stats["peak_depth"], len(self._pending))
+            self._cond.notify_all()
+        return True
+
+    def _take_batch(self) -> tuple[float, list[ForecastCacheEntry]] | None:
+        """次に書き込むエントリを取り出す（キューが閉じられて空の場合はNone）"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self._closed)
+            if not self._pending:
+                return None
+
+            # 件数が溜まるか一定時間が経つまで待ち、まとめて書き込む
+            deadline = self._pending[0][0] + self.flush_interval
+            while (len(self._pending) < self.batch_size and not self._closed
+                   and not self._flush_waiters):
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            count = min(len(self._pending), self.batch_size)
+            oldest_enqueued_at = self._pending[0][0]
+            batch = [self._pending.popleft()[1] for _ in range(count)]
+            self._inflight = batch
+            # 空きを待っている呼び出し側を起こす
+            self._cond.notify_all()
+        return oldest_enqueued_at, batch
+
+    def _run(self) -> None:
+        """ライタースレッドのメインループ"""
+        while True:
+            taken = self._take_batch()
+            if taken is None:
+                return
+            oldest_enqueued_at, batch = taken
+
+            # 地点ごとにまとめて書き込む（CSVバックエンドでは1ファイル1回の追記になる）
+            batch.sort(key=lambda entry: entry.location_name)
+            error = None
+            try:
+                self._backend.save_entries(batch)
+            except Exception as e:
+                error = e
+                logger.error(f"予報キャッシュの書き込みに失敗: {len(batch)}件 - {e}")
+
+            retry_delay = None
+            with self._cond:
+                self._inflight = []
+                if error is None:
+                    self._failed_attempts = 0
+                    lag = self._clock() - oldest_enqueued_at
+                    self._stats["written"] += len(batch)
+                    self._stats["batches"] += 1
+                    self._stats["last_commit_lag_seconds"] = lag
+                    self._stats["max_commit_lag_seconds"] = max(self._stats["max_commit_lag_seconds"], lag)
+                elif self._failed_attempts < self.max_retries:
+                    # 一時的なエラーでデータを失わないよう、先頭に戻して再試行する
+                    self._failed_attempts += 1
+                    self._pending.extendleft((oldest_enqueued_at, entry) for entry in reversed(batch))
+                    self._stats["errors"] += 1
+                    self._stats["retries"] += 1
+                    retry_delay = self.retry_backoff * 2 ** (self._failed_attempts - 1)
+                else:
+                    self._failed_attempts = 0
+                    self._stats["errors"] += 1
+                    self._stats["dropped"] += len(batch)
+                    logger.error(f"予報キャッシュの書き込みを{self.max_retries}回再試行したため破棄: {len(batch)}件")
+                self._cond.notify_all()
+
+            if retry_delay is not None:
+                self._wait(retry_delay)
+                continue
+
+            if self._after_write is not None:
+                try:
+                    self._after_write()
+                except Exception as e:
+                    logger.error(f"予報キャッシュ書き込み後の処理でエラー: {e}")
+
+    def _wait(self, seconds: float) -> None:
+        """再試行までライタースレッドを待たせる"""
+        with self._cond:
+            deadline = self._clock() + seconds
+            while (remaining := deadline - self._clock()) > 0:
+                self._cond.wait(remaining)
+
+    def pending_entries(self, location_name: str, start: datetime | None = None,
+                        end: datetime | None = None) -> list[ForecastCacheEntry]:
+        """まだバックエンドに書き込まれていない地点のエントリを取得"""
+        with self._cond:
+            entries = [entry for _, entry in self._pending] + self._inflight
+        result = []
+        for entry in entries:
+            if entry.location_name != location_name:
+                continue
+            if start is not None or end is not None:
+                entry_dt_jst = ensure_jst(entry.forecast_datetime)
+                if start is not None and entry_dt_jst < start:
+                    continue
+                if end is not None and entry_dt_jst > end:
+                    continue
+            result.append(entry)
+        return result
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """キューに積まれたエントリが全て書き込まれるまで待つ
+
+        Args:
+            timeout: 最大待ち時間（秒、Noneの場合は無制限）
+
+        Returns:
+            全て書き込まれた場合True（再試行しても書き込めずに破棄したエントリがある場合はFalse）
+        """
+        with self._cond:
+            self._flush_waiters += 1
+            dropped = self._stats["dropped"]
+            self._cond.notify_all()
+            try:
+                drained = self._cond.wait_for(lambda: not self._pending and not self._inflight, timeout)
+                return drained and self._stats["dropped"] == dropped
+            finally:
+                self._flush_waiters -= 1
+
+    def close(self, timeout: float | None = None) -> None:
+        """残りのエントリを書き込んでライタースレッドを停止"""
+        atexit.unregister(self.close)
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def get_stats(self) -> dict[str, Any]:
+        """キューの深さ・遅延などの統計情報を取得"""
+        with self._cond:
+            stats: dict[str, Any] = dict(self._stats)
+            stats["queue_depth"] = len(self._pending)
+            stats["in_flight"] = len(self._inflight)
+            stats["oldest_pending_age_seconds"] = (
+                self._clock() - self._pending[0][0] if self._pending else 0.0
+            )
+        stats["max_queue_size"] = self.max_queue_size
+        return stats
+
+
+__all__ = ["ForecastWriteBehindQueue"]
@@ -0,0 +1,185 @@
+"""
+予報の時刻インデックス
+
+予報を時刻（エポック秒）の昇順に並べた配列として保持し、「D日のHH:00に最も近い予報」を
+二分探索で O(log n) で引けるようにする。WxTechレスポンスの解析、予報コレクション、
+予報キャッシュで共通して使用する。
+
+コメント生成の対象日（日付境界時刻より前は当日、以降は翌日）もここで計算し、
+天気予報ノード・WxTechクライアント・キャッシュ温めで同じ対象日を使う。
+"""
+
+from __future__ import annotations
+import logging
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Sequence
+from datetime import date, datetime, time, timedelta
+from operator import attrgetter
+from typing import Generic, TypeVar
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+JST = ZoneInfo("Asia/Tokyo")
+
+# 日付境界時刻（この時刻より前は前日扱い）
+DATE_BOUNDARY_HOUR = 6
+
+T = TypeVar("T")
+
+
+def to_timestamp(value: datetime, tz: ZoneInfo = JST) -> float:
+    """日時をエポック秒に変換（タイムゾーンを持たない日時は ``tz`` として扱う）"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=tz)
+    return value.timestamp()
+
+
+def get_target_date(now: datetime, date_boundary_hour: int = DATE_BOUNDARY_HOUR) -> date:
+    """コメント生成の対象日を計算
+
+    Args:
+        now: 現在時刻（JST）
+        date_boundary_hour: 日付境界時刻
+
+    Returns:
+        境界時刻より前（深夜〜早朝）は当日、境界時刻以降は翌日
+    """
+    if now.hour < date_boundary_hour:
+        return now.date()
+    return now.date() + timedelta(days=1)
+
+
+def load_date_boundary_hour() -> int:
+    """コメント生成の日付境界時刻を設定から読み込み（読み込めない場合は6時）"""
+    try:
+        from src.config.config_loader import load_config
+        weather_config = load_config('weather_thresholds', validate=False)
+        return int(weather_config.get('generation', {}).get('date_boundary_hour', DATE_BOUNDARY_HOUR))
+    except Exception as e:
+        logger.warning(f"日付境界時刻の読み込みに失敗したため{DATE_BOUNDARY_HOUR}時を使用: {e}")
+        return DATE_BOUNDARY_HOUR
+
+
+class ForecastTimeIndex(Generic[T]):
+    """時刻順に並べた予報のインデックス
+
+    同じ距離の候補が前後にある場合は早い時刻を、同じ時刻の候補が複数ある場合は
+    入力順で先のものを選ぶ（時刻順のリストを先頭から線形探索した場合と同じ結果）。
+    """
+
+    __slots__ = ("_items", "_timestamps", "tz")
+
+    def __init__(self, items: Iterable[T], key: Callable[[T], datetime] = attrgetter("datetime"),
+                 tz: ZoneInfo = JST):
+        """
+        Args:
+            items: 予報（WeatherForecast など）
+            key: 予報から日時を取り出す関数
+            tz: タイムゾーンを持たない日時と対象時刻に使うタイムゾーン
+        """
+        self.tz = tz
+        pairs = sorted(((to_timestamp(key(item), tz), item) for item in items), key=lambda pair: pair[0])
+        self._timestamps = [timestamp for timestamp, _ in pairs]
+        self._items = [item for _, item in pairs]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def items(self) -> Sequence[T]:
+        """時刻順の予報"""
+        return self._items
+
+    def _day_bounds(self, target_date: date) -> tuple[int, int]:
+        start = datetime.combine(target_date, time(), tzinfo=self.tz)
+        return (bisect_left(self._timestamps, start.timestamp()),
+                bisect_left(self._timestamps, (start + timedelta(days=1)).timestamp()))
+
+    def _nearest_position(self, target: float, lo: int, hi: int) -> int | None:
+        if lo >= hi:
+            return None
+        position = bisect_left(self._timestamps, target, lo, hi)
+        if position == hi:
+            position = hi - 1
+        elif position > lo and target - self._timestamps[position - 1] <= self._timestamps[position] - target:
+            position -= 1
+        # 同じ時刻の候補が複数ある場合は先頭のものを使う
+        return bisect_left(self._timestamps, self._timestamps[position], lo, position + 1)
+
+    def nearest(self, target: datetime, on_date: date | None = None,
+                max_distance: timedelta | None = None) -> T | None:
+        """指定時刻に最も近い予報を取得
+
+        Args:
+            target: 目標時刻
+            on_date: 指定した場合はその日（``tz`` 基準）の予報だけを対象にする
+            max_distance: 許容する時間差（超える場合はNone）
+
+        Returns:
+            最も近い予報（見つからない場合はNone）
+        """
+        group = self.nearest_group(target, on_date, max_distance)
+        return group[0] if group else None
+
+    def nearest_group(self, target: datetime, on_date: date | None = None,
+                      max_distance: timedelta | None = None) -> list[T]:
+        """指定時刻に最も近い予報を、同じ時間差のものを全て含めて取得
+
+        前後に同じ時間差の予報がある場合は両方を時刻順に返す。引数は ``nearest`` と同じ。
+        """
+        lo, hi = self._day_bounds(on_date) if on_date is not None else (0, len(self._timestamps))
+        target_timestamp = to_timestamp(target, self.tz)
+        position = self._nearest_position(target_timestamp, lo, hi)
+        if position is None:
+            return []
+        distance = abs(self._timestamps[position] - target_timestamp)
+        if max_distance is not None and distance > max_distance.total_seconds():
+            return []
+        end = bisect_right(self._timestamps, self._timestamps[position], position, hi)
+        mirror = target_timestamp + distance
+        if distance and mirror != self._timestamps[position]:
+            end = bisect_right(self._timestamps, mirror, end, hi)
+        return self._items[position:end]
+
+    def at_hours(self, target_date: date, hours: Iterable[int], same_day: bool = False) -> list[T]:
+        """指定日の各時刻に最も近い予報を時刻の指定順に取得
+
+        Args:
+            target_date: 対象日
+            hours: 対象時刻のリスト
+            same_day: Trueの場合は対象日の予報だけを候補にする
+
+        Returns:
+            予報のリスト（候補がない時刻は含まない）
+        """
+        on_date = target_date if same_day else None
+        forecasts = []
+        for hour in hours:
+            forecast = self.nearest(datetime.combine(target_date, time(hour), tzinfo=self.tz), on_date)
+            if forecast is not None:
+                forecasts.append(forecast)
+        return forecasts
+
+    def between(self, start: datetime, end: datetime) -> list[T]:
+        """指定期間（両端を含む）の予報を時刻順に取得"""
+        return self._items[bisect_left(self._timestamps, to_timestamp(start, self.tz)):
+                           bisect_right(self._timestamps, to_timestamp(end, self.tz))]
+
+    def discard(self, item: T) -> None:
+        """予報をインデックスから取り除く"""
+        for position, candidate in enumerate(self._items):
+            if candidate is item:
+                del self._items[position]
+                del self._timestamps[position]
+                return
+
+
+__all__ = [
+    "DATE_BOUNDARY_HOUR",
+    "JST",
+    "ForecastTimeIndex",
+    "get_target_date",
+    "load_date_boundary_hour",
+    "to_timestamp",
+]
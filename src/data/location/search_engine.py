@@ -4,6 +4,7 @@ from __future__ import annotations
 import logging
 from collections import defaultdict
 
+from src.utils.spatial_index import GeoGridIndex
 from .models import Location
 from .trie import LocationTrie
 
@@ -33,9 +34,10 @@ class LocationSearchEngine:
         self.prefecture_index: dict[str, list[Location]] = defaultdict(list)
         self.region_index: dict[str, list[Location]] = defaultdict(list)
         self.prefix_trie = LocationTrie()  # Trie構造を使用
+        self.geo_index = GeoGridIndex()  # 近隣検索用（キーはself.locationsの位置）
         
         # インデックスの構築
-        for location in self.locations:
+        for position, location in enumerate(self.locations):
             # 名前インデックス
             self.name_index[location.name.lower()] = location
             self.normalized_index[location.normalized_name.lower()] = location
@@ -53,6 +55,10 @@ class LocationSearchEngine:
             self.prefix_trie.insert(location.name, location)
             if location.normalized_name.lower() != location.name.lower():
                 self.prefix_trie.insert(location.normalized_name, location)
+            
+            # 空間インデックス（座標が不明な地点は距離を計算できないため除外）
+            if location.latitude and location.longitude:
+                self.geo_index.insert(position, location.latitude, location.longitude)
         
         logger.info(
             f"インデックス構築完了: "
@@ -199,21 +205,17 @@ class LocationSearchEngine:
             logger.warning(f"座標情報がありません: {location.name}")
             return []
         
+        # 半径内の地点を距離順に取得
         nearby = []
-        
-        for other in self.locations:
+        for position, _ in self.geo_index.query_radius(location.latitude, location.longitude, radius_km):
+            other = self.locations[position]
             if other == location:
                 continue
-            
-            distance = location.distance_to(other)
-            if distance is not None and distance <= radius_km:
-                nearby.append((distance, other))
-        
-        # 距離順にソート
-        nearby.sort(key=lambda x: x[0])
+            nearby.append(other)
+            if len(nearby) >= limit:
+                break
         
-        # 上位N件を返す
-        return [loc for _, loc in nearby[:limit]]
+        return nearby
     
     def get_statistics(self) -> dict[str, any]:
         """検索エンジンの統計情報を取得
@@ -6,9 +6,10 @@
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Iterator, Any
+from datetime import date, datetime
+from typing import Iterable, Iterator, Any
 
+from src.data.forecast_time_index import ForecastTimeIndex
 from src.data.weather_models import WeatherForecast
 from src.data.weather_enums import WeatherCondition
 
@@ -25,6 +26,8 @@ class WeatherForecastCollection:
     def __post_init__(self) -> None:
         """予報データを時系列でソート"""
         self.forecasts.sort(key=lambda f: f.datetime)
+        self._time_index: ForecastTimeIndex[WeatherForecast] | None = None
+        self._time_index_key: tuple[int, int] | None = None
 
     def __len__(self) -> int:
         """予報データ数を返す"""
@@ -44,15 +47,31 @@ class WeatherForecastCollection:
             raise ValueError(f"Location ID mismatch: expected {self.location_id}, got {forecast.location_id}")
         self.forecasts.append(forecast)
         self.forecasts.sort(key=lambda f: f.datetime)
+        self._time_index = None
+
+    @property
+    def time_index(self) -> ForecastTimeIndex[WeatherForecast]:
+        """時刻インデックス（初回アクセス時に作成し、予報リストが変わるまで再利用）"""
+        key = (id(self.forecasts), len(self.forecasts))
+        if self._time_index is None or self._time_index_key != key:
+            self._time_index = ForecastTimeIndex(self.forecasts)
+            self._time_index_key = key
+        return self._time_index
 
     def get_forecast_at(self, target_datetime: datetime) -> WeatherForecast | None:
         """指定時刻の予報を取得（最も近い時刻の予報を返す）"""
-        if not self.forecasts:
-            return None
+        return self.time_index.nearest(target_datetime)
+
+    def get_forecasts_at_hours(self, target_date: date, hours: Iterable[int],
+                               same_day: bool = False) -> list[WeatherForecast]:
+        """指定日の各時刻に最も近い予報を取得（タイムゾーンを持たない日時はJSTとして扱う）
         
-        # 最も近い時刻の予報を探す
-        closest = min(self.forecasts, key=lambda f: abs((f.datetime - target_datetime).total_seconds()))
-        return closest
+        Args:
+            target_date: 対象日
+            hours: 対象時刻のリスト
+            same_day: Trueの場合は対象日の予報だけを候補にする
+        """
+        return self.time_index.at_hours(target_date, hours, same_day)
 
     def get_forecasts_between(self, start: datetime, end: datetime) -> list[WeatherForecast]:
         """指定期間内の予報を取得"""
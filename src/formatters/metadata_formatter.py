@@ -48,6 +48,11 @@ class MetadataFormatter:
                 metadata.update(weather_info)
                 logger.debug(f"metadata keys after weather_info update: {list(metadata.keys())}")
         
+        # 予報の鮮度（取得からの経過秒数、期限切れのキャッシュを返したかどうか）
+        forecast_freshness = state.generation_metadata.get("forecast_freshness")
+        if forecast_freshness:
+            metadata["forecast_freshness"] = forecast_freshness
+        
         # 選択されたコメント情報
         selected_pair = state.selected_pair
         if selected_pair:
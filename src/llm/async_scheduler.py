@@ -0,0 +1,193 @@
+"""LLM呼び出しの非同期スケジューラー
+
+バッチ処理ではLLM呼び出しをイベントループ上で直接 await するため、スレッドプールの
+ワーカー数による暗黙の並列数制限がなくなる。このモジュールはプロバイダーごとに
+セマフォ（同時実行数）とトークンバケット（毎秒リクエスト数）を持つスケジューラーを提供し、
+ベンダーのレート制限を超えないように呼び出しを調停する。
+
+asyncio のプリミティブはイベントループに紐づくため、スケジューラーはイベントループごとに
+1つ作成される（get_llm_scheduler を参照）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    """プロバイダーごとの呼び出し制限
+
+    Attributes:
+        max_concurrency: 同時に実行できる呼び出し数
+        requests_per_second: 1秒あたりの呼び出し数（0以下で無制限）
+        burst: トークンバケットの容量（連続して即時実行できる呼び出し数）
+    """
+
+    max_concurrency: int = 8
+    requests_per_second: float = 5.0
+    burst: int = 10
+
+
+class TokenBucket:
+    """asyncio用のトークンバケット
+
+    単一のイベントループ内でのみ使用する。トークンの確認と消費の間に await を挟まないため
+    ロックは不要。
+    """
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: 1秒あたりに補充されるトークン数（0以下で無制限）
+            capacity: バケットの容量
+            clock: 単調増加する時計（テスト用に差し替え可能）
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    async def acquire(self) -> float:
+        """トークンを1つ消費する（不足している場合は補充を待つ）
+
+        Returns:
+            待機した時間（秒）
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return waited
+            delay = (1 - self._tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+
+class _ProviderSlot:
+    """プロバイダーごとのセマフォ・トークンバケットと統計"""
+
+    def __init__(self, limits: ProviderLimits):
+        self.limits = limits
+        self.semaphore = asyncio.Semaphore(limits.max_concurrency)
+        self.bucket = TokenBucket(limits.requests_per_second, limits.burst)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.total_wait_seconds = 0.0
+
+
+class LLMScheduler:
+    """プロバイダーごとの同時実行数とレートを制限して非同期LLM呼び出しを実行する"""
+
+    def __init__(self, default_limits: ProviderLimits | None = None,
+                 provider_limits: dict[str, ProviderLimits] | None = None):
+        """
+        Args:
+            default_limits: 個別設定のないプロバイダーに適用する制限
+            provider_limits: プロバイダー名ごとの制限
+        """
+        self.default_limits = default_limits or ProviderLimits()
+        self.provider_limits = dict(provider_limits or {})
+        self._slots: dict[str, _ProviderSlot] = {}
+
+    def _get_slot(self, provider: str) -> _ProviderSlot:
+        slot = self._slots.get(provider)
+        if slot is None:
+            limits = self.provider_limits.get(provider, self.default_limits)
+            slot = self._slots[provider] = _ProviderSlot(limits)
+        return slot
+
+    async def run(self, provider: str, func: Callable[[], Awaitable[T]]) -> T:
+        """制限の範囲内でLLM呼び出しを実行する
+
+        Args:
+            provider: プロバイダー名
+            func: 呼び出しを行うコルーチンを返す関数
+
+        Returns:
+            呼び出し結果
+        """
+        slot = self._get_slot(provider)
+        start_time = time.perf_counter()
+        async with slot.semaphore:
+            rate_wait = await slot.bucket.acquire()
+            wait_seconds = time.perf_counter() - start_time
+            slot.calls += 1
+            slot.total_wait_seconds += wait_seconds
+            if rate_wait:
+                slot.rate_limited += 1
+                logger.debug(f"LLM rate limit: {provider} waited {rate_wait * 1000:.1f}ms")
+            slot.in_flight += 1
+            slot.peak_in_flight = max(slot.peak_in_flight, slot.in_flight)
+            try:
+                return await func()
+            except Exception:
+                slot.errors += 1
+                raise
+            finally:
+                slot.in_flight -= 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """統計情報を取得"""
+        return {
+            provider: {
+                "max_concurrency": slot.limits.max_concurrency,
+                "requests_per_second": slot.limits.requests_per_second,
+                "in_flight": slot.in_flight,
+                "peak_in_flight": slot.peak_in_flight,
+                "calls": slot.calls,
+                "errors": slot.errors,
+                "rate_limited": slot.rate_limited,
+                "total_wait_seconds": slot.total_wait_seconds,
+            }
+            for provider, slot in self._slots.items()
+        }
+
+
+_schedulers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMScheduler] = weakref.WeakKeyDictionary()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """実行中のイベントループに対応するスケジューラーを取得（未作成の場合は作成）
+
+    イベントループ内から呼び出す必要がある。
+    """
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        from src.config.config import get_llm_config
+        llm_config = get_llm_config()
+        scheduler = LLMScheduler(ProviderLimits(
+            max_concurrency=llm_config.async_max_concurrency,
+            requests_per_second=llm_config.requests_per_second,
+            burst=llm_config.rate_limit_burst,
+        ))
+        _schedulers[loop] = scheduler
+    return scheduler
+
+
+__all__ = ["LLMScheduler", "ProviderLimits", "TokenBucket", "get_llm_scheduler"]
@@ -0,0 +1,265 @@
+"""LLMプロバイダーのクライアントプール
+
+ワークフローの各ノードはリクエストごとに LLMManager を生成するため、そのたびに
+SDKクライアント（とHTTPコネクションプール）が作り直され、接続が再利用されない。
+このモジュールは (プロバイダー, モデル) ごとに1つのプロバイダーインスタンスを保持し、
+キープアライブ接続を持つHTTPクライアントをプロセス全体で共有する。
+
+同時に実行できるAPI呼び出し数は max_connections に制限され、上限に達した呼び出しは
+空きが出るまで待機する。待機の発生はメトリクスフックに通知される。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from src.llm.providers.base_provider import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PoolMetrics:
+    """API呼び出し開始時点のプール状態
+
+    Attributes:
+        provider: プロバイダー名
+        model: モデル名
+        in_flight: 実行中の呼び出し数（この呼び出しを含む）
+        max_connections: 同時呼び出し数の上限
+        wait_seconds: 空きを待った時間（秒）
+    """
+
+    provider: str
+    model: str
+    in_flight: int
+    max_connections: int
+    wait_seconds: float
+
+    @property
+    def saturation(self) -> float:
+        """使用率（0.0〜1.0）"""
+        return self.in_flight / self.max_connections if self.max_connections else 0.0
+
+    @property
+    def waited(self) -> bool:
+        """上限に達していて待機が発生したか"""
+        return self.wait_seconds > 0
+
+
+MetricsHook = Callable[[PoolMetrics], None]
+
+
+class _PoolEntry:
+    """(プロバイダー, モデル) ごとの共有インスタンスと利用状況"""
+
+    def __init__(self, provider: LLMProvider, provider_class: type[LLMProvider],
+                 api_key_digest: str, http_client: Any | None, max_connections: int):
+        self.provider = provider
+        self.provider_class = provider_class
+        self.api_key_digest = api_key_digest
+        self.http_client = http_client
+        self.semaphore = threading.BoundedSemaphore(max_connections)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.calls = 0
+        self.waits = 0
+        self.total_wait_seconds = 0.0
+
+
+class LLMClientPool:
+    """(プロバイダー, モデル) ごとにLLMプロバイダーを共有するプール
+
+    スレッドセーフであり、ParallelCommentGenerator のスレッドプールから同時に利用できる。
+    """
+
+    def __init__(self, max_connections: int = 20, max_keepalive_connections: int = 10):
+        """
+        Args:
+            max_connections: (プロバイダー, モデル) ごとの同時接続・同時呼び出し数の上限
+            max_keepalive_connections: 保持するキープアライブ接続数の上限
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self._entries: dict[tuple[str, str], _PoolEntry] = {}
+        self._lock = threading.Lock()
+        self._hooks: list[MetricsHook] = []
+
+    @staticmethod
+    def _digest(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    def _create_entry(self, provider_class: type[LLMProvider], api_key: str, model: str,
+                      digest: str) -> _PoolEntry:
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+        )
+        http_client = provider_class.create_http_client(limits)
+        kwargs = {"http_client": http_client} if http_client is not None else {}
+        provider = provider_class(api_key=api_key, model=model, **kwargs)
+        return _PoolEntry(provider, provider_class, digest, http_client, self.max_connections)
+
+    def get_provider(self, provider_name: str, model: str, api_key: str,
+                     provider_class: type[LLMProvider]) -> LLMProvider:
+        """共有プロバイダーを取得（未作成の場合は作成）
+
+        APIキーまたはプロバイダークラスが変わった場合はインスタンスを作り直す。
+
+        Args:
+            provider_name: プロバイダー名
+            model: モデル名
+            api_key: APIキー
+            provider_class: プロバイダークラス
+
+        Returns:
+            共有されたプロバイダーインスタンス
+        """
+        key = (provider_name, model)
+        digest = self._digest(api_key)
+        entry = self._entries.get(key)
+        if entry is not None and entry.api_key_digest == digest and entry.provider_class is provider_class:
+            return entry.provider
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.api_key_digest == digest and entry.provider_class is provider_class:
+                return entry.provider
+            if entry is not None:
+                logger.info(f"LLM client for {provider_name}/{model} is being recreated")
+                self._close_entry(entry)
+            entry = self._create_entry(provider_class, api_key, model, digest)
+            self._entries[key] = entry
+            logger.info(f"LLM client pooled: {provider_name}/{model} (max_connections={self.max_connections})")
+            return entry.provider
+
+    @contextmanager
+    def lease(self, provider_name: str, model: str) -> Iterator[None]:
+        """API呼び出し1回分の枠を確保する
+
+        同時呼び出し数が上限に達している場合は空きが出るまで待機する。
+        プールに存在しない (プロバイダー, モデル) の場合は何もしない。
+        """
+        entry = self._entries.get((provider_name, model))
+        if entry is None:
+            yield
+            return
+
+        wait_seconds = 0.0
+        if not entry.semaphore.acquire(blocking=False):
+            start_time = time.perf_counter()
+            entry.semaphore.acquire()
+            wait_seconds = time.perf_counter() - start_time
+
+        with self._lock:
+            entry.in_flight += 1
+            entry.calls += 1
+            entry.peak_in_flight = max(entry.peak_in_flight, entry.in_flight)
+            if wait_seconds:
+                entry.waits += 1
+                entry.total_wait_seconds += wait_seconds
+            metrics = PoolMetrics(provider_name, model, entry.in_flight, self.max_connections, wait_seconds)
+
+        self._emit(metrics)
+        try:
+            yield
+        finally:
+            with self._lock:
+                entry.in_flight -= 1
+            entry.semaphore.release()
+
+    def add_metrics_hook(self, hook: MetricsHook) -> None:
+        """API呼び出しごとにプール状態を受け取るフックを登録"""
+        with self._lock:
+            self._hooks = [*self._hooks, hook]
+
+    def remove_metrics_hook(self, hook: MetricsHook) -> None:
+        """登録済みのメトリクスフックを解除"""
+        with self._lock:
+            self._hooks = [h for h in self._hooks if h is not hook]
+
+    def _emit(self, metrics: PoolMetrics) -> None:
+        if metrics.waited:
+            logger.debug(f"LLM pool saturated: {metrics.provider}/{metrics.model} "
+                         f"waited {metrics.wait_seconds * 1000:.1f}ms")
+        for hook in self._hooks:
+            try:
+                hook(metrics)
+            except Exception as e:
+                logger.warning(f"LLM pool metrics hook failed: {e}")
+
+    @staticmethod
+    def _close_entry(entry: _PoolEntry) -> None:
+        if entry.http_client is not None:
+            try:
+                entry.http_client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close pooled HTTP client: {e}")
+
+    def close(self) -> None:
+        """全ての共有クライアントを閉じてプールを空にする"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._close_entry(entry)
+
+    def get_stats(self) -> dict[str, Any]:
+        """統計情報を取得"""
+        with self._lock:
+            return {
+                "max_connections": self.max_connections,
+                "clients": {
+                    f"{provider}/{model}": {
+                        "in_flight": entry.in_flight,
+                        "peak_in_flight": entry.peak_in_flight,
+                        "calls": entry.calls,
+                        "waits": entry.waits,
+                        "total_wait_seconds": entry.total_wait_seconds,
+                    }
+                    for (provider, model), entry in self._entries.items()
+                },
+            }
+
+
+_llm_client_pool: LLMClientPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_llm_client_pool() -> LLMClientPool:
+    """グローバルなLLMクライアントプールを取得"""
+    global _llm_client_pool
+    pool = _llm_client_pool
+    if pool is None:
+        with _pool_lock:
+            pool = _llm_client_pool
+            if pool is None:
+                from src.config.config import get_llm_config
+                llm_config = get_llm_config()
+                pool = LLMClientPool(
+                    max_connections=llm_config.max_connections,
+                    max_keepalive_connections=llm_config.max_keepalive_connections,
+                )
+                _llm_client_pool = pool
+    return pool
+
+
+def reset_llm_client_pool() -> None:
+    """グローバルなクライアントプールを閉じて破棄（主にテスト用）"""
+    global _llm_client_pool
+    with _pool_lock:
+        pool, _llm_client_pool = _llm_client_pool, None
+    if pool is not None:
+        pool.close()
+
+
+__all__ = ["LLMClientPool", "PoolMetrics", "get_llm_client_pool", "reset_llm_client_pool"]
@@ -4,6 +4,7 @@
 """
 
 from __future__ import annotations
+import hashlib
 import os
 from typing import Any
 import logging
@@ -14,6 +15,9 @@ from src.llm.providers.base_provider import LLMProvider
 from src.llm.providers.openai_provider import OpenAIProvider
 from src.llm.providers.gemini_provider import GeminiProvider
 from src.llm.providers.anthropic_provider import AnthropicProvider
+from src.llm.client_pool import get_llm_client_pool
+from src.llm.async_scheduler import LLMScheduler, get_llm_scheduler
+from src.utils.single_flight import get_async_single_flight, get_single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -57,10 +61,18 @@ class LLMManager:
         """
         self.provider_name = provider
         self.config = config
+        self.model: str | None = None
         self.provider = self._initialize_provider(provider)
+        
+        from src.config.config import get_llm_config
+        self._coalesce_requests = get_llm_config().coalesce_requests
 
     def _initialize_provider(self, provider_name: str) -> LLMProvider:
-        """プロバイダーを初期化（統一された実装）"""
+        """プロバイダーを初期化（統一された実装）
+
+        プロバイダーインスタンスはクライアントプールから取得し、
+        同じ (プロバイダー, モデル) の LLMManager 間でHTTP接続を共有する。
+        """
         if provider_name not in self.PROVIDER_CONFIGS:
             raise ValueError(f"Unknown provider: {provider_name}")
         
@@ -74,9 +86,10 @@ class LLMManager:
         
         logger.info(f"Using {config['display_name']}")
         
-        # プロバイダーインスタンスの作成
+        # 共有プロバイダーインスタンスの取得
         provider_class: ProviderClass = config["provider_class"]
-        return provider_class(api_key=api_key, model=model)
+        self.model = model
+        return get_llm_client_pool().get_provider(provider_name, model, api_key, provider_class)
     
     def _get_api_key(self, env_name: str) -> str:
         """環境変数からAPIキーを取得"""
@@ -103,6 +116,14 @@ class LLMManager:
         
         return model
 
+    def _flight_key(self, prompt: str) -> tuple[str, str | None, str]:
+        """同時リクエストを合流させるためのキー（プロバイダー・モデル・プロンプト）"""
+        return self.provider_name, self.model, hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    def _provider_generate(self, prompt: str) -> str:
+        with get_llm_client_pool().lease(self.provider_name, self.model):
+            return self.provider.generate(prompt)
+
     def generate(self, prompt: str) -> str:
         """
         汎用的なテキスト生成を行う。
@@ -117,8 +138,11 @@ class LLMManager:
             logger.info(f"Generating text using {self.provider_name}")
 
             # プロバイダーの汎用生成メソッドを呼び出す
+            # （同じプロンプトを処理中のリクエストがあれば、その応答を共有する）
             if hasattr(self.provider, "generate"):
-                return self.provider.generate(prompt)
+                if self._coalesce_requests:
+                    return get_single_flight("llm").do(self._flight_key(prompt), self._provider_generate, prompt)
+                return self._provider_generate(prompt)
             else:
                 # generateメソッドがない場合は、generate_commentを使う
                 # ダミーのweather_dataとpast_commentsを作成
@@ -145,9 +169,40 @@ class LLMManager:
                 # プロンプトをそのまま使用
                 constraints = {"custom_prompt": prompt}
 
-                return self.provider.generate_comment(
-                    weather_data=dummy_weather, past_comments=None, constraints=constraints
-                )
+                with get_llm_client_pool().lease(self.provider_name, self.model):
+                    return self.provider.generate_comment(
+                        weather_data=dummy_weather, past_comments=None, constraints=constraints
+                    )
+
+        except Exception as e:
+            logger.error(f"Error generating text: {str(e)}")
+            raise
+
+    async def agenerate(self, prompt: str, scheduler: LLMScheduler | None = None) -> str:
+        """
+        汎用的なテキスト生成を非同期で行う。
+
+        呼び出しはスケジューラーを経由し、プロバイダーごとの同時実行数と
+        レート制限の範囲内で実行される。
+
+        Args:
+            prompt: プロンプト文字列
+            scheduler: 使用するスケジューラー（省略時は実行中のイベントループのもの）
+
+        Returns:
+            生成されたテキスト
+        """
+        try:
+            logger.info(f"Generating text asynchronously using {self.provider_name}")
+            scheduler = scheduler or get_llm_scheduler()
+            
+            async def run() -> str:
+                return await scheduler.run(self.provider_name, lambda: self.provider.agenerate(prompt))
+            
+            # 同じプロンプトを処理中のリクエストがあれば、その応答を共有する
+            if self._coalesce_requests:
+                return await get_async_single_flight("llm_async").do(self._flight_key(prompt), run)
+            return await run()
 
         except Exception as e:
             logger.error(f"Error generating text: {str(e)}")
@@ -171,9 +226,10 @@ class LLMManager:
             logger.info(f"Generating comment using {self.provider_name}")
 
             # プロバイダーを使用してコメント生成
-            comment = self.provider.generate_comment(
-                weather_data=weather_data, past_comments=past_comments, constraints=constraints
-            )
+            with get_llm_client_pool().lease(self.provider_name, self.model):
+                comment = self.provider.generate_comment(
+                    weather_data=weather_data, past_comments=past_comments, constraints=constraints
+                )
 
             # コメント長の検証と調整
             max_length = constraints.get("max_length", 15)
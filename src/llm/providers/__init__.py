@@ -1,8 +1,8 @@
 """LLMプロバイダーパッケージ"""
 
-from src.llm.providers.base_provider import LLMProvider
+from src.llm.providers.base_provider import AsyncClientProvider, LLMProvider
 from src.llm.providers.openai_provider import OpenAIProvider
 from src.llm.providers.gemini_provider import GeminiProvider
 from src.llm.providers.anthropic_provider import AnthropicProvider
 
-__all__ = ["LLMProvider", "OpenAIProvider", "GeminiProvider", "AnthropicProvider"]
+__all__ = ["LLMProvider", "AsyncClientProvider", "OpenAIProvider", "GeminiProvider", "AnthropicProvider"]
@@ -4,30 +4,41 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic, DefaultHttpxClient
 
-from src.llm.providers.base_provider import LLMProvider
+from src.llm.providers.base_provider import AsyncClientProvider
 from src.data.weather_data import WeatherForecast
 from src.data.comment_pair import CommentPair
 
 logger = logging.getLogger(__name__)
 
 
-class AnthropicProvider(LLMProvider):
+class AnthropicProvider(AsyncClientProvider):
     """Anthropic Claude APIを使用するプロバイダー"""
 
-    def __init__(self, api_key: str, model: str = "claude-3-opus-20240229"):
+    def __init__(self, api_key: str, model: str = "claude-3-opus-20240229", http_client: Any | None = None):
         """
         Anthropicプロバイダーの初期化。
 
         Args:
             api_key: Anthropic APIキー
             model: 使用するモデル名
+            http_client: 共有するHTTPクライアント（省略時はSDKの既定のクライアント）
         """
-        self.client = Anthropic(api_key=api_key)
+        self.client = Anthropic(api_key=api_key, http_client=http_client)
+        self._api_key = api_key
         self.model = model
         logger.info(f"Initialized Anthropic provider with model: {model}")
 
+    @classmethod
+    def create_http_client(cls, limits: Any) -> Any:
+        """キープアライブ接続を共有するHTTPクライアントを作成"""
+        return DefaultHttpxClient(limits=limits)
+
+    def _create_async_client(self) -> AsyncAnthropic:
+        """非同期クライアントを作成"""
+        return AsyncAnthropic(api_key=self._api_key)
+
     def generate_comment(
         self, weather_data: WeatherForecast, past_comments: CommentPair, constraints: dict[str, Any]
     ) -> str:
@@ -97,6 +108,35 @@ class AnthropicProvider(LLMProvider):
             logger.error(f"Anthropic API error: {str(e)}")
             raise
 
+    async def agenerate(self, prompt: str) -> str:
+        """
+        汎用的なテキスト生成を非同期クライアントで行う。
+
+        Args:
+            prompt: プロンプト文字列
+
+        Returns:
+            生成されたテキスト
+        """
+        try:
+            logger.info(f"Generating text asynchronously with Anthropic {self.model}")
+
+            message = await self._get_async_client().messages.create(
+                model=self.model,
+                max_tokens=500,
+                temperature=0.7,
+                messages=[{"role": "user", "content": prompt}],
+            )
+
+            generated_text = message.content[0].text
+            logger.info(f"Generated text: {generated_text[:100]}...")
+
+            return generated_text
+
+        except Exception as e:
+            logger.error(f"Anthropic API error: {str(e)}")
+            raise
+
 
 # エクスポート
 __all__ = ["AnthropicProvider"]
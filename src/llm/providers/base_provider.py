@@ -1,6 +1,8 @@
 """LLMプロバイダーの基底クラス"""
 
 from __future__ import annotations
+import asyncio
+import weakref
 from abc import ABC, abstractmethod
 from typing import Any
 
@@ -11,6 +13,21 @@ from src.data.comment_pair import CommentPair
 class LLMProvider(ABC):
     """LLMプロバイダーの抽象基底クラス"""
 
+    @classmethod
+    def create_http_client(cls, limits: Any) -> Any | None:
+        """
+        クライアントプールで共有するHTTPクライアントを作成する。
+
+        HTTPクライアントを差し替えられないSDKを使うプロバイダーは None を返す。
+
+        Args:
+            limits: 接続数の上限（httpx.Limits）
+
+        Returns:
+            HTTPクライアント、または None
+        """
+        return None
+
     @abstractmethod
     def generate_comment(
         self, weather_data: WeatherForecast, past_comments: CommentPair, constraints: dict[str, Any]
@@ -41,6 +58,21 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def agenerate(self, prompt: str) -> str:
+        """
+        汎用的なテキスト生成を非同期で行う。
+
+        非同期クライアントを持たないプロバイダー向けの既定実装で、
+        generate をワーカースレッドで実行する。
+
+        Args:
+            prompt: プロンプト文字列
+
+        Returns:
+            生成されたテキスト
+        """
+        return await asyncio.to_thread(self.generate, prompt)
+
     def _build_prompt(
         self, weather_data: WeatherForecast, past_comments: CommentPair, constraints: dict[str, Any]
     ) -> str:
@@ -75,5 +107,29 @@ class LLMProvider(ABC):
         return prompt
 
 
+class AsyncClientProvider(LLMProvider):
+    """SDKの非同期クライアントで agenerate をネイティブ実装するプロバイダーの基底クラス"""
+
+    @abstractmethod
+    def _create_async_client(self) -> Any:
+        """非同期クライアントを作成する"""
+
+    def _get_async_client(self) -> Any:
+        """
+        実行中のイベントループ用の非同期クライアントを取得する。
+
+        非同期クライアントのコネクションプールは作成したイベントループに紐づくため、
+        イベントループごとに1つ作成して再利用する。
+        """
+        loop = asyncio.get_running_loop()
+        clients = getattr(self, "_async_clients", None)
+        if clients is None:
+            clients = self._async_clients = weakref.WeakKeyDictionary()
+        client = clients.get(loop)
+        if client is None:
+            client = clients[loop] = self._create_async_client()
+        return client
+
+
 # エクスポート
-__all__ = ["LLMProvider"]
+__all__ = ["AsyncClientProvider", "LLMProvider"]
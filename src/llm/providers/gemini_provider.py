@@ -106,6 +106,36 @@ class GeminiProvider(LLMProvider):
             logger.error(f"Gemini API error: {str(e)}")
             raise
 
+    async def agenerate(self, prompt: str) -> str:
+        """
+        汎用的なテキスト生成を非同期APIで行う。
+
+        Args:
+            prompt: プロンプト文字列
+
+        Returns:
+            生成されたテキスト
+        """
+        try:
+            logger.debug("Generating text asynchronously with Gemini")
+
+            response = await self.model.generate_content_async(
+                prompt,
+                generation_config=genai.GenerationConfig(
+                    temperature=0.3,  # より決定的な出力に
+                    max_output_tokens=500,  # 統合生成に十分なトークン数
+                )
+            )
+
+            generated_text = response.text
+            logger.debug(f"Generated text: {generated_text[:100]}...")
+
+            return generated_text
+
+        except Exception as e:
+            logger.error(f"Gemini API error: {str(e)}")
+            raise
+
 
 # エクスポート
 __all__ = ["GeminiProvider"]
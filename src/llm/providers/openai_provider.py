@@ -1,34 +1,46 @@
 """OpenAI APIプロバイダー"""
 
 from __future__ import annotations
+import asyncio
 import logging
 import time
 from typing import Any
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI, DefaultHttpxClient
 
-from src.llm.providers.base_provider import LLMProvider
+from src.llm.providers.base_provider import AsyncClientProvider
 from src.data.weather_data import WeatherForecast
 from src.data.comment_pair import CommentPair
 
 logger = logging.getLogger(__name__)
 
 
-class OpenAIProvider(LLMProvider):
+class OpenAIProvider(AsyncClientProvider):
     """OpenAI APIを使用するプロバイダー"""
 
-    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo"):
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo", http_client: Any | None = None):
         """
         OpenAIプロバイダーの初期化。
 
         Args:
             api_key: OpenAI APIキー
             model: 使用するモデル名
+            http_client: 共有するHTTPクライアント（省略時はSDKの既定のクライアント）
         """
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key, http_client=http_client)
+        self._api_key = api_key
         self.model = model
         logger.info(f"Initialized OpenAI provider with model: {model}")
 
+    @classmethod
+    def create_http_client(cls, limits: Any) -> Any:
+        """キープアライブ接続を共有するHTTPクライアントを作成"""
+        return DefaultHttpxClient(limits=limits)
+
+    def _create_async_client(self) -> AsyncOpenAI:
+        """非同期クライアントを作成"""
+        return AsyncOpenAI(api_key=self._api_key)
+
     def generate_comment(
         self, weather_data: WeatherForecast, past_comments: CommentPair, constraints: dict[str, Any]
     ) -> str:
@@ -137,6 +149,55 @@ class OpenAIProvider(LLMProvider):
                 logger.error(f"OpenAI API error: {error_message}")
                 raise
 
+    async def agenerate(self, prompt: str) -> str:
+        """
+        汎用的なテキスト生成を非同期クライアントで行う。
+
+        Args:
+            prompt: プロンプト文字列
+
+        Returns:
+            生成されたテキスト
+        """
+        max_retries = 3
+        retry_delay = 3  # 初期待機時間（秒）
+        client = self._get_async_client()
+
+        for attempt in range(max_retries):
+            try:
+                logger.info(
+                    f"Generating text asynchronously with OpenAI {self.model} (attempt {attempt + 1}/{max_retries})"
+                )
+
+                response = await client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": "あなたは役立つアシスタントです。"},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.7,
+                    max_tokens=500,
+                )
+
+                generated_text = response.choices[0].message.content
+                logger.info(f"Generated text: {generated_text[:100]}...")
+
+                return generated_text
+
+            except Exception as e:
+                error_message = str(e)
+
+                # Rate limit errorの場合はリトライ
+                if "rate_limit_exceeded" in error_message or "429" in error_message:
+                    if attempt < max_retries - 1:
+                        wait_time = retry_delay * (2**attempt)  # 指数バックオフ
+                        logger.warning(f"Rate limit exceeded. Retrying in {wait_time} seconds...")
+                        await asyncio.sleep(wait_time)
+                        continue
+
+                logger.error(f"OpenAI API error: {error_message}")
+                raise
+
 
 # エクスポート
 __all__ = ["OpenAIProvider"]
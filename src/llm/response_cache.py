@@ -0,0 +1,277 @@
+"""LLMレスポンスキャッシュ
+
+同じ地点・同じ天気・同じ候補コメントの統合生成は、再生成や一括生成の再実行で
+同じプロンプトになる。このモジュールは正規化したプロンプトとプロバイダー・モデルの
+ハッシュをキーにLLMの応答を保存し、同じ入力に対するLLM呼び出しを省略する。
+
+- メモリ層: TTLCache（プロセス内）
+- ディスク層: SQLite（任意。LLM_RESPONSE_CACHE_DB を設定した場合のみ）
+
+エントリは予報対象日の終わりに失効する。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from src.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# TTLの下限（秒）。対象日の終わり直前に保存したエントリがすぐに失効しないようにする
+MIN_TTL_SECONDS = 60
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str, ignored_line_prefixes: Iterable[str] = ()) -> str:
+    """キャッシュキー用にプロンプトを正規化
+
+    NFKC正規化・行ごとの空白の畳み込み・空行の除去を行い、指定された接頭辞で
+    始まる行（応答に影響しない可変部分）を取り除く。
+
+    Args:
+        prompt: プロンプト文字列
+        ignored_line_prefixes: キーから除外する行の接頭辞
+
+    Returns:
+        正規化されたプロンプト
+    """
+    prefixes = tuple(ignored_line_prefixes)
+    lines = []
+    for line in unicodedata.normalize("NFKC", prompt).splitlines():
+        line = _WHITESPACE_PATTERN.sub(" ", line).strip()
+        if not line or (prefixes and line.startswith(prefixes)):
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def make_cache_key(provider: str, model: str | None, prompt: str,
+                   ignored_line_prefixes: Iterable[str] = ()) -> str:
+    """プロバイダー・モデル・正規化済みプロンプトからキャッシュキーを生成"""
+    normalized = normalize_prompt(prompt, ignored_line_prefixes)
+    key_source = f"{provider}\0{model or ''}\0{normalized}"
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+
+def end_of_forecast_day(target_datetime: datetime) -> datetime:
+    """予報対象日の終わり（翌日0時）を取得"""
+    next_day = target_datetime.date() + timedelta(days=1)
+    return datetime(next_day.year, next_day.month, next_day.day, tzinfo=target_datetime.tzinfo)
+
+
+class _SQLiteResponseStore:
+    """SQLiteによるディスク層"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " key TEXT PRIMARY KEY,"
+            " provider TEXT NOT NULL,"
+            " model TEXT,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " expire_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_expire ON llm_responses (expire_at)")
+
+    def get(self, key: str, now: float) -> tuple[str, float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expire_at FROM llm_responses WHERE key = ? AND expire_at > ?",
+                (key, now),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, key: str, provider: str, model: str | None, response: str,
+            now: float, expire_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, model, response, now, expire_at),
+            )
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM llm_responses WHERE expire_at <= ?", (now,)).rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LLMResponseCache:
+    """正規化プロンプトのハッシュをキーとするLLMレスポンスキャッシュ（スレッドセーフ）"""
+
+    def __init__(self, max_memory_entries: int = 1000, db_path: Path | str | None = None):
+        """
+        Args:
+            max_memory_entries: メモリ層の最大エントリ数
+            db_path: ディスク層のSQLiteファイル（Noneの場合はメモリ層のみ）
+        """
+        self._memory = TTLCache(default_ttl=MIN_TTL_SECONDS, max_size=max_memory_entries,
+                                auto_cleanup=True, cleanup_interval=300)
+        self._disk: _SQLiteResponseStore | None = None
+        if db_path:
+            try:
+                self._disk = _SQLiteResponseStore(Path(db_path))
+                purged = self._disk.purge_expired(time.time())
+                logger.info(f"LLM response cache disk tier: {db_path} (purged {purged} expired)")
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache disk tier disabled: {e}")
+                self._disk = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, key: str) -> str | None:
+        """キャッシュから応答を取得（メモリ層 → ディスク層の順に参照）
+
+        Args:
+            key: make_cache_key で生成したキー
+
+        Returns:
+            キャッシュされた応答、存在しないか期限切れの場合はNone
+        """
+        response = self._memory.get(key)
+        if response is not None:
+            self._count("memory_hits")
+            return response
+
+        if self._disk is not None:
+            now = time.time()
+            try:
+                row = self._disk.get(key, now)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache disk read failed: {e}")
+                row = None
+            if row is not None:
+                response, expire_at = row
+                # メモリ層に昇格
+                self._memory.set(key, response, ttl=max(1, int(expire_at - now)))
+                self._count("disk_hits")
+                return response
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, response: str, expires_at: datetime, provider: str = "",
+            model: str | None = None) -> None:
+        """応答をキャッシュに保存
+
+        Args:
+            key: make_cache_key で生成したキー
+            response: LLMの応答
+            expires_at: 失効日時（予報対象日の終わり）
+            provider: プロバイダー名（ディスク層の記録用）
+            model: モデル名（ディスク層の記録用）
+        """
+        now = time.time()
+        ttl = max(MIN_TTL_SECONDS, int(expires_at.timestamp() - now))
+        self._memory.set(key, response, ttl=ttl)
+        if self._disk is not None:
+            try:
+                self._disk.set(key, provider, model, response, now, now + ttl)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache disk write failed: {e}")
+        self._count("stores")
+
+    def clear(self) -> None:
+        """全てのエントリを削除"""
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self) -> None:
+        """クリーンアップスレッドとディスク層を閉じる"""
+        self._memory.stop_cleanup()
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """統計情報を取得"""
+        with self._lock:
+            stats: dict[str, Any] = dict(self._stats)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        total = hits + stats["misses"]
+        stats["hits"] = hits
+        stats["hit_rate"] = hits / total if total else 0.0
+        stats["memory_size"] = self._memory.get_stats()["size"]
+        stats["disk_size"] = self._disk.count() if self._disk is not None else None
+        return stats
+
+
+_response_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache | None:
+    """グローバルなLLMレスポンスキャッシュを取得（無効化されている場合はNone）"""
+    global _response_cache
+    cache = _response_cache
+    if cache is None:
+        from src.config.config import get_llm_config
+        llm_config = get_llm_config()
+        if not llm_config.response_cache_enabled:
+            return None
+        with _cache_lock:
+            cache = _response_cache
+            if cache is None:
+                cache = LLMResponseCache(
+                    max_memory_entries=llm_config.response_cache_max_entries,
+                    db_path=llm_config.response_cache_db_path or None,
+                )
+                _response_cache = cache
+    return cache
+
+
+def reset_llm_response_cache() -> None:
+    """グローバルなレスポンスキャッシュを閉じて破棄（主にテスト用）"""
+    global _response_cache
+    with _cache_lock:
+        cache, _response_cache = _response_cache, None
+    if cache is not None:
+        cache.close()
+
+
+__all__ = [
+    "LLMResponseCache",
+    "end_of_forecast_day",
+    "get_llm_response_cache",
+    "make_cache_key",
+    "normalize_prompt",
+    "reset_llm_response_cache",
+]
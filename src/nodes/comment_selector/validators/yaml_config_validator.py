@@ -36,13 +36,12 @@ class YamlConfigValidator:
         
         # YAML設定ファイル読み込み
         config_path = Path(__file__).parent.parent.parent.parent / "config" / "comment_restrictions.yaml"
-        if not config_path.exists():
-            logger.debug("comment_restrictions.yaml が見つかりません。基本チェックのみ実行")
-            return
-        
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                self.restrictions = self.yaml.safe_load(f)
+            # 共有ストアで一度だけ解析される（インスタンスごとのファイルI/Oは発生しない）
+            from src.config.yaml_config_store import get_yaml_config_store
+            self.restrictions = get_yaml_config_store().get(config_path)
+        except FileNotFoundError:
+            logger.debug("comment_restrictions.yaml が見つかりません。基本チェックのみ実行")
         except Exception as e:
             logger.warning(f"設定ファイル読み込み時のエラー: {e}")
     
@@ -3,8 +3,9 @@
 from __future__ import annotations
 from typing import Any
 import logging
-from pathlib import Path
-import yaml
+
+from src.config.yaml_config_store import CONFIG_DIR, get_yaml_config_store
+from src.utils.keyword_matcher import get_keyword_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -23,15 +24,17 @@ DEFAULT_NG_WORDS = [
 ]
 
 
+NG_WORDS_CONFIG_PATH = CONFIG_DIR / "ng_words.yaml"
+
+
 def get_ng_words() -> list[str]:
     """NGワードリストを取得"""
-    # 設定ファイルから読み込み
-    config_path = Path(__file__).parent.parent.parent.parent / "config" / "ng_words.yaml"
+    # 設定ファイルは共有ストアで一度だけ解析され、変更時のみ再読み込みされる
+    config_path = NG_WORDS_CONFIG_PATH
 
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
-            return config.get("ng_words", [])
+        config = get_yaml_config_store().get(config_path)
+        return list(config.get("ng_words", []))
     except FileNotFoundError:
         logger.warning(f"NG words config file not found: {config_path}")
         # フォールバック
@@ -53,12 +56,7 @@ def check_ng_words(text: str) -> dict[str, Any]:
             - is_valid: NGワードが含まれていない場合True
             - found_words: 見つかったNGワードのリスト
     """
-    ng_words = get_ng_words()
-    found_words = []
-    
-    for ng_word in ng_words:
-        if ng_word in text:
-            found_words.append(ng_word)
+    found_words = get_keyword_matcher().scan(text).in_category("ng_words")
     
     return {
         "is_valid": len(found_words) == 0,
@@ -5,6 +5,7 @@ import logging
 from src.data.weather_data import WeatherForecast
 from src.data.comment_generation_state import CommentGenerationState
 from src.data.past_comment import PastComment, CommentType
+from src.utils.keyword_matcher import get_keyword_matcher
 from .constants import (
     SUNNY_KEYWORDS,
     RAIN_ADVICE_PATTERNS,
@@ -18,6 +19,13 @@ logger = logging.getLogger(__name__)
 class AlternativeCommentFinder:
     """代替コメントを検索するクラス"""
     
+    # にわか雨表現を避ける場合の除外キーワード
+    SHOWER_KEYWORDS = ["にわか", "一時的", "急な"]
+    
+    # 曇りに関するキーワードと、曇天時に避けるキーワード
+    CLOUDY_KEYWORDS = ["曇", "くもり", "雲", "どんより", "グレー"]
+    CLOUDY_AVOID_KEYWORDS = ["強い日差し", "太陽", "ギラギラ", "照りつける"]
+    
     def find_alternative_weather_comment(
         self,
         weather_data: WeatherForecast,
@@ -45,26 +53,25 @@ class AlternativeCommentFinder:
         # 天気コメントのみをフィルタリング
         weather_comments = [c for c in past_comments if c and c.comment_type == CommentType.WEATHER_COMMENT]
         
+        # 各コメントは1回だけ走査し、以降の判定は照合結果に問い合わせる
+        matcher = get_keyword_matcher()
+        scanned = [(c.comment_text, matcher.scan(c.comment_text)) for c in weather_comments]
+        
         # 優先パターンに一致するものを探す
-        for past_comment in weather_comments:
-            comment_text = past_comment.comment_text
-            for preferred in preferred_patterns:
-                if preferred in comment_text:
-                    logger.info(f"🚨 代替コメント発見: '{comment_text}'")
-                    return comment_text
+        for comment_text, matches in scanned:
+            if matches.any(preferred_patterns):
+                logger.info(f"🚨 代替コメント発見: '{comment_text}'")
+                return comment_text
         
         # 優先パターンが見つからない場合、晴天系の任意のコメントを選択
-        for past_comment in weather_comments:
-            comment_text = past_comment.comment_text
-            if any(keyword in comment_text for keyword in SUNNY_KEYWORDS) and \
-               not any(ng in comment_text for ng in inappropriate_patterns):
+        for comment_text, matches in scanned:
+            if matches.any(SUNNY_KEYWORDS) and not matches.any(inappropriate_patterns):
                 logger.info(f"🚨 晴天系代替コメント: '{comment_text}'")
                 return comment_text
         
         # それでも見つからない場合、禁止パターンを含まないコメントを探す
-        for past_comment in weather_comments:
-            comment_text = past_comment.comment_text
-            if not any(ng in comment_text for ng in inappropriate_patterns):
+        for comment_text, matches in scanned:
+            if not matches.any(inappropriate_patterns):
                 logger.info(f"🚨 デフォルト代替（禁止ワード回避）: '{comment_text}'")
                 return comment_text
         
@@ -85,9 +92,10 @@ class AlternativeCommentFinder:
         advice_comments = [c for c in past_comments if c and c.comment_type == CommentType.ADVICE]
         
         # 雨天に適したアドバイスを検索
+        matcher = get_keyword_matcher()
         for past_comment in advice_comments:
             comment_text = past_comment.comment_text
-            if any(pattern in comment_text for pattern in RAIN_ADVICE_PATTERNS):
+            if matcher.scan(comment_text).any(RAIN_ADVICE_PATTERNS):
                 logger.info(f"🚨 雨天用代替アドバイス: '{comment_text}'")
                 return comment_text
         
@@ -112,9 +120,10 @@ class AlternativeCommentFinder:
         weather_comments = [c for c in past_comments if c and c.comment_type == CommentType.WEATHER_COMMENT]
         
         # 悪天候に適したコメントを検索
+        matcher = get_keyword_matcher()
         for past_comment in weather_comments:
             comment_text = past_comment.comment_text
-            if any(pattern in comment_text for pattern in STORM_WEATHER_PATTERNS):
+            if matcher.scan(comment_text).any(STORM_WEATHER_PATTERNS):
                 logger.info(f"🚨 悪天候用代替コメント: '{comment_text}'")
                 return comment_text
         
@@ -141,11 +150,13 @@ class AlternativeCommentFinder:
         weather_comments = [c for c in past_comments if c and c.comment_type == CommentType.WEATHER_COMMENT]
         
         # 雨に関するコメントを検索
+        matcher = get_keyword_matcher()
         for past_comment in weather_comments:
             comment_text = past_comment.comment_text
-            if "雨" in comment_text:
+            matches = matcher.scan(comment_text)
+            if "雨" in matches:
                 # にわか雨表現を避ける場合
-                if avoid_shower and any(shower in comment_text for shower in ["にわか", "一時的", "急な"]):
+                if avoid_shower and matches.any(self.SHOWER_KEYWORDS):
                     continue
                 logger.info(f"🚨 雨天用代替コメント: '{comment_text}'")
                 return comment_text
@@ -165,13 +176,11 @@ class AlternativeCommentFinder:
         weather_comments = [c for c in past_comments if c and c.comment_type == CommentType.WEATHER_COMMENT]
         
         # 曇りに関するコメントを検索
-        cloudy_keywords = ["曇", "くもり", "雲", "どんより", "グレー"]
-        avoid_keywords = ["強い日差し", "太陽", "ギラギラ", "照りつける"]
-        
+        matcher = get_keyword_matcher()
         for past_comment in weather_comments:
             comment_text = past_comment.comment_text
-            if any(cloudy in comment_text for cloudy in cloudy_keywords) and \
-               not any(avoid in comment_text for avoid in avoid_keywords):
+            matches = matcher.scan(comment_text)
+            if matches.any(self.CLOUDY_KEYWORDS) and not matches.any(self.CLOUDY_AVOID_KEYWORDS):
                 logger.info(f"🚨 曇天用代替コメント: '{comment_text}'")
                 return comment_text
         
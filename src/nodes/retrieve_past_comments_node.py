@@ -7,7 +7,7 @@ from typing import Any
 
 from src.data.past_comment import CommentType
 from src.data.weather_data import WeatherForecast
-from src.repositories.lazy_comment_repository import LazyCommentRepository
+from src.repositories.comment_corpus import get_comment_corpus, get_relevant_seasons
 
 logger = logging.getLogger(__name__)
 
@@ -34,28 +34,11 @@ def retrieve_past_comments_node(state: dict[str, Any]) -> dict[str, Any]:
         target_datetime = state.target_datetime or datetime.now()
         month = target_datetime.month
         
-        # 月ごとの関連季節マッピング
-        season_mapping = {
-            1: ["冬"],  # 1月
-            2: ["冬"],  # 2月
-            3: ["冬", "春"],  # 3月（季節の変わり目）
-            4: ["春"],  # 4月
-            5: ["春", "梅雨"],  # 5月（梅雨の始まり）
-            6: ["梅雨", "夏"],  # 6月
-            7: ["夏", "梅雨", "台風"],  # 7月
-            8: ["夏", "台風"],  # 8月
-            9: ["夏", "台風", "秋"],  # 9月
-            10: ["秋", "台風"],  # 10月
-            11: ["秋"],  # 11月
-            12: ["冬"],  # 12月
-        }
-        
-        relevant_seasons = season_mapping.get(month, ["春", "夏", "秋", "冬"])
+        relevant_seasons = get_relevant_seasons(month)
         logger.info(f"{month}月のため、関連季節: {relevant_seasons}")
         
-        # リポジトリ初期化（関連季節のみを読み込む）
-        logger.info("Using lazy-loading CSV repository with seasonal filtering")
-        repository = LazyCommentRepository(seasons=relevant_seasons)
+        # プロセス全体で共有する解析済みコーパスを使用（定常状態ではファイルI/Oなし）
+        corpus = get_comment_corpus()
         
         # WeatherForecastチェック（並列実行対応）
         if weather_data is not None and not isinstance(weather_data, WeatherForecast):
@@ -63,7 +46,8 @@ def retrieve_past_comments_node(state: dict[str, Any]) -> dict[str, Any]:
             # 並列実行時はweather_dataがまだ設定されていない可能性があるため、処理を続行
             
         # コメント取得（関連季節のみから取得）
-        past_comments = repository.get_recent_comments(
+        past_comments = corpus.get_recent_comments(
+            seasons=relevant_seasons,
             limit=100  # 季節を絞ったので件数を減らす
         )
         
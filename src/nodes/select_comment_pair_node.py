@@ -59,25 +59,18 @@ def select_comment_pair_node(state: CommentGenerationState) -> CommentGeneration
         
         if exclude_previous:
             # 前回の生成履歴から除外すべきコメントを取得
-            from src.ui.streamlit_utils import load_history
+            from src.repositories.generation_history_store import get_history_store
             try:
-                history = load_history()
-                logger.info(f"🔄 再生成モード - 履歴読み込み結果: {len(history) if history else 0}件")
-                if history:
-                    # 同じ地点の最新の履歴を取得
-                    location_history = [h for h in history if h.get('location') == location_name]
-                    logger.info(f"🔄 {location_name}の履歴: {len(location_history)}件")
-                    if location_history:
-                        latest = location_history[-1]
-                        previous_weather_comment = latest.get('comment')
-                        previous_advice_comment = latest.get('advice_comment')
-                        logger.info(f"🔄 前回のコメントを除外対象として設定:")
-                        logger.info(f"🔄   天気コメント: '{previous_weather_comment}'")
-                        logger.info(f"🔄   アドバイス: '{previous_advice_comment}'")
-                    else:
-                        logger.info(f"🔄 {location_name}の履歴が見つかりません")
+                # 地点ごとの最新履歴はストアが保持しているため、履歴全体は読み込まない
+                latest = get_history_store().get_latest(location_name)
+                if latest:
+                    previous_weather_comment = latest.get('comment')
+                    previous_advice_comment = latest.get('advice_comment')
+                    logger.info(f"🔄 前回のコメントを除外対象として設定:")
+                    logger.info(f"🔄   天気コメント: '{previous_weather_comment}'")
+                    logger.info(f"🔄   アドバイス: '{previous_advice_comment}'")
                 else:
-                    logger.info("🔄 履歴ファイルが空または存在しません")
+                    logger.info(f"🔄 {location_name}の履歴が見つかりません")
             except Exception as e:
                 logger.warning(f"🔄 履歴の読み込みに失敗しましたが、処理を続行します: {e}")
         
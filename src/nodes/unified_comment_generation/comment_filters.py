@@ -11,6 +11,8 @@ from src.data.past_comment import PastComment
 from src.data.comment_generation_state import CommentGenerationState
 from src.constants.content_constants import FORBIDDEN_PHRASES
 from src.constants.weather_constants import COMMENT
+from src.repositories.comment_corpus import resolve_comment_rows
+from src.utils.keyword_matcher import get_keyword_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -105,9 +107,19 @@ def filter_forbidden_phrases(comments: list[PastComment]) -> list[PastComment]:
     Returns:
         フィルタリング後のコメントリスト
     """
+    # 共有コーパス由来のコメントはキーワードビットセットで判定する
+    resolved = resolve_comment_rows(comments)
+    if resolved is not None:
+        store, rows = resolved
+        hits = store.features.rows_containing_any(rows, FORBIDDEN_PHRASES)
+        if hits is not None:
+            filtered = [comment for comment, hit in zip(comments, hits, strict=True) if not hit]
+            return filtered if filtered else comments
+    
+    matcher = get_keyword_matcher()
     filtered = []
     for comment in comments:
-        if not any(phrase in comment.comment_text for phrase in FORBIDDEN_PHRASES):
+        if not matcher.scan(comment.comment_text).any(FORBIDDEN_PHRASES):
             filtered.append(comment)
         else:
             logger.debug(f"禁止フレーズを含むため除外: {comment.comment_text}")
@@ -5,8 +5,10 @@
 """
 
 from __future__ import annotations
+import asyncio
 import json
 import logging
+from dataclasses import dataclass
 from typing import Any
 from datetime import datetime
 
@@ -14,6 +16,7 @@ from src.data.comment_generation_state import CommentGenerationState
 from src.data.comment_pair import CommentPair
 from src.data.past_comment import PastComment, CommentType
 from src.llm.llm_manager import LLMManager
+from src.llm.response_cache import end_of_forecast_day, get_llm_response_cache, make_cache_key
 from src.utils.weather_comment_validator import WeatherCommentValidator
 from src.nodes.helpers.comment_safety import check_and_fix_weather_comment_safety
 from src.nodes.helpers.ng_words import check_ng_words
@@ -32,295 +35,414 @@ from src.utils.weather_comment_filter import WeatherCommentFilter
 
 logger = logging.getLogger(__name__)
 
+# parse_unified_response がJSONを解析できずにデフォルト値を返した場合の選択理由
+_PARSE_FALLBACK_REASON = "JSON解析エラー"
+
+
+@dataclass
+class _UnifiedGenerationContext:
+    """LLM呼び出しの前後で受け渡す統合生成の中間データ"""
+
+    weather_data: Any
+    weather_comments: list[PastComment]
+    advice_comments: list[PastComment]
+    llm_manager: LLMManager
+    llm_provider: str
+    prompt: str
+    is_continuous_rain: bool
+    target_datetime: datetime
+    parsed_response: dict[str, Any] | None = None
+
 
 def unified_comment_generation_node(state: CommentGenerationState) -> CommentGenerationState:
     """選択と生成を1回のLLM呼び出しで実行する統合ノード"""
     logger.info("UnifiedCommentGenerationNode: 統合コメント生成を開始")
     
     try:
-        # 入力データの検証
-        weather_data = state.weather_data
-        past_comments = state.past_comments
-        location_name = state.location_name
-        # target_datetimeの安全な取得
-        target_datetime = state.target_datetime
-        if not isinstance(target_datetime, datetime):
-            logger.warning(f"target_datetimeが不正な型です: {type(target_datetime)}, 現在時刻を使用します")
-            target_datetime = datetime.now()
-        llm_provider = state.llm_provider or "openai"
+        context = _prepare_unified_generation(state)
         
-        # 統合フィルターの初期化
-        weather_filter = WeatherCommentFilter()
+        # 同じ入力の応答がキャッシュにあればLLM呼び出しを省略
+        cache_key, response = _get_cached_response(context)
+        if response is None:
+            # 1回のLLM呼び出しで選択と生成を実行
+            response = context.llm_manager.generate(context.prompt)
+            state = _apply_unified_response(state, context, response)
+            _store_response(cache_key, context, response)
+            return state
         
-        logger.info(f"入力データ確認 - weather_data: {weather_data is not None}, past_comments: {past_comments is not None}")
-        if past_comments:
-            logger.info(f"past_comments count: {len(past_comments)}")
-        
-        if not weather_data:
-            raise ValueError("天気データが利用できません")
-        if not past_comments:
-            logger.error("過去コメントが空です。CSVファイルの読み込みに問題がある可能性があります。")
-            raise ValueError("過去コメントが存在しません")
-            
-        # コメントをタイプ別に分離
-        weather_comments = [c for c in past_comments if c.comment_type == CommentType.WEATHER_COMMENT]
-        advice_comments = [c for c in past_comments if c.comment_type == CommentType.ADVICE]
-        
-        if not weather_comments or not advice_comments:
-            raise ValueError("適切なコメントタイプが見つかりません")
-            
-        logger.info(f"初期コメント数 - 天気: {len(weather_comments)}, アドバイス: {len(advice_comments)}")
+        return _apply_unified_response(state, context, response, cached=True)
         
-        # 安定天気の判定
-        is_stable_weather = False
-        if state and hasattr(state, 'generation_metadata') and state.generation_metadata:
-            period_forecasts = state.generation_metadata.get('period_forecasts', [])
-            if len(period_forecasts) >= 4:
-                weather_conditions = [f.weather_description for f in period_forecasts if hasattr(f, 'weather_description')]
-                precipitations = [getattr(f, 'precipitation', 0) for f in period_forecasts]
-                max_precip = max(precipitations) if precipitations else 0
-                
-                from src.utils.weather_normalizer import is_stable_weather_condition
-                is_stable_weather = is_stable_weather_condition(weather_conditions) and max_precip < 0.5
-                logger.info(f"安定天気判定: {is_stable_weather}")
-        
-        # 統合フィルタリングパイプラインを適用
-        from src.utils.validators.temperature_validator import TemperatureValidator
-        temp_validator = TemperatureValidator()
-        
-        # フィルタリング用パラメータの準備
-        precipitation = getattr(weather_data, 'precipitation', 0)
-        month = target_datetime.month
-        temperature = getattr(weather_data, 'temperature', 0)
-        if temperature is None:
-            temperature = 0
-        
-        def apply_unified_filters(comments, comment_type="weather"):
-            """
-            全てのフィルタリングを統合したパイプライン
-            1. 禁止フレーズフィルター
-            2. 天気・季節性統合フィルター（WeatherCommentFilter）
-            3. 温度バリデーション
-            """
-            if not comments:
-                logger.warning(f"{comment_type}コメントが空のためフィルタリングをスキップ")
-                return comments
-            
-            # Step 1: 禁止フレーズフィルター
-            filtered = filter_forbidden_phrases(comments)
-            logger.info(f"禁止フレーズフィルター後の{comment_type}コメント数: {len(filtered)}")
-            
-            # Step 2: 天気・季節性統合フィルター（WeatherCommentFilterに季節性チェックが含まれる）
-            weather_filtered = weather_filter.filter_comments(
-                filtered,
-                weather_data.weather_description,
-                precipitation=precipitation,
-                temperature=temperature,
-                month=month,
-                is_stable_weather=is_stable_weather
-            )
-            
-            if not weather_filtered:
-                logger.warning(f"天気・季節性フィルタリング後の{comment_type}コメントが0件になったため、前のリストを使用")
-                weather_filtered = filtered
-            else:
-                logger.info(f"天気・季節性フィルタリング後の{comment_type}コメント数: {len(weather_filtered)}")
-                filtered = weather_filtered
-            
-            # Step 3: 温度バリデーション
-            temp_filtered = []
-            for comment in filtered:
-                is_valid, reason = temp_validator.validate(comment, weather_data)
-                if is_valid:
-                    temp_filtered.append(comment)
-                else:
-                    logger.info(f"温度バリデーターで{comment_type}コメントを除外: {reason}")
-            
-            if not temp_filtered:
-                logger.warning(f"温度バリデーション後の{comment_type}コメントが0件になったため、フィルタリング前のリストを使用")
-                return filtered
-            else:
-                logger.info(f"温度バリデーション後の{comment_type}コメント数: {len(temp_filtered)}")
-                return temp_filtered
-        
-        # 統合フィルタリングパイプラインを適用
-        weather_comments = apply_unified_filters(weather_comments, "天気")
-        advice_comments = apply_unified_filters(advice_comments, "アドバイス")
-        
-        # LLMマネージャーの初期化
-        from src.config.config import get_config
-        config = get_config()
-        llm_manager = LLMManager(provider=llm_provider, config=config)
+    except Exception as e:
+        logger.error(f"統合コメント生成エラー: {str(e)}", exc_info=True)
+        state.errors = state.errors or []
+        state.errors.append(f"UnifiedCommentGenerationNode: {str(e)}")
+        state.is_candidate_suitable = False
+        return state
+
+
+async def aunified_comment_generation_node(state: CommentGenerationState) -> CommentGenerationState:
+    """統合ノードの非同期版
+
+    フィルタリングとプロンプト構築は同期版と共通の処理をワーカースレッドで実行し、
+    LLM呼び出しのみをイベントループ上で await する（プロバイダーごとのスケジューラーを経由）。
+    """
+    logger.info("UnifiedCommentGenerationNode: 統合コメント生成を開始（非同期）")
+    
+    try:
+        context = await asyncio.to_thread(_prepare_unified_generation, state)
         
-        # 熱中症フィルタリングはWeatherCommentFilterに統合済み
+        # 同じ入力の応答がキャッシュにあればLLM呼び出しを省略
+        cache_key, response = _get_cached_response(context)
+        if response is None:
+            # 1回のLLM呼び出しで選択と生成を実行
+            response = await context.llm_manager.agenerate(context.prompt)
+            state = _apply_unified_response(state, context, response)
+            _store_response(cache_key, context, response)
+            return state
         
-        # 天気に応じたコメントのフィルタリング
-        if hasattr(weather_data, 'weather_description') and '雨' in weather_data.weather_description:
-            precipitation = getattr(weather_data, 'precipitation', 0)
-            if precipitation is None:
-                precipitation = 0
-            logger.info(f"雨の天気（降水量: {precipitation}mm）のため、適切なコメントを選択")
-            
-            # 降水量に応じて適切なコメントを選択
-            original_weather_comments = weather_comments.copy()  # フィルタリング前のリストを保存
-            
-            if precipitation >= PRECIP.HEAVY:  # 大雨閾値以上
-                logger.info("大雨のため、大雨・豪雨関連のコメントを優先")
-                weather_comments = [c for c in original_weather_comments if c.weather_condition in ['大雨', '嵐', '雷']]
-                if not weather_comments:  # 大雨コメントがない場合は通常の雨コメントも含める
-                    weather_comments = [c for c in original_weather_comments if c.weather_condition in ['雨', '大雨', '嵐', '雷']]
-            elif precipitation >= PRECIP.LIGHT_RAIN:  # 軽い雨閾値以上
-                logger.info("通常の雨のため、雨関連のコメントを選択")
-                weather_comments = [c for c in original_weather_comments if c.weather_condition in ['雨', '大雨', '雷']]
-            else:  # 2mm未満は小雨
-                logger.info(f"小雨（{precipitation}mm）のため、雨のコメントのみ選択")
-                weather_comments = [c for c in original_weather_comments if c.weather_condition == '雨']  # 雨のコメントのみ
-            
-            if not weather_comments:
-                logger.warning("適切な雨関連のコメントが見つかりません。全コメントを使用します。")
-                weather_comments = [c for c in past_comments if c.comment_type == CommentType.WEATHER_COMMENT]
-                weather_comments = filter_forbidden_phrases(weather_comments)
+        return _apply_unified_response(state, context, response, cached=True)
         
-        # 連続雨判定
-        is_continuous_rain = check_continuous_rain(state)
+    except Exception as e:
+        logger.error(f"統合コメント生成エラー: {str(e)}", exc_info=True)
+        state.errors = state.errors or []
+        state.errors.append(f"UnifiedCommentGenerationNode: {str(e)}")
+        state.is_candidate_suitable = False
+        return state
+
+
+def _prepare_unified_generation(state: CommentGenerationState) -> _UnifiedGenerationContext:
+    """入力の検証・コメントのフィルタリング・統合プロンプトの構築を行う"""
+    # 入力データの検証
+    weather_data = state.weather_data
+    past_comments = state.past_comments
+    location_name = state.location_name
+    # target_datetimeの安全な取得
+    target_datetime = state.target_datetime
+    if not isinstance(target_datetime, datetime):
+        logger.warning(f"target_datetimeが不正な型です: {type(target_datetime)}, 現在時刻を使用します")
+        target_datetime = datetime.now()
+    llm_provider = state.llm_provider or "openai"
+    
+    # 統合フィルターの初期化
+    weather_filter = WeatherCommentFilter()
+    
+    logger.info(f"入力データ確認 - weather_data: {weather_data is not None}, past_comments: {past_comments is not None}")
+    if past_comments:
+        logger.info(f"past_comments count: {len(past_comments)}")
+    
+    if not weather_data:
+        raise ValueError("天気データが利用できません")
+    if not past_comments:
+        logger.error("過去コメントが空です。CSVファイルの読み込みに問題がある可能性があります。")
+        raise ValueError("過去コメントが存在しません")
+        
+    # コメントをタイプ別に分離
+    weather_comments = [c for c in past_comments if c.comment_type == CommentType.WEATHER_COMMENT]
+    advice_comments = [c for c in past_comments if c.comment_type == CommentType.ADVICE]
+    
+    if not weather_comments or not advice_comments:
+        raise ValueError("適切なコメントタイプが見つかりません")
         
-        # 連続雨の場合、「にわか雨」を含むコメントをフィルタリング
-        if is_continuous_rain:
-            logger.info("連続雨を検出 - にわか雨表現を含むコメントをフィルタリング")
-            
-            # フィルタリング前のログ
-            logger.info(f"フィルタリング前 - 天気コメント数: {len(weather_comments)}")
-            logger.info(f"フィルタリング前 - アドバイスコメント数: {len(advice_comments)}")
-            
-            # アドバイスコメントの内容を確認
-            logger.info("フィルタリング前のアドバイスコメント:")
-            for i, comment in enumerate(advice_comments[:COMMENT.CANDIDATE_LIMIT]):
-                logger.info(f"  {i}: {comment.comment_text}")
-            
-            weather_comments = filter_shower_comments(weather_comments)
-            advice_comments = filter_mild_umbrella_comments(advice_comments)
-            
-            # フィルタリング後のログ
-            logger.info(f"フィルタリング後 - 天気コメント数: {len(weather_comments)}")
-            logger.info(f"フィルタリング後 - アドバイスコメント数: {len(advice_comments)}")
+    logger.info(f"初期コメント数 - 天気: {len(weather_comments)}, アドバイス: {len(advice_comments)}")
+    
+    # 安定天気の判定
+    is_stable_weather = False
+    if state and hasattr(state, 'generation_metadata') and state.generation_metadata:
+        period_forecasts = state.generation_metadata.get('period_forecasts', [])
+        if len(period_forecasts) >= 4:
+            weather_conditions = [f.weather_description for f in period_forecasts if hasattr(f, 'weather_description')]
+            precipitations = [getattr(f, 'precipitation', 0) for f in period_forecasts]
+            max_precip = max(precipitations) if precipitations else 0
             
-            # フィルタリング後のアドバイスコメントの内容を確認
-            logger.info("フィルタリング後のアドバイスコメント:")
-            for i, comment in enumerate(advice_comments[:COMMENT.CANDIDATE_LIMIT]):
-                logger.info(f"  {i}: {comment.comment_text}")
-        
-        # 天気情報のフォーマット
-        weather_info = format_weather_info(
-            weather_data, 
-            state.generation_metadata.get('temperature_differences') if state.generation_metadata else None,
-            state.generation_metadata.get('weather_trend') if state.generation_metadata else None
-        )
-        
-        # 統合プロンプトの構築
-        # パフォーマンス最適化のため候補数を制限
-        unified_prompt = build_unified_prompt(
-            weather_comments[:COMMENT.OPTIMIZED_CANDIDATE_LIMIT],  # 上位5件に制限（パフォーマンス最適化）
-            advice_comments[:COMMENT.OPTIMIZED_CANDIDATE_LIMIT],   # 上位5件に制限（パフォーマンス最適化）
-            weather_info,
-            location_name,
-            target_datetime
+            from src.utils.weather_normalizer import is_stable_weather_condition
+            is_stable_weather = is_stable_weather_condition(weather_conditions) and max_precip < 0.5
+            logger.info(f"安定天気判定: {is_stable_weather}")
+    
+    # 統合フィルタリングパイプラインを適用
+    from src.utils.validators.temperature_validator import TemperatureValidator
+    temp_validator = TemperatureValidator()
+    
+    # フィルタリング用パラメータの準備
+    precipitation = getattr(weather_data, 'precipitation', 0)
+    month = target_datetime.month
+    temperature = getattr(weather_data, 'temperature', 0)
+    if temperature is None:
+        temperature = 0
+    
+    def apply_unified_filters(comments, comment_type="weather"):
+        """
+        全てのフィルタリングを統合したパイプライン
+        1. 禁止フレーズフィルター
+        2. 天気・季節性統合フィルター（WeatherCommentFilter）
+        3. 温度バリデーション
+        
+        共有コーパス由来のコメントでは、1と2は読み込み時に計算済みの
+        キーワードビットセットとのマスク演算で判定される
+        """
+        if not comments:
+            logger.warning(f"{comment_type}コメントが空のためフィルタリングをスキップ")
+            return comments
+        
+        # Step 1: 禁止フレーズフィルター
+        filtered = filter_forbidden_phrases(comments)
+        logger.info(f"禁止フレーズフィルター後の{comment_type}コメント数: {len(filtered)}")
+        
+        # Step 2: 天気・季節性統合フィルター（WeatherCommentFilterに季節性チェックが含まれる）
+        weather_filtered = weather_filter.filter_comments(
+            filtered,
+            weather_data.weather_description,
+            precipitation=precipitation,
+            temperature=temperature,
+            month=month,
+            is_stable_weather=is_stable_weather
         )
         
-        # 1回のLLM呼び出しで選択と生成を実行
-        response = llm_manager.generate(unified_prompt)
-        
-        # レスポンスの解析
-        result = parse_unified_response(response)
-        
-        # 選択されたコメントペアを取得
-        weather_idx = result.get("selected_weather_index", 0)
-        advice_idx = result.get("selected_advice_index", 0)
-        
-        # LLMがnullを返した場合の処理
-        if weather_idx is None:
-            logger.warning("LLMがweather_indexにnullを返しました。デフォルト値0を使用します。")
-            weather_idx = 0
-        if advice_idx is None:
-            logger.warning("LLMがadvice_indexにnullを返しました。デフォルト値0を使用します。")
-            advice_idx = 0
+        if not weather_filtered:
+            logger.warning(f"天気・季節性フィルタリング後の{comment_type}コメントが0件になったため、前のリストを使用")
+            weather_filtered = filtered
+        else:
+            logger.info(f"天気・季節性フィルタリング後の{comment_type}コメント数: {len(weather_filtered)}")
+            filtered = weather_filtered
+        
+        # Step 3: 温度バリデーション
+        temp_filtered = []
+        for comment in filtered:
+            is_valid, reason = temp_validator.validate(comment, weather_data)
+            if is_valid:
+                temp_filtered.append(comment)
+            else:
+                logger.info(f"温度バリデーターで{comment_type}コメントを除外: {reason}")
+        
+        if not temp_filtered:
+            logger.warning(f"温度バリデーション後の{comment_type}コメントが0件になったため、フィルタリング前のリストを使用")
+            return filtered
+        else:
+            logger.info(f"温度バリデーション後の{comment_type}コメント数: {len(temp_filtered)}")
+            return temp_filtered
+    
+    # 統合フィルタリングパイプラインを適用
+    weather_comments = apply_unified_filters(weather_comments, "天気")
+    advice_comments = apply_unified_filters(advice_comments, "アドバイス")
+    
+    # LLMマネージャーの初期化
+    from src.config.config import get_config
+    config = get_config()
+    llm_manager = LLMManager(provider=llm_provider, config=config)
+    
+    # 熱中症フィルタリングはWeatherCommentFilterに統合済み
+    
+    # 天気に応じたコメントのフィルタリング
+    if hasattr(weather_data, 'weather_description') and '雨' in weather_data.weather_description:
+        precipitation = getattr(weather_data, 'precipitation', 0)
+        if precipitation is None:
+            precipitation = 0
+        logger.info(f"雨の天気（降水量: {precipitation}mm）のため、適切なコメントを選択")
+        
+        # 降水量に応じて適切なコメントを選択
+        original_weather_comments = weather_comments.copy()  # フィルタリング前のリストを保存
+        
+        if precipitation >= PRECIP.HEAVY:  # 大雨閾値以上
+            logger.info("大雨のため、大雨・豪雨関連のコメントを優先")
+            weather_comments = [c for c in original_weather_comments if c.weather_condition in ['大雨', '嵐', '雷']]
+            if not weather_comments:  # 大雨コメントがない場合は通常の雨コメントも含める
+                weather_comments = [c for c in original_weather_comments if c.weather_condition in ['雨', '大雨', '嵐', '雷']]
+        elif precipitation >= PRECIP.LIGHT_RAIN:  # 軽い雨閾値以上
+            logger.info("通常の雨のため、雨関連のコメントを選択")
+            weather_comments = [c for c in original_weather_comments if c.weather_condition in ['雨', '大雨', '雷']]
+        else:  # 2mm未満は小雨
+            logger.info(f"小雨（{precipitation}mm）のため、雨のコメントのみ選択")
+            weather_comments = [c for c in original_weather_comments if c.weather_condition == '雨']  # 雨のコメントのみ
         
-        # 空リストチェックを含む安全なインデックスアクセス
         if not weather_comments:
-            logger.error("天気コメントが空です")
-            raise ValueError("天気コメントが利用可能ではありません")
-        if not advice_comments:
-            logger.error("アドバイスコメントが空です")
-            raise ValueError("アドバイスコメントが利用可能ではありません")
-        
-        # 安全なインデックスアクセス
-        # min()を使用してインデックスが範囲外の場合は最後の要素を選択
-        selected_weather = weather_comments[min(weather_idx, len(weather_comments) - 1)]
-        selected_advice = advice_comments[min(advice_idx, len(advice_comments) - 1)]
-        
-        # CommentPairの作成
-        selected_pair = CommentPair(
-            weather_comment=selected_weather,
-            advice_comment=selected_advice,
-            similarity_score=1.0,  # 統一モードでは常に最適として扱う
-            selection_reason="統一モードによる自動選択"
-        )
-        
-        # LLMの応答を確認（デバッグ用）
-        weather_comment = result.get("weather_comment", "")
-        advice_comment = result.get("advice_comment", "")
-        logger.debug(f"LLMの応答 - 天気: {weather_comment}, アドバイス: {advice_comment}")
-        
-        # 常に選択されたコメントの結合を使用（LLMが創作しないように）
-        weather_text = selected_weather.comment_text
-        advice_text = selected_advice.comment_text
-        
-        # 安全性チェック
-        weather_text, advice_text = check_and_fix_weather_comment_safety(
-            weather_data, weather_text, advice_text, state
-        )
-        
-        # 重複除去
-        weather_text, advice_text = CommentDeduplicator.deduplicate_comment(weather_text, advice_text)
-        
-        # 最終的なコメントは必ず選択されたコメントの結合
-        generated_comment = f"{weather_text}　{advice_text}"
-        
-        # NGワードチェック
-        ng_check = check_ng_words(generated_comment)
-        if not ng_check["is_valid"]:
-            logger.warning(f"NGワードが検出されました: {ng_check['found_words']}")
-            # NGワードは既に適切に処理されているはずなので、そのまま使用
-            # （重複除去済みのコメントを維持）
-        
-        # 状態の更新
-        state.selected_pair = selected_pair
-        state.generated_comment = generated_comment
-        state.final_comment = generated_comment
-        
-        # メタデータの更新
-        generation_metadata = state.generation_metadata or {}
-        generation_metadata.update({
-            "unified_generation": True,
-            "selected_weather_index": weather_idx,
-            "selected_advice_index": advice_idx,
-            "selected_weather_comment": selected_weather.comment_text,
-            "selected_advice_comment": selected_advice.comment_text,
-            "llm_provider": llm_provider,
-            "generation_method": "unified",
-            "weather_comments_count": len(weather_comments),
-            "advice_comments_count": len(advice_comments),
-            "is_continuous_rain": is_continuous_rain
-        })
-        state.generation_metadata = generation_metadata
-        
-        logger.info(f"統合生成完了 - 天気: {selected_weather.comment_text}, アドバイス: {selected_advice.comment_text}")
-        logger.info(f"最終コメント: {generated_comment}")
-        
-        return state
-        
-    except Exception as e:
-        logger.error(f"統合コメント生成エラー: {str(e)}", exc_info=True)
-        state.errors = state.errors or []
-        state.errors.append(f"UnifiedCommentGenerationNode: {str(e)}")
-        state.is_candidate_suitable = False
-        return state 
+            logger.warning("適切な雨関連のコメントが見つかりません。全コメントを使用します。")
+            weather_comments = [c for c in past_comments if c.comment_type == CommentType.WEATHER_COMMENT]
+            weather_comments = filter_forbidden_phrases(weather_comments)
+    
+    # 連続雨判定
+    is_continuous_rain = check_continuous_rain(state)
+    
+    # 連続雨の場合、「にわか雨」を含むコメントをフィルタリング
+    if is_continuous_rain:
+        logger.info("連続雨を検出 - にわか雨表現を含むコメントをフィルタリング")
+        
+        # フィルタリング前のログ
+        logger.info(f"フィルタリング前 - 天気コメント数: {len(weather_comments)}")
+        logger.info(f"フィルタリング前 - アドバイスコメント数: {len(advice_comments)}")
+        
+        # アドバイスコメントの内容を確認
+        logger.info("フィルタリング前のアドバイスコメント:")
+        for i, comment in enumerate(advice_comments[:COMMENT.CANDIDATE_LIMIT]):
+            logger.info(f"  {i}: {comment.comment_text}")
+        
+        weather_comments = filter_shower_comments(weather_comments)
+        advice_comments = filter_mild_umbrella_comments(advice_comments)
+        
+        # フィルタリング後のログ
+        logger.info(f"フィルタリング後 - 天気コメント数: {len(weather_comments)}")
+        logger.info(f"フィルタリング後 - アドバイスコメント数: {len(advice_comments)}")
+        
+        # フィルタリング後のアドバイスコメントの内容を確認
+        logger.info("フィルタリング後のアドバイスコメント:")
+        for i, comment in enumerate(advice_comments[:COMMENT.CANDIDATE_LIMIT]):
+            logger.info(f"  {i}: {comment.comment_text}")
+    
+    # 天気情報のフォーマット
+    weather_info = format_weather_info(
+        weather_data, 
+        state.generation_metadata.get('temperature_differences') if state.generation_metadata else None,
+        state.generation_metadata.get('weather_trend') if state.generation_metadata else None
+    )
+    
+    # 統合プロンプトの構築
+    # パフォーマンス最適化のため候補数を制限
+    unified_prompt = build_unified_prompt(
+        weather_comments[:COMMENT.OPTIMIZED_CANDIDATE_LIMIT],  # 上位5件に制限（パフォーマンス最適化）
+        advice_comments[:COMMENT.OPTIMIZED_CANDIDATE_LIMIT],   # 上位5件に制限（パフォーマンス最適化）
+        weather_info,
+        location_name,
+        target_datetime
+    )
+
+    return _UnifiedGenerationContext(
+        weather_data=weather_data,
+        weather_comments=weather_comments,
+        advice_comments=advice_comments,
+        llm_manager=llm_manager,
+        llm_provider=llm_provider,
+        prompt=unified_prompt,
+        is_continuous_rain=is_continuous_rain,
+        target_datetime=target_datetime,
+    )
+
+
+def _get_cached_response(context: _UnifiedGenerationContext) -> tuple[str | None, str | None]:
+    """キャッシュキーとキャッシュ済みの応答を取得（キャッシュ無効時は両方None）"""
+    cache = get_llm_response_cache()
+    if cache is None:
+        return None, None
+    # プロンプトは地点名に応じた地域性の考慮を求めるため、地点名の行もキーに含める
+    cache_key = make_cache_key(context.llm_provider, context.llm_manager.model, context.prompt)
+    response = cache.get(cache_key)
+    if response is not None:
+        logger.info("統合生成: キャッシュ済みのLLM応答を使用")
+    return cache_key, response
+
+
+def _store_response(cache_key: str | None, context: _UnifiedGenerationContext, response: str) -> None:
+    """解析に成功した応答を予報対象日の終わりまでキャッシュ"""
+    cache = get_llm_response_cache()
+    if cache is None or cache_key is None:
+        return
+    parsed = context.parsed_response
+    if not parsed or parsed.get("selection_reason") == _PARSE_FALLBACK_REASON:
+        return
+    cache.set(
+        cache_key,
+        response,
+        expires_at=end_of_forecast_day(context.target_datetime),
+        provider=context.llm_provider,
+        model=context.llm_manager.model,
+    )
+
+
+def _apply_unified_response(
+    state: CommentGenerationState, context: _UnifiedGenerationContext, response: str,
+    cached: bool = False
+) -> CommentGenerationState:
+    """LLMの応答から選択されたコメントペアを確定し、状態を更新する"""
+    weather_data = context.weather_data
+    weather_comments = context.weather_comments
+    advice_comments = context.advice_comments
+    llm_provider = context.llm_provider
+    is_continuous_rain = context.is_continuous_rain
+    
+    # レスポンスの解析
+    result = parse_unified_response(response)
+    context.parsed_response = result
+    
+    # 選択されたコメントペアを取得
+    weather_idx = result.get("selected_weather_index", 0)
+    advice_idx = result.get("selected_advice_index", 0)
+    
+    # LLMがnullを返した場合の処理
+    if weather_idx is None:
+        logger.warning("LLMがweather_indexにnullを返しました。デフォルト値0を使用します。")
+        weather_idx = 0
+    if advice_idx is None:
+        logger.warning("LLMがadvice_indexにnullを返しました。デフォルト値0を使用します。")
+        advice_idx = 0
+    
+    # 空リストチェックを含む安全なインデックスアクセス
+    if not weather_comments:
+        logger.error("天気コメントが空です")
+        raise ValueError("天気コメントが利用可能ではありません")
+    if not advice_comments:
+        logger.error("アドバイスコメントが空です")
+        raise ValueError("アドバイスコメントが利用可能ではありません")
+    
+    # 安全なインデックスアクセス
+    # min()を使用してインデックスが範囲外の場合は最後の要素を選択
+    selected_weather = weather_comments[min(weather_idx, len(weather_comments) - 1)]
+    selected_advice = advice_comments[min(advice_idx, len(advice_comments) - 1)]
+    
+    # CommentPairの作成
+    selected_pair = CommentPair(
+        weather_comment=selected_weather,
+        advice_comment=selected_advice,
+        similarity_score=1.0,  # 統一モードでは常に最適として扱う
+        selection_reason="統一モードによる自動選択"
+    )
+    
+    # LLMの応答を確認（デバッグ用）
+    weather_comment = result.get("weather_comment", "")
+    advice_comment = result.get("advice_comment", "")
+    logger.debug(f"LLMの応答 - 天気: {weather_comment}, アドバイス: {advice_comment}")
+    
+    # 常に選択されたコメントの結合を使用（LLMが創作しないように）
+    weather_text = selected_weather.comment_text
+    advice_text = selected_advice.comment_text
+    
+    # 安全性チェック
+    weather_text, advice_text = check_and_fix_weather_comment_safety(
+        weather_data, weather_text, advice_text, state
+    )
+    
+    # 重複除去
+    weather_text, advice_text = CommentDeduplicator.deduplicate_comment(weather_text, advice_text)
+    
+    # 最終的なコメントは必ず選択されたコメントの結合
+    generated_comment = f"{weather_text}　{advice_text}"
+    
+    # NGワードチェック
+    ng_check = check_ng_words(generated_comment)
+    if not ng_check["is_valid"]:
+        logger.warning(f"NGワードが検出されました: {ng_check['found_words']}")
+        # NGワードは既に適切に処理されているはずなので、そのまま使用
+        # （重複除去済みのコメントを維持）
+    
+    # 状態の更新
+    state.selected_pair = selected_pair
+    state.generated_comment = generated_comment
+    state.final_comment = generated_comment
+    
+    # メタデータの更新
+    generation_metadata = state.generation_metadata or {}
+    generation_metadata.update({
+        "unified_generation": True,
+        "selected_weather_index": weather_idx,
+        "selected_advice_index": advice_idx,
+        "selected_weather_comment": selected_weather.comment_text,
+        "selected_advice_comment": selected_advice.comment_text,
+        "llm_provider": llm_provider,
+        "generation_method": "unified",
+        "weather_comments_count": len(weather_comments),
+        "advice_comments_count": len(advice_comments),
+        "is_continuous_rain": is_continuous_rain,
+        "llm_response_cached": cached
+    })
+    state.generation_metadata = generation_metadata
+    
+    logger.info(f"統合生成完了 - 天気: {selected_weather.comment_text}, アドバイス: {selected_advice.comment_text}")
+    logger.info(f"最終コメント: {generated_comment}")
+    
+    return state
@@ -8,7 +8,6 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timedelta
 from typing import Any
-import pytz
 
 from src.apis.wxtech import WxTechAPIError
 from src.apis.wxtech.cached_client import CachedWxTechAPIClient
@@ -174,34 +173,5 @@ class WeatherDataFetcher:
         Returns:
             抽出された予報のリスト
         """
-        # JST タイムゾーンの設定
-        jst = pytz.timezone("Asia/Tokyo")
-        
-        # 対象時刻のリスト
-        target_times = [
-            jst.localize(datetime.combine(target_date, datetime.min.time().replace(hour=hour))) 
-            for hour in target_hours
-        ]
-        
-        # 各対象時刻に最も近い予報を抽出
-        period_forecasts = []
-        for target_time in target_times:
-            closest_forecast = None
-            min_diff = float('inf')
-            
-            for forecast in forecast_collection.forecasts:
-                # forecastのdatetimeがnaiveな場合はJSTとして扱う
-                forecast_dt = forecast.datetime
-                if forecast_dt.tzinfo is None:
-                    forecast_dt = jst.localize(forecast_dt)
-                
-                # 目標時刻との差を計算
-                diff = abs((forecast_dt - target_time).total_seconds())
-                if diff < min_diff:
-                    min_diff = diff
-                    closest_forecast = forecast
-            
-            if closest_forecast:
-                period_forecasts.append(closest_forecast)
-        
-        return period_forecasts
\ No newline at end of file
+        # 各対象時刻に最も近い予報を時刻インデックスから抽出
+        return forecast_collection.get_forecasts_at_hours(target_date, target_hours)
@@ -9,8 +9,10 @@ import os
 from datetime import datetime
 from typing import Any
 
+from src.apis.wxtech.grid import describe_freshness
 from src.config.config import get_config
-from src.config.config_loader import load_config
+from src.data.forecast_time_index import load_date_boundary_hour
+from src.data.weather_data import WeatherForecastCollection
 from src.nodes.weather_forecast.service_factory import WeatherForecastServiceFactory
 
 logger = logging.getLogger(__name__)
@@ -109,8 +111,7 @@ class WeatherForecastNodeHandler:
         
         # 設定の読み込み
         config = get_config()
-        weather_config = load_config('weather_thresholds', validate=False)
-        date_boundary_hour = weather_config.get('generation', {}).get('date_boundary_hour', 6)
+        date_boundary_hour = load_date_boundary_hour()
         
         import pytz
         jst = pytz.timezone("Asia/Tokyo")
@@ -166,6 +167,9 @@ class WeatherForecastNodeHandler:
         # 状態の更新
         state.weather_data = selected_forecast
         state.update_metadata("forecast_collection", forecast_collection)
+        if isinstance(forecast_collection, WeatherForecastCollection):
+            # 期限切れのキャッシュを返した場合も分かるよう、予報の鮮度を記録する
+            state.update_metadata("forecast_freshness", describe_freshness(forecast_collection))
         state.location = location
         state.update_metadata("location_coordinates", {"latitude": lat, "longitude": lon})
         state.update_metadata("temperature_differences", temperature_differences)
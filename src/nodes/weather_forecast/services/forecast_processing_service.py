@@ -7,8 +7,9 @@ Forecast processing service for weather forecast node
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 import pytz
+from src.data.forecast_time_index import ForecastTimeIndex, get_target_date
 from src.data.weather_data import WeatherForecast, WeatherForecastCollection
 from src.data.weather_trend import WeatherTrend
 from src.nodes.weather_forecast.data_validator import WeatherDataValidator
@@ -38,12 +39,7 @@ class ForecastProcessingService:
         Returns:
             対象日
         """
-        if now_jst.hour < date_boundary_hour:
-            # 深夜〜早朝は当日を対象
-            return now_jst.date()
-        else:
-            # 境界時刻以降は翌日を対象
-            return now_jst.date() + timedelta(days=1)
+        return get_target_date(now_jst, date_boundary_hour)
     
     def extract_period_forecasts(
         self, 
@@ -74,11 +70,10 @@ class ForecastProcessingService:
         period_forecasts = []
         logger.info(f"Total forecasts in collection: {len(forecast_collection.forecasts)}")
         
+        # 解析時に作成した時刻インデックスを使い、各目標時刻を二分探索で引く
+        time_index = forecast_collection.time_index
         for target_time in target_times:
-            closest_forecast = self._find_closest_forecast(
-                forecast_collection.forecasts, 
-                target_time
-            )
+            closest_forecast = time_index.nearest(target_time)
             
             if closest_forecast:
                 period_forecasts.append(closest_forecast)
@@ -108,34 +103,7 @@ class ForecastProcessingService:
         Returns:
             最も近い予報（見つからない場合はNone）
         """
-        closest_forecast = None
-        min_diff = float('inf')
-        
-        # デバッグ: 利用可能な予報時刻を記録
-        available_times = []
-        for forecast in forecasts:
-            forecast_dt = forecast.datetime
-            if forecast_dt.tzinfo is None:
-                forecast_dt = self.jst.localize(forecast_dt)
-            if forecast_dt.date() == target_time.date():
-                available_times.append(forecast_dt.strftime('%H:%M'))
-        
-        if available_times:
-            logger.debug(f"目標時刻 {target_time.strftime('%H:%M')} に対して利用可能な予報時刻: {sorted(available_times)}")
-        
-        for forecast in forecasts:
-            # forecastのdatetimeがnaiveな場合はJSTとして扱う
-            forecast_dt = forecast.datetime
-            if forecast_dt.tzinfo is None:
-                forecast_dt = self.jst.localize(forecast_dt)
-            
-            # 目標時刻との差を計算
-            diff = abs((forecast_dt - target_time).total_seconds())
-            if diff < min_diff:
-                min_diff = diff
-                closest_forecast = forecast
-        
-        return closest_forecast
+        return ForecastTimeIndex(forecasts).nearest(target_time)
     
     def analyze_weather_trend(
         self, 
@@ -12,6 +12,7 @@ import time
 from src.apis.wxtech import WxTechAPIError
 from src.apis.wxtech.cached_client import CachedWxTechAPIClient
 from src.config.config import get_weather_config
+from src.data.forecast_cache.cache_warmer import get_cache_warmer
 from src.data.weather_data import WeatherForecastCollection
 from src.nodes.weather_forecast.constants import (
     API_MAX_RETRIES,
@@ -32,6 +33,13 @@ class WeatherAPIService:
         self.initial_retry_delay = API_INITIAL_RETRY_DELAY
         self.weather_config = get_weather_config()
     
+    def _record_access(self, lat: float, lon: float, location_name: str) -> None:
+        """キャッシュ事前温めのためにアクセスを記録（失敗しても予報取得は続ける）"""
+        try:
+            get_cache_warmer().record_access(location_name, lat, lon)
+        except Exception as e:
+            logger.debug(f"アクセス記録エラー {location_name}: {e}")
+    
     def fetch_forecast_with_retry(
         self, 
         lat: float, 
@@ -52,6 +60,7 @@ class WeatherAPIService:
             WxTechAPIError: API通信エラー（ネットワークエラー、タイムアウト、サーバーエラー等）
             ValueError: データ取得失敗（空のデータ、無効な地点名等）
         """
+        self._record_access(lat, lon, location_name)
         
         retry_delay = self.initial_retry_delay
         forecast_collection = None
@@ -120,6 +129,7 @@ class WeatherAPIService:
             WxTechAPIError: API通信エラー（ネットワークエラー、タイムアウト、サーバーエラー等）
             ValueError: データ取得失敗（空のデータ、無効な地点名等）
         """
+        self._record_access(lat, lon, location_name)
         
         retry_delay = self.initial_retry_delay
         forecast_collection = None
@@ -0,0 +1,334 @@
+"""列指向の過去コメントストア
+
+季節・タイプ別CSVのコメントを、行ごとの PastComment オブジェクトではなく
+列（NumPy配列）と重複排除したテキストテーブルで保持する。
+フィルタリングは行インデックスの配列に対して行い、PastComment への変換は
+ノードが実際に必要とした行だけ遅延して行う。
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import sys
+from array import array
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.data.past_comment import CommentType, PastComment
+from src.repositories.csv_file_handler import CommentParser
+from src.repositories.keyword_feature_index import KeywordFeatureIndex
+
+logger = logging.getLogger(__name__)
+
+COMMENT_TYPES: tuple[CommentType, ...] = (CommentType.WEATHER_COMMENT, CommentType.ADVICE)
+
+
+class ColumnarCommentStore:
+    """配列ベースの過去コメントストア
+
+    各列は以下の通り（行インデックスで対応）:
+        text_ids: テキストテーブルへのインデックス（uint32）
+        condition_ids: 推定天気条件テーブルへのインデックス（uint8）
+        counts: 使用回数（int64）
+        season_codes: 季節テーブルへのインデックス（uint8）
+        type_codes: COMMENT_TYPES へのインデックス（uint8）
+        line_numbers: CSVの行番号（uint32）
+        file_codes: ファイル名テーブルへのインデックス（uint16）
+
+    構築後は不変で、複数スレッドから同時に参照してよい。
+    キーワード特徴インデックス（features）は公開前に build_keyword_features で構築する。
+    """
+
+    def __init__(self, seasons: tuple[str, ...], strings: list[str], conditions: list[str],
+                 files: list[str], columns: dict[str, np.ndarray],
+                 loaded_at: datetime | None = None):
+        self.seasons = tuple(seasons)
+        self._strings = strings
+        self._conditions = conditions
+        self._files = files
+        self.text_ids = columns["text_ids"]
+        self.condition_ids = columns["condition_ids"]
+        self.counts = columns["counts"]
+        self.season_codes = columns["season_codes"]
+        self.type_codes = columns["type_codes"]
+        self.line_numbers = columns["line_numbers"]
+        self.file_codes = columns["file_codes"]
+        self.loaded_at = loaded_at or datetime.now()
+
+        self._season_index = {season: code for code, season in enumerate(self.seasons)}
+        self._materialized: dict[int, PastComment] = {}
+        self.features: KeywordFeatureIndex | None = None
+
+    @classmethod
+    def from_csv_files(cls, output_dir: str | Path, seasons: Iterable[str],
+                       comment_types: Iterable[CommentType] = COMMENT_TYPES,
+                       encoding: str = "utf-8-sig") -> "ColumnarCommentStore":
+        """季節・タイプ別のCSVファイルからストアを構築
+
+        CommentParser.parse_comment_row と同じ規則（空行の除外、文字数の切り詰め、
+        天気条件の推定）で各行を解析するが、行ごとの辞書やオブジェクトは生成しない。
+
+        Args:
+            output_dir: CSVファイルが格納されているディレクトリ
+            seasons: 対象とする季節
+            comment_types: 対象とするコメントタイプ
+            encoding: CSVファイルのエンコーディング
+
+        Returns:
+            構築されたストア
+        """
+        output_dir = Path(output_dir)
+        seasons = tuple(seasons)
+
+        strings: list[str] = []
+        string_ids: dict[str, int] = {}
+        conditions: list[str] = []
+        condition_ids: dict[str, int] = {}
+        files: list[str] = []
+
+        text_col = array("I")
+        condition_col = array("B")
+        count_col = array("q")
+        season_col = array("B")
+        type_col = array("B")
+        line_col = array("I")
+        file_col = array("H")
+
+        for season_code, season in enumerate(seasons):
+            for comment_type in comment_types:
+                file_path = output_dir / f"{season}_{comment_type.value}_enhanced100.csv"
+                if not file_path.exists():
+                    logger.debug(f"File not found: {file_path}")
+                    continue
+
+                try:
+                    with open(file_path, "r", encoding=encoding, newline="") as f:
+                        reader = csv.reader(f)
+                        header = next(reader, None)
+                        if not header or comment_type.value not in header:
+                            logger.warning(f"Invalid CSV headers in {file_path}, expected columns: [{comment_type.value!r}]")
+                            continue
+
+                        text_index = header.index(comment_type.value)
+                        count_index = header.index("count") if "count" in header else None
+                        file_code = len(files)
+                        files.append(file_path.name)
+                        type_code = COMMENT_TYPES.index(comment_type)
+
+                        for line_number, row in enumerate(reader, start=2):
+                            raw_text = row[text_index] if text_index < len(row) else ""
+                            if not raw_text or raw_text.strip() == "":
+                                continue
+
+                            raw_count = row[count_index] if count_index is not None and count_index < len(row) else "0"
+                            count = CommentParser._parse_count(raw_count, line_number)
+                            raw_text = CommentParser._validate_comment_length(raw_text, file_path, line_number)
+                            condition = CommentParser._infer_weather_condition(raw_text, comment_type.value)
+                            text = PastComment._clean_text(raw_text.strip())
+
+                            text_id = string_ids.get(text)
+                            if text_id is None:
+                                text_id = len(strings)
+                                strings.append(sys.intern(text))
+                                string_ids[text] = text_id
+
+                            condition_id = condition_ids.get(condition)
+                            if condition_id is None:
+                                condition_id = len(conditions)
+                                conditions.append(condition)
+                                condition_ids[condition] = condition_id
+
+                            text_col.append(text_id)
+                            condition_col.append(condition_id)
+                            count_col.append(count)
+                            season_col.append(season_code)
+                            type_col.append(type_code)
+                            line_col.append(line_number)
+                            file_col.append(file_code)
+                except Exception as e:
+                    logger.error(f"Error reading CSV file {file_path}: {e}")
+
+        columns = {
+            "text_ids": np.frombuffer(text_col, dtype=np.uint32),
+            "condition_ids": np.frombuffer(condition_col, dtype=np.uint8),
+            "counts": np.frombuffer(count_col, dtype=np.int64),
+            "season_codes": np.frombuffer(season_col, dtype=np.uint8),
+            "type_codes": np.frombuffer(type_col, dtype=np.uint8),
+            "line_numbers": np.frombuffer(line_col, dtype=np.uint32),
+            "file_codes": np.frombuffer(file_col, dtype=np.uint16),
+        }
+        store = cls(seasons, strings, conditions, files, columns)
+        logger.info(f"Columnar comment store built: {len(store)} rows, {len(strings)} unique texts")
+        return store
+
+    def __len__(self) -> int:
+        return len(self.text_ids)
+
+    # --- 行インデックスの選択・フィルタリング ---
+
+    def select(self, seasons: Iterable[str] | None = None,
+               comment_type: CommentType | None = None) -> np.ndarray:
+        """条件に一致する行インデックスを取得（CSVの並び順を維持）
+
+        Args:
+            seasons: 対象とする季節（省略時は全季節）
+            comment_type: 対象とするコメントタイプ（省略時は全タイプ）
+
+        Returns:
+            行インデックスの配列
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if seasons is not None:
+            codes = [self._season_index[s] for s in seasons if s in self._season_index]
+            mask &= np.isin(self.season_codes, codes)
+        if comment_type is not None:
+            if comment_type not in COMMENT_TYPES:
+                return np.empty(0, dtype=np.intp)
+            mask &= self.type_codes == COMMENT_TYPES.index(comment_type)
+        return np.flatnonzero(mask)
+
+    def filter(self, indices: Iterable[int], predicate: Callable[[str], bool]) -> np.ndarray:
+        """テキストに対する述語で行インデックスを絞り込む
+
+        同じテキストが複数行にある場合、述語の評価は1回だけ行う。
+
+        Args:
+            indices: 対象の行インデックス
+            predicate: テキストを受け取り、残す場合にTrueを返す関数
+
+        Returns:
+            述語を満たす行インデックスの配列
+        """
+        results: dict[int, bool] = {}
+        kept = []
+        for index in indices:
+            text_id = int(self.text_ids[index])
+            keep = results.get(text_id)
+            if keep is None:
+                keep = bool(predicate(self._strings[text_id]))
+                results[text_id] = keep
+            if keep:
+                kept.append(index)
+        return np.asarray(kept, dtype=np.intp)
+
+    def build_keyword_features(self, matcher: Any) -> KeywordFeatureIndex:
+        """全ユニークテキストのキーワード特徴ビットセットを構築して保持する
+
+        Args:
+            matcher: キーワード照合エンジン（KeywordMatcher）
+
+        Returns:
+            構築された特徴インデックス
+        """
+        self.features = KeywordFeatureIndex.build(self, matcher)
+        return self.features
+
+    # --- 列の参照 ---
+
+    @property
+    def unique_texts(self) -> list[str]:
+        """重複排除したテキストテーブル（text_ids の参照先）"""
+        return self._strings
+
+    def text(self, index: int) -> str:
+        """行のコメントテキストを取得"""
+        return self._strings[self.text_ids[index]]
+
+    def texts(self, indices: Iterable[int]) -> list[str]:
+        """複数行のコメントテキストを取得"""
+        strings = self._strings
+        return [strings[text_id] for text_id in self.text_ids[np.asarray(indices, dtype=np.intp)]]
+
+    def weather_condition(self, index: int) -> str:
+        """行の推定天気条件を取得"""
+        return self._conditions[self.condition_ids[index]]
+
+    def season(self, index: int) -> str:
+        """行の季節を取得"""
+        return self.seasons[self.season_codes[index]]
+
+    def comment_type(self, index: int) -> CommentType:
+        """行のコメントタイプを取得"""
+        return COMMENT_TYPES[self.type_codes[index]]
+
+    # --- PastComment への変換 ---
+
+    def materialize(self, index: int) -> PastComment:
+        """行を PastComment に変換（一度変換した行は同じオブジェクトを返す）"""
+        index = int(index)
+        comment = self._materialized.get(index)
+        if comment is not None:
+            return comment
+
+        condition = self.weather_condition(index)
+        comment = PastComment(
+            location="全国",  # CSVには地点情報がない
+            datetime=self.loaded_at,
+            weather_condition=condition,
+            comment_text=self.text(index),
+            comment_type=self.comment_type(index),
+            raw_data={
+                'count': int(self.counts[index]),
+                'source': 'local_csv',
+                'file': self._files[self.file_codes[index]],
+                'line': int(self.line_numbers[index]),
+                'season': self.season(index),
+                'inferred_weather': condition,
+                'row_index': index,
+            }
+        )
+        # 並行して変換された場合も最初に登録されたオブジェクトを共有する
+        return self._materialized.setdefault(index, comment)
+
+    def materialize_many(self, indices: Iterable[int]) -> list[PastComment]:
+        """複数行を PastComment に変換"""
+        return [self.materialize(index) for index in indices]
+
+    @staticmethod
+    def row_index_of(comment: PastComment) -> int | None:
+        """このストアから変換された PastComment の行インデックスを取得"""
+        raw_data = getattr(comment, "raw_data", None) or {}
+        return raw_data.get("row_index")
+
+    def rows_of(self, comments: Iterable[PastComment]) -> np.ndarray | None:
+        """PastComment のリストをこのストアの行インデックスに変換
+
+        全てのコメントがこのストアの materialize で生成されたオブジェクトの場合のみ変換する。
+
+        Returns:
+            行インデックスの配列。このストア由来でないコメントが含まれる場合は None
+        """
+        rows = []
+        materialized = self._materialized
+        for comment in comments:
+            row = self.row_index_of(comment)
+            if row is None or materialized.get(row) is not comment:
+                return None
+            rows.append(row)
+        return np.asarray(rows, dtype=np.intp)
+
+    # --- 統計 ---
+
+    def memory_usage_bytes(self) -> int:
+        """列とテキストテーブルの推定メモリ使用量（変換済みオブジェクトは除く）"""
+        columns = (self.text_ids, self.condition_ids, self.counts, self.season_codes,
+                   self.type_codes, self.line_numbers, self.file_codes)
+        total = sum(column.nbytes for column in columns)
+        total += sys.getsizeof(self._strings) + sum(sys.getsizeof(s) for s in self._strings)
+        total += sum(sys.getsizeof(s) for s in self._conditions + self._files)
+        return total
+
+    def get_statistics(self) -> dict[str, Any]:
+        """統計情報を取得"""
+        return {
+            "rows": len(self),
+            "unique_texts": len(self._strings),
+            "materialized": len(self._materialized),
+            "memory_usage_bytes": self.memory_usage_bytes(),
+            "keyword_features": self.features.get_statistics() if self.features else None,
+        }
@@ -140,6 +140,14 @@ class CommentCache:
         """
         return self._multilevel_cache.invalidate(comment_type, season, region)
     
+    def invalidate_all_multilevel(self) -> dict[str, int]:
+        """マルチレベルキャッシュ全体を世代番号の更新で無効化（CSVの再読み込み時など）
+        
+        Returns:
+            各レベルの新しい世代番号
+        """
+        return self._multilevel_cache.invalidate_all()
+    
     def get_multilevel_stats(self) -> dict[str, Any]:
         """マルチレベルキャッシュの統計情報を取得"""
         return self._multilevel_cache.get_stats()
@@ -0,0 +1,308 @@
+"""プロセス全体で共有する過去コメントコーパス
+
+季節・タイプ別のCSVファイルを一度だけ読み込んで解析し、不変のスナップショットとして
+全リクエストで共有する。CSVファイルの更新（mtimeの変化）を検出した場合は
+新しいスナップショットを構築し、参照を差し替えることでアトミックに再読み込みする。
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
+
+import numpy as np
+
+from src.data.past_comment import CommentType, PastComment
+from src.repositories.columnar_comment_store import ColumnarCommentStore
+from src.utils.keyword_matcher import get_keyword_matcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEASONS = ("春", "夏", "秋", "冬", "梅雨", "台風")
+DEFAULT_COMMENT_TYPES = (CommentType.WEATHER_COMMENT, CommentType.ADVICE)
+
+# 月ごとの関連季節マッピング
+SEASON_MAPPING: Mapping[int, tuple[str, ...]] = MappingProxyType({
+    1: ("冬",),  # 1月
+    2: ("冬",),  # 2月
+    3: ("冬", "春"),  # 3月（季節の変わり目）
+    4: ("春",),  # 4月
+    5: ("春", "梅雨"),  # 5月（梅雨の始まり）
+    6: ("梅雨", "夏"),  # 6月
+    7: ("夏", "梅雨", "台風"),  # 7月
+    8: ("夏", "台風"),  # 8月
+    9: ("夏", "台風", "秋"),  # 9月
+    10: ("秋", "台風"),  # 10月
+    11: ("秋",),  # 11月
+    12: ("冬",),  # 12月
+})
+
+
+def get_relevant_seasons(month: int) -> list[str]:
+    """月から関連する季節のリストを取得"""
+    return list(SEASON_MAPPING.get(month, ("春", "夏", "秋", "冬")))
+
+
+@dataclass(frozen=True)
+class CommentCorpusSnapshot:
+    """ある時点のコメントコーパスの不変スナップショット
+
+    コメントは列指向ストアに保持し、(季節, コメントタイプ) ごとの行インデックスで分割する。
+    PastComment への変換は参照された行だけ遅延して行う。
+
+    Attributes:
+        store: 列指向のコメントストア
+        partitions: (季節, コメントタイプ) ごとの行インデックス配列
+        file_mtimes: 読み込み時点の各CSVファイルのmtime（ナノ秒、存在しない場合はNone）
+        loaded_at: 読み込み時刻（UNIX時間）
+    """
+
+    store: ColumnarCommentStore
+    partitions: Mapping[tuple[str, CommentType], np.ndarray]
+    file_mtimes: Mapping[Path, int | None]
+    loaded_at: float = field(default_factory=time.time)
+
+    def get_indices(self, season: str, comment_type: CommentType) -> np.ndarray:
+        """指定された季節・タイプの行インデックスを取得"""
+        indices = self.partitions.get((season, comment_type))
+        if indices is None:
+            return np.empty(0, dtype=np.intp)
+        return indices
+
+    def get(self, season: str, comment_type: CommentType) -> tuple[PastComment, ...]:
+        """指定された季節・タイプのコメントを取得"""
+        return tuple(self.store.materialize_many(self.get_indices(season, comment_type)))
+
+    @property
+    def total_comments(self) -> int:
+        """コメントの総数"""
+        return len(self.store)
+
+
+class SharedCommentCorpus:
+    """プロセス全体で共有する読み取り専用のコメントコーパス
+
+    返却されるPastCommentオブジェクトは全リクエストで共有されるため、
+    呼び出し側で変更してはならない。
+
+    定常状態ではファイルI/Oは発生せず、mtimeの確認も check_interval 秒に1回に抑える。
+    """
+
+    def __init__(self, output_dir: str | Path = "output",
+                 seasons: tuple[str, ...] = DEFAULT_SEASONS,
+                 comment_types: tuple[CommentType, ...] = DEFAULT_COMMENT_TYPES,
+                 check_interval: float = 5.0):
+        """
+        Args:
+            output_dir: CSVファイルが格納されているディレクトリ
+            seasons: 対象とする季節
+            comment_types: 対象とするコメントタイプ
+            check_interval: CSVファイルの更新確認間隔（秒）
+        """
+        self.output_dir = Path(output_dir)
+        self.seasons = tuple(seasons)
+        self.comment_types = tuple(comment_types)
+        self.check_interval = check_interval
+
+        self._snapshot: CommentCorpusSnapshot | None = None
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+        self._reload_count = 0
+
+    def _get_csv_file_path(self, season: str, comment_type: CommentType) -> Path:
+        """CSVファイルのパスを生成"""
+        return self.output_dir / f"{season}_{comment_type.value}_enhanced100.csv"
+
+    def _stat_files(self) -> dict[Path, int | None]:
+        """全CSVファイルのmtimeを取得"""
+        mtimes: dict[Path, int | None] = {}
+        for season in self.seasons:
+            for comment_type in self.comment_types:
+                path = self._get_csv_file_path(season, comment_type)
+                try:
+                    mtimes[path] = path.stat().st_mtime_ns
+                except OSError:
+                    mtimes[path] = None
+        return mtimes
+
+    def _build_snapshot(self, mtimes: dict[Path, int | None]) -> CommentCorpusSnapshot:
+        """全CSVファイルを読み込んでスナップショットを構築"""
+        store = ColumnarCommentStore.from_csv_files(self.output_dir, self.seasons, self.comment_types)
+        try:
+            # フィルタリング用のキーワード特徴はスナップショット公開前に計算しておく
+            store.build_keyword_features(get_keyword_matcher())
+        except Exception as e:
+            logger.error(f"Failed to build keyword feature index: {e}")
+        partitions: dict[tuple[str, CommentType], np.ndarray] = {}
+        for season in self.seasons:
+            for comment_type in self.comment_types:
+                indices = store.select([season], comment_type)
+                indices.flags.writeable = False
+                partitions[(season, comment_type)] = indices
+
+        snapshot = CommentCorpusSnapshot(
+            store=store,
+            partitions=MappingProxyType(partitions),
+            file_mtimes=MappingProxyType(mtimes),
+        )
+        logger.info(f"Comment corpus loaded: {snapshot.total_comments} comments from {self.output_dir}")
+        return snapshot
+
+    def _reload_if_changed(self) -> CommentCorpusSnapshot:
+        """CSVファイルが更新されていれば再読み込み"""
+        with self._reload_lock:
+            snapshot = self._snapshot
+            # 他のスレッドが確認済みの場合はそのまま返す
+            if snapshot is not None and time.monotonic() - self._last_check < self.check_interval:
+                return snapshot
+
+            mtimes = self._stat_files()
+            if snapshot is None or dict(snapshot.file_mtimes) != mtimes:
+                if snapshot is not None:
+                    logger.info("Comment CSV files changed, reloading corpus")
+                snapshot = self._build_snapshot(mtimes)
+                # 参照の差し替えはアトミック。読み込み中のリクエストは旧スナップショットを使い続ける
+                self._snapshot = snapshot
+                self._reload_count += 1
+
+            self._last_check = time.monotonic()
+            return snapshot
+
+    def get_snapshot(self) -> CommentCorpusSnapshot:
+        """現在のスナップショットを取得"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._last_check < self.check_interval:
+            return snapshot
+        return self._reload_if_changed()
+
+    def get_comments(self, season: str, comment_type: CommentType) -> tuple[PastComment, ...]:
+        """指定された季節・タイプのコメントを取得"""
+        return self.get_snapshot().get(season, comment_type)
+
+    def get_recent_indices(self, seasons: list[str] | None = None, limit: int = 100,
+                           snapshot: CommentCorpusSnapshot | None = None) -> np.ndarray:
+        """各季節・タイプから均等に選んだコメントの行インデックスを取得
+
+        Args:
+            seasons: 対象とする季節（省略時は全季節）
+            limit: 最大取得数
+            snapshot: 対象のスナップショット（省略時は現在のスナップショット）。
+                行インデックスはスナップショットのストアに対してのみ有効
+
+        Returns:
+            行インデックス配列
+        """
+        snapshot = snapshot or self.get_snapshot()
+        target_seasons = seasons or list(self.seasons)
+
+        comments_per_category = limit // (len(target_seasons) * len(self.comment_types))
+        if comments_per_category < 1:
+            comments_per_category = 1
+
+        selected: list[np.ndarray] = []
+        total = 0
+        for season in target_seasons:
+            for comment_type in self.comment_types:
+                indices = snapshot.get_indices(season, comment_type)[:comments_per_category]
+                selected.append(indices)
+                total += len(indices)
+                if total >= limit:
+                    return np.concatenate(selected)[:limit]
+
+        return np.concatenate(selected) if selected else np.empty(0, dtype=np.intp)
+
+    def get_recent_comments(self, seasons: list[str] | None = None, limit: int = 100) -> list[PastComment]:
+        """各季節・タイプから均等にコメントを取得
+
+        LazyCommentRepository.get_recent_comments と同じ選択結果を返す。
+        選択された行だけを PastComment に変換する。
+
+        Args:
+            seasons: 対象とする季節（省略時は全季節）
+            limit: 最大取得数
+
+        Returns:
+            コメントのリスト（リスト自体は呼び出し側で自由に変更してよい）
+        """
+        snapshot = self.get_snapshot()
+        return snapshot.store.materialize_many(self.get_recent_indices(seasons, limit, snapshot))
+
+    def reload(self) -> CommentCorpusSnapshot:
+        """強制的に再読み込み"""
+        with self._reload_lock:
+            snapshot = self._build_snapshot(self._stat_files())
+            self._snapshot = snapshot
+            self._reload_count += 1
+            self._last_check = time.monotonic()
+            return snapshot
+
+    def get_statistics(self) -> dict[str, Any]:
+        """統計情報を取得"""
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "total_comments": snapshot.total_comments if snapshot else 0,
+            "reload_count": self._reload_count,
+            "loaded_at": snapshot.loaded_at if snapshot else None,
+            "partitions": {
+                f"{season}_{comment_type.value}": len(indices)
+                for (season, comment_type), indices in snapshot.partitions.items()
+            } if snapshot else {},
+            "store": snapshot.store.get_statistics() if snapshot else {},
+        }
+
+
+_corpus_instances: dict[Path, SharedCommentCorpus] = {}
+_corpus_lock = threading.Lock()
+
+
+def get_comment_corpus(output_dir: str | Path = "output") -> SharedCommentCorpus:
+    """出力ディレクトリごとの共有コメントコーパスを取得
+
+    Args:
+        output_dir: CSVファイルが格納されているディレクトリ
+
+    Returns:
+        共有コメントコーパス
+    """
+    key = Path(output_dir).absolute()
+    corpus = _corpus_instances.get(key)
+    if corpus is None:
+        with _corpus_lock:
+            corpus = _corpus_instances.get(key)
+            if corpus is None:
+                corpus = SharedCommentCorpus(output_dir=output_dir)
+                _corpus_instances[key] = corpus
+    return corpus
+
+
+def resolve_comment_rows(comments: list[PastComment]) -> tuple[ColumnarCommentStore, np.ndarray] | None:
+    """共有コーパス由来のコメントリストを (ストア, 行インデックス) に変換
+
+    フィルタがキーワード特徴ビットセットを使えるかの判定に使う。
+    再読み込みで古くなったスナップショットのコメントなどは変換できない。
+
+    Returns:
+        (ストア, 行インデックス)。変換できない場合は None
+    """
+    if not comments:
+        return None
+    for corpus in list(_corpus_instances.values()):
+        snapshot = corpus._snapshot
+        if snapshot is None or snapshot.store.features is None:
+            continue
+        rows = snapshot.store.rows_of(comments)
+        if rows is not None:
+            return snapshot.store, rows
+    return None
+
+
+def reset_comment_corpus() -> None:
+    """共有コメントコーパスを破棄（主にテスト用）"""
+    with _corpus_lock:
+        _corpus_instances.clear()
@@ -197,4 +197,38 @@ class CommentParser:
                 return condition
         
         # マッチしない場合は「不明」
-        return "不明"
\ No newline at end of file
+        return "不明"
+
+
+def load_comments_from_csv(file_path: Path, comment_type: str, season: str,
+                           file_handler: CSVFileHandler | None = None) -> list[PastComment]:
+    """季節・タイプ別のCSVファイルを読み込んでPastCommentのリストを返す
+
+    Args:
+        file_path: CSVファイルのパス
+        comment_type: コメントタイプ（weather_comment or advice）
+        season: 季節名
+        file_handler: 使用するファイルハンドラ（省略時は新規作成）
+
+    Returns:
+        解析済みのコメントリスト（ファイルが存在しない・不正な場合は空リスト）
+    """
+    if not file_path.exists():
+        logger.debug(f"File not found: {file_path}")
+        return []
+
+    file_handler = file_handler or CSVFileHandler()
+
+    # ヘッダー検証
+    expected_columns = ['weather_comment'] if comment_type == 'weather_comment' else ['advice']
+    if not file_handler.validate_csv_headers(file_path, expected_columns):
+        logger.warning(f"Invalid CSV headers in {file_path}, expected columns: {expected_columns}")
+        return []
+
+    comments = []
+    for row in file_handler.read_csv_file(file_path):
+        comment = CommentParser.parse_comment_row(row, comment_type, season)
+        if comment:
+            comments.append(comment)
+
+    return comments
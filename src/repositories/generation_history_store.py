@@ -0,0 +1,321 @@
+"""追記専用の生成履歴ストア
+
+生成履歴を1件1行のJSONL形式でセグメントファイルに追記する。
+履歴全体を読み込んで書き戻す処理は行わず、保持件数の上限は古いセグメントの削除で実現する。
+
+    data/generation_history/
+        .lock                       # プロセス間の書き込みロック
+        segment-000001.jsonl
+        segment-000002.jsonl        # 最新のセグメントにのみ追記する
+
+プロセス内では保持中の履歴と地点ごとの最新履歴をメモリに持ち、他のプロセスによる追記は
+セグメントのサイズ変化を確認して差分だけ読み込む。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_DIR = Path("data/generation_history")
+LEGACY_HISTORY_FILE = Path("data/generation_history.json")
+
+_SEGMENT_PATTERN = re.compile(r"^segment-(\d{6})\.jsonl$")
+
+
+class GenerationHistoryStore:
+    """JSONLセグメントによる追記専用の生成履歴ストア
+
+    複数スレッド・複数プロセスからの同時追記に対応する（プロセス間はfcntlのファイルロック）。
+    """
+
+    def __init__(self, directory: str | Path = DEFAULT_HISTORY_DIR,
+                 segment_size: int = 250, max_segments: int = 5, max_entries: int = 1000,
+                 legacy_file: str | Path | None = LEGACY_HISTORY_FILE):
+        """
+        Args:
+            directory: セグメントファイルを格納するディレクトリ
+            segment_size: 1セグメントあたりの最大件数
+            max_segments: 保持するセグメント数の上限（超えた分は古い順に削除）
+            max_entries: 読み込み時に返す最大件数
+            legacy_file: 移行元の旧形式（JSON配列）の履歴ファイル
+        """
+        self.directory = Path(directory)
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.max_entries = max_entries
+        self.legacy_file = Path(legacy_file) if legacy_file else None
+
+        self._lock = threading.RLock()
+        self._entries: deque[dict[str, Any]] = deque(maxlen=max_entries)
+        self._latest: dict[str, dict[str, Any]] = {}
+        # 読み込み済みの状態: セグメント一覧と最新セグメントの読み込み位置
+        self._segments: list[Path] | None = None
+        self._dir_mtime_ns: int | None = None
+        self._active_offset = 0
+        self._active_count = 0
+
+    # --- セグメント管理 ---
+
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"segment-{number:06d}.jsonl"
+
+    def _list_segments(self) -> list[Path]:
+        try:
+            names = [entry.name for entry in os.scandir(self.directory)]
+        except FileNotFoundError:
+            return []
+        numbered = sorted(
+            (int(match.group(1)), name)
+            for name in names
+            if (match := _SEGMENT_PATTERN.match(name))
+        )
+        return [self.directory / name for _, name in numbered]
+
+    @staticmethod
+    def _segment_number(path: Path) -> int:
+        match = _SEGMENT_PATTERN.match(path.name)
+        return int(match.group(1)) if match else 0
+
+    def _dir_mtime(self) -> int | None:
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _read_lines(path: Path, offset: int = 0) -> tuple[list[dict[str, Any]], int]:
+        """offset 以降の完全な行を読み込む（書き込み途中の末尾行は読まない）"""
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+
+        end = data.rfind(b"\n")
+        if end == -1:
+            return [], offset
+
+        items = []
+        for line in data[:end].split(b"\n"):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"履歴の不正な行をスキップしました: {path}")
+        return items, offset + end + 1
+
+    def _remember(self, item: dict[str, Any]) -> None:
+        self._entries.append(item)
+        location = item.get("location")
+        if location:
+            self._latest[location] = item
+
+    def _reload(self) -> None:
+        """全セグメントを読み直す（初回・ローテーション検出時）"""
+        self._entries.clear()
+        self._latest.clear()
+        self._dir_mtime_ns = self._dir_mtime()
+        segments = self._list_segments()
+        self._active_offset = 0
+        self._active_count = 0
+        for path in segments:
+            items, offset = self._read_lines(path)
+            for item in items:
+                self._remember(item)
+            self._active_offset = offset
+            self._active_count = len(items)
+        self._segments = segments
+
+    def _refresh(self) -> None:
+        """他のプロセスによる追記・ローテーションを取り込む"""
+        if self._segments is None or self._dir_mtime() != self._dir_mtime_ns:
+            self._reload()
+            return
+        if not self._segments:
+            return
+
+        active = self._segments[-1]
+        try:
+            size = os.stat(active).st_size
+        except FileNotFoundError:
+            self._reload()
+            return
+        if size > self._active_offset:
+            items, self._active_offset = self._read_lines(active, self._active_offset)
+            for item in items:
+                self._remember(item)
+            self._active_count += len(items)
+
+    def _migrate_legacy(self) -> None:
+        """旧形式のJSON配列ファイルからセグメントへ移行（セグメントが無い場合のみ）"""
+        if self.legacy_file is None or self._list_segments() or not self.legacy_file.exists():
+            return
+        try:
+            with open(self.legacy_file, "r", encoding="utf-8") as f:
+                history = json.load(f)
+        except Exception as e:
+            logger.warning(f"旧形式の履歴ファイルを読み込めませんでした: {self.legacy_file}: {e}")
+            return
+        if not isinstance(history, list):
+            return
+
+        history = history[-self.max_entries:]
+        for start in range(0, len(history), self.segment_size):
+            chunk = history[start:start + self.segment_size]
+            path = self._segment_path(start // self.segment_size + 1)
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(item, ensure_ascii=False) + "\n" for item in chunk)
+        logger.info(f"旧形式の履歴 {len(history)} 件をセグメントへ移行しました: {self.legacy_file}")
+
+    # --- プロセス間ロック ---
+
+    def _acquire_file_lock(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        handle = open(self.directory / ".lock", "a")
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        return handle
+
+    @staticmethod
+    def _release_file_lock(handle) -> None:
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            handle.close()
+
+    # --- 公開API ---
+
+    def append(self, item: dict[str, Any]) -> None:
+        """履歴を1件追記
+
+        Args:
+            item: 履歴データ（JSONシリアライズ可能な辞書）
+        """
+        line = (json.dumps(item, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            handle = self._acquire_file_lock()
+            try:
+                if self._segments is None:
+                    self._migrate_legacy()
+                self._refresh()
+
+                if not self._segments or self._active_count >= self.segment_size:
+                    last = self._segment_number(self._segments[-1]) if self._segments else 0
+                    active = self._segment_path(last + 1)
+                    self._segments.append(active)
+                    self._active_offset = 0
+                    self._active_count = 0
+                    # 保持上限を超えたセグメントを古い順に削除
+                    while len(self._segments) > self.max_segments:
+                        oldest = self._segments.pop(0)
+                        oldest.unlink(missing_ok=True)
+                else:
+                    active = self._segments[-1]
+
+                # O_APPEND で1回の write にまとめることで行単位の書き込みをアトミックにする
+                fd = os.open(active, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, line)
+                finally:
+                    os.close(fd)
+
+                self._remember(json.loads(line))
+                self._active_offset += len(line)
+                self._active_count += 1
+                self._dir_mtime_ns = self._dir_mtime()
+            finally:
+                self._release_file_lock(handle)
+
+    def _ensure_loaded(self) -> None:
+        """読み込み前の最新化（self._lock を保持した状態で呼び出す）"""
+        if self._segments is None and self.legacy_file is not None and self.legacy_file.exists():
+            handle = self._acquire_file_lock()
+            try:
+                self._migrate_legacy()
+            finally:
+                self._release_file_lock(handle)
+        self._refresh()
+
+    def get_all(self) -> list[dict[str, Any]]:
+        """保持中の履歴を古い順に取得（最大 max_entries 件）"""
+        with self._lock:
+            self._ensure_loaded()
+            return list(self._entries)
+
+    def get_page(self, limit: int, offset: int = 0, newest_first: bool = True) -> list[dict[str, Any]]:
+        """履歴の1ページを取得
+
+        Args:
+            limit: 取得件数
+            offset: 先頭から読み飛ばす件数
+            newest_first: 新しい順に並べる場合True
+
+        Returns:
+            履歴データのリスト
+        """
+        with self._lock:
+            self._ensure_loaded()
+            total = len(self._entries)
+            if newest_first:
+                indices = range(total - 1 - offset, max(total - 1 - offset - limit, -1), -1)
+            else:
+                indices = range(offset, min(offset + limit, total))
+            return [self._entries[i] for i in indices]
+
+    def get_latest(self, location: str) -> dict[str, Any] | None:
+        """地点の最新の履歴を取得"""
+        with self._lock:
+            self._ensure_loaded()
+            return self._latest.get(location)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._entries)
+
+
+_history_stores: dict[Path, GenerationHistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_default_history_dir() -> Path:
+    """既定の履歴ディレクトリ（環境変数 GENERATION_HISTORY_DIR で変更できる）"""
+    return Path(os.getenv("GENERATION_HISTORY_DIR", str(DEFAULT_HISTORY_DIR)))
+
+
+def get_history_store(directory: str | Path | None = None) -> GenerationHistoryStore:
+    """ディレクトリごとの共有履歴ストアを取得（省略時は既定の履歴ディレクトリ）"""
+    if directory is None:
+        directory = get_default_history_dir()
+    key = Path(directory).absolute()
+    store = _history_stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _history_stores.get(key)
+            if store is None:
+                store = GenerationHistoryStore(directory)
+                _history_stores[key] = store
+    return store
+
+
+def reset_history_stores() -> None:
+    """共有履歴ストアを破棄（主にテスト用）"""
+    with _stores_lock:
+        _history_stores.clear()
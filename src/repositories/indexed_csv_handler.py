@@ -3,12 +3,17 @@
 このモジュールは、CSVファイルをインデックス化してメモリに保持し、
 高速な検索を可能にします。ファイルハッシュによる変更検知と
 自動再構築機能を提供します。
+
+変更検知は (inode, サイズ, 更新時刻ns) のフィンガープリントで行い、内容のハッシュは
+フィンガープリントが変わったときだけ計算してプロセス内で共有する。ディスク上の
+インデックスは pickle（プロトコル5）で保存する。
 """
 
 from __future__ import annotations
 import hashlib
-import json
 import logging
+import pickle
+import threading
 from pathlib import Path
 from typing import Any
 from datetime import datetime
@@ -18,6 +23,51 @@ from src.data.past_comment import PastComment, CommentType
 
 logger = logging.getLogger(__name__)
 
+INDEX_SUFFIX = ".pkl"
+PICKLE_PROTOCOL = 5
+
+FileFingerprint = tuple[int, int, int]
+
+# プロセス内で共有する内容ハッシュ（パス -> (フィンガープリント, MD5)）
+_content_hashes: dict[str, tuple[FileFingerprint, str]] = {}
+_content_hashes_lock = threading.Lock()
+
+
+def get_file_fingerprint(file_path: Path) -> FileFingerprint:
+    """ファイルのフィンガープリント (inode, サイズ, 更新時刻ns) を取得"""
+    stat = file_path.stat()
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def compute_file_hash(file_path: Path) -> str:
+    """ファイル内容のMD5を計算（常にファイル全体を読む）"""
+    hasher = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def get_content_hash(file_path: Path) -> str:
+    """ファイル内容のMD5を取得（フィンガープリントが前回と同じ場合は再計算しない）"""
+    key = str(file_path)
+    fingerprint = get_file_fingerprint(file_path)
+    with _content_hashes_lock:
+        cached = _content_hashes.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    
+    file_hash = compute_file_hash(file_path)
+    with _content_hashes_lock:
+        _content_hashes[key] = (fingerprint, file_hash)
+    return file_hash
+
+
+def clear_content_hashes() -> None:
+    """プロセス内の内容ハッシュのメモをクリア"""
+    with _content_hashes_lock:
+        _content_hashes.clear()
+
 
 class IndexedCSVHandler:
     """インデックス化されたCSVハンドラー"""
@@ -35,12 +85,8 @@ class IndexedCSVHandler:
         self.file_hashes: dict[str, str] = {}
         
     def get_file_hash(self, file_path: Path) -> str:
-        """ファイルのハッシュ値を計算"""
-        hasher = hashlib.md5()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hasher.update(chunk)
-        return hasher.hexdigest()
+        """ファイルのハッシュ値を取得（フィンガープリントが変わった場合のみ計算）"""
+        return get_content_hash(file_path)
     
     def need_rebuild_index(self, csv_path: Path) -> bool:
         """インデックスの再構築が必要かチェック"""
@@ -51,14 +97,15 @@ class IndexedCSVHandler:
         cached_hash = self.file_hashes.get(str(csv_path))
         
         if cached_hash != current_hash:
-            logger.info(f"File changed, need to rebuild index: {csv_path}")
-            return True
+            # 変更前の内容のインデックスは使わない
+            self.index_cache.pop(str(csv_path), None)
             
         # メモリキャッシュにない場合
         if str(csv_path) not in self.index_cache:
-            # ディスクキャッシュを確認
+            # 同じ内容のインデックスがディスクにあればそれを使う
             index_path = self._get_index_path(csv_path)
             if not index_path.exists():
+                logger.info(f"File changed, need to rebuild index: {csv_path}")
                 return True
                 
         return False
@@ -66,7 +113,7 @@ class IndexedCSVHandler:
     def _get_index_path(self, csv_path: Path) -> Path:
         """インデックスファイルのパスを取得"""
         file_hash = self.get_file_hash(csv_path)
-        index_name = f"{csv_path.stem}_{file_hash}.json"
+        index_name = f"{csv_path.stem}_{file_hash}{INDEX_SUFFIX}"
         return self.cache_dir / index_name
     
     def load_indexed_csv(self, csv_path: Path, 
@@ -85,6 +132,7 @@ class IndexedCSVHandler:
         index = self._load_index_from_disk(csv_path)
         if index:
             self.index_cache[str(csv_path)] = index
+            self.file_hashes[str(csv_path)] = self.get_file_hash(csv_path)
             return index.get("all_comments", [])
             
         return []
@@ -133,6 +181,7 @@ class IndexedCSVHandler:
         index = self._load_index_from_disk(csv_path)
         if index:
             self.index_cache[str(csv_path)] = index
+            self.file_hashes[str(csv_path)] = self.get_file_hash(csv_path)
             
         return index
     
@@ -229,12 +278,9 @@ class IndexedCSVHandler:
         
         for attempt in range(max_retries):
             try:
-                # PastCommentオブジェクトを辞書に変換
-                serializable_index = self._convert_index_to_serializable(index)
-                
-                # 一時ファイルに書き込み
-                with open(temp_path, 'w', encoding='utf-8') as f:
-                    json.dump(serializable_index, f, ensure_ascii=False, indent=2)
+                # 一時ファイルに書き込み（各索引が同じPastCommentを共有したまま保存される）
+                with open(temp_path, 'wb') as f:
+                    pickle.dump(index, f, protocol=PICKLE_PROTOCOL)
                 
                 # アトミックな移動（rename）
                 temp_path.replace(index_path)
@@ -256,17 +302,17 @@ class IndexedCSVHandler:
                             pass
     
     def _load_index_from_disk(self, csv_path: Path) -> dict[str, Any | None]:
-        """ディスクからインデックスをロード"""
+        """ディスクからインデックスをロード
+        
+        インデックスはこのハンドラーが cache_dir に書き込んだ pickle のみを読み込む。
+        """
         index_path = self._get_index_path(csv_path)
         if not index_path.exists():
             return None
             
         try:
-            with open(index_path, 'r', encoding='utf-8') as f:
-                serializable_index = json.load(f)
-            
-            # 辞書をPastCommentオブジェクトに変換
-            index = self._convert_index_from_serializable(serializable_index)
+            with open(index_path, 'rb') as f:
+                index = pickle.load(f)
             
             logger.info(f"Index loaded from: {index_path}")
             return index
@@ -279,8 +325,8 @@ class IndexedCSVHandler:
         self.index_cache.clear()
         self.file_hashes.clear()
         
-        # ディスクキャッシュも削除（.idxと.jsonの両方を削除）
-        for pattern in ["*.idx", "*.json"]:
+        # ディスクキャッシュも削除（旧形式の.idx・.jsonも削除）
+        for pattern in [f"*{INDEX_SUFFIX}", "*.idx", "*.json"]:
             for index_file in self.cache_dir.glob(pattern):
                 try:
                     index_file.unlink()
@@ -288,7 +334,7 @@ class IndexedCSVHandler:
                     logger.error(f"Failed to delete index file {index_file}: {e}")
     
     def _convert_index_to_serializable(self, index: dict[str, Any]) -> dict[str, Any]:
-        """インデックスをJSON用にシリアライズ可能な形式に変換"""
+        """インデックスをJSON用にシリアライズ可能な形式に変換（エクスポート用）"""
         serializable_index = {}
         
         for key, value in index.items():
@@ -0,0 +1,107 @@
+"""コメントごとのキーワード特徴ビットセット
+
+コーパスとキーワード集合はCSV更新まで変化しないため、コメントテキストごとに
+「どのキーワードを含むか」を読み込み時に1回だけ計算し、NumPyのパックされた
+ビット行列として保持する。リクエストごとのフィルタリングは、禁止キーワードから
+作ったマスクとの AND だけで判定できる。
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.repositories.columnar_comment_store import ColumnarCommentStore
+    from src.utils.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordFeatureIndex:
+    """ユニークテキスト × キーワードのパック済みビット行列
+
+    Attributes:
+        bits: 形状 (ユニークテキスト数, ceil(キーワード数 / 8)) の uint8 行列
+        text_ids: 行インデックス → ユニークテキストのインデックス（ストアの text_ids）
+    """
+
+    def __init__(self, keywords: Iterable[str], bits: np.ndarray, text_ids: np.ndarray):
+        self._keyword_ids = {keyword: i for i, keyword in enumerate(keywords)}
+        self.bits = bits
+        self.text_ids = text_ids
+
+    @classmethod
+    def build(cls, store: ColumnarCommentStore, matcher: KeywordMatcher) -> "KeywordFeatureIndex":
+        """ストアの全ユニークテキストを走査してビット行列を構築
+
+        Args:
+            store: 列指向のコメントストア
+            matcher: キーワード照合エンジン
+
+        Returns:
+            構築された特徴インデックス
+        """
+        start_time = time.perf_counter()
+        keywords = matcher.vocabulary
+        keyword_ids = {keyword: i for i, keyword in enumerate(keywords)}
+        strings = store.unique_texts
+
+        dense = np.zeros((len(strings), len(keywords)), dtype=bool)
+        for text_id, text in enumerate(strings):
+            for keyword in matcher.scan(text).positions:
+                dense[text_id, keyword_ids[keyword]] = True
+        bits = np.packbits(dense, axis=1)
+        bits.flags.writeable = False
+
+        index = cls(keywords, bits, store.text_ids)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(f"Keyword feature index built: {len(strings)} texts x {len(keywords)} keywords "
+                    f"({bits.nbytes} bytes, {elapsed_ms:.1f}ms)")
+        return index
+
+    def mask(self, keywords: Iterable[str]) -> np.ndarray | None:
+        """キーワード集合のパック済みマスクを作成
+
+        Returns:
+            マスク。索引に含まれないキーワードがある場合は None（呼び出し側で従来の判定に戻す）
+        """
+        dense = np.zeros(self.bits.shape[1] * 8, dtype=bool)
+        for keyword in keywords:
+            keyword_id = self._keyword_ids.get(keyword)
+            if keyword_id is None:
+                return None
+            dense[keyword_id] = True
+        return np.packbits(dense)
+
+    def rows_containing_any(self, rows: np.ndarray, keywords: Iterable[str]) -> np.ndarray | None:
+        """各行がキーワード集合のいずれかを含むかを判定
+
+        Args:
+            rows: ストアの行インデックス
+            keywords: 判定するキーワード集合
+
+        Returns:
+            行ごとの bool 配列。索引に含まれないキーワードがある場合は None
+        """
+        mask = self.mask(keywords)
+        if mask is None:
+            return None
+        rows = np.asarray(rows, dtype=np.intp)
+        if not mask.any():
+            return np.zeros(len(rows), dtype=bool)
+        # ユニークテキスト単位で判定してから行に展開する
+        text_hits = np.bitwise_and(self.bits, mask).any(axis=1)
+        return text_hits[self.text_ids[rows]]
+
+    def get_statistics(self) -> dict[str, Any]:
+        """統計情報を取得"""
+        return {
+            "texts": int(self.bits.shape[0]),
+            "keywords": len(self._keyword_ids),
+            "memory_usage_bytes": int(self.bits.nbytes),
+        }
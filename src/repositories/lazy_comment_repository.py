@@ -14,7 +14,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 
 from src.repositories.base_repository import CommentRepositoryInterface
-from src.repositories.csv_file_handler import CSVFileHandler, CommentParser
+from src.repositories.csv_file_handler import CSVFileHandler, CommentParser, load_comments_from_csv
 from src.data.past_comment import PastComment, CommentType
 from src.utils.cache import TTLCache
 
@@ -101,27 +101,7 @@ class LazyCommentRepository(CommentRepositoryInterface):
     
     def _load_comments_from_file(self, file_path: Path, comment_type: str, season: str) -> list[PastComment]:
         """特定のファイルからコメントを読み込み"""
-        if not file_path.exists():
-            logger.debug(f"File not found: {file_path}")
-            return []
-        
-        # ヘッダー検証
-        expected_columns = ['weather_comment'] if comment_type == 'weather_comment' else ['advice']
-        if not self.file_handler.validate_csv_headers(file_path, expected_columns):
-            logger.warning(f"Invalid CSV headers in {file_path}, expected columns: {expected_columns}")
-            return []
-        
-        rows = self.file_handler.read_csv_file(file_path)
-        comments = []
-        
-        comment_type_enum = CommentType.WEATHER_COMMENT if comment_type == 'weather_comment' else CommentType.ADVICE
-        
-        for row in rows:
-            comment = CommentParser.parse_comment_row(row, comment_type, season)
-            if comment:
-                comments.append(comment)
-        
-        return comments
+        return load_comments_from_csv(file_path, comment_type, season, self.file_handler)
     
     def get_all_comments(self) -> list[PastComment]:
         """全てのコメントを取得（並列遅延読み込み）"""
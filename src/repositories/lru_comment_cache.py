@@ -2,6 +2,9 @@
 
 メモリ使用量を制限しながら、複数のクエリ結果をキャッシュする高性能なキャッシュシステム。
 スレッドセーフ実装により、並列処理環境でも安全に使用可能。
+
+メモリ使用量はエントリごとの推定サイズを保存時に1回だけ計算し、合計を保存・削除のたびに
+増減させて管理する（エビクション時に全エントリを走査しない）。
 """
 
 from __future__ import annotations
@@ -10,12 +13,45 @@ import threading
 from typing import Any
 from datetime import datetime, timedelta
 from collections import OrderedDict
+from collections.abc import Callable, Iterator
 import sys
 
 from src.data.past_comment import PastComment
 
 logger = logging.getLogger(__name__)
 
+SIZE_ESTIMATORS = ("fast", "deep")
+
+
+def _iter_referents(obj: Any) -> Iterator[Any]:
+    """deep_sizeof で辿る参照先（コンテナの要素とインスタンス属性）"""
+    if isinstance(obj, dict):
+        yield from obj.keys()
+        yield from obj.values()
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        yield from obj
+    elif hasattr(obj, "__dict__"):
+        yield obj.__dict__
+
+
+def deep_sizeof(obj: Any, seen: set[int] | None = None) -> int:
+    """オブジェクトと、そこから辿れるコンテナ・属性の sys.getsizeof の合計（バイト）
+
+    同じオブジェクトは1回だけ数える。Enum などのクラスは共有されるため数えない。
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, type):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        stack.extend(_iter_referents(current))
+    return total
+
 
 class LRUCommentCache:
     """コメントのLRUキャッシュ管理
@@ -27,13 +63,27 @@ class LRUCommentCache:
     def __init__(self, 
                  max_size: int = 1000, 
                  cache_ttl_minutes: int = 60,
-                 max_memory_mb: float = 100):
+                 max_memory_mb: float = 100,
+                 size_estimator: str = "fast",
+                 deep_sample_size: int = 16,
+                 on_evict: Callable[[str], None] | None = None):
         """
         Args:
             max_size: キャッシュに保持する最大エントリ数
             cache_ttl_minutes: キャッシュの有効期限（分）
             max_memory_mb: 最大メモリ使用量（MB）
+            size_estimator: エントリサイズの推定方法。"fast" はコメント本文の長さ + 固定の
+                オーバーヘッドで推定し、"deep" は一部のコメントを deep_sizeof で計測して
+                件数倍に外挿する
+            deep_sample_size: "deep" の場合に計測するコメント数の上限
+            on_evict: エビクション・期限切れで削除されたキーを受け取るコールバック
+                （ロックを保持したまま呼ばれる。invalidate・clear では呼ばれない）
         """
+        if size_estimator not in SIZE_ESTIMATORS:
+            raise ValueError(f"size_estimator must be one of {SIZE_ESTIMATORS}: {size_estimator!r}")
+        if deep_sample_size < 1:
+            raise ValueError(f"deep_sample_size must be positive: {deep_sample_size}")
+
         # スレッドセーフティのためのロック
         self._lock = threading.RLock()
         
@@ -41,6 +91,13 @@ class LRUCommentCache:
         self._max_size = max_size
         self._cache_ttl = timedelta(minutes=cache_ttl_minutes)
         self._max_memory_bytes = max_memory_mb * 1024 * 1024
+        self._size_estimator = size_estimator
+        self._deep_sample_size = deep_sample_size
+        self._on_evict = on_evict
+        
+        # エントリごとの推定サイズとその合計（バイト）
+        self._entry_sizes: dict[str, int] = {}
+        self._memory_bytes = 0
         
         # 統計情報
         self._cache_hits = 0
@@ -50,6 +107,8 @@ class LRUCommentCache:
         
     def _estimate_memory_usage(self, comments: list[PastComment]) -> int:
         """コメントリストのメモリ使用量を推定（バイト）"""
+        if self._size_estimator == "deep":
+            return self._estimate_deep_memory_usage(comments)
         # 簡易的な推定: 各コメントのテキスト長 + オーバーヘッド
         total_size = 0
         for comment in comments:
@@ -59,12 +118,27 @@ class LRUCommentCache:
             total_size += sys.getsizeof(comment.raw_data)
         return total_size
     
+    def _estimate_deep_memory_usage(self, comments: list[PastComment]) -> int:
+        """等間隔に抜き出したコメントを deep_sizeof で計測し、件数倍に外挿して推定"""
+        if not comments:
+            return sys.getsizeof(comments)
+        step = max(1, len(comments) // self._deep_sample_size)
+        sample = comments[::step][:self._deep_sample_size]
+        # サンプル内で共有されるオブジェクト（同じコメントの重複など）は1回だけ数える
+        seen: set[int] = set()
+        sampled_size = sum(deep_sizeof(comment, seen) for comment in sample)
+        return sys.getsizeof(comments) + sampled_size * len(comments) // len(sample)
+    
     def _get_total_memory_usage(self) -> int:
-        """現在のキャッシュの総メモリ使用量を推定"""
-        total = 0
-        for comments, _ in self._cache.values():
-            total += self._estimate_memory_usage(comments)
-        return total
+        """現在のキャッシュの総メモリ使用量（エントリごとの推定サイズの合計）"""
+        return self._memory_bytes
+    
+    def _remove_entry(self, key: str, evicted: bool = False) -> None:
+        """エントリを削除し、メモリ使用量の合計から差し引く"""
+        del self._cache[key]
+        self._memory_bytes -= self._entry_sizes.pop(key, 0)
+        if evicted and self._on_evict is not None:
+            self._on_evict(key)
     
     def _evict_if_needed(self, new_size: int) -> None:
         """必要に応じて古いエントリを削除"""
@@ -72,16 +146,15 @@ class LRUCommentCache:
         while len(self._cache) >= self._max_size:
             self._evict_oldest()
             
-        # メモリ制限チェック
-        current_memory = self._get_total_memory_usage()
-        while current_memory + new_size > self._max_memory_bytes and self._cache:
+        # メモリ制限チェック（合計は増減で管理しているため再計算しない）
+        while self._memory_bytes + new_size > self._max_memory_bytes and self._cache:
             self._evict_oldest()
-            current_memory = self._get_total_memory_usage()
     
     def _evict_oldest(self) -> None:
         """最も古いエントリを削除"""
         if self._cache:
-            key, _ = self._cache.popitem(last=False)
+            key = next(iter(self._cache))
+            self._remove_entry(key, evicted=True)
             self._eviction_count += 1
             logger.debug(f"Evicted cache entry: {key}")
     
@@ -105,7 +178,7 @@ class LRUCommentCache:
                     return comments
                 else:
                     # 期限切れのエントリを削除
-                    del self._cache[key]
+                    self._remove_entry(key, evicted=True)
                     logger.debug(f"Cache entry expired for key: {key}")
             
             self._cache_misses += 1
@@ -119,26 +192,30 @@ class LRUCommentCache:
         with self._lock:
             # 既存のエントリがある場合は削除
             if key in self._cache:
-                del self._cache[key]
+                self._remove_entry(key)
             
             # 必要に応じて古いエントリを削除
             self._evict_if_needed(new_size)
             
             # 新しいエントリを追加
             self._cache[key] = (comments, datetime.now())
+            self._entry_sizes[key] = new_size
+            self._memory_bytes += new_size
             logger.info(f"Cache updated for key: {key} with {len(comments)} comments")
     
     def clear(self) -> None:
         """キャッシュを完全にクリア"""
         with self._lock:
             self._cache.clear()
+            self._entry_sizes.clear()
+            self._memory_bytes = 0
             logger.info("Cache cleared")
     
     def invalidate(self, key: str) -> bool:
         """特定のキーのキャッシュを無効化"""
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
+                self._remove_entry(key)
                 logger.debug(f"Invalidated cache for key: {key}")
                 return True
             return False
@@ -153,13 +230,16 @@ class LRUCommentCache:
     def get_stats(self) -> dict[str, Any]:
         """詳細なキャッシュ統計を取得"""
         with self._lock:
-            memory_usage_mb = self._get_total_memory_usage() / (1024 * 1024)
+            memory_usage_mb = self._memory_bytes / (1024 * 1024)
             
             return {
                 'size': len(self._cache),
                 'max_size': self._max_size,
                 'memory_usage_mb': round(memory_usage_mb, 2),
                 'max_memory_mb': self._max_memory_bytes / (1024 * 1024),
+                'memory_usage_bytes': self._memory_bytes,
+                'max_memory_bytes': int(self._max_memory_bytes),
+                'size_estimator': self._size_estimator,
                 'ttl_minutes': self._cache_ttl.total_seconds() / 60,
                 'hits': self._cache_hits,
                 'misses': self._cache_misses,
@@ -178,7 +258,7 @@ class LRUCommentCache:
                     expired_keys.append(key)
             
             for key in expired_keys:
-                del self._cache[key]
+                self._remove_entry(key, evicted=True)
             
             if expired_keys:
                 logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
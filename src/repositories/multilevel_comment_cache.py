@@ -2,12 +2,19 @@
 Multi-level comment cache implementation
 
 マルチレベルコメントキャッシュの実装
+
+各レベルのエントリにはタイプ・季節・地域のタグを付け、タグからキーを引く副インデックスで
+条件に該当するエントリだけを無効化する。また各レベルは世代番号を持ち、キャッシュキーに
+世代を含めることで、CSVの再読み込みなどによる一括無効化をエントリに触れずに O(1) で行う
+（古い世代のエントリは参照されなくなり、LRU・TTLで順次削除される。タグインデックスも
+世代ごとに持ち、古い世代のものはエントリが全て削除された時点で破棄する）。
 """
 
 from __future__ import annotations
+import itertools
 import logging
 import hashlib
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from datetime import datetime
 from threading import RLock
 
@@ -16,6 +23,53 @@ from src.repositories.lru_comment_cache import LRUCommentCache
 
 logger = logging.getLogger(__name__)
 
+# タグの値で「全て」（その次元で絞り込んでいないエントリ）を表す
+ALL = "all"
+LEVELS = ("l1", "l2", "l3")
+
+
+class CacheTagIndex:
+    """タグ（次元と値の組）からキャッシュキーを引く副インデックス"""
+    
+    def __init__(self):
+        self._keys_by_tag: Dict[tuple[str, str], set[str]] = {}
+        self._tags_by_key: Dict[str, Dict[str, str]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._tags_by_key)
+    
+    def add(self, key: str, tags: Dict[str, str]) -> None:
+        """キーをタグ付きで登録（登録済みの場合はタグを置き換える）"""
+        self.discard(key)
+        self._tags_by_key[key] = tags
+        for tag in tags.items():
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+    
+    def discard(self, key: str) -> None:
+        """キーをインデックスから取り除く（未登録の場合は何もしない）"""
+        for tag in self._tags_by_key.pop(key, {}).items():
+            keys = self._keys_by_tag[tag]
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
+    
+    def match(self, conditions: Dict[str, str]) -> set[str]:
+        """条件と重なるキー（各次元のタグが条件の値か ALL のもの）を取得
+        
+        候補が最も少ない次元のキーだけを走査し、残りの次元はキーごとのタグで確認する。
+        """
+        if not conditions:
+            return set()
+        groups = [
+            (self._keys_by_tag.get((dimension, value), ()), self._keys_by_tag.get((dimension, ALL), ()))
+            for dimension, value in conditions.items()
+        ]
+        exact, wildcard = min(groups, key=lambda group: len(group[0]) + len(group[1]))
+        return {
+            key for key in itertools.chain(exact, wildcard)
+            if all(self._tags_by_key[key][dimension] in (value, ALL) for dimension, value in conditions.items())
+        }
+
 
 class MultiLevelCommentCache:
     """マルチレベルコメントキャッシュ
@@ -37,22 +91,30 @@ class MultiLevelCommentCache:
             cache_ttl_minutes: キャッシュTTL（分）
             max_memory_mb_per_level: 各レベルの最大メモリ使用量（MB）
         """
+        # 各レベルの世代番号と、世代ごとのタグインデックス
+        self._generations = dict.fromkeys(LEVELS, 0)
+        self._tag_indexes: Dict[str, Dict[int, CacheTagIndex]] = {level: {0: CacheTagIndex()} for level in LEVELS}
+        
         # 各レベルのキャッシュを作成
         self.l1_cache = LRUCommentCache(
             max_size=max_size_per_level,
             cache_ttl_minutes=cache_ttl_minutes,
-            max_memory_mb=max_memory_mb_per_level
+            max_memory_mb=max_memory_mb_per_level,
+            on_evict=lambda key: self._discard_evicted("l1", key)
         )
         self.l2_cache = LRUCommentCache(
             max_size=max_size_per_level * 2,  # L2はより大きく
             cache_ttl_minutes=cache_ttl_minutes * 2,  # TTLも長く
-            max_memory_mb=max_memory_mb_per_level * 1.5
+            max_memory_mb=max_memory_mb_per_level * 1.5,
+            on_evict=lambda key: self._discard_evicted("l2", key)
         )
         self.l3_cache = LRUCommentCache(
             max_size=max_size_per_level * 3,  # L3は最大
             cache_ttl_minutes=cache_ttl_minutes * 3,  # TTLも最長
-            max_memory_mb=max_memory_mb_per_level * 2
+            max_memory_mb=max_memory_mb_per_level * 2,
+            on_evict=lambda key: self._discard_evicted("l3", key)
         )
+        self._caches = {"l1": self.l1_cache, "l2": self.l2_cache, "l3": self.l3_cache}
         
         self._lock = RLock()
         self._stats = {
@@ -88,6 +150,53 @@ class MultiLevelCommentCache:
         
         return l1_key, l2_key, l3_key
     
+    def _versioned_key(self, level: str, key: str) -> str:
+        """現在の世代を含む、各レベルのキャッシュに実際に保存するキー"""
+        return f"g{self._generations[level]}:{key}"
+    
+    def _current_index(self, level: str) -> CacheTagIndex:
+        return self._tag_indexes[level][self._generations[level]]
+    
+    def _discard_evicted(self, level: str, key: str) -> None:
+        """LRU・TTLで削除されたキーをその世代のタグインデックスから除く
+        
+        各レベルのキャッシュ操作（ロック取得済み）の中から呼ばれる。
+        """
+        generation = int(key[1:key.index(":")])
+        indexes = self._tag_indexes[level]
+        index = indexes.get(generation)
+        if index is None:
+            return
+        index.discard(key)
+        if not index and generation != self._generations[level]:
+            del indexes[generation]
+    
+    def _level_tags(self,
+                    level: str,
+                    comment_type: Optional[CommentType],
+                    season: Optional[str],
+                    region: Optional[str]) -> Dict[str, str]:
+        """レベルのキー粒度に合わせたタグ（粒度に含まれない次元は ALL）"""
+        return {
+            "type": comment_type.value if comment_type else ALL,
+            "season": (season or ALL) if level != "l3" else ALL,
+            "region": (region or ALL) if level == "l1" else ALL,
+        }
+    
+    def _get_level(self, level: str, key: str) -> Optional[List[PastComment]]:
+        return self._caches[level].get(self._versioned_key(level, key))
+    
+    def _set_level(self,
+                   level: str,
+                   key: str,
+                   comments: List[PastComment],
+                   comment_type: Optional[CommentType],
+                   season: Optional[str],
+                   region: Optional[str]) -> None:
+        versioned_key = self._versioned_key(level, key)
+        self._caches[level].set(versioned_key, comments)
+        self._current_index(level).add(versioned_key, self._level_tags(level, comment_type, season, region))
+    
     def get(self, 
             comment_type: Optional[CommentType] = None,
             season: Optional[str] = None,
@@ -108,25 +217,25 @@ class MultiLevelCommentCache:
             self._stats["total_requests"] += 1
             
             # L1キャッシュをチェック
-            if region and (result := self.l1_cache.get(l1_key)):
+            if region and (result := self._get_level("l1", l1_key)):
                 self._stats["l1_hits"] += 1
                 logger.debug(f"L1 cache hit: {l1_key}")
                 return result
             
             # L2キャッシュをチェック
-            if season and (result := self.l2_cache.get(l2_key)):
+            if season and (result := self._get_level("l2", l2_key)):
                 self._stats["l2_hits"] += 1
                 logger.debug(f"L2 cache hit: {l2_key}")
                 # 必要に応じて地域でフィルタリング
                 if region:
                     filtered = self._filter_by_region(result, region)
                     # L1にも追加
-                    self.l1_cache.set(l1_key, filtered)
+                    self._set_level("l1", l1_key, filtered, comment_type, season, region)
                     return filtered
                 return result
             
             # L3キャッシュをチェック
-            if comment_type and (result := self.l3_cache.get(l3_key)):
+            if comment_type and (result := self._get_level("l3", l3_key)):
                 self._stats["l3_hits"] += 1
                 logger.debug(f"L3 cache hit: {l3_key}")
                 # 必要に応じて季節・地域でフィルタリング
@@ -138,9 +247,9 @@ class MultiLevelCommentCache:
                 
                 # より具体的なキャッシュレベルにも追加
                 if season:
-                    self.l2_cache.set(l2_key, filtered)
+                    self._set_level("l2", l2_key, filtered, comment_type, season, None)
                 if region:
-                    self.l1_cache.set(l1_key, filtered)
+                    self._set_level("l1", l1_key, filtered, comment_type, season, region)
                     
                 return filtered
             
@@ -167,24 +276,29 @@ class MultiLevelCommentCache:
         with self._lock:
             # 最も具体的なレベルから保存
             if region:
-                self.l1_cache.set(l1_key, comments)
+                self._set_level("l1", l1_key, comments, comment_type, season, region)
                 logger.debug(f"Cached to L1: {l1_key}")
             
             if season and not region:
                 # 季節レベルのキャッシュ
-                self.l2_cache.set(l2_key, comments)
+                self._set_level("l2", l2_key, comments, comment_type, season, None)
                 logger.debug(f"Cached to L2: {l2_key}")
             
             if comment_type and not season and not region:
                 # タイプレベルのキャッシュ
-                self.l3_cache.set(l3_key, comments)
+                self._set_level("l3", l3_key, comments, comment_type, None, None)
                 logger.debug(f"Cached to L3: {l3_key}")
     
     def invalidate(self, 
                   comment_type: Optional[CommentType] = None,
                   season: Optional[str] = None,
                   region: Optional[str] = None) -> int:
-        """指定された条件のキャッシュを無効化
+        """指定された条件と重なるキャッシュを全レベルから無効化
+        
+        指定した各次元について、値が一致するエントリと、その次元で絞り込んでいない
+        （条件のコメントを含みうる）エントリが対象になる。タグインデックスで対象の
+        キーだけを引くため、キャッシュ全体は走査しない。条件を1つも指定しない場合は
+        何も無効化しない（全体の無効化は invalidate_all / clear を使う）。
         
         Args:
             comment_type: コメントタイプ
@@ -194,34 +308,49 @@ class MultiLevelCommentCache:
         Returns:
             無効化されたエントリ数
         """
+        conditions = {
+            dimension: value
+            for dimension, value in (
+                ("type", comment_type.value if comment_type else None),
+                ("season", season),
+                ("region", region),
+            )
+            if value
+        }
         count = 0
         
         with self._lock:
-            # 最も具体的なレベルから無効化
-            if region:
-                l1_key, _, _ = self._generate_cache_key(comment_type, season, region)
-                if self.l1_cache.invalidate(l1_key):
-                    count += 1
-            
-            if season:
-                _, l2_key, _ = self._generate_cache_key(comment_type, season, None)
-                # L2の関連エントリを無効化
-                for key in list(self.l2_cache._cache.keys()):
-                    if key.startswith(l2_key):
-                        if self.l2_cache.invalidate(key):
-                            count += 1
-            
-            if comment_type:
-                _, _, l3_key = self._generate_cache_key(comment_type, None, None)
-                # L3の関連エントリを無効化
-                for key in list(self.l3_cache._cache.keys()):
-                    if key.startswith(l3_key):
-                        if self.l3_cache.invalidate(key):
-                            count += 1
+            for level in LEVELS:
+                index = self._current_index(level)
+                for key in index.match(conditions):
+                    index.discard(key)
+                    if self._caches[level].invalidate(key):
+                        count += 1
         
         logger.info(f"Invalidated {count} cache entries")
         return count
     
+    def invalidate_all(self, levels: Iterable[str] = LEVELS) -> Dict[str, int]:
+        """世代番号を進めて、指定レベルの全エントリを O(1) で無効化
+        
+        古い世代のエントリには触れず、参照されなくなったものが LRU・TTL で順次削除される。
+        CSVの再読み込みなど、全体が入れ替わる場合に使う。
+        
+        Args:
+            levels: 対象レベル（"l1"・"l2"・"l3"）
+            
+        Returns:
+            各レベルの新しい世代番号
+        """
+        with self._lock:
+            for level in levels:
+                if level not in self._generations:
+                    raise ValueError(f"Unknown cache level: {level}")
+                self._generations[level] += 1
+                self._tag_indexes[level][self._generations[level]] = CacheTagIndex()
+            logger.info(f"Advanced cache generations: {self._generations}")
+            return dict(self._generations)
+    
     def _filter_by_season(self, comments: List[PastComment], season: str) -> List[PastComment]:
         """季節でフィルタリング"""
         return [c for c in comments if c.raw_data.get('season') == season]
@@ -236,6 +365,7 @@ class MultiLevelCommentCache:
             self.l1_cache.clear()
             self.l2_cache.clear()
             self.l3_cache.clear()
+            self._tag_indexes = {level: {self._generations[level]: CacheTagIndex()} for level in LEVELS}
             self._stats = {
                 "l1_hits": 0,
                 "l2_hits": 0,
@@ -259,6 +389,8 @@ class MultiLevelCommentCache:
                 "l2_hits": self._stats["l2_hits"],
                 "l3_hits": self._stats["l3_hits"],
                 "misses": self._stats["misses"],
+                "generations": dict(self._generations),
+                "indexed_keys": {level: len(self._current_index(level)) for level in LEVELS},
                 "l1_stats": self.l1_cache.get_stats(),
                 "l2_stats": self.l2_cache.get_stats(),
                 "l3_stats": self.l3_cache.get_stats()
@@ -39,6 +39,7 @@ class GenerationMetadata(TypedDict, total=False):
     weather_timeline: dict[str, Any | None]
     selected_past_comments: list[dict[str, str | None]]
     selection_metadata: dict[str, Any | None]
+    forecast_freshness: dict[str, Any]
 
 
 class GenerationResult(TypedDict):
@@ -5,13 +5,13 @@
 """
 
 from __future__ import annotations
-import json
-from pathlib import Path
 from typing import Any
 from datetime import datetime
 import pandas as pd
 import streamlit as st
 
+from src.repositories.generation_history_store import get_history_store
+
 
 def save_to_history(result: dict[str, Any], location: str, llm_provider: str):
     """
@@ -22,8 +22,6 @@ def save_to_history(result: dict[str, Any], location: str, llm_provider: str):
         location: 地点名
         llm_provider: LLMプロバイダー名
     """
-    history_file = Path("data/generation_history.json")
-
     # 履歴データの作成
     history_item = {
         "timestamp": datetime.now().isoformat(),
@@ -38,27 +36,8 @@ def save_to_history(result: dict[str, Any], location: str, llm_provider: str):
     }
 
     try:
-        # 既存履歴の読み込み
-        if history_file.exists():
-            with open(history_file, "r", encoding="utf-8") as f:
-                history = json.load(f)
-        else:
-            history = []
-
-        # 新しい履歴を追加
-        history.append(history_item)
-
-        # 履歴サイズの制限（最新1000件まで）
-        if len(history) > 1000:
-            history = history[-1000:]
-
-        # ディレクトリが存在しない場合は作成
-        history_file.parent.mkdir(parents=True, exist_ok=True)
-
-        # ファイルに保存
-        with open(history_file, "w", encoding="utf-8") as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
-
+        # 1行追記するだけで、既存履歴の読み込み・書き戻しは行わない（最新1000件を保持）
+        get_history_store().append(history_item)
     except Exception as e:
         st.error(f"履歴保存エラー: {str(e)}")
 
@@ -70,13 +49,27 @@ def load_history() -> list[dict[str, Any]]:
     Returns:
         履歴データのリスト
     """
-    history_file = Path("data/generation_history.json")
+    try:
+        return get_history_store().get_all()
+    except Exception as e:
+        st.error(f"履歴読み込みエラー: {str(e)}")
+
+    return []
+
+
+def load_history_page(limit: int, offset: int = 0) -> list[dict[str, Any]]:
+    """
+    履歴データを新しい順に1ページ分読み込む
 
+    Args:
+        limit: 取得件数
+        offset: 読み飛ばす件数
+
+    Returns:
+        履歴データのリスト
+    """
     try:
-        if history_file.exists():
-            with open(history_file, "r", encoding="utf-8") as f:
-                history = json.load(f)
-                return history
+        return get_history_store().get_page(limit, offset)
     except Exception as e:
         st.error(f"履歴読み込みエラー: {str(e)}")
 
@@ -3,11 +3,15 @@
 from __future__ import annotations
 import time
 import hashlib
+import heapq
 import json
+import math
 import inspect
 import threading
 import sys
+import weakref
 from typing import Any, TypeVar
+from collections import OrderedDict
 from collections.abc import Callable
 from functools import wraps
 import logging
@@ -21,16 +25,94 @@ logger = logging.getLogger(__name__)
 T = TypeVar('T')
 
 
+class CacheReaper:
+    """全TTLCacheの期限切れエントリを削除する、プロセス全体で1つのスレッド
+    
+    キャッシュごとにクリーンアップスレッドを立てる代わりに、登録されたキャッシュを
+    弱参照で保持し、それぞれの ``cleanup_interval`` ごとに ``cleanup_expired`` を呼び出す。
+    参照されなくなったキャッシュは自動的に対象から外れる。
+    """
+    
+    def __init__(self):
+        # キャッシュ → 次回のクリーンアップ時刻（time.monotonic）
+        self._due: weakref.WeakKeyDictionary[TTLCache, float] = weakref.WeakKeyDictionary()
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+    
+    def register(self, cache: TTLCache) -> None:
+        """キャッシュを定期クリーンアップの対象に追加"""
+        with self._condition:
+            self._due[cache] = time.monotonic() + cache.cleanup_interval
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="ttl-cache-reaper", daemon=True)
+                self._thread.start()
+                logger.info("Started shared cache reaper thread")
+            self._condition.notify()
+    
+    def unregister(self, cache: TTLCache) -> None:
+        """キャッシュを定期クリーンアップの対象から外す"""
+        with self._condition:
+            self._due.pop(cache, None)
+    
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._due)
+    
+    def _run(self) -> None:
+        """クリーンアップ時刻を迎えたキャッシュを順に処理するワーカー"""
+        while True:
+            with self._condition:
+                now = time.monotonic()
+                due = [cache for cache, due_at in self._due.items() if due_at <= now]
+                for cache in due:
+                    self._due[cache] = now + cache.cleanup_interval
+                if not due:
+                    next_due = min(self._due.values(), default=None)
+                    self._condition.wait(None if next_due is None else next_due - now)
+                    continue
+            
+            for cache in due:
+                try:
+                    cache.cleanup_expired()
+                except Exception as e:
+                    logger.error(f"Error during automatic cache cleanup: {e}")
+            del due
+
+
+_cache_reaper: CacheReaper | None = None
+_cache_reaper_lock = threading.Lock()
+
+
+def get_cache_reaper() -> CacheReaper:
+    """プロセス全体で共有するクリーンアップスレッドを取得"""
+    global _cache_reaper
+    if _cache_reaper is None:
+        with _cache_reaper_lock:
+            if _cache_reaper is None:
+                _cache_reaper = CacheReaper()
+    return _cache_reaper
+
+
 class TTLCache:
-    """TTL（Time To Live）付きキャッシュ（スレッドセーフ版）
+    """TTL（Time To Live）付きLRUキャッシュ（スレッドセーフ版）
     
     指定された期間だけデータをメモリにキャッシュし、
     期限切れのデータは自動的に削除される。
     threadingモジュールのRLockを使用してスレッドセーフを保証。
+    
+    エントリはアクセス順の OrderedDict で保持するため、取得・保存・LRUエビクションは O(1)。
+    キーは期限の秒ごとのバケットにも登録し（タイミングホイール）、期限切れの削除では
+    期限を迎えたバケットだけを処理する（期限切れの件数に比例）。
+    自動クリーンアップは全キャッシュ共通のスレッド（``CacheReaper``）が行う。
     """
     
+    # 期限バケットの幅（秒）
+    _BUCKET_SECONDS = 1.0
+    # バケットに残った無効な項目（上書き・削除済みのキー）がこの数を超えたら作り直す
+    _BUCKET_COMPACT_THRESHOLD = 1024
+    
     def __init__(self, default_ttl: int = 300, max_size: int | None = None,
-                 auto_cleanup: bool = True, cleanup_interval: int = 60):
+                 auto_cleanup: bool = True, cleanup_interval: int = 60, stale_ttl: int = 0):
         """初期化
         
         Args:
@@ -38,10 +120,18 @@ class TTLCache:
             max_size: キャッシュの最大サイズ（エントリ数）。Noneの場合は無制限
             auto_cleanup: 自動クリーンアップを有効にするか。デフォルトはTrue
             cleanup_interval: クリーンアップの実行間隔（秒）。デフォルトは60秒
+            stale_ttl: 期限切れ後も古い値として保持する期間（秒）。``get_with_age`` で
+                取得でき、stale-while-revalidate / stale-if-error に使う。デフォルトは0（保持しない）
         """
-        self._cache: dict[CacheKey, CacheEntry[Any]] = {}
+        # 先頭が最も長く使われていないエントリ
+        self._cache: OrderedDict[CacheKey, CacheEntry[Any]] = OrderedDict()
+        # 期限バケット番号 → キー。上書き・削除されたキーの項目は処理する時に読み飛ばす
+        self._expiry_buckets: dict[int, list[CacheKey]] = {}
+        self._bucket_heap: list[int] = []
+        self._bucketed_keys = 0
         self.default_ttl = default_ttl
         self.max_size = max_size
+        self.stale_ttl = stale_ttl
         self._stats: dict[str, int] = {
             "hits": 0,
             "misses": 0,
@@ -50,14 +140,15 @@ class TTLCache:
         # RLock（再入可能ロック）を使用してスレッドセーフを保証
         self._lock = threading.RLock()
         
-        # 自動クリーンアップ機能
+        # 自動クリーンアップ機能（共有スレッドに登録）
         self.auto_cleanup = auto_cleanup
         self.cleanup_interval = cleanup_interval
-        self._cleanup_thread: threading.Thread | None = None
-        self._stop_cleanup = threading.Event()
-        
         if self.auto_cleanup:
-            self._start_cleanup_thread()
+            get_cache_reaper().register(self)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
     
     def get(self, key: CacheKey) -> Any | None:
         """キャッシュからデータを取得（スレッドセーフ）
@@ -69,18 +160,19 @@ class TTLCache:
             キャッシュされたデータ、存在しないか期限切れの場合はNone
         """
         with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
+            entry = self._cache.get(key)
+            if entry is not None:
                 current_time = time.time()
                 if current_time < entry["expire_at"]:
                     self._stats["hits"] += 1
                     # アクセス情報を更新
                     entry["access_count"] += 1
                     entry["last_accessed"] = current_time
+                    self._cache.move_to_end(key)
                     logger.debug(f"Cache hit: {key}")
                     return entry["value"]
-                else:
-                    # 期限切れのエントリを削除
+                elif current_time >= entry["expire_at"] + self.stale_ttl:
+                    # 期限切れのエントリを削除（古い値の保持期間内であれば残す）
                     del self._cache[key]
                     self._stats["evictions"] += 1
                     logger.debug(f"Cache expired: {key}")
@@ -88,6 +180,28 @@ class TTLCache:
             self._stats["misses"] += 1
             return None
     
+    def get_with_age(self, key: CacheKey, allow_stale: bool = False) -> tuple[Any, float, bool] | None:
+        """キャッシュからデータを経過時間付きで取得（スレッドセーフ）
+        
+        Args:
+            key: キャッシュキー
+            allow_stale: Trueの場合は期限切れでも古い値の保持期間内であれば返す
+            
+        Returns:
+            (データ, 保存からの経過秒数, 期限切れかどうか)。存在しない場合はNone
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            current_time = time.time()
+            if entry is not None and allow_stale and entry["expire_at"] <= current_time < entry["expire_at"] + self.stale_ttl:
+                self._stats["misses"] += 1
+                logger.debug(f"Cache stale hit: {key}")
+                return entry["value"], current_time - entry["created_at"], True
+            value = self.get(key)
+            if value is None:
+                return None
+            return value, current_time - self._cache[key]["created_at"], False
+    
     def set(self, key: CacheKey, value: Any, ttl: int | None = None):
         """データをキャッシュに保存（スレッドセーフ）
         
@@ -100,19 +214,26 @@ class TTLCache:
             ttl = self.default_ttl
         
         with self._lock:
-            # 最大サイズチェック
-            if self.max_size and len(self._cache) >= self.max_size:
-                # LRU（Least Recently Used）エビクション
-                self._evict_lru()
-            
             current_time = time.time()
+            if key in self._cache:
+                self._cache.move_to_end(key)
+            elif self.max_size and len(self._cache) >= self.max_size:
+                # 期限切れのエントリがあればそれを先に削除し、なければLRUエビクション
+                self._remove_expired(current_time)
+                if len(self._cache) >= self.max_size:
+                    self._evict_lru()
+            
+            expire_at = current_time + ttl
             self._cache[key] = CacheEntry(
                 value=value,
-                expire_at=current_time + ttl,
+                expire_at=expire_at,
                 created_at=current_time,
                 access_count=0,
                 last_accessed=current_time
             )
+            self._add_to_bucket(key, expire_at)
+            if self._bucketed_keys > 2 * len(self._cache) + self._BUCKET_COMPACT_THRESHOLD:
+                self._compact_buckets()
             logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
     
     def _evict_lru(self):
@@ -121,10 +242,7 @@ class TTLCache:
         if not self._cache:
             return
         
-        # 最も古いアクセス時刻を持つキーを探す
-        lru_key = min(self._cache.keys(), 
-                     key=lambda k: self._cache[k]["last_accessed"])
-        del self._cache[lru_key]
+        lru_key, _ = self._cache.popitem(last=False)
         self._stats["evictions"] += 1
         logger.debug(f"LRU eviction: {lru_key}")
     
@@ -138,36 +256,78 @@ class TTLCache:
             実際に削除されたエントリ数
         """
         with self._lock:
-            evicted = 0
-            for _ in range(min(count, len(self._cache))):
-                if self._cache:
-                    self._evict_lru()
-                    evicted += 1
-                else:
-                    break
+            evicted = min(count, len(self._cache))
+            for _ in range(evicted):
+                self._evict_lru()
             return evicted
     
     def clear(self):
         """キャッシュをクリア（スレッドセーフ）"""
         with self._lock:
             self._cache.clear()
+            self._expiry_buckets.clear()
+            self._bucket_heap.clear()
+            self._bucketed_keys = 0
             logger.info("Cache cleared")
     
+    def _bucket_of(self, expire_at: float) -> int:
+        return math.floor(expire_at / self._BUCKET_SECONDS)
+    
+    def _add_to_bucket(self, key: CacheKey, expire_at: float):
+        """キーを期限バケットに登録（内部メソッド）"""
+        # ロックは既に取得済みの前提
+        bucket = self._bucket_of(expire_at)
+        keys = self._expiry_buckets.get(bucket)
+        if keys is None:
+            keys = self._expiry_buckets[bucket] = []
+            heapq.heappush(self._bucket_heap, bucket)
+        keys.append(key)
+        self._bucketed_keys += 1
+    
+    def _remove_expired(self, current_time: float) -> int:
+        """古い値の保持期間も過ぎたエントリを期限バケット順に削除（内部メソッド）"""
+        # ロックは既に取得済みの前提
+        removed = 0
+        limit = current_time - self.stale_ttl
+        while self._bucket_heap and self._bucket_heap[0] * self._BUCKET_SECONDS <= limit:
+            bucket = heapq.heappop(self._bucket_heap)
+            keys = self._expiry_buckets.pop(bucket)
+            self._bucketed_keys -= len(keys)
+            remaining = []
+            for key in keys:
+                entry = self._cache.get(key)
+                # 削除済み、または上書きで別のバケットに移ったキーは読み飛ばす
+                if entry is None or self._bucket_of(entry["expire_at"]) != bucket:
+                    continue
+                if entry["expire_at"] <= limit:
+                    del self._cache[key]
+                    self._stats["evictions"] += 1
+                    removed += 1
+                else:
+                    remaining.append(key)
+            if remaining:
+                # 境界のバケットに期限前のキーが残っている場合、以降のバケットも期限前
+                self._expiry_buckets[bucket] = remaining
+                self._bucketed_keys += len(remaining)
+                heapq.heappush(self._bucket_heap, bucket)
+                break
+        return removed
+    
+    def _compact_buckets(self):
+        """無効な項目を除いて期限バケットを作り直す（内部メソッド）"""
+        # ロックは既に取得済みの前提
+        self._expiry_buckets = {}
+        self._bucket_heap = []
+        self._bucketed_keys = 0
+        for key, entry in self._cache.items():
+            self._add_to_bucket(key, entry["expire_at"])
+    
     def cleanup_expired(self):
         """期限切れのエントリを削除（スレッドセーフ）"""
         with self._lock:
-            current_time = time.time()
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if current_time >= entry["expire_at"]
-            ]
-            
-            for key in expired_keys:
-                del self._cache[key]
-                self._stats["evictions"] += 1
-            
-            if expired_keys:
-                logger.debug(f"Cleaned up {len(expired_keys)} expired entries")
+            removed = self._remove_expired(time.time())
+            if removed:
+                logger.debug(f"Cleaned up {removed} expired entries")
     
     def get_stats(self) -> CacheStats:
         """キャッシュの統計情報を取得（スレッドセーフ）"""
@@ -233,39 +393,12 @@ class TTLCache:
             
             return total_size
     
-    def _start_cleanup_thread(self):
-        """自動クリーンアップスレッドを開始"""
-        def cleanup_worker():
-            """クリーンアップワーカー"""
-            while not self._stop_cleanup.is_set():
-                # 指定された間隔で待機
-                if self._stop_cleanup.wait(self.cleanup_interval):
-                    break
-                
-                # 期限切れエントリをクリーンアップ
-                try:
-                    self.cleanup_expired()
-                    logger.debug("Automatic cache cleanup executed")
-                except Exception as e:
-                    logger.error(f"Error during automatic cache cleanup: {e}")
-        
-        self._cleanup_thread = threading.Thread(target=cleanup_worker, daemon=True)
-        self._cleanup_thread.start()
-        logger.info(f"Started automatic cache cleanup thread (interval: {self.cleanup_interval}s)")
-    
     def stop_cleanup(self):
-        """自動クリーンアップを停止"""
-        if self._cleanup_thread and self._cleanup_thread.is_alive():
-            self._stop_cleanup.set()
-            self._cleanup_thread.join(timeout=5)
-            logger.info("Stopped automatic cache cleanup thread")
-    
-    def __del__(self):
-        """デストラクタ - クリーンアップスレッドを停止"""
-        try:
-            self.stop_cleanup()
-        except Exception:
-            pass  # デストラクタでのエラーは無視
+        """自動クリーンアップを停止（共有スレッドの対象から外す）"""
+        if self.auto_cleanup:
+            get_cache_reaper().unregister(self)
+            self.auto_cleanup = False
+            logger.debug("Stopped automatic cache cleanup")
 
 
 def generate_cache_key(*args, **kwargs) -> CacheKey:
@@ -292,12 +425,14 @@ def generate_cache_key(*args, **kwargs) -> CacheKey:
     return hashlib.md5(key_str.encode()).hexdigest()
 
 
-def universal_cached_method(ttl: int | None = None, cache_attr: str = "_cache"):
+def universal_cached_method(ttl: int | None = None, cache_attr: str = "_cache",
+                            cache_if: Callable[[Any], bool] | None = None):
     """メソッドの結果をキャッシュする統一デコレータ（同期・非同期両対応）
     
     Args:
         ttl: TTL（秒）。Noneの場合はキャッシュのデフォルト値を使用
         cache_attr: キャッシュオブジェクトの属性名
+        cache_if: 結果をキャッシュするかを判定する関数。Noneの場合は常にキャッシュする
         
     Returns:
         デコレートされたメソッド（同期または非同期）
@@ -325,8 +460,9 @@ def universal_cached_method(ttl: int | None = None, cache_attr: str = "_cache"):
                 
                 # キャッシュにない場合は実行してキャッシュに保存
                 result = await func(self, *args, **kwargs)
-                cache.set(cache_key, result, ttl)
-                logger.debug(f"Cached result for async method: {func.__name__}")
+                if cache_if is None or cache_if(result):
+                    cache.set(cache_key, result, ttl)
+                    logger.debug(f"Cached result for async method: {func.__name__}")
                 
                 return result
             
@@ -351,8 +487,9 @@ def universal_cached_method(ttl: int | None = None, cache_attr: str = "_cache"):
                 
                 # キャッシュにない場合は実行してキャッシュに保存
                 result = func(self, *args, **kwargs)
-                cache.set(cache_key, result, ttl)
-                logger.debug(f"Cached result for sync method: {func.__name__}")
+                if cache_if is None or cache_if(result):
+                    cache.set(cache_key, result, ttl)
+                    logger.debug(f"Cached result for sync method: {func.__name__}")
                 
                 return result
             
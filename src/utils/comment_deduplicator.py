@@ -10,6 +10,8 @@ import logging
 from typing import Tuple, List, Optional
 from difflib import SequenceMatcher
 
+from src.utils.keyword_matcher import get_keyword_matcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -98,8 +100,9 @@ class CommentDeduplicator:
     ) -> Tuple[str, str]:
         """特定のパターンの重複をチェックして除去"""
         # 両方のコメントに同じキーワードが含まれているかチェック
-        has_keyword_in_weather = any(keyword in weather_comment for keyword in pattern["keywords"])
-        has_keyword_in_advice = any(keyword in advice_comment for keyword in pattern["keywords"])
+        matcher = get_keyword_matcher()
+        has_keyword_in_weather = matcher.scan(weather_comment).any(pattern["keywords"])
+        has_keyword_in_advice = matcher.scan(advice_comment).any(pattern["keywords"])
         
         if has_keyword_in_weather and has_keyword_in_advice:
             # 両方に含まれている場合、優先度の高いものを残す
@@ -130,10 +133,7 @@ class CommentDeduplicator:
     @classmethod
     def _find_variation(cls, text: str, variations: List[str]) -> Optional[str]:
         """テキスト内に含まれるバリエーションを検索"""
-        for variation in variations:
-            if variation in text:
-                return variation
-        return None
+        return get_keyword_matcher().scan(text).first(variations)
     
     @classmethod
     def _get_priority(cls, variation: str, priority_order: List[str]) -> int:
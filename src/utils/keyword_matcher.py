@@ -0,0 +1,328 @@
+"""複数キーワードの一括照合エンジン
+
+禁止ワード・NGワード・重複検出用キーワードなど、各所に散らばっていたキーワードリストを
+1つの Aho–Corasick オートマトンにまとめてコンパイルする。コメントは1回の走査で
+全キーワードの出現位置と、該当するカテゴリを取得できる。
+
+各呼び出し側は `get_keyword_matcher().scan(text)` の結果に対して
+「このリストのうちどれが含まれるか」を問い合わせるだけでよく、
+キーワード数 × コメント数の部分文字列検索を繰り返す必要がなくなる。
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any
+
+from src.config.yaml_config_store import CONFIG_DIR, get_yaml_config_store
+
+logger = logging.getLogger(__name__)
+
+class KeywordMatches:
+    """1つのテキストに対する照合結果
+
+    Attributes:
+        text: 走査したテキスト
+        positions: 出現したキーワードとその最初の出現位置（str.index と同じ値）
+        categories: 出現したキーワードを含むカテゴリの集合
+    """
+
+    __slots__ = ("text", "positions", "categories", "_matcher")
+
+    def __init__(self, text: str, positions: Mapping[str, int], categories: frozenset[str],
+                 matcher: KeywordMatcher):
+        self.text = text
+        self.positions = positions
+        self.categories = categories
+        self._matcher = matcher
+
+    def __contains__(self, keyword: str) -> bool:
+        if keyword in self.positions:
+            return True
+        # オートマトンに登録されていないキーワードは通常の部分文字列検索にフォールバック
+        return not self._matcher.knows(keyword) and keyword in self.text
+
+    def __bool__(self) -> bool:
+        return bool(self.positions)
+
+    def position(self, keyword: str) -> int:
+        """キーワードの最初の出現位置を取得（出現しない場合は-1）"""
+        position = self.positions.get(keyword)
+        if position is not None:
+            return position
+        if self._matcher.knows(keyword):
+            return -1
+        return self.text.find(keyword)
+
+    def found(self, keywords: Iterable[str]) -> list[str]:
+        """キーワードのうち出現したものを、渡された順序で取得"""
+        return [keyword for keyword in keywords if keyword in self]
+
+    def first(self, keywords: Iterable[str]) -> str | None:
+        """キーワードのうち最初に出現したものを、渡された順序で取得"""
+        for keyword in keywords:
+            if keyword in self:
+                return keyword
+        return None
+
+    def any(self, keywords: Iterable[str]) -> bool:
+        """キーワードのいずれかが出現したか"""
+        return self.first(keywords) is not None
+
+    def in_category(self, category: str) -> list[str]:
+        """カテゴリのキーワードのうち出現したものを、カテゴリの定義順で取得"""
+        if category not in self.categories:
+            return []
+        return [keyword for keyword in self._matcher.keywords_of(category) if keyword in self.positions]
+
+    def has_category(self, category: str) -> bool:
+        """カテゴリのキーワードのいずれかが出現したか"""
+        return category in self.categories
+
+
+class KeywordMatcher:
+    """カテゴリ付きキーワード集合をコンパイルした Aho–Corasick オートマトン
+
+    構築後は不変で、複数スレッドから同時に scan してよい。
+    同じテキストの走査結果は LRU キャッシュで再利用する。
+    """
+
+    def __init__(self, categories: Mapping[str, Iterable[str]], cache_size: int = 4096):
+        """
+        Args:
+            categories: カテゴリ名 → キーワードリスト
+            cache_size: 走査結果のキャッシュ件数（0でキャッシュ無効）
+        """
+        self._categories: dict[str, tuple[str, ...]] = {}
+        keyword_categories: dict[str, set[str]] = {}
+        for category, keywords in categories.items():
+            unique = tuple(dict.fromkeys(keyword for keyword in keywords if keyword))
+            self._categories[category] = unique
+            for keyword in unique:
+                keyword_categories.setdefault(keyword, set()).add(category)
+
+        self._keyword_categories: Mapping[str, frozenset[str]] = MappingProxyType({
+            keyword: frozenset(cats) for keyword, cats in keyword_categories.items()
+        })
+        self._build_automaton(list(self._keyword_categories))
+
+        if cache_size > 0:
+            self._cached_scan = lru_cache(maxsize=cache_size)(self._scan)
+        else:
+            self._cached_scan = self._scan
+
+    def _build_automaton(self, keywords: list[str]) -> None:
+        """goto / failure 関数を構築し、各状態の出力をfailureリンク経由で集約する"""
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[str]] = [[]]
+
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(keyword)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[next_state] = target if target != next_state else 0
+                # BFS順なので failure 先の出力は集約済み
+                outputs[next_state].extend(outputs[fail[next_state]])
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs: list[tuple[str, ...]] = [tuple(output) for output in outputs]
+
+    def _scan(self, text: str) -> KeywordMatches:
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        positions: dict[str, int] = {}
+
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword in outputs[state]:
+                # 左から走査するため最初に見つかった位置が最初の出現位置になる
+                if keyword not in positions:
+                    positions[keyword] = end - len(keyword) + 1
+
+        categories: set[str] = set()
+        for keyword in positions:
+            categories.update(self._keyword_categories[keyword])
+        return KeywordMatches(text, MappingProxyType(positions), frozenset(categories), self)
+
+    def scan(self, text: str) -> KeywordMatches:
+        """テキストを1回走査して全キーワードの出現を取得
+
+        Args:
+            text: 走査するテキスト
+
+        Returns:
+            照合結果
+        """
+        return self._cached_scan(text or "")
+
+    def knows(self, keyword: str) -> bool:
+        """キーワードがオートマトンに登録されているか"""
+        return keyword in self._keyword_categories
+
+    def keywords_of(self, category: str) -> tuple[str, ...]:
+        """カテゴリのキーワードを定義順で取得"""
+        return self._categories.get(category, ())
+
+    @property
+    def vocabulary(self) -> tuple[str, ...]:
+        """登録されている全キーワード（重複なし）"""
+        return tuple(self._keyword_categories)
+
+    @property
+    def category_names(self) -> tuple[str, ...]:
+        """登録されているカテゴリ名"""
+        return tuple(self._categories)
+
+    def get_stats(self) -> dict[str, Any]:
+        """統計情報を取得"""
+        stats: dict[str, Any] = {
+            "categories": len(self._categories),
+            "keywords": len(self._keyword_categories),
+            "states": len(self._goto),
+        }
+        cache_info = getattr(self._cached_scan, "cache_info", None)
+        if cache_info is not None:
+            info = cache_info()
+            stats["cache_hits"] = info.hits
+            stats["cache_misses"] = info.misses
+        return stats
+
+
+def build_default_categories() -> dict[str, list[str]]:
+    """YAML設定とPython定数から既定のキーワードカテゴリを構築
+
+    カテゴリ名は「用途.種類」の形式。各呼び出し側はここに登録されたリストを
+    scan 結果に問い合わせる。
+    """
+    # 循環インポートを避けるため遅延インポート
+    from src.constants.content_constants import FORBIDDEN_PHRASES, SEVERE_WEATHER_PATTERNS
+    from src.constants import validation_constants as vc
+    from src.nodes.helpers.ng_words import get_ng_words
+    from src.nodes.helpers.safety_checks import constants as safety
+    from src.nodes.helpers.safety_checks.alternative_finder import AlternativeCommentFinder
+    from src.utils.comment_deduplicator import CommentDeduplicator
+    from src.utils.validators.duplication_checker import UMBRELLA_MEANINGS
+    from src.utils.validators.weather_specific.weather_condition_validator import WeatherConditionValidator
+    from src.utils.validators.weather_validator import WeatherValidator
+    from src.utils.weather_comment_filter import WeatherCommentFilter
+
+    categories: dict[str, list[str]] = {
+        "ng_words": list(get_ng_words()),
+        "forbidden_phrases": list(FORBIDDEN_PHRASES),
+        "severe_weather": list(SEVERE_WEATHER_PATTERNS),
+    }
+
+    # WeatherCommentFilter
+    for weather_type, config in WeatherCommentFilter.WEATHER_INCOMPATIBLE_KEYWORDS.items():
+        categories[f"weather_filter.{weather_type}"] = list(config["forbidden"])
+    categories["weather_filter.rain_related"] = list(WeatherCommentFilter.RAIN_RELATED_KEYWORDS)
+    categories["weather_filter.unstable"] = list(WeatherCommentFilter.UNSTABLE_WEATHER_KEYWORDS)
+    for month, words in WeatherCommentFilter.SEASONAL_FORBIDDEN.items():
+        categories[f"weather_filter.month.{month}"] = list(words)
+
+    # WeatherValidator（コード内定義）と WeatherConditionValidator（weather_forbidden_words.yaml）
+    for weather_type, words in WeatherValidator().weather_forbidden_words.items():
+        for comment_type, keywords in words.items():
+            categories[f"weather_validator.{weather_type}.{comment_type}"] = list(keywords)
+    for weather_type, words in (WeatherConditionValidator().weather_forbidden_words or {}).items():
+        for comment_type, keywords in (words or {}).items():
+            categories[f"weather_forbidden.{weather_type}.{comment_type}"] = [str(k) for k in keywords]
+
+    # DuplicationChecker
+    categories["duplication.keywords"] = list(vc.DUPLICATE_KEYWORDS)
+    categories["duplication.umbrella"] = list(vc.UMBRELLA_EXPRESSIONS) + ["傘"]
+    categories["duplication.umbrella_meanings"] = [m for group in UMBRELLA_MEANINGS for m in group]
+    for pattern in vc.REPETITIVE_PATTERNS:
+        categories[f"duplication.repetitive.{pattern['concept']}"] = list(pattern["expressions"])
+    for i, (positive, negative) in enumerate(vc.CONTRADICTION_PATTERNS):
+        categories[f"duplication.contradiction.{i}.positive"] = list(positive)
+        categories[f"duplication.contradiction.{i}.negative"] = list(negative)
+    for i, (weather_patterns, advice_patterns) in enumerate(vc.SIMILARITY_PATTERNS):
+        categories[f"duplication.similarity.{i}.weather"] = list(weather_patterns)
+        categories[f"duplication.similarity.{i}.advice"] = list(advice_patterns)
+
+    # CommentDeduplicator
+    for i, pattern in enumerate(CommentDeduplicator.DUPLICATE_PATTERNS):
+        categories[f"deduplicator.{i}.keywords"] = list(pattern["keywords"])
+        categories[f"deduplicator.{i}.variations"] = list(pattern["variations"])
+
+    # AlternativeCommentFinder
+    categories["alternative.sunny"] = list(safety.SUNNY_KEYWORDS)
+    categories["alternative.rain_advice"] = list(safety.RAIN_ADVICE_PATTERNS)
+    categories["alternative.storm"] = list(safety.STORM_WEATHER_PATTERNS)
+    categories["alternative.shower"] = list(AlternativeCommentFinder.SHOWER_KEYWORDS)
+    categories["alternative.cloudy"] = list(AlternativeCommentFinder.CLOUDY_KEYWORDS)
+    categories["alternative.cloudy_avoid"] = list(AlternativeCommentFinder.CLOUDY_AVOID_KEYWORDS)
+    for name in ("RAIN_INAPPROPRIATE_SUNNY", "RAIN_INAPPROPRIATE_CLOUDY", "SUNNY_INAPPROPRIATE_RAIN",
+                 "SUNNY_INAPPROPRIATE_CLOUDY", "CLOUDY_INAPPROPRIATE_SUN"):
+        categories[f"alternative.{name.lower()}"] = list(getattr(safety, name))
+
+    return categories
+
+
+# 照合エンジンの構築に使うYAML設定（変更された場合は次回取得時に再構築する）
+KEYWORD_CONFIG_FILES = (CONFIG_DIR / "ng_words.yaml", CONFIG_DIR / "weather_forbidden_words.yaml")
+
+_keyword_matcher: KeywordMatcher | None = None
+_matcher_config_versions: tuple[int | None, ...] | None = None
+_matcher_lock = threading.Lock()
+
+
+def _config_versions() -> tuple[int | None, ...]:
+    store = get_yaml_config_store()
+    return tuple(store.version_of(path) for path in KEYWORD_CONFIG_FILES)
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """プロセス全体で共有するキーワード照合エンジンを取得
+
+    初回呼び出し時に構築し、元になったYAML設定が変更された場合は再構築する。
+    """
+    global _keyword_matcher, _matcher_config_versions
+    versions = _config_versions()
+    matcher = _keyword_matcher
+    if matcher is None or versions != _matcher_config_versions:
+        with _matcher_lock:
+            matcher = _keyword_matcher
+            if matcher is None or versions != _matcher_config_versions:
+                matcher = KeywordMatcher(build_default_categories())
+                _keyword_matcher = matcher
+                _matcher_config_versions = versions
+                logger.info(f"キーワード照合エンジンを構築しました: {matcher.get_stats()}")
+    return matcher
+
+
+def reset_keyword_matcher() -> None:
+    """共有キーワード照合エンジンを破棄（テスト用）"""
+    global _keyword_matcher, _matcher_config_versions
+    with _matcher_lock:
+        _keyword_matcher = None
+        _matcher_config_versions = None
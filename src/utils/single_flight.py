@@ -0,0 +1,229 @@
+"""
+同時呼び出しの合流（single-flight）
+
+同じキーで同時に呼び出された処理を1回の実行にまとめ、待っている呼び出し側全員に
+同じ結果（または例外）を返す。キャッシュと違い結果は保持せず、実行が終わった時点で
+キーは解放される。キャッシュの手前に置くことで、キャッシュが埋まる前に届いた
+同時リクエストが上流へ重複して送られるのを防ぐ。
+
+同期版（スレッド間で合流）と asyncio 版（同じイベントループ上のタスク間で合流）がある。
+"""
+
+from __future__ import annotations
+import asyncio
+import logging
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call:
+    """実行中の同期呼び出し"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class _FlightStats:
+    """合流の統計情報（スレッドセーフ）"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "errors": 0,
+        }
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _snapshot(self, in_flight: int) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = dict(self._stats)
+        stats["name"] = self.name
+        stats["in_flight"] = in_flight
+        return stats
+
+
+class SingleFlight(_FlightStats):
+    """同じキーの同時呼び出しを1回の実行にまとめる（スレッド間、スレッドセーフ）"""
+
+    def __init__(self, name: str = "default"):
+        """
+        Args:
+            name: 統計情報に表示する名前
+        """
+        super().__init__(name)
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """キーごとに1回だけ ``func`` を実行し、同時に呼び出した全員に結果を返す
+
+        Args:
+            key: 合流させる呼び出しを識別するキー
+            func: 実行する関数
+            *args: 関数の位置引数
+            **kwargs: 関数のキーワード引数
+
+        Returns:
+            関数の戻り値（合流した呼び出し側には同じオブジェクトが返る）
+
+        Raises:
+            関数が送出した例外（合流した呼び出し側にも同じ例外を送出する）
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executions"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            self._count("errors")
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def get_stats(self) -> dict[str, Any]:
+        """呼び出し数・実行数・合流数などの統計情報を取得"""
+        with self._lock:
+            in_flight = len(self._calls)
+        return self._snapshot(in_flight)
+
+
+class AsyncSingleFlight(_FlightStats):
+    """同じキーの同時呼び出しを1回の実行にまとめる（asyncio版）
+
+    処理は呼び出し側とは別のタスクで実行するため、最初の呼び出し側がキャンセルされても
+    合流した他の呼び出し側には影響しない。別のイベントループ上で実行中の呼び出しには
+    合流せず、それぞれのループで実行する。
+    """
+
+    def __init__(self, name: str = "default"):
+        """
+        Args:
+            name: 統計情報に表示する名前
+        """
+        super().__init__(name)
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """キーごとに1回だけ ``func`` を実行し、同時に呼び出した全員に結果を返す
+
+        引数と戻り値は ``SingleFlight.do`` と同じ（``func`` はコルーチン関数）。
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._stats["calls"] += 1
+            task = self._tasks.get(key)
+            if task is not None and task.get_loop() is loop:
+                self._stats["coalesced"] += 1
+            else:
+                task = loop.create_task(self._run(key, func, args, kwargs))
+                task.add_done_callback(_consume_exception)
+                self._tasks[key] = task
+                self._stats["executions"] += 1
+        # 待っている側のキャンセルが実行中のタスクに波及しないようにする
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, func: Callable[..., Awaitable[T]],
+                   args: tuple, kwargs: dict[str, Any]) -> T:
+        try:
+            return await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            self._count("errors")
+            raise
+        finally:
+            with self._lock:
+                if self._tasks.get(key) is asyncio.current_task():
+                    del self._tasks[key]
+
+    def get_stats(self) -> dict[str, Any]:
+        """呼び出し数・実行数・合流数などの統計情報を取得"""
+        with self._lock:
+            in_flight = len(self._tasks)
+        return self._snapshot(in_flight)
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    """待っている呼び出しがいなくなったタスクの例外が未取得として警告されないようにする"""
+    if not task.cancelled():
+        task.exception()
+
+
+_groups: dict[str, SingleFlight | AsyncSingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def _get_group(name: str, group_class: type) -> Any:
+    group = _groups.get(name)
+    if group is None:
+        with _groups_lock:
+            group = _groups.get(name)
+            if group is None:
+                group = _groups[name] = group_class(name)
+    if not isinstance(group, group_class):
+        raise ValueError(f"Single-flight group '{name}' is already registered as {type(group).__name__}")
+    return group
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """プロセス全体で共有する同期版の合流グループを取得"""
+    return _get_group(name, SingleFlight)
+
+
+def get_async_single_flight(name: str) -> AsyncSingleFlight:
+    """プロセス全体で共有する asyncio 版の合流グループを取得"""
+    return _get_group(name, AsyncSingleFlight)
+
+
+def get_single_flight_stats() -> dict[str, dict[str, Any]]:
+    """登録されている全ての合流グループの統計情報を取得"""
+    with _groups_lock:
+        groups = list(_groups.items())
+    return {name: group.get_stats() for name, group in groups}
+
+
+def reset_single_flights() -> None:
+    """登録されている合流グループを破棄（主にテスト用）"""
+    with _groups_lock:
+        _groups.clear()
+
+
+__all__ = [
+    "AsyncSingleFlight",
+    "SingleFlight",
+    "get_async_single_flight",
+    "get_single_flight",
+    "get_single_flight_stats",
+    "reset_single_flights",
+]
@@ -0,0 +1,229 @@
+"""
+緯度経度の空間インデックス
+
+地点を緯度経度のグリッドセルに振り分けて保持し、半径検索・k近傍検索では
+検索範囲に重なるセルの候補だけをベクトル化したハーバサイン公式で距離計算する。
+地点の追加・更新・削除はインデックス全体を再構築せずに行える。
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Hashable, Iterator
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# 緯度1度あたりの距離（km）
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+
+
+def haversine_km(latitude: float, longitude: float,
+                 latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """1地点から複数地点への大圏距離をまとめて計算（km）
+
+    Args:
+        latitude: 基準地点の緯度（度）
+        longitude: 基準地点の経度（度）
+        latitudes: 対象地点の緯度の配列（度）
+        longitudes: 対象地点の経度の配列（度）
+
+    Returns:
+        距離（km）の配列
+    """
+    lat1 = math.radians(latitude)
+    lon1 = math.radians(longitude)
+    lat2 = np.radians(latitudes)
+    lon2 = np.radians(longitudes)
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    a = np.clip(a, 0.0, 1.0)
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+class GeoGridIndex:
+    """緯度経度グリッドによる空間インデックス（スレッドセーフ）
+
+    キーは任意のハッシュ可能な値で、同じキーで追加すると座標を更新する。
+    """
+
+    def __init__(self, cell_size_deg: float = 0.5, initial_capacity: int = 64):
+        """
+        Args:
+            cell_size_deg: グリッドセルの大きさ（度）
+            initial_capacity: 座標配列の初期容量
+        """
+        self.cell_size_deg = cell_size_deg
+        self._lock = threading.RLock()
+        self._latitudes = np.empty(initial_capacity, dtype=np.float64)
+        self._longitudes = np.empty(initial_capacity, dtype=np.float64)
+        self._keys: list[Hashable | None] = []
+        self._slots: dict[Hashable, int] = {}
+        self._free_slots: list[int] = []
+        self._cells: dict[tuple[int, int], list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slots
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._slots))
+
+    def _cell_of(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return (math.floor(latitude / self.cell_size_deg), math.floor(longitude / self.cell_size_deg))
+
+    def _allocate_slot(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+        slot = len(self._keys)
+        if slot >= len(self._latitudes):
+            capacity = max(1, len(self._latitudes)) * 2
+            self._latitudes = np.resize(self._latitudes, capacity)
+            self._longitudes = np.resize(self._longitudes, capacity)
+        self._keys.append(None)
+        return slot
+
+    def insert(self, key: Hashable, latitude: float, longitude: float) -> None:
+        """地点を追加（既に存在するキーの場合は座標を更新）"""
+        with self._lock:
+            if key in self._slots:
+                self.remove(key)
+            slot = self._allocate_slot()
+            self._latitudes[slot] = latitude
+            self._longitudes[slot] = longitude
+            self._keys[slot] = key
+            self._slots[key] = slot
+            self._cells.setdefault(self._cell_of(latitude, longitude), []).append(slot)
+
+    def remove(self, key: Hashable) -> bool:
+        """地点を削除
+
+        Returns:
+            削除した場合True
+        """
+        with self._lock:
+            slot = self._slots.pop(key, None)
+            if slot is None:
+                return False
+            cell = self._cell_of(self._latitudes[slot], self._longitudes[slot])
+            members = self._cells[cell]
+            members.remove(slot)
+            if not members:
+                del self._cells[cell]
+            self._keys[slot] = None
+            self._free_slots.append(slot)
+            return True
+
+    def get(self, key: Hashable) -> tuple[float, float] | None:
+        """キーの座標（緯度, 経度）を取得"""
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                return None
+            return float(self._latitudes[slot]), float(self._longitudes[slot])
+
+    def _candidate_slots(self, latitude: float, longitude: float, radius_km: float) -> list[int]:
+        """検索範囲の外接矩形に重なるセルに含まれるスロットを取得"""
+        lat_delta = radius_km / KM_PER_DEGREE
+        max_abs_lat = min(90.0, abs(latitude) + lat_delta)
+        cos_lat = math.cos(math.radians(max_abs_lat))
+        lon_delta = lat_delta / cos_lat if cos_lat > 1e-6 else 360.0
+
+        if lon_delta >= 180.0 or not (-180.0 <= longitude - lon_delta and longitude + lon_delta <= 180.0):
+            # 極付近や日付変更線をまたぐ場合は全セルを対象にする
+            return [slot for members in self._cells.values() for slot in members]
+
+        min_row, min_col = self._cell_of(latitude - lat_delta, longitude - lon_delta)
+        max_row, max_col = self._cell_of(latitude + lat_delta, longitude + lon_delta)
+
+        # 走査するセル数が登録済みセル数より多い場合は登録済みセルを絞り込む
+        if (max_row - min_row + 1) * (max_col - min_col + 1) > len(self._cells):
+            return [
+                slot
+                for (row, col), members in self._cells.items()
+                if min_row <= row <= max_row and min_col <= col <= max_col
+                for slot in members
+            ]
+
+        slots = []
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                members = self._cells.get((row, col))
+                if members:
+                    slots.extend(members)
+        return slots
+
+    def _rank(self, latitude: float, longitude: float, slots: list[int] | np.ndarray,
+              radius_km: float | None, k: int | None,
+              exclude: Hashable | None) -> list[tuple[Hashable, float]]:
+        """候補スロットを距離順に並べる"""
+        if len(slots) == 0:
+            return []
+        slots = np.asarray(slots, dtype=np.intp)
+        distances = haversine_km(latitude, longitude, self._latitudes[slots], self._longitudes[slots])
+
+        if radius_km is not None:
+            mask = distances <= radius_km
+            slots = slots[mask]
+            distances = distances[mask]
+
+        if exclude is not None and exclude in self._slots:
+            mask = slots != self._slots[exclude]
+            slots = slots[mask]
+            distances = distances[mask]
+
+        if k is not None and k < len(distances):
+            nearest = np.argpartition(distances, k)[:k]
+            slots = slots[nearest]
+            distances = distances[nearest]
+
+        order = np.argsort(distances, kind="stable")
+        return [(self._keys[slots[i]], float(distances[i])) for i in order]
+
+    def query_radius(self, latitude: float, longitude: float, radius_km: float,
+                     k: int | None = None, exclude: Hashable | None = None) -> list[tuple[Hashable, float]]:
+        """半径内の地点を距離順に取得
+
+        Args:
+            latitude: 基準地点の緯度
+            longitude: 基準地点の経度
+            radius_km: 検索半径（km）
+            k: 最大件数（Noneの場合は全件）
+            exclude: 結果から除外するキー（基準地点自身など）
+
+        Returns:
+            (キー, 距離km) のリスト（距離順）
+        """
+        with self._lock:
+            slots = self._candidate_slots(latitude, longitude, radius_km)
+            return self._rank(latitude, longitude, slots, radius_km, k, exclude)
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1,
+                exclude: Hashable | None = None) -> list[tuple[Hashable, float]]:
+        """距離に制限を設けずにk近傍を取得
+
+        Returns:
+            (キー, 距離km) のリスト（距離順）
+        """
+        with self._lock:
+            slots = list(self._slots.values())
+            return self._rank(latitude, longitude, slots, None, k, exclude)
+
+    def clear(self) -> None:
+        """全ての地点を削除"""
+        with self._lock:
+            self._keys.clear()
+            self._slots.clear()
+            self._free_slots.clear()
+            self._cells.clear()
+
+
+__all__ = [
+    "EARTH_RADIUS_KM",
+    "GeoGridIndex",
+    "haversine_km",
+]
@@ -12,9 +12,15 @@ from src.constants.validation_constants import (
     CONTRADICTION_PATTERNS,
     SIMILARITY_PATTERNS
 )
+from src.utils.keyword_matcher import get_keyword_matcher
 
 logger = logging.getLogger(__name__)
 
+# 傘関連の意味的に類似した表現グループ
+UMBRELLA_MEANINGS = [
+    ["必須", "お守り", "必要", "忘れずに", "お忘れなく", "携帯", "準備", "活躍", "安心"],
+]
+
 
 class DuplicationChecker:
     """重複チェックの共通ロジックを提供するユーティリティクラス"""
@@ -37,9 +43,13 @@ class DuplicationChecker:
         Returns:
             重複が検出された場合True
         """
+        matcher = get_keyword_matcher()
+        weather_matches = matcher.scan(weather_text)
+        advice_matches = matcher.scan(advice_text)
+        
         for concept, expressions in DuplicationChecker._repetitive_pattern_cache.items():
-            weather_expressions = [expr for expr in expressions if expr in weather_text]
-            advice_expressions = [expr for expr in expressions if expr in advice_text]
+            weather_expressions = weather_matches.found(expressions)
+            advice_expressions = advice_matches.found(expressions)
             
             if weather_expressions and advice_expressions:
                 logger.debug(f"同一概念の繰り返し検出 [{concept}]: 天気={weather_expressions}, アドバイス={advice_expressions}")
@@ -93,14 +103,9 @@ class DuplicationChecker:
         Returns:
             重要キーワードの重複が検出された場合True
         """
-        weather_keywords = []
-        advice_keywords = []
-        
-        for keyword in DUPLICATE_KEYWORDS:
-            if keyword in weather_text:
-                weather_keywords.append(keyword)
-            if keyword in advice_text:
-                advice_keywords.append(keyword)
+        matcher = get_keyword_matcher()
+        weather_keywords = matcher.scan(weather_text).found(DUPLICATE_KEYWORDS)
+        advice_keywords = matcher.scan(advice_text).found(DUPLICATE_KEYWORDS)
         
         common_keywords = set(weather_keywords) & set(advice_keywords)
         if common_keywords:
@@ -122,12 +127,16 @@ class DuplicationChecker:
         Returns:
             意味的矛盾が検出された場合True
         """
+        matcher = get_keyword_matcher()
+        weather_matches = matcher.scan(weather_text)
+        advice_matches = matcher.scan(advice_text)
+        
         for positive_patterns, negative_patterns in CONTRADICTION_PATTERNS:
-            has_positive = any(pattern in weather_text for pattern in positive_patterns)
-            has_negative = any(pattern in advice_text for pattern in negative_patterns)
+            has_positive = weather_matches.any(positive_patterns)
+            has_negative = advice_matches.any(negative_patterns)
             
-            has_positive_advice = any(pattern in advice_text for pattern in positive_patterns)
-            has_negative_weather = any(pattern in weather_text for pattern in negative_patterns)
+            has_positive_advice = advice_matches.any(positive_patterns)
+            has_negative_weather = weather_matches.any(negative_patterns)
             
             if (has_positive and has_negative) or (has_positive_advice and has_negative_weather):
                 logger.debug(f"意味的矛盾検出: ポジティブ={positive_patterns}, ネガティブ={negative_patterns}")
@@ -148,9 +157,13 @@ class DuplicationChecker:
         Returns:
             類似表現が検出された場合True
         """
+        matcher = get_keyword_matcher()
+        weather_matches = matcher.scan(weather_text)
+        advice_matches = matcher.scan(advice_text)
+        
         for weather_patterns, advice_patterns in SIMILARITY_PATTERNS:
-            weather_match = any(pattern in weather_text for pattern in weather_patterns)
-            advice_match = any(pattern in advice_text for pattern in advice_patterns)
+            weather_match = weather_matches.any(weather_patterns)
+            advice_match = advice_matches.any(advice_patterns)
             if weather_match and advice_match:
                 logger.debug(f"類似表現検出: 天気パターン={weather_patterns}, アドバイスパターン={advice_patterns}")
                 return True
@@ -169,19 +182,19 @@ class DuplicationChecker:
         Returns:
             傘関連の重複が検出された場合True
         """
-        weather_has_umbrella = any(expr in weather_text for expr in UMBRELLA_EXPRESSIONS) or "傘" in weather_text
-        advice_has_umbrella = any(expr in advice_text for expr in UMBRELLA_EXPRESSIONS) or "傘" in advice_text
+        matcher = get_keyword_matcher()
+        weather_matches = matcher.scan(weather_text)
+        advice_matches = matcher.scan(advice_text)
+        
+        weather_has_umbrella = weather_matches.any(UMBRELLA_EXPRESSIONS) or "傘" in weather_matches
+        advice_has_umbrella = advice_matches.any(UMBRELLA_EXPRESSIONS) or "傘" in advice_matches
         
         if weather_has_umbrella and advice_has_umbrella:
             logger.debug(f"傘関連の重複候補検出: 天気='{weather_text}', アドバイス='{advice_text}'")
             
-            similar_umbrella_meanings = [
-                ["必須", "お守り", "必要", "忘れずに", "お忘れなく", "携帯", "準備", "活躍", "安心"],
-            ]
-            
-            for meaning_group in similar_umbrella_meanings:
-                weather_meanings = [m for m in meaning_group if m in weather_text]
-                advice_meanings = [m for m in meaning_group if m in advice_text]
+            for meaning_group in UMBRELLA_MEANINGS:
+                weather_meanings = weather_matches.found(meaning_group)
+                advice_meanings = advice_matches.found(meaning_group)
                 
                 if weather_meanings and advice_meanings:
                     logger.debug(f"傘関連の意味的重複検出: 天気側={weather_meanings}, アドバイス側={advice_meanings}")
@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 import logging
-import yaml
 from pathlib import Path
+from src.config.yaml_config_store import get_yaml_config_store
 from src.data.weather_data import WeatherForecast
 
 logger = logging.getLogger(__name__)
@@ -16,9 +16,8 @@ class ToneConsistencyValidator:
         """設定ファイルから単語リストを読み込み"""
         config_path = Path(__file__).parent.parent.parent.parent / "config" / "validator_words.yaml"
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-                self.tone_words = config.get('tone_words', {})
+            config = get_yaml_config_store().get(config_path)
+            self.tone_words = config.get('tone_words', {})
         except Exception as e:
             logger.warning(f"設定ファイル読み込みエラー: {e}. デフォルト値を使用します。")
             self.tone_words = self._get_default_tone_words()
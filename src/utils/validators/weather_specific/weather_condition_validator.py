@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 import logging
-import yaml
 from pathlib import Path
 from src.config.config import get_weather_constants
+from src.config.yaml_config_store import get_yaml_config_store
+from src.data.weather_data import WeatherForecast
+from src.data.past_comment import PastComment
+from src.utils.keyword_matcher import get_keyword_matcher
 
 # 定数を取得
 SUNNY_WEATHER_KEYWORDS = get_weather_constants().SUNNY_WEATHER_KEYWORDS
-from src.data.weather_data import WeatherForecast
-from src.data.past_comment import PastComment
 
 logger = logging.getLogger(__name__)
 
@@ -34,34 +35,35 @@ class WeatherConditionValidator:
     ) -> tuple[bool, str]:
         """天気条件に基づく検証"""
         weather_desc_lower = weather_description.lower()
+        matches = get_keyword_matcher().scan(comment_text)
         
         # 晴天パターン
         if any(sunny_word in weather_desc_lower for sunny_word in SUNNY_WEATHER_KEYWORDS):
             forbidden_words = self.weather_forbidden_words.get("sunny", {}).get(comment_type, [])
-            for word in forbidden_words:
-                if word in comment_text:
-                    return False, f"晴天時に「{word}」は不適切"
+            word = matches.first(forbidden_words)
+            if word:
+                return False, f"晴天時に「{word}」は不適切"
         
         # 雨天パターン（豪雨・大雨を優先的にチェック）
         elif any(word in weather_desc_lower for word in ["豪雨", "大雨", "暴風雨", "激しい雨", "非常に激しい雨", "猛烈な雨"]):
             forbidden_words = self.weather_forbidden_words.get("heavy_rain", {}).get(comment_type, [])
-            for word in forbidden_words:
-                if word in comment_text:
-                    return False, f"大雨時に「{word}」は不適切"
+            word = matches.first(forbidden_words)
+            if word:
+                return False, f"大雨時に「{word}」は不適切"
         
         # 通常の雨
         elif "雨" in weather_desc_lower or "rain" in weather_desc_lower:
             forbidden_words = self.weather_forbidden_words.get("rain", {}).get(comment_type, [])
-            for word in forbidden_words:
-                if word in comment_text:
-                    return False, f"雨天時に「{word}」は不適切"
+            word = matches.first(forbidden_words)
+            if word:
+                return False, f"雨天時に「{word}」は不適切"
         
         # 曇天パターン
         elif any(word in weather_desc_lower for word in ["曇", "くもり", "曇り", "雲", "cloudy"]):
             forbidden_words = self.weather_forbidden_words.get("cloudy", {}).get(comment_type, [])
-            for word in forbidden_words:
-                if word in comment_text:
-                    return False, f"曇天時に「{word}」は不適切"
+            word = matches.first(forbidden_words)
+            if word:
+                return False, f"曇天時に「{word}」は不適切"
         
         return True, "天気条件チェックOK"
     
@@ -119,19 +121,11 @@ class WeatherConditionValidator:
             config_path = current_file.parent.parent.parent.parent.parent / "config" / "weather_forbidden_words.yaml"
         
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                # YAMLファイルの先頭にあるドキュメントストリングをスキップ
-                content = f.read()
-                # 三重引用符で囲まれた部分を削除
-                if content.startswith('"""'):
-                    end_index = content.find('"""', 3)
-                    if end_index != -1:
-                        content = content[end_index + 3:].strip()
-                
-                forbidden_words = yaml.safe_load(content)
-                logger.info(f"禁止ワード設定を読み込みました: {config_path}")
-                return forbidden_words
-                
+            # 共有ストアで一度だけ解析される（先頭のドキュメントストリングはストア側で除去）
+            forbidden_words = get_yaml_config_store().get(config_path)
+            logger.debug(f"禁止ワード設定を取得しました: {config_path}")
+            return forbidden_words
+            
         except FileNotFoundError:
             logger.warning(f"設定ファイルが見つかりません: {config_path}. デフォルト設定を使用します。")
             return self._get_default_forbidden_words()
@@ -5,13 +5,14 @@ import logging
 from typing import TypedDict
 
 from src.config.config import get_weather_constants
-
-# 定数を取得
-SUNNY_WEATHER_KEYWORDS = get_weather_constants().SUNNY_WEATHER_KEYWORDS
 from src.data.weather_data import WeatherForecast, WeatherCondition
 from src.data.past_comment import PastComment, CommentType
+from src.utils.keyword_matcher import get_keyword_matcher
 from .base_validator import BaseValidator
 
+# 定数を取得
+SUNNY_WEATHER_KEYWORDS = get_weather_constants().SUNNY_WEATHER_KEYWORDS
+
 logger = logging.getLogger(__name__)
 
 
@@ -128,22 +129,23 @@ class WeatherValidator(BaseValidator):
         # 該当する天気タイプの禁止ワードを取得
         if weather_type in self.weather_forbidden_words:
             forbidden_words = self.weather_forbidden_words[weather_type].get(comment_type, [])
+            matches = get_keyword_matcher().scan(comment_text)
             
-            for word in forbidden_words:
-                if word in comment_text:
-                    # コンテキストを考慮した判定
-                    # 例：「日差しはなく」「晴れ間はありません」のような否定形は許可
-                    negative_patterns = ["ない", "なく", "ません", "無い", "無く", "ありません"]
-                    if any(neg in comment_text[comment_text.index(word):comment_text.index(word)+10] for neg in negative_patterns):
-                        continue
+            for word in matches.found(forbidden_words):
+                # コンテキストを考慮した判定
+                # 例：「日差しはなく」「晴れ間はありません」のような否定形は許可
+                position = matches.position(word)
+                negative_patterns = ["ない", "なく", "ません", "無い", "無く", "ありません"]
+                if any(neg in comment_text[position:position+10] for neg in negative_patterns):
+                    continue
                     
-                    # 降水量が極めて少ない場合（0.1mm/h未満）は、軽い表現を許可
-                    if weather_type == "rain" and weather_data.precipitation < 0.1:
-                        mild_allowed = ["変わりやすい", "不安定", "にわか雨"]
-                        if word in mild_allowed:
-                            continue
-                    
-                    return False, f"天気条件に不適切なワード: {word}"
+                # 降水量が極めて少ない場合（0.1mm/h未満）は、軽い表現を許可
+                if weather_type == "rain" and weather_data.precipitation < 0.1:
+                    mild_allowed = ["変わりやすい", "不安定", "にわか雨"]
+                    if word in mild_allowed:
+                        continue
+                
+                return False, f"天気条件に不適切なワード: {word}"
         
         # 雨天時の追加チェック
         if weather_type in ["rain", "heavy_rain"]:
@@ -7,10 +7,15 @@
 import logging
 from typing import List, Tuple, Optional, TYPE_CHECKING
 from datetime import datetime
+
 from src.constants.weather_constants import TEMP
+from src.utils.keyword_matcher import get_keyword_matcher
 
 if TYPE_CHECKING:
+    import numpy as np
+
     from src.data.past_comment import PastComment
+    from src.repositories.columnar_comment_store import ColumnarCommentStore
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +66,12 @@ class WeatherCommentFilter:
         12: ["梅雨", "台風", "残暑"]  # 12月
     }
     
+    # 曇りで降水がある場合に許可する雨関連表現
+    RAIN_RELATED_KEYWORDS = [
+        "雨", "傘", "濡れ", "しっとり", "じめじめ", "ずぶ濡れ", "土砂降り",
+        "にわか雨", "雷雨", "降りやすい", "雨具", "レインコート"
+    ]
+    
     # 安定天気時の禁止表現
     UNSTABLE_WEATHER_KEYWORDS = [
         "変わりやすい", "天気急変", "不安定", "変化", "急変",
@@ -115,6 +126,50 @@ class WeatherCommentFilter:
         
         return "cloudy"  # デフォルト
     
+    def get_forbidden_keywords(
+        self,
+        weather_description: str,
+        precipitation: float = 0,
+        temperature: Optional[float] = None,
+        month: Optional[int] = None,
+        is_stable_weather: bool = False
+    ) -> List[str]:
+        """
+        天気条件で禁止されるキーワードの集合を取得
+        
+        is_comment_appropriate が False を返すのは、コメントがこの集合の
+        いずれかを含む場合に限られる（キーワードビットセットでの判定に使用）。
+        
+        Args:
+            weather_description: 天気の説明
+            precipitation: 降水量
+            temperature: 気温
+            month: 月
+            is_stable_weather: 安定した天気かどうか
+            
+        Returns:
+            禁止キーワードのリスト
+        """
+        weather_type = self.get_weather_type(weather_description, precipitation)
+        keywords: List[str] = []
+        
+        if weather_type in self.WEATHER_INCOMPATIBLE_KEYWORDS:
+            forbidden = self.WEATHER_INCOMPATIBLE_KEYWORDS[weather_type]["forbidden"]
+            if weather_type == "cloudy" and precipitation > 0:
+                forbidden = [kw for kw in forbidden if kw not in self.RAIN_RELATED_KEYWORDS]
+            keywords.extend(forbidden)
+        
+        if is_stable_weather:
+            keywords.extend(self.UNSTABLE_WEATHER_KEYWORDS)
+        
+        if month and month in self.SEASONAL_FORBIDDEN:
+            keywords.extend(self.SEASONAL_FORBIDDEN[month])
+        
+        if temperature is not None and temperature < TEMP.HEATSTROKE:
+            keywords.append("熱中症")
+        
+        return keywords
+    
     def is_comment_appropriate(
         self, 
         comment_text: str, 
@@ -141,6 +196,9 @@ class WeatherCommentFilter:
         # 天気タイプの判定
         weather_type = self.get_weather_type(weather_description, precipitation)
         
+        # コメントは1回だけ走査し、以降のチェックは照合結果に問い合わせる
+        matches = get_keyword_matcher().scan(comment_text)
+        
         # 天気別チェック
         if weather_type in self.WEATHER_INCOMPATIBLE_KEYWORDS:
             forbidden = self.WEATHER_INCOMPATIBLE_KEYWORDS[weather_type]["forbidden"]
@@ -148,27 +206,27 @@ class WeatherCommentFilter:
             # 曇りで降水なしの場合のみ雨関連を除外
             if weather_type == "cloudy" and precipitation > 0:
                 # 降水がある場合は雨関連表現を許可
-                forbidden = [kw for kw in forbidden if kw not in ["雨", "傘", "濡れ", "しっとり", "じめじめ", "ずぶ濡れ", "土砂降り", "にわか雨", "雷雨", "降りやすい", "雨具", "レインコート"]]
+                forbidden = [kw for kw in forbidden if kw not in self.RAIN_RELATED_KEYWORDS]
             
-            for keyword in forbidden:
-                if keyword in comment_text:
-                    return False, f"{weather_description}時に「{keyword}」は不適切"
+            keyword = matches.first(forbidden)
+            if keyword:
+                return False, f"{weather_description}時に「{keyword}」は不適切"
         
         # 安定天気チェック
         if is_stable_weather:
-            for keyword in self.UNSTABLE_WEATHER_KEYWORDS:
-                if keyword in comment_text:
-                    return False, f"安定した天気で「{keyword}」は不適切"
+            keyword = matches.first(self.UNSTABLE_WEATHER_KEYWORDS)
+            if keyword:
+                return False, f"安定した天気で「{keyword}」は不適切"
         
         # 季節チェック
         if month and month in self.SEASONAL_FORBIDDEN:
-            for keyword in self.SEASONAL_FORBIDDEN[month]:
-                if keyword in comment_text:
-                    return False, f"{month}月に「{keyword}」は不適切"
+            keyword = matches.first(self.SEASONAL_FORBIDDEN[month])
+            if keyword:
+                return False, f"{month}月に「{keyword}」は不適切"
         
         # 熱中症チェック
         if temperature is not None and temperature < TEMP.HEATSTROKE:
-            if "熱中症" in comment_text:
+            if "熱中症" in matches:
                 return False, f"温度{temperature}°C（{TEMP.HEATSTROKE}°C未満）で「熱中症」は不適切"
         
         return True, None
@@ -202,7 +260,35 @@ class WeatherCommentFilter:
             
         if not weather_description:
             weather_description = ""
-            
+        
+        # 共有コーパス由来のコメントはキーワードビットセットで判定する
+        from src.repositories.comment_corpus import resolve_comment_rows
+        resolved = resolve_comment_rows(comments)
+        if resolved is not None:
+            store, rows = resolved
+            keep = self._appropriate_rows_mask(
+                store, rows, weather_description, precipitation, temperature, month, is_stable_weather
+            )
+            if keep is not None:
+                filtered = [comment for comment, kept in zip(comments, keep, strict=True) if kept]
+                if len(filtered) < len(comments):
+                    logger.info(f"コメントを除外: {len(comments) - len(filtered)}件（キーワードビットセット判定）")
+                return filtered
+        
+        return self._filter_comments_by_scan(
+            comments, weather_description, precipitation, temperature, month, is_stable_weather
+        )
+    
+    def _filter_comments_by_scan(
+        self,
+        comments: List['PastComment'],
+        weather_description: str,
+        precipitation: float = 0,
+        temperature: Optional[float] = None,
+        month: Optional[int] = None,
+        is_stable_weather: bool = False
+    ) -> List['PastComment']:
+        """コメントごとに is_comment_appropriate で判定する（ビットセット判定の参照実装）"""
         filtered = []
         
         for comment in comments:
@@ -224,4 +310,25 @@ class WeatherCommentFilter:
             else:
                 logger.info(f"コメントを除外: {reason} - '{comment_text}'")
         
-        return filtered
\ No newline at end of file
+        return filtered
+    
+    def _appropriate_rows_mask(
+        self,
+        store: 'ColumnarCommentStore',
+        rows: 'np.ndarray',
+        weather_description: str,
+        precipitation: float = 0,
+        temperature: Optional[float] = None,
+        month: Optional[int] = None,
+        is_stable_weather: bool = False
+    ) -> Optional['np.ndarray']:
+        """キーワードビットセットで各行が適切かを判定（使えない場合は None）"""
+        if store.features is None:
+            return None
+        forbidden = self.get_forbidden_keywords(
+            weather_description, precipitation, temperature, month, is_stable_weather
+        )
+        hits = store.features.rows_containing_any(rows, forbidden)
+        if hits is None:
+            return None
+        return ~hits
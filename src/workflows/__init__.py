@@ -5,5 +5,12 @@ LangGraphベースの天気コメント生成ワークフロー
 """
 
 from src.workflows.comment_generation_workflow import create_comment_generation_workflow, run_comment_generation
+from src.workflows.workflow_registry import WorkflowVariant, get_compiled_workflow, warm_up_workflows
 
-__all__ = ["create_comment_generation_workflow", "run_comment_generation"]
+__all__ = [
+    "create_comment_generation_workflow",
+    "run_comment_generation",
+    "WorkflowVariant",
+    "get_compiled_workflow",
+    "warm_up_workflows",
+]
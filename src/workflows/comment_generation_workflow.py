@@ -34,6 +34,7 @@ from src.nodes.unified_comment_generation_node import unified_comment_generation
 from src.nodes.weather_forecast_node import fetch_weather_forecast_node
 from src.types.validation import ensure_validation_result
 from src.utils.error_handler import ErrorHandler
+from src.workflows.workflow_registry import WorkflowVariant, get_compiled_workflow
 
 logger = logging.getLogger(__name__)
 
@@ -215,7 +216,8 @@ def run_comment_generation(
     """
     logger.info("並列処理ワークフローを実行")
 
-    workflow = create_comment_generation_workflow()
+    # コンパイル済みワークフローを再利用（リクエストごとの構築・コンパイルを回避）
+    workflow = get_compiled_workflow(WorkflowVariant.LEGACY)
 
     config = get_config()
     forecast_hours_ahead = config.weather.forecast_hours_ahead
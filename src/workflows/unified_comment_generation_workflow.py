@@ -5,6 +5,8 @@
 """
 
 from __future__ import annotations
+import asyncio
+import inspect
 from typing import Any
 from datetime import datetime, timedelta
 import time
@@ -15,7 +17,10 @@ from langgraph.graph import StateGraph, END
 from src.data.comment_generation_state import CommentGenerationState
 from src.nodes.weather_forecast_node import fetch_weather_forecast_node
 from src.nodes.retrieve_past_comments_node import retrieve_past_comments_node
-from src.nodes.unified_comment_generation_node import unified_comment_generation_node
+from src.nodes.unified_comment_generation_node import (
+    unified_comment_generation_node,
+    aunified_comment_generation_node,
+)
 from src.nodes.input_node import input_node
 from src.nodes.output_node import output_node
 from src.config.weather_config import get_config
@@ -24,10 +29,28 @@ from src.exceptions.error_types import (
     LLMError, AppException
 )
 from src.utils.error_handler import ErrorHandler
+from src.workflows.workflow_registry import WorkflowVariant, get_compiled_workflow
 
 logger = logging.getLogger(__name__)
 
 
+def _record_execution_time(state: CommentGenerationState, node_name: str, start_time: float) -> None:
+    """ノード実行時間をメタデータに記録"""
+    execution_time = (time.time() - start_time) * 1000  # ミリ秒
+    if "generation_metadata" not in state:
+        state["generation_metadata"] = {}
+    if "node_execution_times" not in state["generation_metadata"]:
+        state["generation_metadata"]["node_execution_times"] = {}
+    state["generation_metadata"]["node_execution_times"][node_name] = execution_time
+
+
+def _record_node_error(state: CommentGenerationState, node_name: str, error: Exception) -> None:
+    """ノードのエラーをstateに記録"""
+    if "errors" not in state:
+        state["errors"] = []
+    state["errors"].append({"error": f"{node_name}: {str(error)}", "node": node_name})
+
+
 def timed_node(node_func):
     """ノード実行時間を計測するデコレーター"""
     def wrapper(state: CommentGenerationState) -> CommentGenerationState:
@@ -38,27 +61,42 @@ def timed_node(node_func):
             result = node_func(state)
             
             # 実行時間を記録
-            execution_time = (time.time() - start_time) * 1000  # ミリ秒
-            if "generation_metadata" not in result:
-                result["generation_metadata"] = {}
-            if "node_execution_times" not in result["generation_metadata"]:
-                result["generation_metadata"]["node_execution_times"] = {}
-            result["generation_metadata"]["node_execution_times"][node_name] = execution_time
-            
+            _record_execution_time(result, node_name, start_time)
             return result
         except Exception as e:
-            # エラーでも実行時間を記録
-            execution_time = (time.time() - start_time) * 1000
-            if "generation_metadata" not in state:
-                state["generation_metadata"] = {}
-            if "node_execution_times" not in state["generation_metadata"]:
-                state["generation_metadata"]["node_execution_times"] = {}
-            state["generation_metadata"]["node_execution_times"][node_name] = execution_time
+            # エラーでも実行時間を記録し、エラーをstateに記録して再発生
+            _record_execution_time(state, node_name, start_time)
+            _record_node_error(state, node_name, e)
+            raise e
+    
+    return wrapper
+
+
+def timed_async_node(node_func):
+    """ノード実行時間を計測する非同期版デコレーター
+
+    同期ノードは ``asyncio.to_thread`` でワーカースレッドに逃がし、予報取得などの
+    ブロッキング処理の間もイベントループが他の地点の処理やタイムアウトを進められるようにする。
+    """
+    is_coroutine = inspect.iscoroutinefunction(node_func)
+    node_name = getattr(node_func, '__name__', 'unknown_node')
+    if is_coroutine:
+        # 同期版と同じキーで記録する（aunified_... -> unified_...）
+        node_name = node_name.removeprefix("a")
+    
+    async def wrapper(state: CommentGenerationState) -> CommentGenerationState:
+        start_time = time.time()
+        
+        try:
+            result = await node_func(state) if is_coroutine else await asyncio.to_thread(node_func, state)
             
-            # エラーをstateに記録して再発生
-            if "errors" not in state:
-                state["errors"] = []
-            state["errors"].append({"error": f"{node_name}: {str(e)}", "node": node_name})
+            # 実行時間を記録
+            _record_execution_time(result, node_name, start_time)
+            return result
+        except Exception as e:
+            # エラーでも実行時間を記録し、エラーをstateに記録して再発生
+            _record_execution_time(state, node_name, start_time)
+            _record_node_error(state, node_name, e)
             raise e
     
     return wrapper
@@ -88,6 +126,55 @@ def create_unified_comment_generation_workflow() -> StateGraph:
     return workflow.compile()
 
 
+def create_async_unified_comment_generation_workflow() -> StateGraph:
+    """統合コメント生成ワークフロー（非同期版）を構築
+
+    ノード構成は同期版と同じで、統合生成ノードのLLM呼び出しのみを await する。
+    """
+    workflow = StateGraph(CommentGenerationState)
+    
+    # ノードの追加（実行時間計測付き）
+    workflow.add_node("input", timed_async_node(input_node))
+    workflow.add_node("fetch_forecast", timed_async_node(fetch_weather_forecast_node))
+    workflow.add_node("retrieve_comments", timed_async_node(retrieve_past_comments_node))
+    workflow.add_node("unified_generation", timed_async_node(aunified_comment_generation_node))
+    workflow.add_node("output", timed_async_node(output_node))
+    
+    # エッジの追加（シンプルな直線フロー）
+    workflow.add_edge("input", "fetch_forecast")
+    workflow.add_edge("fetch_forecast", "retrieve_comments")
+    workflow.add_edge("retrieve_comments", "unified_generation")
+    workflow.add_edge("unified_generation", "output")
+    workflow.add_edge("output", END)
+    
+    # エントリーポイントの設定
+    workflow.set_entry_point("input")
+    
+    return workflow.compile()
+
+
+def _build_initial_state(
+    location_name: str,
+    target_datetime: datetime | None,
+    llm_provider: str,
+    exclude_previous: bool,
+    **kwargs,
+) -> dict[str, Any]:
+    """ワークフローの初期状態を構築"""
+    config = get_config()
+    forecast_hours_ahead = config.weather.forecast_hours_ahead
+    return {
+        "location_name": location_name,
+        "target_datetime": target_datetime or (datetime.now() + timedelta(hours=forecast_hours_ahead)),
+        "llm_provider": llm_provider,
+        "exclude_previous": exclude_previous,
+        "errors": [],
+        "warnings": [],
+        "workflow_start_time": datetime.now(),
+        **kwargs,
+    }
+
+
 def run_unified_comment_generation(
     location_name: str,
     target_datetime: datetime | None = None,
@@ -107,89 +194,112 @@ def run_unified_comment_generation(
     Returns:
         生成結果を含む辞書
     """
-    workflow = create_unified_comment_generation_workflow()
-    
-    config = get_config()
-    forecast_hours_ahead = config.weather.forecast_hours_ahead
-    initial_state = {
-        "location_name": location_name,
-        "target_datetime": target_datetime or (datetime.now() + timedelta(hours=forecast_hours_ahead)),
-        "llm_provider": llm_provider,
-        "exclude_previous": exclude_previous,
-        "errors": [],
-        "warnings": [],
-        "workflow_start_time": datetime.now(),
-        **kwargs,
-    }
+    # コンパイル済みワークフローを再利用（リクエストごとの構築・コンパイルを回避）
+    workflow = get_compiled_workflow(WorkflowVariant.UNIFIED)
+    initial_state = _build_initial_state(
+        location_name, target_datetime, llm_provider, exclude_previous, **kwargs
+    )
     
     try:
         result = workflow.invoke(initial_state)
-        
-        workflow_end_time = datetime.now()
-        total_execution_time = (
-            workflow_end_time - result.get("workflow_start_time", workflow_end_time)
-        ).total_seconds() * 1000
-        
-        # 結果の取得
-        output_json_str = result.get("generation_metadata", {}).get("output_json")
-        if output_json_str:
-            try:
-                output_data = json.loads(output_json_str)
-                final_comment = output_data.get("final_comment")
-                generation_metadata = output_data.get("generation_metadata", {})
-            except json.JSONDecodeError:
-                logger.error(f"output_jsonのパースに失敗: {output_json_str}")
-                final_comment = result.get("final_comment")
-                generation_metadata = result.get("generation_metadata", {})
-        else:
+        return _build_workflow_result(result)
+    except Exception as e:
+        logger.error(f"統合ワークフロー実行エラー: {str(e)}", exc_info=True)
+        return _build_error_result(e)
+
+
+async def arun_unified_comment_generation(
+    location_name: str,
+    target_datetime: datetime | None = None,
+    llm_provider: str = "openai",
+    exclude_previous: bool = False,
+    **kwargs,
+) -> dict[str, Any]:
+    """統合コメント生成ワークフローを非同期で実行
+    
+    同期ノードはワーカースレッドで実行し、LLM呼び出しは呼び出し元のイベントループ上で await する。
+    引数と戻り値は run_unified_comment_generation と同じ。
+    """
+    workflow = get_compiled_workflow(WorkflowVariant.ASYNC_UNIFIED)
+    initial_state = _build_initial_state(
+        location_name, target_datetime, llm_provider, exclude_previous, **kwargs
+    )
+    
+    try:
+        result = await workflow.ainvoke(initial_state)
+        return _build_workflow_result(result)
+    except Exception as e:
+        logger.error(f"統合ワークフロー実行エラー: {str(e)}", exc_info=True)
+        return _build_error_result(e)
+
+
+def _build_workflow_result(result: dict[str, Any]) -> dict[str, Any]:
+    """ワークフローの最終状態から戻り値を構築"""
+    workflow_end_time = datetime.now()
+    total_execution_time = (
+        workflow_end_time - result.get("workflow_start_time", workflow_end_time)
+    ).total_seconds() * 1000
+    
+    # 結果の取得
+    output_json_str = result.get("generation_metadata", {}).get("output_json")
+    if output_json_str:
+        try:
+            output_data = json.loads(output_json_str)
+            final_comment = output_data.get("final_comment")
+            generation_metadata = output_data.get("generation_metadata", {})
+        except json.JSONDecodeError:
+            logger.error(f"output_jsonのパースに失敗: {output_json_str}")
             final_comment = result.get("final_comment")
             generation_metadata = result.get("generation_metadata", {})
-            
-        # エラーチェック
-        if result.get("errors"):
-            return {
-                "success": False,
-                "error": "; ".join([str(e) for e in result.get("errors", [])]),
-                "final_comment": None,
-                "generation_metadata": generation_metadata,
-                "execution_time_ms": total_execution_time,
-                "node_execution_times": generation_metadata.get("node_execution_times", {}),
-                "warnings": result.get("warnings", []),
-            }
-            
+    else:
+        final_comment = result.get("final_comment")
+        generation_metadata = result.get("generation_metadata", {})
+        
+    # エラーチェック
+    if result.get("errors"):
         return {
-            "success": True,
-            "final_comment": final_comment,
+            "success": False,
+            "error": "; ".join([str(e) for e in result.get("errors", [])]),
+            "final_comment": None,
             "generation_metadata": generation_metadata,
             "execution_time_ms": total_execution_time,
             "node_execution_times": generation_metadata.get("node_execution_times", {}),
             "warnings": result.get("warnings", []),
         }
         
-    except Exception as e:
-        logger.error(f"統合ワークフロー実行エラー: {str(e)}", exc_info=True)
-        
-        # エラー分類
-        error_msg = str(e)
-        app_error = None
-        
-        if "天気予報の取得に失敗しました" in error_msg or "weather" in error_msg.lower():
-            app_error = WeatherFetchError(message=error_msg)
-        elif "過去コメントが存在しません" in error_msg or "CSV" in error_msg:
-            app_error = DataAccessError(message=error_msg)
-        elif "コメントの生成に失敗しました" in error_msg or "LLM" in error_msg:
-            app_error = LLMError(message=error_msg)
-        else:
-            app_error = AppException(ErrorType.UNKNOWN_ERROR, message=error_msg)
-            
-        error_response = ErrorHandler.handle_error(app_error)
+    return {
+        "success": True,
+        "final_comment": final_comment,
+        "generation_metadata": generation_metadata,
+        "execution_time_ms": total_execution_time,
+        "node_execution_times": generation_metadata.get("node_execution_times", {}),
+        "warnings": result.get("warnings", []),
+    }
+
+
+def _build_error_result(e: Exception) -> dict[str, Any]:
+    """例外を分類してエラー時の戻り値を構築"""
+    # エラー分類
+    error_msg = str(e)
+    app_error = None
+    
+    if "天気予報の取得に失敗しました" in error_msg or "weather" in error_msg.lower():
+        app_error = WeatherFetchError(message=error_msg)
+    elif "過去コメントが存在しません" in error_msg or "CSV" in error_msg:
+        app_error = DataAccessError(message=error_msg)
+    elif "コメントの生成に失敗しました" in error_msg or "LLM" in error_msg:
+        app_error = LLMError(message=error_msg)
+    else:
+        app_error = AppException(ErrorType.UNKNOWN_ERROR, message=error_msg)
         
-        return {
-            "success": False,
-            "error": error_response.user_message,
-            "error_type": error_response.error_type,
-            "error_details": error_response.error_details,
-            "final_comment": None,
-            "generation_metadata": {},
-            "execution_time_ms": 0,
-        }
\ No newline at end of file
+    error_response = ErrorHandler.handle_error(app_error)
+    
+    return {
+        "success": False,
+        "error": error_response.user_message,
+        "error_type": error_response.error_type,
+        "error_details": error_response.error_details,
+        "final_comment": None,
+        "generation_metadata": {},
+        "execution_time_ms": 0,
+    }
\ No newline at end of file
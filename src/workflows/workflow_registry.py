@@ -0,0 +1,138 @@
+"""コンパイル済みワークフローのレジストリ
+
+StateGraphの構築と compile() はリクエストごとに行うと無駄なオーバーヘッドになるため、
+ワークフローの種類（統合 / 従来の選択・評価）ごとに一度だけコンパイルし、
+プロセス全体でスレッドセーフに共有する。
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from enum import Enum
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowVariant(str, Enum):
+    """ワークフローの種類"""
+
+    LEGACY = "legacy"  # 並列取得 + 統合/選択・評価の分岐を持つワークフロー
+    UNIFIED = "unified"  # 選択と生成を1回のLLM呼び出しで行う直線ワークフロー
+    ASYNC_UNIFIED = "async_unified"  # UNIFIED の非同期版（ainvoke 専用）
+
+
+class CompiledWorkflowRegistry:
+    """コンパイル済みワークフローをプロセス全体で共有するレジストリ
+
+    コンパイル済みグラフはステートを保持しないため、複数スレッドから
+    同時に invoke しても安全。構築は種類ごとにダブルチェックロックで一度だけ行う。
+
+    キャッシュは (種類, ファクトリ関数) の組で管理する。モジュールの再読み込みや
+    テストでのパッチなどでファクトリが差し替えられた場合は再コンパイルされる。
+    """
+
+    def __init__(self):
+        self._workflows: dict[WorkflowVariant, tuple[Callable[[], Any], Any]] = {}
+        self._lock = threading.Lock()
+        self._stats: dict[str, Any] = {
+            "compilations": 0,
+            "hits": 0,
+            "compile_time_ms": {},
+        }
+
+    def get(self, variant: WorkflowVariant | str, factory: Callable[[], Any]) -> Any:
+        """コンパイル済みワークフローを取得（未構築の場合は構築する）
+
+        Args:
+            variant: ワークフローの種類
+            factory: ワークフローを構築・コンパイルする関数
+
+        Returns:
+            コンパイル済みワークフロー
+        """
+        variant = WorkflowVariant(variant)
+
+        # ロックなしの高速パス（dictの読み取りはアトミック）
+        entry = self._workflows.get(variant)
+        if entry is not None and entry[0] is factory:
+            self._stats["hits"] += 1
+            return entry[1]
+
+        with self._lock:
+            entry = self._workflows.get(variant)
+            if entry is not None and entry[0] is factory:
+                self._stats["hits"] += 1
+                return entry[1]
+
+            start_time = time.perf_counter()
+            workflow = factory()
+            compile_time_ms = (time.perf_counter() - start_time) * 1000
+
+            self._workflows[variant] = (factory, workflow)
+            self._stats["compilations"] += 1
+            self._stats["compile_time_ms"][variant.value] = compile_time_ms
+            logger.info(f"ワークフロー '{variant.value}' をコンパイルしました: {compile_time_ms:.2f}ms")
+            return workflow
+
+    def clear(self) -> None:
+        """全てのコンパイル済みワークフローを破棄"""
+        with self._lock:
+            self._workflows.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """統計情報を取得"""
+        with self._lock:
+            return {
+                "compiled_variants": [variant.value for variant in self._workflows],
+                "compilations": self._stats["compilations"],
+                "hits": self._stats["hits"],
+                "compile_time_ms": dict(self._stats["compile_time_ms"]),
+            }
+
+
+_workflow_registry = CompiledWorkflowRegistry()
+
+
+def get_workflow_registry() -> CompiledWorkflowRegistry:
+    """グローバルなワークフローレジストリを取得"""
+    return _workflow_registry
+
+
+def get_compiled_workflow(variant: WorkflowVariant | str) -> Any:
+    """指定された種類のコンパイル済みワークフローを取得
+
+    Args:
+        variant: ワークフローの種類（"legacy"、"unified" または "async_unified"）
+
+    Returns:
+        コンパイル済みワークフロー
+    """
+    # 循環インポートを避けるため遅延インポート
+    from src.workflows import comment_generation_workflow, unified_comment_generation_workflow
+
+    factories: dict[WorkflowVariant, Callable[[], Any]] = {
+        WorkflowVariant.LEGACY: comment_generation_workflow.create_comment_generation_workflow,
+        WorkflowVariant.UNIFIED: unified_comment_generation_workflow.create_unified_comment_generation_workflow,
+        WorkflowVariant.ASYNC_UNIFIED: unified_comment_generation_workflow.create_async_unified_comment_generation_workflow,
+    }
+    variant = WorkflowVariant(variant)
+    return _workflow_registry.get(variant, factories[variant])
+
+
+def warm_up_workflows() -> dict[str, Any]:
+    """全ての種類のワークフローを事前にコンパイル
+
+    APIサーバー起動時に呼び出し、最初のリクエストでコンパイルコストが発生しないようにする。
+
+    Returns:
+        レジストリの統計情報
+    """
+    for variant in WorkflowVariant:
+        get_compiled_workflow(variant)
+    stats = _workflow_registry.get_stats()
+    logger.info(f"ワークフローのウォームアップ完了: {stats['compile_time_ms']}")
+    return stats
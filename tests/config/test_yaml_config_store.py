@@ -0,0 +1,105 @@
+"""YamlConfigStoreのテスト"""
+
+import os
+from types import MappingProxyType
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from src.config.yaml_config_store import YamlConfigStore, freeze, thaw
+
+
+def _write_yaml(path, data, mtime_ns=None):
+    path.write_text(yaml.safe_dump(data, allow_unicode=True), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "words.yaml"
+    _write_yaml(path, {"ng_words": ["最悪", "絶対"], "nested": {"level": 1}}, mtime_ns=1_000_000_000)
+    return path
+
+
+class TestYamlConfigStore:
+    """YamlConfigStoreのテストクラス"""
+
+    def test_returns_frozen_data(self, config_file):
+        store = YamlConfigStore()
+        config = store.get(config_file)
+        assert isinstance(config, MappingProxyType)
+        assert config["ng_words"] == ("最悪", "絶対")
+        with pytest.raises(TypeError):
+            config["nested"]["level"] = 2
+
+    def test_parses_once_within_interval(self, config_file):
+        store = YamlConfigStore(check_interval=60)
+        first = store.get(config_file)
+        with patch("src.config.yaml_config_store.os.stat") as mock_stat:
+            assert store.get(config_file) is first
+            assert not mock_stat.called
+        assert store.get_stats()["loads"] == 1
+
+    def test_reloads_when_file_changes(self, config_file):
+        store = YamlConfigStore(check_interval=0)
+        first = store.get_version(config_file)
+        assert store.get(config_file) is first.data
+
+        _write_yaml(config_file, {"ng_words": ["ひどい"]}, mtime_ns=2_000_000_000)
+        second = store.get_version(config_file)
+        assert second.version == first.version + 1
+        assert second.data["ng_words"] == ("ひどい",)
+        # 取得済みの旧バージョンは変化しない
+        assert first.data["ng_words"] == ("最悪", "絶対")
+
+    def test_keeps_previous_version_on_parse_error(self, config_file):
+        store = YamlConfigStore(check_interval=0)
+        first = store.get_version(config_file)
+        config_file.write_text("ng_words: [unclosed", encoding="utf-8")
+        assert store.get_version(config_file) is first
+
+    def test_missing_file_raises(self, tmp_path):
+        store = YamlConfigStore()
+        with pytest.raises(FileNotFoundError):
+            store.get(tmp_path / "missing.yaml")
+        assert store.version_of(tmp_path / "missing.yaml") is None
+
+    def test_parser_result_cached_per_version(self, config_file):
+        store = YamlConfigStore(check_interval=0)
+        calls = []
+
+        def parse_words(data):
+            calls.append(1)
+            return frozenset(data["ng_words"])
+
+        assert store.get(config_file, parse_words) == frozenset({"最悪", "絶対"})
+        store.get(config_file, parse_words)
+        assert len(calls) == 1
+
+        _write_yaml(config_file, {"ng_words": ["ひどい"]}, mtime_ns=3_000_000_000)
+        assert store.get(config_file, parse_words) == frozenset({"ひどい"})
+        assert len(calls) == 2
+
+    def test_inline_parsers_are_bounded(self, config_file):
+        store = YamlConfigStore(max_parsed=4)
+        parse_words = frozenset
+        store.get(config_file, parse_words)
+        for _ in range(10):
+            # 呼び出しごとに作られるラムダは別の parser として扱われるが、保持件数は上限で止まる
+            assert store.get(config_file, lambda data: len(data["ng_words"])) == 2
+            store.get(config_file, parse_words)
+
+        assert store.get_stats()["parsed"] == 4
+        # よく使われる parser の結果は追い出されない
+        assert (config_file.absolute(), parse_words) in store._parsed
+
+    def test_strips_docstring_header(self, tmp_path):
+        path = tmp_path / "forbidden.yaml"
+        path.write_text('"""\n説明文\n"""\n\nrain:\n  advice:\n    - 日焼け止め\n', encoding="utf-8")
+        assert YamlConfigStore().get(path)["rain"]["advice"] == ("日焼け止め",)
+
+    def test_freeze_and_thaw_roundtrip(self):
+        data = {"a": [1, {"b": [2, 3]}], "c": "x"}
+        assert thaw(freeze(data)) == data
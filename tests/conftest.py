@@ -138,6 +138,13 @@ def cleanup_test_files():
             import shutil
             shutil.rmtree(test_dir)
 
+@pytest.fixture(autouse=True)
+def reset_llm_response_cache():
+    """Drop cached LLM responses so mocked LLM results do not leak between tests"""
+    yield
+    from src.llm.response_cache import reset_llm_response_cache as reset_cache
+    reset_cache()
+
 # Performance testing fixtures
 @pytest.fixture
 def benchmark_timer():
@@ -0,0 +1,115 @@
+"""
+非同期バッチ処理（AsyncBatchProcessor）のテスト
+
+WxTech はベンチマーク用のスタブサーバー、LLM は FakeLLMProvider を使い、
+外部サービスに接続せずに実行する。
+"""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.fake_llm import FAKE_PROVIDER_NAME
+from benchmarks.macro import location_names, offline_environment, reset_forecast_caches
+from src.controllers.async_batch_processor import AsyncBatchProcessor
+from src.data.forecast_cache import manager
+from src.data.forecast_cache.manager import ForecastCache
+from src.data.forecast_cache.storage import ForecastCacheBackend
+from src.nodes.output_node import output_node
+from src.nodes.weather_forecast.services import WeatherAPIService
+from src.workflows.workflow_registry import get_workflow_registry
+
+
+@pytest.fixture
+def offline():
+    with offline_environment() as server:
+        reset_forecast_caches()
+        yield server
+        reset_forecast_caches()
+
+
+class StalledBackend(ForecastCacheBackend):
+    """解放されるまで書き込みが終わらないバックエンド"""
+
+    name = "stalled"
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def save_entries(self, entries):
+        self.release.wait(10)
+
+    def load_entries(self, location_name, start=None, end=None):
+        return []
+
+    def delete_older_than(self, cutoff, location_name=None):
+        return 0
+
+    def location_names(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class TestAsyncBatchProcessor:
+    """AsyncBatchProcessorのテストクラス"""
+
+    def test_prefetched_weather_skips_upstream_calls(self, offline):
+        locations = location_names(3)
+
+        with patch.object(WeatherAPIService, "fetch_forecast_with_retry") as fetch:
+            result = asyncio.run(
+                AsyncBatchProcessor().generate_comments_batch_async(locations, FAKE_PROVIDER_NAME)
+            )
+
+        assert result["success_count"] == len(locations), result["results"]
+        # 予報は先読みの1回（メッシュごと）だけ取得し、各地点のワークフローは取得しない
+        fetch.assert_not_called()
+        assert 1 <= offline.request_count <= len(locations)
+
+    def test_sync_nodes_do_not_block_event_loop(self, offline):
+        locations = location_names(2)
+        # 2地点の出力ノードが同時に実行されない限り待ち合わせは成立しない
+        barrier = threading.Barrier(len(locations), timeout=5)
+
+        def waiting_output_node(state):
+            barrier.wait()
+            return output_node(state)
+
+        registry = get_workflow_registry()
+        registry.clear()
+        try:
+            with patch("src.workflows.unified_comment_generation_workflow.output_node", waiting_output_node):
+                result = asyncio.run(
+                    AsyncBatchProcessor().generate_comments_batch_async(locations, FAKE_PROVIDER_NAME)
+                )
+        finally:
+            registry.clear()
+
+        assert result["success_count"] == len(locations), result["results"]
+
+    def test_full_write_queue_does_not_stall_fetch(self, offline, tmp_path, monkeypatch):
+        locations = location_names(3)
+        backend = StalledBackend()
+        cache = ForecastCache(cache_dir=tmp_path, enable_spatial_cache=False, backend=backend, write_behind=True)
+        cache._writer.max_queue_size = 1
+        monkeypatch.setattr(manager, "_forecast_cache_instance", cache)
+
+        results = []
+        worker = threading.Thread(
+            target=lambda: results.append(asyncio.run(AsyncBatchProcessor().fetch_all_weather_data_async(locations)))
+        )
+        try:
+            worker.start()
+            # 書き込みが止まっていても、満杯のキューを待たずに取得結果を返す
+            worker.join(5)
+            assert not worker.is_alive()
+            assert all(results[0][name] for name in locations)
+            assert cache.get_cache_stats()["write_queue"]["rejected"] > 0
+        finally:
+            backend.release.set()
+            worker.join(10)
+            cache.close()
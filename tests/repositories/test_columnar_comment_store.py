@@ -0,0 +1,95 @@
+"""ColumnarCommentStoreのテスト"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.data.past_comment import CommentType
+from src.repositories.columnar_comment_store import ColumnarCommentStore
+from src.repositories.csv_file_handler import load_comments_from_csv
+
+SEASONS = ("夏", "冬")
+
+
+def _write_csv(path: Path, column: str, rows: list[tuple[str, str]]) -> None:
+    lines = [f"{column},count"] + [f"{text},{count}" for text, count in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    """季節別CSVを含む一時ディレクトリ"""
+    _write_csv(tmp_path / "夏_weather_comment_enhanced100.csv", "weather_comment",
+               [("晴れて暑い", "10"), ("", "3"), ("にわか雨に注意", "abc"), ("青空広がる", "7")])
+    _write_csv(tmp_path / "夏_advice_enhanced100.csv", "advice",
+               [("熱中症対策を", "5"), ("傘を忘れずに", "4")])
+    _write_csv(tmp_path / "冬_weather_comment_enhanced100.csv", "weather_comment",
+               [("晴れて暑い", "1"), ("雪が降る", "2")])
+    return tmp_path
+
+
+@pytest.fixture
+def store(output_dir):
+    return ColumnarCommentStore.from_csv_files(output_dir, SEASONS)
+
+
+class TestColumnarCommentStore:
+    """ColumnarCommentStoreのテストクラス"""
+
+    def test_columns_and_interning(self, store):
+        """空行を除外し、同一テキストは1つにまとめる"""
+        assert len(store) == 7
+        assert store.get_statistics()["unique_texts"] == 6
+        assert store.text_ids.dtype == np.uint32
+        assert list(store.counts) == [10, 0, 7, 5, 4, 1, 2]
+
+    def test_select_by_season_and_type(self, store):
+        """季節・タイプで行インデックスを選択する"""
+        summer_weather = store.select(["夏"], CommentType.WEATHER_COMMENT)
+        assert store.texts(summer_weather) == ["晴れて暑い", "にわか雨に注意", "青空広がる"]
+        assert len(store.select(None, CommentType.ADVICE)) == 2
+        assert len(store.select(["春"])) == 0
+
+    def test_materialize_matches_csv_parser(self, output_dir, store):
+        """変換結果は CommentParser による解析結果と一致する"""
+        for season in SEASONS:
+            for comment_type in (CommentType.WEATHER_COMMENT, CommentType.ADVICE):
+                path = output_dir / f"{season}_{comment_type.value}_enhanced100.csv"
+                expected = load_comments_from_csv(path, comment_type.value, season)
+                actual = store.materialize_many(store.select([season], comment_type))
+
+                assert len(actual) == len(expected)
+                for a, e in zip(actual, expected, strict=True):
+                    assert a.comment_text == e.comment_text
+                    assert a.comment_type == e.comment_type
+                    assert a.weather_condition == e.weather_condition
+                    raw_data = dict(a.raw_data)
+                    assert ColumnarCommentStore.row_index_of(a) == raw_data.pop("row_index")
+                    assert raw_data == e.raw_data
+
+    def test_materialize_is_lazy_and_cached(self, store):
+        """変換は必要な行だけ行い、同じオブジェクトを再利用する"""
+        assert store.get_statistics()["materialized"] == 0
+        first = store.materialize(0)
+        assert store.materialize(0) is first
+        assert store.get_statistics()["materialized"] == 1
+
+    def test_filter_evaluates_each_text_once(self, store):
+        """同じテキストの述語評価は1回だけ"""
+        calls = []
+
+        def predicate(text):
+            calls.append(text)
+            return "暑い" not in text
+
+        kept = store.filter(store.select(), predicate)
+
+        assert calls.count("晴れて暑い") == 1
+        assert "晴れて暑い" not in store.texts(kept)
+
+    def test_missing_directory_builds_empty_store(self, tmp_path):
+        """ファイルが無い場合は空のストア"""
+        store = ColumnarCommentStore.from_csv_files(tmp_path / "missing", SEASONS)
+        assert len(store) == 0
+        assert len(store.select(["夏"], CommentType.ADVICE)) == 0
@@ -0,0 +1,135 @@
+"""SharedCommentCorpusのテスト"""
+
+import os
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.data.past_comment import CommentType
+from src.repositories.columnar_comment_store import ColumnarCommentStore
+from src.repositories.comment_corpus import (
+    SharedCommentCorpus,
+    get_comment_corpus,
+    get_relevant_seasons,
+    reset_comment_corpus,
+)
+
+
+def _write_csv(path: Path, column: str, comments: list[str]) -> None:
+    lines = [f"{column},count"] + [f"{comment},1" for comment in comments]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    """季節別CSVを含む一時ディレクトリ"""
+    _write_csv(tmp_path / "夏_weather_comment_enhanced100.csv", "weather_comment", ["晴れて暑い", "蒸し暑い"])
+    _write_csv(tmp_path / "夏_advice_enhanced100.csv", "advice", ["水分補給を"])
+    _write_csv(tmp_path / "冬_weather_comment_enhanced100.csv", "weather_comment", ["冷え込む朝"])
+    return tmp_path
+
+
+class TestSharedCommentCorpus:
+    """SharedCommentCorpusのテストクラス"""
+
+    def test_partitions_by_season_and_type(self, output_dir):
+        """季節とタイプ別に分割して保持する"""
+        corpus = SharedCommentCorpus(output_dir=output_dir)
+
+        summer_weather = corpus.get_comments("夏", CommentType.WEATHER_COMMENT)
+        summer_advice = corpus.get_comments("夏", CommentType.ADVICE)
+
+        assert isinstance(summer_weather, tuple)
+        assert [c.comment_text for c in summer_weather] == ["晴れて暑い", "蒸し暑い"]
+        assert [c.comment_text for c in summer_advice] == ["水分補給を"]
+        assert corpus.get_comments("春", CommentType.ADVICE) == ()
+        assert corpus.get_snapshot().total_comments == 4
+
+    def test_no_file_io_in_steady_state(self, output_dir):
+        """一度読み込んだ後はCSVを再読み込みしない"""
+        corpus = SharedCommentCorpus(output_dir=output_dir, check_interval=60)
+        corpus.get_snapshot()
+
+        with patch.object(ColumnarCommentStore, "from_csv_files") as mock_load, \
+             patch.object(SharedCommentCorpus, "_stat_files") as mock_stat:
+            for _ in range(10):
+                corpus.get_recent_comments(["夏"], limit=10)
+
+        mock_load.assert_not_called()
+        mock_stat.assert_not_called()
+
+    def test_reloads_when_mtime_changes(self, output_dir):
+        """CSVのmtimeが変わるとスナップショットを差し替える"""
+        corpus = SharedCommentCorpus(output_dir=output_dir, check_interval=0)
+        old_snapshot = corpus.get_snapshot()
+
+        path = output_dir / "夏_advice_enhanced100.csv"
+        _write_csv(path, "advice", ["水分補給を", "日傘を"])
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        new_snapshot = corpus.get_snapshot()
+
+        assert new_snapshot is not old_snapshot
+        assert len(new_snapshot.get("夏", CommentType.ADVICE)) == 2
+        # 旧スナップショットは変更されない
+        assert len(old_snapshot.get("夏", CommentType.ADVICE)) == 1
+        assert corpus.get_statistics()["reload_count"] == 2
+
+    def test_unchanged_files_keep_snapshot(self, output_dir):
+        """ファイルが変わらなければ同じスナップショットを返す"""
+        corpus = SharedCommentCorpus(output_dir=output_dir, check_interval=0)
+        assert corpus.get_snapshot() is corpus.get_snapshot()
+
+    def test_snapshot_is_read_only(self, output_dir):
+        """スナップショットは変更できない"""
+        snapshot = SharedCommentCorpus(output_dir=output_dir).get_snapshot()
+
+        with pytest.raises(TypeError):
+            snapshot.partitions[("春", CommentType.ADVICE)] = ()
+
+    def test_get_recent_comments_balances_categories(self, output_dir):
+        """各季節・タイプから均等に取得する"""
+        corpus = SharedCommentCorpus(output_dir=output_dir)
+
+        comments = corpus.get_recent_comments(["夏", "冬"], limit=4)
+
+        assert [c.comment_text for c in comments] == ["晴れて暑い", "水分補給を", "冷え込む朝"]
+
+    def test_concurrent_first_load_reads_once(self, output_dir):
+        """同時アクセスでも読み込みは一度だけ"""
+        corpus = SharedCommentCorpus(output_dir=output_dir)
+        barrier = threading.Barrier(8)
+        snapshots = []
+
+        def worker():
+            barrier.wait()
+            snapshots.append(corpus.get_snapshot())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(snapshot) for snapshot in snapshots}) == 1
+        assert corpus.get_statistics()["reload_count"] == 1
+
+
+class TestCommentCorpusRegistry:
+    """get_comment_corpusのテストクラス"""
+
+    def test_singleton_per_directory(self, output_dir):
+        """同じディレクトリには同じインスタンスを返す"""
+        reset_comment_corpus()
+        try:
+            assert get_comment_corpus(output_dir) is get_comment_corpus(str(output_dir))
+        finally:
+            reset_comment_corpus()
+
+    def test_relevant_seasons(self):
+        """月から関連季節を決定する"""
+        assert get_relevant_seasons(7) == ["夏", "梅雨", "台風"]
+        assert get_relevant_seasons(13) == ["春", "夏", "秋", "冬"]
@@ -0,0 +1,108 @@
+"""GenerationHistoryStoreのテスト"""
+
+import json
+import threading
+
+import pytest
+
+from src.repositories.generation_history_store import GenerationHistoryStore
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    return tmp_path / "history"
+
+
+def _store(store_dir, **kwargs):
+    kwargs.setdefault("legacy_file", None)
+    return GenerationHistoryStore(store_dir, **kwargs)
+
+
+class TestGenerationHistoryStore:
+    """GenerationHistoryStoreのテストクラス"""
+
+    def test_append_and_read(self, store_dir):
+        store = _store(store_dir)
+        store.append({"location": "東京", "comment": "晴れ"})
+        store.append({"location": "大阪", "comment": "雨"})
+
+        assert [item["comment"] for item in store.get_all()] == ["晴れ", "雨"]
+        assert len(store) == 2
+
+    def test_get_latest_per_location(self, store_dir):
+        store = _store(store_dir)
+        store.append({"location": "東京", "comment": "1回目"})
+        store.append({"location": "大阪", "comment": "雨"})
+        store.append({"location": "東京", "comment": "2回目"})
+
+        assert store.get_latest("東京")["comment"] == "2回目"
+        assert store.get_latest("那覇") is None
+
+    def test_get_page(self, store_dir):
+        store = _store(store_dir)
+        for i in range(10):
+            store.append({"location": "東京", "comment": str(i)})
+
+        assert [item["comment"] for item in store.get_page(3)] == ["9", "8", "7"]
+        assert [item["comment"] for item in store.get_page(3, offset=8)] == ["1", "0"]
+        assert [item["comment"] for item in store.get_page(2, offset=1, newest_first=False)] == ["1", "2"]
+
+    def test_rotation_drops_oldest_segments(self, store_dir):
+        store = _store(store_dir, segment_size=5, max_segments=2, max_entries=10)
+        for i in range(23):
+            store.append({"location": "東京", "comment": str(i)})
+
+        segments = sorted(store_dir.glob("segment-*.jsonl"))
+        assert [path.name for path in segments] == ["segment-000004.jsonl", "segment-000005.jsonl"]
+        # 別インスタンス（別プロセス相当）からも同じ内容が読める
+        assert [item["comment"] for item in _store(store_dir, max_entries=10).get_all()] == \
+            [str(i) for i in range(15, 23)]
+
+    def test_picks_up_appends_from_other_instances(self, store_dir):
+        reader = _store(store_dir)
+        writer = _store(store_dir)
+        assert reader.get_all() == []
+
+        writer.append({"location": "東京", "comment": "晴れ"})
+        assert reader.get_latest("東京")["comment"] == "晴れ"
+        writer.append({"location": "東京", "comment": "曇り"})
+        assert [item["comment"] for item in reader.get_all()] == ["晴れ", "曇り"]
+
+    def test_ignores_partial_trailing_line(self, store_dir):
+        store = _store(store_dir)
+        store.append({"location": "東京", "comment": "晴れ"})
+        with open(store_dir / "segment-000001.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"location": "大阪"')
+
+        assert [item["comment"] for item in _store(store_dir).get_all()] == ["晴れ"]
+
+    def test_concurrent_appends(self, store_dir):
+        store = _store(store_dir, segment_size=50)
+        other = _store(store_dir, segment_size=50)
+
+        def worker(target, prefix):
+            for i in range(50):
+                target.append({"location": prefix, "comment": f"{prefix}{i}"})
+
+        threads = [threading.Thread(target=worker, args=(target, prefix))
+                   for target, prefix in [(store, "a"), (store, "b"), (other, "c"), (other, "d")]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        lines = [json.loads(line) for path in sorted(store_dir.glob("segment-*.jsonl"))
+                 for line in path.read_text(encoding="utf-8").splitlines()]
+        assert len(lines) == 200
+        assert len(_store(store_dir).get_all()) == 200
+
+    def test_migrates_legacy_file(self, tmp_path, store_dir):
+        legacy = tmp_path / "generation_history.json"
+        legacy.write_text(json.dumps([{"location": "東京", "comment": str(i)} for i in range(7)]),
+                          encoding="utf-8")
+        store = GenerationHistoryStore(store_dir, segment_size=5, legacy_file=legacy)
+
+        assert [item["comment"] for item in store.get_all()] == [str(i) for i in range(7)]
+        store.append({"location": "東京", "comment": "7"})
+        assert len(list(store_dir.glob("segment-*.jsonl"))) == 2
+        assert store.get_latest("東京")["comment"] == "7"
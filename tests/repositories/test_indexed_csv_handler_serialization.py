@@ -3,10 +3,13 @@
 import pytest
 import tempfile
 import json
+import os
+import pickle
 from pathlib import Path
 from datetime import datetime
 import csv
 
+from src.repositories import indexed_csv_handler
 from src.repositories.indexed_csv_handler import IndexedCSVHandler
 from src.data.past_comment import PastComment, CommentType
 
@@ -140,15 +143,15 @@ class TestIndexedCSVHandlerSerialization:
         # インデックスファイルが作成されたことを確認
         index_path = handler._get_index_path(csv_path)
         assert index_path.exists()
-        assert index_path.suffix == '.json'
+        assert index_path.suffix == '.pkl'
         
-        # JSONファイルの内容を確認
-        with open(index_path, 'r', encoding='utf-8') as f:
-            saved_data = json.load(f)
+        # pickleファイルの内容を確認
+        with open(index_path, 'rb') as f:
+            saved_data = pickle.load(f)
         
         assert "all_comments" in saved_data
         assert len(saved_data["all_comments"]) == 1
-        assert saved_data["all_comments"][0]["comment_text"] == "晴れています"
+        assert saved_data["all_comments"][0].comment_text == "晴れています"
     
     def test_atomic_write_with_temp_file(self, temp_cache_dir):
         """アトミックな書き込み（一時ファイル使用）のテスト"""
@@ -177,7 +180,63 @@ class TestIndexedCSVHandlerSerialization:
         assert index_path.exists()
         
         # 内容が正しく保存されていることを確認
-        with open(index_path, 'r', encoding='utf-8') as f:
-            loaded_data = json.load(f)
+        with open(index_path, 'rb') as f:
+            loaded_data = pickle.load(f)
         assert "all_comments" in loaded_data
-        assert isinstance(loaded_data["all_comments"], list)
\ No newline at end of file
+        assert isinstance(loaded_data["all_comments"], list)
+
+
+class TestIndexedCSVHandlerChangeDetection:
+    """フィンガープリントによる変更検知のテスト"""
+    
+    @pytest.fixture
+    def csv_path(self, tmp_path):
+        path = tmp_path / "夏_weather_comment.csv"
+        path.write_text("weather_comment,advice\n晴れています,日焼け止めを\n", encoding="utf-8")
+        indexed_csv_handler.clear_content_hashes()
+        yield path
+        indexed_csv_handler.clear_content_hashes()
+    
+    @pytest.fixture
+    def hash_calls(self, monkeypatch):
+        calls = []
+        compute = indexed_csv_handler.compute_file_hash
+        
+        def counting_compute(path):
+            calls.append(path)
+            return compute(path)
+        
+        monkeypatch.setattr(indexed_csv_handler, "compute_file_hash", counting_compute)
+        return calls
+    
+    def test_hash_is_computed_only_when_fingerprint_changes(self, tmp_path, csv_path, hash_calls):
+        """内容ハッシュがフィンガープリントの変化時だけ計算され、ハンドラー間で共有されるテスト"""
+        first = IndexedCSVHandler(cache_dir=tmp_path / "indices")
+        second = IndexedCSVHandler(cache_dir=tmp_path / "indices")
+        
+        original_hash = first.get_file_hash(csv_path)
+        assert second.get_file_hash(csv_path) == original_hash
+        assert first._get_index_path(csv_path).name == f"{csv_path.stem}_{original_hash}.pkl"
+        assert len(hash_calls) == 1
+        
+        csv_path.write_text("weather_comment,advice\n雨です,傘を\n", encoding="utf-8")
+        stat = csv_path.stat()
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        assert first.get_file_hash(csv_path) != original_hash
+        assert len(hash_calls) == 2
+    
+    def test_disk_index_for_same_content_is_reused(self, tmp_path, csv_path):
+        """同じ内容のインデックスがディスクにあれば再構築しないテスト"""
+        index = {"all_comments": [], "by_weather": {}, "by_count": {}, "by_season": {}}
+        IndexedCSVHandler(cache_dir=tmp_path / "indices")._save_index_to_disk(csv_path, index)
+        
+        handler = IndexedCSVHandler(cache_dir=tmp_path / "indices")
+        assert handler.need_rebuild_index(csv_path) is False
+        assert handler._get_or_load_index(csv_path) == index
+        
+        csv_path.write_text("weather_comment,advice\n曇りです,上着を\n", encoding="utf-8")
+        stat = csv_path.stat()
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert handler.need_rebuild_index(csv_path) is True
+        assert str(csv_path) not in handler.index_cache
@@ -0,0 +1,100 @@
+"""KeywordFeatureIndexのテスト
+
+キーワードビットセットによる判定が、コメントごとに走査する従来のフィルタと
+同じ結果になることを実際のコメントCSVで確認する。
+"""
+
+import copy
+import itertools
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.data.past_comment import CommentType
+from src.nodes.unified_comment_generation import filter_forbidden_phrases
+from src.repositories.comment_corpus import get_comment_corpus, reset_comment_corpus, resolve_comment_rows
+from src.repositories.keyword_feature_index import KeywordFeatureIndex
+from src.utils.keyword_matcher import KeywordMatcher, get_keyword_matcher
+from src.utils.weather_comment_filter import WeatherCommentFilter
+
+OUTPUT_DIR = Path(__file__).parent.parent.parent / "output"
+
+WEATHER_DESCRIPTIONS = ["晴れ", "快晴", "曇り", "薄曇", "雨", "にわか雨", "雪", "sunny", "cloudy", "不明"]
+
+
+@pytest.fixture
+def corpus():
+    reset_comment_corpus()
+    corpus = get_comment_corpus(OUTPUT_DIR)
+    if corpus.get_snapshot().total_comments == 0:
+        pytest.skip("コメントCSVが存在しません")
+    yield corpus
+    reset_comment_corpus()
+
+
+class TestKeywordFeatureIndex:
+    """KeywordFeatureIndexのテストクラス"""
+
+    def test_bits_match_scan(self, corpus):
+        """ビット行列は各ユニークテキストの走査結果と一致する"""
+        store = corpus.get_snapshot().store
+        features = store.features
+        assert features is not None
+        assert features.bits.dtype == np.uint8
+
+        matcher = get_keyword_matcher()
+        vocabulary = matcher.vocabulary
+        dense = np.unpackbits(features.bits, axis=1)[:, :len(vocabulary)]
+        for text_id, text in enumerate(store.unique_texts[:200]):
+            expected = {k for k in matcher.scan(text).positions}
+            assert {vocabulary[i] for i in np.flatnonzero(dense[text_id])} == expected
+
+    def test_unknown_keyword_returns_none(self, corpus):
+        """索引にないキーワードを含むマスクは作らない"""
+        features = corpus.get_snapshot().store.features
+        assert features.mask(["索引にないキーワード"]) is None
+        assert features.rows_containing_any(np.arange(3), ["索引にないキーワード"]) is None
+
+    def test_build_from_small_matcher(self, corpus):
+        """任意の照合エンジンから構築できる"""
+        store = corpus.get_snapshot().store
+        features = KeywordFeatureIndex.build(store, KeywordMatcher({"rain": ["雨"]}))
+        rows = np.arange(len(store))
+        expected = np.array(["雨" in text for text in store.texts(rows)])
+        assert np.array_equal(features.rows_containing_any(rows, ["雨"]), expected)
+
+    def test_resolve_comment_rows(self, corpus):
+        """共有コーパス由来のコメントだけが行インデックスに変換される"""
+        comments = corpus.get_recent_comments(limit=20)
+        resolved = resolve_comment_rows(comments)
+        assert resolved is not None
+        store, rows = resolved
+        assert store.texts(rows) == [c.comment_text for c in comments]
+
+        copied = [copy.copy(c) for c in comments]
+        assert resolve_comment_rows(copied) is None
+
+
+class TestFilterParity:
+    """ビットセット判定と従来のフィルタの一致を確認するテストクラス"""
+
+    def test_weather_filter_parity(self, corpus):
+        weather_filter = WeatherCommentFilter()
+        snapshot = corpus.get_snapshot()
+        for comment_type in (CommentType.WEATHER_COMMENT, CommentType.ADVICE):
+            comments = snapshot.store.materialize_many(snapshot.store.select(None, comment_type))
+            for description, precipitation, temperature, month, stable in itertools.product(
+                WEATHER_DESCRIPTIONS, [0, 0.5], [None, 10, 30], [1, 7, 9, 12, None], [False, True]
+            ):
+                args = (description, precipitation, temperature, month, stable)
+                assert weather_filter.filter_comments(comments, *args) == \
+                    weather_filter._filter_comments_by_scan(comments, *args), args
+
+    def test_forbidden_phrase_parity(self, corpus):
+        snapshot = corpus.get_snapshot()
+        comments = snapshot.store.materialize_many(snapshot.store.select())
+        # コピーはコーパスに解決されないため従来の走査で判定される
+        expected = filter_forbidden_phrases([copy.copy(c) for c in comments])
+        assert [c.comment_text for c in filter_forbidden_phrases(comments)] == \
+            [c.comment_text for c in expected]
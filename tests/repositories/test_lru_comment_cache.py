@@ -1,5 +1,7 @@
 """LRUCommentCacheのテスト"""
 
+import copy
+
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock
@@ -202,4 +204,51 @@ class TestLRUCommentCache:
         assert stats['hits'] == 1
         assert stats['misses'] == 1
         assert stats['total_requests'] == 2
-        assert stats['hit_rate'] == 0.5
\ No newline at end of file
+        assert stats['hit_rate'] == 0.5
+
+    def test_memory_accounting_tracks_entries(self, cache, sample_comments):
+        """メモリ使用量の合計が保存・上書き・無効化・期限切れで増減することのテスト"""
+        def recomputed():
+            return sum(cache._estimate_memory_usage(comments) for comments, _ in cache._cache.values())
+        
+        cache.set("key1", sample_comments)
+        cache.set("key2", sample_comments[:1])
+        cache.set("key1", sample_comments[1:])
+        assert cache.get_stats()['memory_usage_bytes'] == recomputed() > 0
+        
+        cache.invalidate("key2")
+        assert cache.get_stats()['memory_usage_bytes'] == recomputed()
+        
+        comments, _ = cache._cache["key1"]
+        cache._cache["key1"] = (comments, datetime.now() - timedelta(hours=2))
+        assert cache.get("key1") is None
+        assert cache.get_stats()['memory_usage_bytes'] == 0
+    
+    def test_tight_byte_budget_evicts_oldest(self, sample_comments):
+        """バイト数の上限を超える場合に古いエントリから必要な分だけ削除されることのテスト"""
+        entry_size = LRUCommentCache()._estimate_memory_usage(sample_comments)
+        cache = LRUCommentCache(max_size=100, max_memory_mb=(entry_size * 3) / (1024 * 1024))
+        
+        for i in range(10):
+            cache.set(f"key{i}", sample_comments)
+        
+        stats = cache.get_stats()
+        assert stats['keys'] == ["key7", "key8", "key9"]
+        assert stats['memory_usage_bytes'] == entry_size * 3 <= stats['max_memory_bytes']
+        assert stats['eviction_count'] == 7
+    
+    def test_deep_size_estimator(self, sample_comments):
+        """サンプリングによる deep 推定のテスト"""
+        cache = LRUCommentCache(size_estimator="deep", deep_sample_size=4)
+        
+        # 同じ内容のコメントの繰り返しは件数倍に外挿される
+        one = cache._estimate_memory_usage(sample_comments[:1] * 4)
+        many = cache._estimate_memory_usage([copy.deepcopy(sample_comments[0]) for _ in range(400)])
+        assert one > LRUCommentCache()._estimate_memory_usage(sample_comments[:1]) > 0
+        assert many > one * 10
+        
+        cache.set("key1", sample_comments)
+        assert cache.get_stats()['size_estimator'] == "deep"
+        
+        with pytest.raises(ValueError):
+            LRUCommentCache(size_estimator="exact")
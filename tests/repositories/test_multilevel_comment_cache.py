@@ -0,0 +1,102 @@
+"""MultiLevelCommentCacheのテスト"""
+
+import pytest
+from datetime import datetime
+
+from src.repositories.multilevel_comment_cache import CacheTagIndex, MultiLevelCommentCache
+from src.data.past_comment import PastComment, CommentType
+
+
+def make_comments(season, region):
+    return [
+        PastComment(
+            location=region,
+            datetime=datetime.now(),
+            weather_condition="晴れ",
+            comment_text=f"{season}の{region}",
+            comment_type=CommentType.WEATHER_COMMENT,
+            raw_data={"season": season, "region": region}
+        )
+    ]
+
+
+class TestMultiLevelCommentCache:
+    """MultiLevelCommentCacheのテストクラス"""
+    
+    @pytest.fixture
+    def cache(self):
+        """L1に2地域×2季節、L2に2季節、L3にタイプのみを保存したキャッシュ"""
+        cache = MultiLevelCommentCache(max_size_per_level=50)
+        weather = CommentType.WEATHER_COMMENT
+        for season in ("夏", "冬"):
+            for region in ("東京", "大阪"):
+                cache.set(make_comments(season, region), weather, season, region)
+            cache.set(make_comments(season, "全国"), weather, season)
+        cache.set(make_comments("通年", "全国"), weather)
+        cache.set(make_comments("夏", "東京"), CommentType.ADVICE, "夏", "東京")
+        return cache
+    
+    def test_invalidate_removes_overlapping_entries_only(self, cache):
+        """条件と重なるエントリ（値が一致するか絞り込みなし）だけが無効化されるテスト"""
+        weather = CommentType.WEATHER_COMMENT
+        
+        # L1(夏・東京)、L2(夏)、L3(タイプのみ) が対象。冬・大阪・アドバイスは残る
+        assert cache.invalidate(weather, "夏", "東京") == 3
+        assert cache.get(weather, "夏", "大阪")[0].comment_text == "夏の大阪"
+        assert cache.get(weather, "冬", "東京")[0].comment_text == "冬の東京"
+        assert cache.get(CommentType.ADVICE, "夏", "東京") is not None
+        assert cache.get(weather) is None
+        
+        # 季節だけの指定は全タイプ・全地域の該当季節が対象
+        assert cache.invalidate(season="冬") == 3
+        assert cache.get(weather, "冬", "東京") is None
+        assert cache.invalidate() == 0
+        assert cache.get_stats()["indexed_keys"] == {"l1": 2, "l2": 0, "l3": 0}
+    
+    def test_invalidate_all_advances_generations(self, cache):
+        """世代番号の更新で全エントリが参照されなくなるテスト"""
+        weather = CommentType.WEATHER_COMMENT
+        
+        assert cache.invalidate_all() == {"l1": 1, "l2": 1, "l3": 1}
+        assert cache.get(weather, "夏", "東京") is None
+        assert cache.get(weather) is None
+        # 古い世代のエントリは削除されずに残る
+        assert cache.get_stats()["l1_stats"]["size"] == 5
+        
+        cache.set(make_comments("夏", "東京"), weather, "夏", "東京")
+        assert cache.get(weather, "夏", "東京")[0].comment_text == "夏の東京"
+        assert cache.invalidate(region="東京") == 1
+        
+        with pytest.raises(ValueError):
+            cache.invalidate_all(["l4"])
+    
+    def test_evicted_keys_leave_tag_index(self):
+        """LRUで削除されたキーがタグインデックスからも除かれるテスト"""
+        cache = MultiLevelCommentCache(max_size_per_level=2)
+        for region in ("東京", "大阪", "札幌"):
+            cache.set(make_comments("夏", region), CommentType.WEATHER_COMMENT, "夏", region)
+        
+        assert cache.get_stats()["indexed_keys"]["l1"] == 2
+        assert cache.invalidate(region="東京") == 0
+        
+        # 古い世代のインデックスは、その世代のエントリが全て削除された時点で破棄される
+        cache.invalidate_all(["l1"])
+        for region in ("那覇", "仙台"):
+            cache.set(make_comments("夏", region), CommentType.WEATHER_COMMENT, "夏", region)
+        assert list(cache._tag_indexes["l1"]) == [1]
+
+
+def test_tag_index_match():
+    """CacheTagIndex の条件一致のテスト"""
+    index = CacheTagIndex()
+    index.add("a", {"type": "advice", "season": "夏", "region": "all"})
+    index.add("b", {"type": "advice", "season": "冬", "region": "東京"})
+    index.add("c", {"type": "all", "season": "夏", "region": "東京"})
+    
+    assert index.match({"season": "夏"}) == {"a", "c"}
+    assert index.match({"type": "advice", "region": "東京"}) == {"a", "b", "c"}
+    
+    index.add("a", {"type": "advice", "season": "冬", "region": "all"})
+    index.discard("c")
+    assert index.match({"season": "夏"}) == set()
+    assert len(index) == 2
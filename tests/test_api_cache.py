@@ -1,11 +1,13 @@
 """APIキャッシュ機能のテスト"""
 
+import gc
 import pytest
+import threading
 import time
 from unittest.mock import Mock, patch
 from datetime import datetime
 
-from src.utils.cache import TTLCache, generate_cache_key, cached_method
+from src.utils.cache import TTLCache, generate_cache_key, cached_method, get_cache_reaper
 from src.apis.wxtech.client import WxTechAPIClient
 from src.data.weather_data import WeatherForecast, WeatherForecastCollection
 
@@ -98,6 +100,57 @@ class TestTTLCache:
         assert cache.get("key1") is None
         assert cache.get("key2") is None
         assert cache.get("key3") == "value3"
+    
+    def test_lru_eviction_order(self):
+        """最も長く使われていないエントリから削除されるテスト"""
+        cache = TTLCache(default_ttl=60, max_size=3, auto_cleanup=False)
+        for key in ("key1", "key2", "key3"):
+            cache.set(key, key)
+        
+        # key1を使う・key3を上書きすると、key2が最も長く使われていないエントリになる
+        cache.get("key1")
+        cache.set("key3", "updated")
+        cache.set("key4", "value4")
+        
+        assert cache.get("key2") is None
+        assert [cache.get(key) for key in ("key1", "key3", "key4")] == ["key1", "updated", "value4"]
+        assert cache.evict_lru(2) == 2
+        assert len(cache) == 1
+    
+    def test_expired_entries_are_removed_before_lru_eviction(self):
+        """満杯時は使用中のエントリより期限切れのエントリを先に削除するテスト"""
+        cache = TTLCache(default_ttl=60, max_size=3, auto_cleanup=False)
+        cache.set("long", "value")
+        cache.set("short", "value", ttl=0.1)
+        # 期限を延ばしたエントリはヒープに古い期限が残っていても削除しない
+        cache.set("short", "value", ttl=60)
+        cache.set("expiring", "value", ttl=0.1)
+        time.sleep(0.15)
+        
+        # 最も長く使われていない long ではなく、期限切れの expiring を削除する
+        cache.set("new", "value")
+        assert len(cache) == 3
+        assert [cache.get(key) for key in ("long", "short", "new")] == ["value"] * 3
+    
+    def test_shared_reaper_cleans_every_cache(self):
+        """共有スレッドが全キャッシュをクリーンアップし、不要になったキャッシュを外すテスト"""
+        reaper = get_cache_reaper()
+        threads_before = threading.active_count()
+        caches = [TTLCache(default_ttl=0.05, cleanup_interval=0.05) for _ in range(5)]
+        for cache in caches:
+            cache.set("key", "value")
+        
+        assert threading.active_count() <= threads_before + 1
+        deadline = time.time() + 5
+        while any(len(cache) for cache in caches) and time.time() < deadline:
+            time.sleep(0.01)
+        assert not any(len(cache) for cache in caches)
+        
+        registered = len(reaper)
+        caches.pop().stop_cleanup()
+        del caches[0]
+        gc.collect()
+        assert len(reaper) == registered - 2
 
 
 class TestCacheKeyGeneration:
@@ -0,0 +1,131 @@
+"""
+ベンチマーク用スタブ（WxTech スタブサーバー・FakeLLMProvider）と計測ハーネスのテスト
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from benchmarks.fake_llm import FakeLLMProvider, install_fake_llm
+from benchmarks.fake_wxtech import FakeWxTechServer, rebase_payload, recording_path, synthesize_payload
+from benchmarks.harness import (
+    IMPROVED,
+    NEW,
+    OK,
+    REGRESSION,
+    Benchmark,
+    BenchmarkResult,
+    compare,
+    load_baseline,
+    run_benchmark,
+    save_baseline,
+)
+from src.apis.wxtech.api import WxTechAPI
+from src.apis.wxtech.parser import parse_forecast_response
+from src.data.forecast_time_index import JST
+
+START = datetime(2025, 7, 1, 6, 0, tzinfo=JST)
+
+
+def _result(name: str, median: float) -> BenchmarkResult:
+    return BenchmarkResult(name, "micro.test", 5, 1, median, median, median, median, 0.0)
+
+
+class TestFakeWxTech:
+    """WxTech スタブサーバーのテストクラス"""
+
+    def test_synthesized_payload_is_deterministic_and_parseable(self):
+        payload = synthesize_payload(35.6762, 139.6503, 24, START)
+        assert payload == synthesize_payload(35.6762, 139.6503, 24, START)
+        assert payload != synthesize_payload(43.0642, 141.3469, 24, START)
+
+        collection = parse_forecast_response(payload, "東京")
+        # srf の毎時予報に mrf の日別予報が加わる
+        hours = {forecast.datetime for forecast in collection.forecasts}
+        assert {datetime.fromisoformat(row["date"]) for row in payload["wxdata"][0]["srf"]} <= hours
+        assert START in hours
+
+    def test_rebase_payload_shifts_srf_and_mrf(self):
+        payload = synthesize_payload(35.6762, 139.6503, 6, START)
+        rebased = rebase_payload(payload, datetime(2025, 7, 10, 9, 0, tzinfo=JST))
+        srf = rebased["wxdata"][0]["srf"]
+        mrf = rebased["wxdata"][0]["mrf"]
+        assert datetime.fromisoformat(srf[0]["date"]) == datetime(2025, 7, 10, 9, 0, tzinfo=JST)
+        assert datetime.fromisoformat(mrf[0]["date"]) == datetime(2025, 7, 10, 0, 0, tzinfo=JST)
+
+    def test_server_replays_recordings_through_wxtech_api(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("WXTECH_API_BASE_URL", raising=False)
+        recording = synthesize_payload(35.0, 135.0, 3, START)
+        recording_path(35.0, 135.0, tmp_path).write_text(json.dumps(recording), encoding="utf-8")
+
+        with FakeWxTechServer(tmp_path) as server:
+            api = WxTechAPI("fake-key")
+            assert api.base_url == server.base_url
+            replayed = api.make_request("ss1wx", {"lat": 35.0, "lon": 135.0, "hours": 3})
+            synthesized = api.make_request("ss1wx", {"lat": 36.0, "lon": 136.0, "hours": 5})
+
+        assert len(replayed["wxdata"][0]["srf"]) == 3
+        assert len(synthesized["wxdata"][0]["srf"]) == 5
+        assert (server.request_count, server.replayed_count) == (2, 1)
+        assert WxTechAPI("fake-key").base_url == WxTechAPI.BASE_URL
+
+
+class TestFakeLLM:
+    """FakeLLMProvider のテストクラス"""
+
+    PROMPT = (
+        "### 天気コメント候補:\n0. 晴れて暑い\n1. 日差しが強い\n\n"
+        "### アドバイスコメント候補:\n0. 水分補給を\n1. 日傘が活躍\n2. 帽子を忘れずに\n"
+    )
+
+    def test_unified_prompt_returns_candidate_selection(self):
+        provider = FakeLLMProvider()
+        response = json.loads(provider.generate(self.PROMPT))
+        assert response["weather_comment"] == ["晴れて暑い", "日差しが強い"][response["selected_weather_index"]]
+        assert response["advice_comment"] == ["水分補給を", "日傘が活躍", "帽子を忘れずに"][response["selected_advice_index"]]
+        assert provider.generate(self.PROMPT) == json.dumps(response, ensure_ascii=False)
+        assert provider.generate("候補から選んでください") == "1"
+
+    def test_delay_is_deterministic_within_jitter(self):
+        provider = FakeLLMProvider()
+        provider.latency_ms, provider.jitter_ms = 50.0, 10.0
+        delays = [provider._delay_seconds(f"prompt {i}") for i in range(20)]
+        assert all(0.04 <= delay <= 0.06 for delay in delays)
+        assert delays == [provider._delay_seconds(f"prompt {i}") for i in range(20)]
+
+    def test_install_fake_llm_replaces_openai_provider(self):
+        from src.llm.llm_manager import LLMManager
+
+        original = LLMManager.PROVIDER_CONFIGS["openai"]["provider_class"]
+        with install_fake_llm(latency_ms=0):
+            assert isinstance(LLMManager("openai").provider, FakeLLMProvider)
+        assert LLMManager.PROVIDER_CONFIGS["openai"]["provider_class"] is original
+
+
+class TestHarness:
+    """計測ハーネスのテストクラス"""
+
+    def test_run_benchmark_respects_min_rounds(self):
+        calls = []
+        bench = Benchmark("micro.test.append", "micro.test", lambda: lambda: calls.append(1),
+                          min_rounds=4, round_time=0.0, max_time=0.0, warmup=1)
+        result = run_benchmark(bench)
+        assert (result.rounds, result.iterations, len(calls)) == (4, 1, 5)
+        assert result.min <= result.median <= result.max
+
+    @pytest.mark.parametrize("median, status", [(1.0, OK), (1.2, OK), (1.3, REGRESSION), (0.7, IMPROVED)])
+    def test_compare_against_baseline(self, median, status):
+        baseline = {"results": {"micro.test.a": _result("micro.test.a", 1.0).to_dict()}}
+        (comparison,) = compare([_result("micro.test.a", median)], baseline, threshold=0.25)
+        assert comparison.status == status
+
+    def test_save_baseline_keeps_other_results(self, tmp_path):
+        path = tmp_path / "baseline.json"
+        save_baseline([_result("micro.test.a", 1.0), _result("micro.test.b", 2.0)], path)
+        save_baseline([_result("micro.test.a", 3.0)], path)
+
+        results = load_baseline(path)["results"]
+        assert (results["micro.test.a"]["median"], results["micro.test.b"]["median"]) == (3.0, 2.0)
+        (comparison,) = compare([_result("micro.test.c", 1.0)], load_baseline(path))
+        assert comparison.status == NEW
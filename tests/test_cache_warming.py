@@ -0,0 +1,187 @@
+"""
+キャッシュ事前温めスケジューラーのテスト
+"""
+
+import asyncio
+from datetime import date, datetime
+
+import pytest
+
+from src.apis.wxtech.cached_client import CachedWxTechAPIClient
+from src.apis.wxtech.grid import GridForecastCache
+from src.data.forecast_cache import cache_warmer
+from src.data.forecast_cache.cache_warmer import (
+    JST,
+    CacheWarmer,
+    CacheWarmingScheduler,
+    PopularLocation,
+    start_cache_warming_scheduler,
+    wxtech_refresher,
+)
+from src.data.weather_data import WeatherForecastCollection
+
+
+def record(warmer, name, times):
+    for _ in range(times):
+        warmer.record_access(name, 35.0, 139.0)
+
+
+class TestCacheWarmer:
+    """CacheWarmerのアクセス統計のテストクラス"""
+
+    def test_top_locations_by_priority_then_access_count(self, tmp_path):
+        warmer = CacheWarmer(popular_locations_file=tmp_path / "popular.json")
+        record(warmer, "大阪", 3)
+        record(warmer, "東京", 5)
+        record(warmer, "福岡", 1)
+        warmer.add_popular_location(PopularLocation("札幌", 43.0, 141.3, priority=2))
+
+        assert [loc.name for loc in warmer.top_locations(3)] == ["札幌", "東京", "大阪"]
+
+        # 保存・読み込みで統計が引き継がれる
+        warmer.save_popular_locations()
+        reloaded = CacheWarmer(popular_locations_file=tmp_path / "popular.json")
+        assert [(loc.name, loc.access_count) for loc in reloaded.top_locations(4)] == [
+            ("札幌", 0), ("東京", 5), ("大阪", 3), ("福岡", 1)
+        ]
+
+    def test_location_stats_are_capped(self):
+        warmer = CacheWarmer(max_locations=10)
+        record(warmer, "東京", 50)
+        for index in range(100):
+            record(warmer, f"地点{index}", 1)
+
+        stats = warmer.get_stats()
+        assert stats["popular_locations_count"] <= 10
+        assert stats["evicted_count"] > 0
+        # アクセスの多い地点と直前に記録した地点は残る
+        assert warmer.top_locations(1)[0].name == "東京"
+        assert any(loc.name == "地点99" for loc in warmer.top_locations(10))
+
+    def test_active_window_excludes_stale_locations(self):
+        warmer = CacheWarmer()
+        record(warmer, "東京", 5)
+        record(warmer, "大阪", 1)
+        warmer.top_locations(1)[0].last_accessed -= 2 * 3600
+
+        assert [loc.name for loc in warmer.top_locations(5, active_within=3600)] == ["大阪"]
+
+
+class TestCacheWarmingScheduler:
+    """CacheWarmingSchedulerのテストクラス"""
+
+    def test_next_run_before_date_boundary(self):
+        scheduler = CacheWarmingScheduler(
+            CacheWarmer(), refresh=None, interval_seconds=1680, lead_seconds=120, date_boundary_hour=6
+        )
+        now = datetime(2025, 7, 2, 5, 40, tzinfo=JST).timestamp()
+        scheduler.last_run = now - 60
+
+        # 定期更新（6:07）より日付境界の2分前（5:58）が先
+        assert scheduler.next_run_at(now) == datetime(2025, 7, 2, 5, 58, tzinfo=JST).timestamp()
+
+        # 境界前の更新を終えた後は定期更新に戻る
+        scheduler.last_run = datetime(2025, 7, 2, 5, 58, tzinfo=JST).timestamp()
+        assert scheduler.next_run_at(scheduler.last_run + 1) == scheduler.last_run + 1680
+
+    def test_warm_once_bounds_concurrency(self):
+        warmer = CacheWarmer()
+        for index in range(6):
+            record(warmer, f"地点{index}", index + 1)
+        running, peak, refreshed = 0, 0, []
+
+        async def refresh(location):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if location.name == "地点0":
+                raise RuntimeError("upstream error")
+            refreshed.append(location.name)
+
+        scheduler = CacheWarmingScheduler(warmer, refresh, interval_seconds=60, top_n=6, max_concurrent=2)
+        result = asyncio.run(scheduler.warm_once())
+
+        assert peak == 2
+        assert sorted(refreshed) == ["地点1", "地点2", "地点3", "地点4", "地点5"]
+        assert (result["refreshed"], result["failed"]) == (5, 1)
+        assert scheduler.last_run > 0
+
+    def test_start_and_stop_on_running_loop(self):
+        calls = []
+
+        async def refresh(location):
+            calls.append(location.name)
+
+        warmer = CacheWarmer()
+        record(warmer, "東京", 1)
+        scheduler = CacheWarmingScheduler(warmer, refresh, interval_seconds=1, top_n=1)
+
+        async def run():
+            await scheduler.start()
+            scheduler.last_run -= 1  # 次回の実行時刻を現在にする
+            await asyncio.sleep(0.05)
+            await scheduler.stop()
+
+        asyncio.run(run())
+
+        assert calls[:1] == ["東京"]
+        assert not scheduler.running
+
+
+@pytest.mark.parametrize("now, lead_seconds, expected", [
+    # 0時を過ぎても日付境界（6時）までは当日の予報を温める
+    (datetime(2025, 7, 2, 0, 30, tzinfo=JST), 120, date(2025, 7, 2)),
+    # 境界の直前の更新は境界以降に使われる翌日の予報を温める
+    (datetime(2025, 7, 2, 5, 58, tzinfo=JST), 120, date(2025, 7, 3)),
+    (datetime(2025, 7, 2, 5, 58, tzinfo=JST), 0, date(2025, 7, 2)),
+    (datetime(2025, 7, 2, 12, 0, tzinfo=JST), 120, date(2025, 7, 3)),
+])
+def test_wxtech_refresher_uses_date_boundary(monkeypatch, now, lead_seconds, expected):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now.astimezone(tz)
+
+    refreshed = []
+    monkeypatch.setattr(cache_warmer, "datetime", FrozenDatetime)
+    monkeypatch.setattr(cache_warmer, "load_date_boundary_hour", lambda: 6)
+    monkeypatch.setattr(
+        CachedWxTechAPIClient, "refresh_next_day_forecast",
+        lambda self, lat, lon, target_date=None: refreshed.append(target_date)
+    )
+
+    refresh = wxtech_refresher("fake-key", lead_seconds)
+    asyncio.run(refresh(PopularLocation("東京", 35.0, 139.0)))
+
+    assert refreshed == [expected]
+
+
+def test_scheduler_not_started_without_grid_sharing(monkeypatch):
+    async def refresh(location):
+        pass
+
+    monkeypatch.setenv("WXTECH_GRID_SNAP", "false")
+    assert asyncio.run(start_cache_warming_scheduler(refresh)) is None
+
+
+def test_grid_refresh_bypasses_cached_entry():
+    grid_cache = GridForecastCache()
+    fetched = []
+
+    def fetch(lat, lon):
+        fetched.append((lat, lon))
+        return WeatherForecastCollection(location_id="mesh", forecasts=[])
+
+    try:
+        grid_cache.get_or_fetch("forecast_hours", 35.0, 139.0, fetch, "2025-07-02")
+        grid_cache.get_or_fetch("forecast_hours", 35.0, 139.0, fetch, "2025-07-02")
+        grid_cache.get_or_fetch("forecast_hours", 35.0, 139.0, fetch, "2025-07-02", refresh=True)
+        grid_cache.get_or_fetch("forecast_hours", 35.0, 139.0, fetch, "2025-07-02")
+
+        stats = grid_cache.get_stats()
+        assert len(fetched) == 2
+        assert (stats["requests"], stats["refreshes"], stats["cache_hits"]) == (3, 1, 2)
+    finally:
+        grid_cache.close()
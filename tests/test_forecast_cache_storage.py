@@ -0,0 +1,163 @@
+"""
+予報キャッシュの永続化バックエンドのテスト
+"""
+
+import csv
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from src.data.forecast_cache.manager import ForecastCache
+from src.data.forecast_cache.models import ForecastCacheEntry
+from src.data.forecast_cache.storage import (
+    CSV_HEADERS,
+    CSVForecastBackend,
+    SQLiteForecastBackend,
+    create_forecast_backend,
+    csv_file_path,
+)
+
+JST = ZoneInfo("Asia/Tokyo")
+
+
+def make_entry(location_name, forecast_datetime, cached_at, temperature=20.0, metadata=None):
+    return ForecastCacheEntry(
+        location_name=location_name,
+        forecast_datetime=forecast_datetime,
+        cached_at=cached_at,
+        temperature=temperature,
+        max_temperature=25.0,
+        weather_condition="晴れ",
+        precipitation=1.5,
+        metadata=metadata or {},
+    )
+
+
+@pytest.fixture(params=["csv", "sqlite"])
+def backend(request, tmp_path):
+    backend = create_forecast_backend(request.param, tmp_path)
+    yield backend
+    backend.close()
+
+
+class TestForecastCacheBackend:
+    """両バックエンド共通の振る舞いのテストクラス"""
+
+    def test_save_and_load_range(self, backend):
+        now = datetime(2025, 7, 1, 6, tzinfo=JST)
+        backend.save_entries([
+            make_entry("東京", now + timedelta(days=offset), now, temperature=offset, metadata={"k": "v"})
+            for offset in range(-10, 11)
+        ])
+        backend.save_entries([make_entry("大阪", now, now)])
+
+        entries = backend.load_entries("東京", now - timedelta(days=2), now + timedelta(days=2))
+        assert [e.temperature for e in entries] == [-2, -1, 0, 1, 2]
+        assert entries[0].metadata == {"k": "v"}
+        assert entries[0].max_temperature == 25.0
+        assert entries[0].min_temperature is None
+        assert entries[0].forecast_datetime == now - timedelta(days=2)
+        assert len(backend.load_entries("東京")) == 21
+        assert sorted(backend.location_names()) == ["大阪", "東京"]
+
+    def test_delete_older_than(self, backend):
+        now = datetime(2025, 7, 1, 6, tzinfo=JST)
+        backend.save_entries([
+            make_entry("東京", now, now - timedelta(days=10)),
+            make_entry("東京", now, now),
+            make_entry("大阪", now, now - timedelta(days=10)),
+        ])
+
+        assert backend.delete_older_than(now - timedelta(days=7), "東京") == 1
+        assert len(backend.load_entries("大阪")) == 1
+        assert backend.delete_older_than(now - timedelta(days=7)) == 1
+        assert [e.cached_at for e in backend.load_entries("東京")] == [now]
+
+    def test_export_csv(self, backend, tmp_path):
+        now = datetime(2025, 7, 1, 6, tzinfo=JST)
+        backend.save_entries([make_entry("東京", now, now, metadata={"source": "test"})])
+
+        path = tmp_path / "export" / "tokyo.csv"
+        assert backend.export_csv("東京", path) == 1
+        with open(path, encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == CSV_HEADERS
+        assert ForecastCacheEntry.from_csv_row(rows[1]).metadata == {"source": "test"}
+
+
+class TestSQLiteForecastBackend:
+    """SQLiteバックエンド固有のテストクラス"""
+
+    def test_imports_legacy_csv_on_creation(self, tmp_path):
+        now = datetime(2025, 7, 1, 6, tzinfo=JST)
+        csv_backend = CSVForecastBackend(tmp_path)
+        csv_backend.save_entries([make_entry("東京", now, now), make_entry("大阪", now, now)])
+
+        backend = create_forecast_backend("sqlite", tmp_path)
+        try:
+            assert isinstance(backend, SQLiteForecastBackend)
+            assert backend.count() == 2
+        finally:
+            backend.close()
+
+        # 既存のデータベースを開く場合は再取り込みしない
+        backend = create_forecast_backend("sqlite", tmp_path)
+        try:
+            assert backend.count() == 2
+        finally:
+            backend.close()
+
+    def test_batched_delete(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.data.forecast_cache.storage.RETENTION_DELETE_BATCH_SIZE", 3)
+        now = datetime(2025, 7, 1, 6, tzinfo=JST)
+        backend = SQLiteForecastBackend(tmp_path / "cache.sqlite3")
+        try:
+            backend.save_entries([make_entry("東京", now, now - timedelta(days=30)) for _ in range(10)])
+            assert backend.delete_older_than(now) == 10
+            assert backend.count() == 0
+        finally:
+            backend.close()
+
+    def test_unknown_backend(self, tmp_path):
+        with pytest.raises(ValueError):
+            create_forecast_backend("redis", tmp_path)
+
+
+class TestForecastCacheWithBackend:
+    """ForecastCacheとバックエンドの統合テストクラス"""
+
+    def test_lookup_after_memory_miss(self, tmp_path):
+        cache = ForecastCache(cache_dir=tmp_path, enable_spatial_cache=False, backend="sqlite")
+        try:
+            now = datetime.now(JST).replace(minute=0, second=0, microsecond=0)
+            cache.backend.save_entries([make_entry("東京", now + timedelta(hours=3), now, temperature=28.0)])
+
+            entry = cache.get_forecast_at_time("東京", now + timedelta(hours=2))
+            assert entry is not None
+            assert entry.temperature == 28.0
+            assert cache.get_forecast_at_time("大阪", now) is None
+
+            path = cache.export_csv("東京")
+            assert path == csv_file_path(tmp_path, "東京")
+            assert path.exists()
+            assert cache.get_cache_stats()["backend"] == "sqlite"
+        finally:
+            cache.close()
+
+    def test_retention_cleanup_is_throttled(self, tmp_path):
+        cache = ForecastCache(cache_dir=tmp_path, enable_spatial_cache=False, backend="sqlite")
+        try:
+            now = datetime.now(JST)
+            old_entry = make_entry("東京", now, now - timedelta(days=30))
+
+            cache.backend.save_entries([old_entry])
+            cache._maybe_cleanup_old_data()
+            assert cache.backend.count() == 0
+
+            # 間隔内の2回目の呼び出しでは削除しない
+            cache.backend.save_entries([old_entry])
+            cache._maybe_cleanup_old_data()
+            assert cache.backend.count() == 1
+        finally:
+            cache.close()
@@ -0,0 +1,168 @@
+"""
+予報キャッシュ書き込みキューのテスト
+"""
+
+import threading
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from src.data.forecast_cache.manager import ForecastCache
+from src.data.forecast_cache.models import ForecastCacheEntry
+from src.data.forecast_cache.storage import ForecastCacheBackend
+from src.data.forecast_cache.write_behind import ForecastWriteBehindQueue
+
+JST = ZoneInfo("Asia/Tokyo")
+NOW = datetime(2025, 7, 1, 9, tzinfo=JST)
+
+
+def make_entry(location_name, hours=0):
+    return ForecastCacheEntry(
+        location_name=location_name,
+        forecast_datetime=NOW + timedelta(hours=hours),
+        cached_at=NOW,
+        temperature=20.0 + hours,
+    )
+
+
+class RecordingBackend(ForecastCacheBackend):
+    """書き込みを記録し、必要に応じて書き込みを止めるバックエンド"""
+
+    name = "recording"
+
+    def __init__(self):
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+
+    def save_entries(self, entries):
+        self.started.set()
+        self.release.wait(5)
+        self.batches.append(list(entries))
+
+    def load_entries(self, location_name, start=None, end=None):
+        return [e for batch in self.batches for e in batch if e.location_name == location_name]
+
+    def delete_older_than(self, cutoff, location_name=None):
+        return 0
+
+    def location_names(self):
+        return sorted({e.location_name for batch in self.batches for e in batch})
+
+    def close(self):
+        pass
+
+
+class TestForecastWriteBehindQueue:
+    """ForecastWriteBehindQueueのテストクラス"""
+
+    def test_group_commits_sorted_by_location(self):
+        backend = RecordingBackend()
+        backend.release.clear()
+        queue = ForecastWriteBehindQueue(backend, flush_interval=0.01)
+        try:
+            # 1件目の書き込み中に残りを積み、2回目のコミットでまとめて書き込まれることを確認
+            queue.put([make_entry("東京")])
+            assert backend.started.wait(5)
+            queue.put([make_entry("大阪", 1), make_entry("東京", 1), make_entry("大阪", 2)])
+            assert len(queue.pending_entries("大阪")) == 2
+            backend.release.set()
+
+            assert queue.flush(timeout=5)
+            assert [[e.location_name for e in batch] for batch in backend.batches] == [
+                ["東京"], ["大阪", "大阪", "東京"]
+            ]
+            stats = queue.get_stats()
+            assert stats["written"] == 4
+            assert stats["batches"] == 2
+            assert stats["queue_depth"] == 0
+        finally:
+            queue.close()
+
+    def test_backpressure_when_queue_is_full(self):
+        backend = RecordingBackend()
+        backend.release.clear()
+        queue = ForecastWriteBehindQueue(backend, max_queue_size=2, flush_interval=0.01)
+        try:
+            queue.put([make_entry("東京")])
+            assert backend.started.wait(5)
+            assert queue.put([make_entry("東京", 1), make_entry("東京", 2)])
+
+            assert not queue.put([make_entry("東京", 3)], block=False)
+            assert not queue.put([make_entry("東京", 3)], timeout=0.05)
+            stats = queue.get_stats()
+            assert stats["rejected"] == 2
+            assert stats["backpressure_waits"] == 1
+            assert stats["queue_depth"] == 2
+            assert stats["in_flight"] == 1
+
+            backend.release.set()
+            assert queue.put([make_entry("東京", 3)], timeout=5)
+            assert queue.flush(timeout=5)
+            assert queue.get_stats()["written"] == 4
+        finally:
+            queue.close()
+
+    @pytest.mark.parametrize("failures, written, dropped", [(2, 2, 0), (10, 0, 2)])
+    def test_failed_batch_is_retried_before_dropping(self, failures, written, dropped):
+        backend = RecordingBackend()
+        save_entries = backend.save_entries
+        attempts = []
+
+        def flaky_save(entries):
+            attempts.append(len(entries))
+            if len(attempts) <= failures:
+                raise OSError("disk busy")
+            save_entries(entries)
+
+        backend.save_entries = flaky_save
+        queue = ForecastWriteBehindQueue(backend, flush_interval=0.01, max_retries=3, retry_backoff=0.01)
+        try:
+            queue.put([make_entry("東京"), make_entry("東京", 1)])
+            # 破棄したエントリがある場合は書き込み完了とみなさない
+            assert queue.flush(timeout=5) == (dropped == 0)
+
+            stats = queue.get_stats()
+            assert (stats["written"], stats["dropped"]) == (written, dropped)
+            assert stats["retries"] == min(failures, 3)
+            assert len(attempts) == min(failures + 1, 4)
+        finally:
+            queue.close()
+
+    def test_close_flushes_pending_entries(self):
+        backend = RecordingBackend()
+        queue = ForecastWriteBehindQueue(backend, flush_interval=60)
+        queue.put([make_entry("東京"), make_entry("東京", 1)])
+        queue.close()
+
+        assert sum(len(batch) for batch in backend.batches) == 2
+        with pytest.raises(RuntimeError):
+            queue.put([make_entry("東京")])
+
+
+class TestForecastCacheWriteBehind:
+    """ForecastCacheの書き込みキュー統合テストクラス"""
+
+    def test_pending_entries_are_readable_before_flush(self, tmp_path):
+        backend = RecordingBackend()
+        backend.release.clear()
+        cache = ForecastCache(cache_dir=tmp_path, enable_spatial_cache=False,
+                              backend=backend, write_behind=True)
+        try:
+            forecasts = [SimpleNamespace(datetime=NOW + timedelta(hours=h), temperature=20.0 + h)
+                         for h in (0, 3, 6)]
+            cache.save_forecasts(forecasts, "東京")
+
+            daily = cache.get_daily_min_max("東京", NOW.date())
+            assert daily == {"min": 20.0, "max": 26.0}
+            assert cache.get_cache_stats()["write_queue"]["enqueued"] == 3
+
+            backend.release.set()
+            assert cache.flush(timeout=5)
+            assert len(backend.load_entries("東京")) == 3
+        finally:
+            backend.release.set()
+            cache.close()
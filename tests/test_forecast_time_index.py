@@ -0,0 +1,88 @@
+"""
+予報の時刻インデックスのテスト
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.data.forecast_time_index import JST, ForecastTimeIndex
+from src.data.weather_data import WeatherCondition, WeatherForecast, WeatherForecastCollection, WindDirection
+
+
+def make_forecast(dt, temperature=20.0):
+    return WeatherForecast(
+        location_id="東京",
+        datetime=dt,
+        temperature=temperature,
+        feels_like=temperature,
+        humidity=60.0,
+        pressure=1013.0,
+        wind_speed=2.0,
+        wind_direction=WindDirection.NORTH,
+        weather_condition=WeatherCondition.CLEAR,
+        weather_description="晴れ",
+    )
+
+
+def linear_nearest(forecasts, target):
+    """インデックス導入前の線形探索（比較用）"""
+    def localize(dt):
+        return dt if dt.tzinfo else dt.replace(tzinfo=JST)
+
+    closest, min_diff = None, float("inf")
+    for forecast in sorted(forecasts, key=lambda f: localize(f.datetime)):
+        diff = abs((localize(forecast.datetime) - target).total_seconds())
+        if diff < min_diff:
+            closest, min_diff = forecast, diff
+    return closest
+
+
+@pytest.fixture
+def forecasts():
+    # 3時間ごと（12時は欠落）の予報。タイムゾーンなし・JST・UTCが混在する
+    hours = [0, 3, 6, 9, 15, 18, 21]
+    result = [make_forecast(datetime(2025, 7, 2, hour), temperature=float(hour)) for hour in hours]
+    result[1] = make_forecast(datetime(2025, 7, 2, 3, tzinfo=JST), temperature=3.0)
+    result[3] = make_forecast(datetime(2025, 7, 2, 0, tzinfo=timezone.utc), temperature=9.0)
+    return result
+
+
+class TestForecastTimeIndex:
+    """ForecastTimeIndexのテストクラス"""
+
+    def test_nearest_matches_linear_search(self, forecasts):
+        index = ForecastTimeIndex(forecasts)
+        start = datetime(2025, 7, 1, 20, tzinfo=JST)
+        for minutes in range(0, 30 * 60, 30):
+            target = start + timedelta(minutes=minutes)
+            assert index.nearest(target) is linear_nearest(forecasts, target)
+
+    def test_ties_prefer_earlier_then_input_order(self, forecasts):
+        duplicate = make_forecast(datetime(2025, 7, 2, 9), temperature=30.0)
+        index = ForecastTimeIndex(forecasts + [duplicate])
+
+        # 12時は9時と15時から等距離 → 早い時刻、同時刻の中では入力順で先の予報
+        assert index.nearest(datetime(2025, 7, 2, 12)).temperature == 9.0
+        group = index.nearest_group(datetime(2025, 7, 2, 12))
+        assert [f.temperature for f in group] == [9.0, 30.0, 15.0]
+
+    def test_day_restriction_and_distance_limit(self, forecasts):
+        index = ForecastTimeIndex(forecasts)
+
+        assert index.nearest(datetime(2025, 7, 3, 9)).temperature == 21.0
+        assert index.nearest(datetime(2025, 7, 3, 9), on_date=date(2025, 7, 3)) is None
+        assert index.nearest(datetime(2025, 7, 2, 12), max_distance=timedelta(hours=2)) is None
+        assert index.at_hours(date(2025, 7, 2), [9, 12, 15, 18]) == [
+            forecasts[3], forecasts[3], forecasts[4], forecasts[5]
+        ]
+
+    def test_collection_reuses_index_until_forecasts_change(self, forecasts):
+        collection = WeatherForecastCollection(location_id="東京", forecasts=[forecasts[0], forecasts[2]])
+        index = collection.time_index
+        assert collection.time_index is index
+
+        collection.forecasts.append(forecasts[5])
+        assert collection.time_index is not index
+        assert collection.get_forecast_at(datetime(2025, 7, 2, 17)) is forecasts[5]
+        assert collection.get_forecasts_at_hours(date(2025, 7, 2), [6, 18]) == [forecasts[2], forecasts[5]]
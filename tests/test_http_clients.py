@@ -0,0 +1,74 @@
+"""
+共有HTTPクライアントのテスト
+"""
+
+import asyncio
+
+import pytest
+
+from src.apis.http_clients import HTTPClientRegistry, HTTPClientSettings
+from src.apis.wxtech.api import WxTechAPI
+
+
+@pytest.fixture
+def registry():
+    registry = HTTPClientRegistry(HTTPClientSettings(max_connections=8, max_connections_per_host=4))
+    yield registry
+    registry.close()
+
+
+class TestSyncSession:
+    """同期セッションのテストクラス"""
+
+    def test_session_is_shared_between_clients(self, registry, monkeypatch):
+        monkeypatch.setattr("src.apis.wxtech.api.get_http_client_registry", lambda: registry)
+
+        first = WxTechAPI("key-a")
+        second = WxTechAPI("key-b")
+        first.close()
+
+        assert first.session is second.session is registry.get_sync_session()
+        # APIキーは共有セッションではなくクライアントごとのヘッダーで送る
+        assert "X-API-Key" not in registry.get_sync_session().headers
+        assert (first.headers["X-API-Key"], second.headers["X-API-Key"]) == ("key-a", "key-b")
+        assert registry.get_stats()["sync_sessions_created"] == 1
+
+
+class TestAsyncSession:
+    """非同期セッションのテストクラス"""
+
+    def test_app_loop_reuses_one_session(self, registry):
+        async def run():
+            await registry.start()
+            first = await registry.acquire()
+            second = await registry.acquire()
+            await registry.release(first)
+            assert not first.closed
+            stats = registry.get_stats()
+            await registry.aclose()
+            return first, second, stats
+
+        first, second, stats = asyncio.run(run())
+
+        assert first is second
+        assert first.closed
+        assert stats["async_sessions_created"] == 1
+        assert stats["app_session_open"] is True
+
+    def test_other_loops_borrow_refcounted_session(self, registry):
+        async def run():
+            first = await registry.acquire()
+            second = await registry.acquire()
+            assert first is second
+            await registry.release(first)
+            assert not first.closed
+            assert registry.get_stats()["loop_sessions"] == 1
+            await registry.release(second)
+            return first
+
+        session = asyncio.run(run())
+
+        assert session.closed
+        assert registry.get_stats()["loop_sessions"] == 0
+        # 別のループには新しいセッションを貸し出す
+        assert asyncio.run(run()) is not session
@@ -0,0 +1,126 @@
+"""
+LLM非同期スケジューラーのテスト
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.llm.async_scheduler import LLMScheduler, ProviderLimits, TokenBucket
+from src.llm.client_pool import LLMClientPool
+from src.llm.providers.base_provider import LLMProvider
+
+
+class FakeClock:
+    """手動で進める時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SyncOnlyProvider(LLMProvider):
+    """同期APIのみを実装したテスト用プロバイダー"""
+
+    def __init__(self, api_key: str, model: str):
+        self.api_key = api_key
+        self.model = model
+
+    def generate_comment(self, weather_data, past_comments, constraints):
+        return "コメント"
+
+    def generate(self, prompt):
+        return f"sync:{prompt}"
+
+
+class TestTokenBucket:
+    """TokenBucketのテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_wait(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+
+        assert await bucket.acquire() == 0.0
+        assert await bucket.acquire() == 0.0
+
+        async def advance(delay):
+            clock.now += delay
+
+        with patch("src.llm.async_scheduler.asyncio.sleep", side_effect=advance) as mock_sleep:
+            waited = await bucket.acquire()
+
+        assert waited == pytest.approx(0.5)
+        mock_sleep.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_unlimited_rate(self):
+        bucket = TokenBucket(rate=0, capacity=1)
+        for _ in range(10):
+            assert await bucket.acquire() == 0.0
+
+
+class TestLLMScheduler:
+    """LLMSchedulerのテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency_per_provider(self):
+        scheduler = LLMScheduler(
+            ProviderLimits(max_concurrency=2, requests_per_second=0),
+            {"gemini": ProviderLimits(max_concurrency=1, requests_per_second=0)},
+        )
+        running = {"openai": 0, "gemini": 0}
+        peak = {"openai": 0, "gemini": 0}
+
+        async def call(provider):
+            running[provider] += 1
+            peak[provider] = max(peak[provider], running[provider])
+            await asyncio.sleep(0.01)
+            running[provider] -= 1
+            return provider
+
+        results = await asyncio.gather(
+            *[scheduler.run("openai", lambda: call("openai")) for _ in range(6)],
+            *[scheduler.run("gemini", lambda: call("gemini")) for _ in range(3)],
+        )
+
+        assert results.count("openai") == 6
+        assert peak == {"openai": 2, "gemini": 1}
+        stats = scheduler.get_stats()
+        assert stats["openai"]["calls"] == 6
+        assert stats["openai"]["peak_in_flight"] == 2
+        assert stats["gemini"]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_counts_errors(self):
+        scheduler = LLMScheduler(ProviderLimits(requests_per_second=0))
+
+        async def failing():
+            raise RuntimeError("API error")
+
+        with pytest.raises(RuntimeError):
+            await scheduler.run("openai", failing)
+        assert scheduler.get_stats()["openai"]["errors"] == 1
+
+
+class TestLLMManagerAsync:
+    """LLMManager.agenerateのテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_agenerate_falls_back_to_sync_provider(self, monkeypatch):
+        from src.llm.llm_manager import LLMManager
+
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        configs = {**LLMManager.PROVIDER_CONFIGS,
+                   "openai": {**LLMManager.PROVIDER_CONFIGS["openai"], "provider_class": SyncOnlyProvider}}
+        scheduler = LLMScheduler(ProviderLimits(requests_per_second=0))
+        with patch("src.llm.llm_manager.get_llm_client_pool", return_value=LLMClientPool()), \
+                patch.object(LLMManager, "PROVIDER_CONFIGS", configs):
+            manager = LLMManager(provider="openai")
+            result = await manager.agenerate("こんにちは", scheduler=scheduler)
+
+        assert result == "sync:こんにちは"
+        assert scheduler.get_stats()["openai"]["calls"] == 1
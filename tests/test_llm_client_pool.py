@@ -0,0 +1,145 @@
+"""
+LLMクライアントプールのテスト
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.llm.client_pool import LLMClientPool
+from src.llm.providers.base_provider import LLMProvider
+
+
+class FakeProvider(LLMProvider):
+    """呼び出しを記録するテスト用プロバイダー"""
+
+    instances = 0
+
+    def __init__(self, api_key: str, model: str, http_client=None):
+        type(self).instances += 1
+        self.api_key = api_key
+        self.model = model
+        self.http_client = http_client
+
+    @classmethod
+    def create_http_client(cls, limits):
+        return {"limits": limits}
+
+    def generate_comment(self, weather_data, past_comments, constraints):
+        return "コメント"
+
+    def generate(self, prompt):
+        return prompt
+
+
+@pytest.fixture(autouse=True)
+def reset_instances():
+    FakeProvider.instances = 0
+
+
+class TestLLMClientPool:
+    """LLMClientPoolのテストクラス"""
+
+    def test_reuses_provider_per_model(self):
+        pool = LLMClientPool(max_connections=4, max_keepalive_connections=2)
+        first = pool.get_provider("openai", "gpt-4o-mini", "key", FakeProvider)
+        assert pool.get_provider("openai", "gpt-4o-mini", "key", FakeProvider) is first
+        assert pool.get_provider("openai", "gpt-3.5-turbo", "key", FakeProvider) is not first
+        assert FakeProvider.instances == 2
+
+        limits = first.http_client["limits"]
+        assert limits.max_connections == 4
+        assert limits.max_keepalive_connections == 2
+
+    def test_recreates_on_api_key_change(self):
+        pool = LLMClientPool()
+        first = pool.get_provider("openai", "gpt-4o-mini", "old-key", FakeProvider)
+        second = pool.get_provider("openai", "gpt-4o-mini", "new-key", FakeProvider)
+        assert second is not first
+        assert second.api_key == "new-key"
+
+    def test_concurrent_get_creates_single_instance(self):
+        pool = LLMClientPool()
+        results = []
+
+        def worker():
+            results.append(pool.get_provider("gemini", "gemini-1.5-flash", "key", FakeProvider))
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert FakeProvider.instances == 1
+        assert all(provider is results[0] for provider in results)
+
+    def test_lease_limits_concurrency_and_reports_saturation(self):
+        pool = LLMClientPool(max_connections=2)
+        pool.get_provider("openai", "gpt-4o-mini", "key", FakeProvider)
+        metrics = []
+        pool.add_metrics_hook(metrics.append)
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def worker():
+            with pool.lease("openai", "gpt-4o-mini"):
+                with lock:
+                    running.append(1)
+                    peak.append(len(running))
+                time.sleep(0.05)
+                with lock:
+                    running.pop()
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max(peak) == 2
+        assert len(metrics) == 6
+        assert any(m.waited for m in metrics)
+        assert max(m.saturation for m in metrics) == 1.0
+
+        stats = pool.get_stats()["clients"]["openai/gpt-4o-mini"]
+        assert stats["calls"] == 6
+        assert stats["peak_in_flight"] == 2
+        assert stats["in_flight"] == 0
+        assert stats["waits"] >= 1
+
+    def test_failing_hook_does_not_break_call(self):
+        pool = LLMClientPool()
+        pool.get_provider("openai", "gpt-4o-mini", "key", FakeProvider)
+
+        def broken_hook(metrics):
+            raise RuntimeError("hook error")
+
+        pool.add_metrics_hook(broken_hook)
+        with pool.lease("openai", "gpt-4o-mini"):
+            pass
+        assert pool.get_stats()["clients"]["openai/gpt-4o-mini"]["calls"] == 1
+
+
+class TestLLMManagerPooling:
+    """LLMManagerがプールを経由することのテスト"""
+
+    def test_managers_share_provider(self, monkeypatch):
+        from src.llm.llm_manager import LLMManager
+
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        pool = LLMClientPool()
+        configs = {**LLMManager.PROVIDER_CONFIGS,
+                   "openai": {**LLMManager.PROVIDER_CONFIGS["openai"], "provider_class": FakeProvider}}
+        with patch("src.llm.llm_manager.get_llm_client_pool", return_value=pool), \
+                patch.object(LLMManager, "PROVIDER_CONFIGS", configs):
+            first = LLMManager(provider="openai")
+            second = LLMManager(provider="openai")
+            assert first.provider is second.provider
+            assert second.generate("こんにちは") == "こんにちは"
+
+        assert FakeProvider.instances == 1
+        assert pool.get_stats()["clients"][f"openai/{first.model}"]["calls"] == 1
@@ -0,0 +1,99 @@
+"""
+LLMレスポンスキャッシュのテスト
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.llm.response_cache import (
+    LLMResponseCache,
+    end_of_forecast_day,
+    make_cache_key,
+    normalize_prompt,
+)
+from src.nodes.unified_comment_generation.prompt_builder import build_unified_prompt
+
+
+class TestCacheKey:
+    """キャッシュキー生成のテストクラス"""
+
+    def test_normalizes_whitespace_and_width(self):
+        assert normalize_prompt("ＡＢＣ  晴れ\n\n   1. 暑い ") == "ABC 晴れ\n1. 暑い"
+        assert make_cache_key("gemini", "m", "晴れ\n1. 暑い") == make_cache_key("gemini", "m", "  晴れ \n\n1.  暑い")
+
+    def test_ignored_lines(self):
+        tokyo = "地点: 東京\n日時: 2025年07月01日 09時\n1. 暑い"
+        osaka = "地点: 大阪\n日時: 2025年07月01日 09時\n1. 暑い"
+        assert make_cache_key("gemini", "m", tokyo) != make_cache_key("gemini", "m", osaka)
+        assert make_cache_key("gemini", "m", tokyo, ("地点:",)) == make_cache_key("gemini", "m", osaka, ("地点:",))
+
+    def test_unified_prompt_key_depends_on_location(self):
+        # 統合生成のプロンプトは地域性の考慮を求めるため、地点が違えば応答を共有しない
+        target = datetime(2025, 7, 1, 9)
+        keys = {
+            make_cache_key("gemini", "m", build_unified_prompt([], [], "天気: 晴れ", location, target))
+            for location in ("東京", "大阪")
+        }
+        assert len(keys) == 2
+
+    def test_provider_and_model_are_part_of_key(self):
+        assert make_cache_key("gemini", "a", "p") != make_cache_key("openai", "a", "p")
+        assert make_cache_key("gemini", "a", "p") != make_cache_key("gemini", "b", "p")
+
+    def test_end_of_forecast_day(self):
+        assert end_of_forecast_day(datetime(2025, 7, 1, 9, 30)) == datetime(2025, 7, 2)
+
+
+class TestLLMResponseCache:
+    """LLMResponseCacheのテストクラス"""
+
+    @pytest.fixture
+    def cache(self):
+        cache = LLMResponseCache(max_memory_entries=10)
+        yield cache
+        cache.close()
+
+    def test_memory_hit_and_miss(self, cache):
+        expires_at = datetime.now() + timedelta(hours=1)
+        assert cache.get("key") is None
+        cache.set("key", '{"selected_weather_index": 1}', expires_at)
+        assert cache.get("key") == '{"selected_weather_index": 1}'
+
+        stats = cache.get_stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["disk_size"] is None
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        db_path = tmp_path / "llm_responses.sqlite3"
+        expires_at = datetime.now() + timedelta(hours=1)
+
+        first = LLMResponseCache(db_path=db_path)
+        first.set("key", "response", expires_at, provider="gemini", model="m")
+        first.close()
+
+        second = LLMResponseCache(db_path=db_path)
+        try:
+            assert second.get("key") == "response"
+            assert second.get("key") == "response"
+            stats = second.get_stats()
+            assert stats["disk_hits"] == 1
+            assert stats["memory_hits"] == 1
+            assert stats["disk_size"] == 1
+        finally:
+            second.close()
+
+    def test_expired_disk_entries_are_ignored(self, tmp_path):
+        db_path = tmp_path / "llm_responses.sqlite3"
+        first = LLMResponseCache(db_path=db_path)
+        first._disk.set("key", "gemini", "m", "response", 0.0, 1.0)
+        first.close()
+
+        second = LLMResponseCache(db_path=db_path)
+        try:
+            assert second.get("key") is None
+            assert second.get_stats()["disk_size"] == 0
+        finally:
+            second.close()
@@ -0,0 +1,179 @@
+"""
+同時呼び出しの合流（single-flight）のテスト
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.llm.client_pool import LLMClientPool
+from src.llm.providers.base_provider import LLMProvider
+from src.utils.single_flight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    get_async_single_flight,
+    get_single_flight,
+    get_single_flight_stats,
+    reset_single_flights,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_groups():
+    reset_single_flights()
+    yield
+    reset_single_flights()
+
+
+class TestSingleFlight:
+    """SingleFlightのテストクラス"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight("test")
+        release = threading.Event()
+        calls = []
+
+        def slow(value):
+            calls.append(value)
+            release.wait(5)
+            return {"value": value}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do("key", slow, 1))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while flight.get_stats()["calls"] < 5:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert calls == [1]
+        assert all(result is results[0] for result in results)
+        stats = flight.get_stats()
+        assert (stats["executions"], stats["coalesced"], stats["in_flight"]) == (1, 4, 0)
+
+        # 実行が終わった後の呼び出しは再度実行される
+        flight.do("key", slow, 2)
+        assert calls == [1, 2]
+
+    def test_errors_are_shared_and_not_retained(self):
+        flight = SingleFlight("test")
+        release = threading.Event()
+
+        def failing():
+            release.wait(5)
+            raise ConnectionError("upstream down")
+
+        errors = []
+
+        def call():
+            try:
+                flight.do("key", failing)
+            except ConnectionError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while flight.get_stats()["calls"] < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(errors) == 3
+        assert flight.get_stats()["errors"] == 1
+        assert flight.do("key", lambda: "ok") == "ok"
+
+
+class TestAsyncSingleFlight:
+    """AsyncSingleFlightのテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_share_one_execution(self):
+        flight = AsyncSingleFlight("test")
+        calls = []
+
+        async def slow(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value * 2
+
+        results = await asyncio.gather(*[flight.do("key", slow, 21) for _ in range(4)], flight.do("other", slow, 1))
+
+        assert results == [42, 42, 42, 42, 2]
+        assert sorted(calls) == [1, 21]
+        assert flight.get_stats()["coalesced"] == 3
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = AsyncSingleFlight("test")
+
+        async def slow():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", slow))
+        second = asyncio.ensure_future(flight.do("key", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "done"
+        assert first.cancelled()
+
+    def test_registry_reports_named_groups(self):
+        assert get_single_flight("wxtech") is get_single_flight("wxtech")
+        asyncio.run(get_async_single_flight("llm_async").do("key", asyncio.sleep, 0, "ok"))
+
+        stats = get_single_flight_stats()
+        assert stats["llm_async"]["executions"] == 1
+        assert stats["wxtech"]["calls"] == 0
+        with pytest.raises(ValueError):
+            get_async_single_flight("wxtech")
+
+
+class CountingProvider(LLMProvider):
+    """呼び出し回数を数える同期専用プロバイダー"""
+
+    calls = 0
+
+    def __init__(self, api_key, model, http_client=None):
+        self.model = model
+
+    def generate_comment(self, weather_data, past_comments, constraints):
+        return ""
+
+    def generate(self, prompt):
+        CountingProvider.calls += 1
+        time.sleep(0.02)
+        return f"応答:{prompt}"
+
+
+class TestLLMManagerCoalescing:
+    """LLMManagerのリクエスト合流のテストクラス"""
+
+    @pytest.mark.asyncio
+    async def test_identical_prompts_share_one_call(self, monkeypatch):
+        from src.llm.async_scheduler import LLMScheduler, ProviderLimits
+        from src.llm.llm_manager import LLMManager
+
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        CountingProvider.calls = 0
+        configs = {**LLMManager.PROVIDER_CONFIGS,
+                   "openai": {**LLMManager.PROVIDER_CONFIGS["openai"], "provider_class": CountingProvider}}
+        scheduler = LLMScheduler(ProviderLimits(requests_per_second=0))
+        with patch("src.llm.llm_manager.get_llm_client_pool", return_value=LLMClientPool()), \
+                patch.object(LLMManager, "PROVIDER_CONFIGS", configs):
+            managers = [LLMManager(provider="openai") for _ in range(3)]
+            results = await asyncio.gather(
+                *[manager.agenerate("晴れのコメント", scheduler=scheduler) for manager in managers],
+                managers[0].agenerate("雨のコメント", scheduler=scheduler),
+            )
+
+        assert results == ["応答:晴れのコメント"] * 3 + ["応答:雨のコメント"]
+        assert CountingProvider.calls == 2
+        assert get_single_flight_stats()["llm_async"]["coalesced"] == 2
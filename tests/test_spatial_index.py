@@ -0,0 +1,105 @@
+"""
+空間インデックスのテスト
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.data.location.models import Location
+from src.data.location.search_engine import LocationSearchEngine
+from src.data.forecast_cache.spatial_cache import LocationCoordinate
+from src.utils.spatial_index import GeoGridIndex, haversine_km
+
+
+def haversine_distance(lat1, lon1, lat2, lon2):
+    return LocationCoordinate("a", lat1, lon1).distance_to(LocationCoordinate("b", lat2, lon2))
+
+
+def brute_force(points, latitude, longitude, radius_km):
+    distances = [(key, haversine_distance(latitude, longitude, lat, lon)) for key, (lat, lon) in points.items()]
+    return sorted([(key, d) for key, d in distances if d <= radius_km], key=lambda x: x[1])
+
+
+class TestHaversine:
+    """ベクトル化したハーバサイン公式のテストクラス"""
+
+    def test_matches_scalar_formula(self):
+        lats = np.array([35.6895, 34.6937, 43.0642])
+        lons = np.array([139.6917, 135.5023, 141.3469])
+        expected = [haversine_distance(35.0, 136.0, lat, lon) for lat, lon in zip(lats, lons, strict=True)]
+        assert haversine_km(35.0, 136.0, lats, lons) == pytest.approx(expected)
+
+
+class TestGeoGridIndex:
+    """GeoGridIndexのテストクラス"""
+
+    @pytest.fixture
+    def points(self):
+        rng = random.Random(42)
+        return {f"地点{i}": (rng.uniform(24, 46), rng.uniform(123, 146)) for i in range(500)}
+
+    @pytest.mark.parametrize("radius_km", [5.0, 50.0, 300.0])
+    def test_query_radius_matches_brute_force(self, points, radius_km):
+        index = GeoGridIndex(cell_size_deg=0.3)
+        for key, (lat, lon) in points.items():
+            index.insert(key, lat, lon)
+
+        for lat, lon in [(35.68, 139.69), (26.2, 127.7), (43.06, 141.35)]:
+            result = index.query_radius(lat, lon, radius_km)
+            expected = brute_force(points, lat, lon, radius_km)
+            assert [key for key, _ in result] == [key for key, _ in expected]
+            assert [d for _, d in result] == pytest.approx([d for _, d in expected])
+
+    def test_k_and_exclude(self, points):
+        index = GeoGridIndex()
+        for key, (lat, lon) in points.items():
+            index.insert(key, lat, lon)
+
+        lat, lon = points["地点0"]
+        result = index.nearest(lat, lon, k=3, exclude="地点0")
+        expected = brute_force({k: v for k, v in points.items() if k != "地点0"}, lat, lon, float("inf"))[:3]
+        assert [key for key, _ in result] == [key for key, _ in expected]
+
+        within = index.query_radius(lat, lon, 10_000, k=5)
+        assert within[0] == ("地点0", 0.0)
+        assert len(within) == 5
+
+    def test_incremental_update_and_remove(self):
+        index = GeoGridIndex(initial_capacity=1)
+        index.insert("東京", 35.6895, 139.6917)
+        index.insert("横浜", 35.4437, 139.6380)
+        index.insert("大阪", 34.6937, 135.5023)
+        assert len(index) == 3
+        assert [key for key, _ in index.query_radius(35.6895, 139.6917, 50)] == ["東京", "横浜"]
+
+        # 座標の更新
+        index.insert("横浜", 34.70, 135.50)
+        assert [key for key, _ in index.query_radius(35.6895, 139.6917, 50)] == ["東京"]
+        assert index.get("横浜") == (34.70, 135.50)
+
+        assert index.remove("大阪")
+        assert not index.remove("大阪")
+        index.insert("札幌", 43.0642, 141.3469)
+        assert sorted(index) == ["札幌", "東京", "横浜"]
+        assert [key for key, _ in index.query_radius(34.69, 135.50, 20)] == ["横浜"]
+
+
+class TestLocationSearchEngineNearby:
+    """LocationSearchEngine.get_nearby_locationsのテストクラス"""
+
+    def test_nearby_locations_sorted_by_distance(self):
+        locations = [
+            Location(name="東京", normalized_name="東京", latitude=35.6895, longitude=139.6917),
+            Location(name="横浜", normalized_name="横浜", latitude=35.4437, longitude=139.6380),
+            Location(name="千葉", normalized_name="千葉", latitude=35.6074, longitude=140.1065),
+            Location(name="大阪", normalized_name="大阪", latitude=34.6937, longitude=135.5023),
+            Location(name="不明", normalized_name="不明"),
+        ]
+        engine = LocationSearchEngine(locations)
+
+        nearby = engine.get_nearby_locations(locations[0], radius_km=50, limit=10)
+        assert [loc.name for loc in nearby] == ["横浜", "千葉"]
+        assert [loc.name for loc in engine.get_nearby_locations(locations[0], radius_km=50, limit=1)] == ["横浜"]
+        assert engine.get_nearby_locations(locations[4]) == []
@@ -5,7 +5,7 @@ UIユーティリティ関数の単体テスト
 """
 
 import pytest
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import patch, MagicMock
 import json
 from datetime import datetime
 import os
@@ -19,6 +19,7 @@ from src.ui.streamlit_utils import (
     format_timestamp,
     validate_api_keys,
 )
+from src.repositories.generation_history_store import GenerationHistoryStore
 from unittest.mock import patch
 
 
@@ -105,14 +106,15 @@ class TestClipboardUtils:
 class TestHistoryManagement:
     """履歴管理関連のテスト"""
 
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("os.path.exists")
-    @patch("os.makedirs")
-    def test_save_to_history(self, mock_makedirs, mock_exists, mock_file):
-        """履歴保存のテスト"""
-        # ディレクトリが存在しない場合
-        mock_exists.return_value = False
+    @pytest.fixture
+    def history_store(self, tmp_path):
+        """一時ディレクトリの履歴ストアを使用"""
+        store = GenerationHistoryStore(tmp_path / "history", legacy_file=tmp_path / "generation_history.json")
+        with patch("src.ui.utils.history_utils.get_history_store", return_value=store):
+            yield store
 
+    def test_save_to_history(self, history_store):
+        """履歴保存のテスト"""
         result = {
             "final_comment": "テストコメント",
             "generation_metadata": {"weather_condition": "晴れ", "temperature": 25.0},
@@ -123,29 +125,20 @@ class TestHistoryManagement:
         # 実行
         save_to_history(result, location, provider)
 
-        # 検証
-        mock_makedirs.assert_called_once()
-        mock_file.assert_called()
-
-        # 書き込まれた内容を確認
-        handle = mock_file()
-        written_data = "".join([call[0][0] for call in handle.write.call_args_list])
-        saved_data = json.loads(written_data)
+        # 検証（1行1件のJSONLとして追記される）
+        segments = list((history_store.directory).glob("segment-*.jsonl"))
+        assert len(segments) == 1
+        lines = segments[0].read_text(encoding="utf-8").splitlines()
+        saved_data = json.loads(lines[0])
 
         assert saved_data["location"] == location
         assert saved_data["comment"] == "テストコメント"
-        assert saved_data["provider"] == provider
+        assert saved_data["llm_provider"] == provider
         assert "timestamp" in saved_data
 
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data='[{"location": "東京", "comment": "晴れです"}]',
-    )
-    @patch("os.path.exists")
-    def test_load_history_with_data(self, mock_exists, mock_file):
+    def test_load_history_with_data(self, history_store):
         """履歴読み込み（データあり）のテスト"""
-        mock_exists.return_value = True
+        save_to_history({"final_comment": "晴れです"}, "東京", "openai")
 
         result = load_history()
 
@@ -153,51 +146,44 @@ class TestHistoryManagement:
         assert result[0]["location"] == "東京"
         assert result[0]["comment"] == "晴れです"
 
-    @patch("os.path.exists")
-    def test_load_history_no_file(self, mock_exists):
+    def test_load_history_no_file(self, history_store):
         """履歴読み込み（ファイルなし）のテスト"""
-        mock_exists.return_value = False
-
         result = load_history()
 
         assert result == []
 
-    @patch("builtins.open", new_callable=mock_open, read_data="invalid json")
-    @patch("os.path.exists")
-    def test_load_history_invalid_json(self, mock_exists, mock_file):
-        """履歴読み込み（無効なJSON）のテスト"""
-        mock_exists.return_value = True
+    def test_load_history_invalid_json(self, history_store):
+        """履歴読み込み（無効な行）のテスト"""
+        history_store.directory.mkdir(parents=True)
+        (history_store.directory / "segment-000001.jsonl").write_text("invalid json\n", encoding="utf-8")
 
         result = load_history()
 
         assert result == []
 
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("os.path.exists")
-    def test_save_history_preserves_limit(self, mock_exists, mock_file):
+    def test_load_history_migrates_legacy_file(self, history_store):
+        """旧形式（JSON配列）の履歴ファイルの移行テスト"""
+        history_store.legacy_file.write_text(
+            json.dumps([{"location": "東京", "comment": "晴れです"}], ensure_ascii=False), encoding="utf-8"
+        )
+
+        result = load_history()
+
+        assert result == [{"location": "東京", "comment": "晴れです"}]
+
+    def test_save_history_preserves_limit(self, tmp_path):
         """履歴保存の件数制限テスト"""
-        # 既存の履歴（100件）
-        existing_history = [
-            {"timestamp": f"2024-06-{i:02d}", "comment": f"コメント{i}"} for i in range(1, 101)
-        ]
-        mock_file.return_value.read.return_value = json.dumps(existing_history)
-        mock_exists.return_value = True
-
-        # 新しい履歴を追加
-        result = {"final_comment": "新しいコメント", "generation_metadata": {}}
-        save_to_history(result, "東京", "openai")
-
-        # 書き込まれたデータを確認
-        handle = mock_file()
-        write_calls = handle.write.call_args_list
-        if write_calls:
-            written_data = "".join([call[0][0] for call in write_calls])
-            saved_history = json.loads(written_data)
-
-            # 100件以下に制限されていることを確認
-            assert len(saved_history) <= 100
-            # 最新のコメントが先頭にあることを確認
-            assert saved_history[0]["comment"] == "新しいコメント"
+        store = GenerationHistoryStore(tmp_path / "history", segment_size=10, max_segments=3,
+                                       max_entries=20, legacy_file=None)
+        with patch("src.ui.utils.history_utils.get_history_store", return_value=store):
+            for i in range(45):
+                save_to_history({"final_comment": f"コメント{i}"}, "東京", "openai")
+            result = load_history()
+
+        # 最新20件までに制限され、古いセグメントは削除される
+        assert len(result) == 20
+        assert result[-1]["comment"] == "コメント44"
+        assert len(list(store.directory.glob("segment-*.jsonl"))) == 3
 
 
 class TestFormatUtils:
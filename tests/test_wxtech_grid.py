@@ -0,0 +1,305 @@
+"""
+WxTech 予報メッシュ共有のテスト
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from src.apis.wxtech.cached_client import CachedWxTechAPIClient
+from src.apis.wxtech.grid import GridForecastCache, MeshGrid, describe_freshness, diff_grid_stats, is_fresh
+from src.data.weather_data import WeatherCondition, WeatherForecast, WeatherForecastCollection, WindDirection
+
+
+def make_collection(lat, lon):
+    location_id = f"{lat:.2f},{lon:.2f}"
+    forecast = WeatherForecast(
+        location_id=location_id,
+        datetime=datetime(2025, 7, 2, 9),
+        temperature=25.0,
+        feels_like=26.0,
+        humidity=60.0,
+        pressure=1013.0,
+        wind_speed=3.0,
+        wind_direction=WindDirection.NORTH,
+        weather_condition=WeatherCondition.CLEAR,
+        weather_description="晴れ",
+    )
+    return WeatherForecastCollection(location_id=location_id, forecasts=[forecast])
+
+
+@pytest.fixture
+def grid_cache():
+    cache = GridForecastCache()
+    yield cache
+    cache.close()
+
+
+class TestMeshGrid:
+    """MeshGridのテストクラス"""
+
+    def test_nearby_points_share_cell(self):
+        grid = MeshGrid()
+        # 約300m離れた2地点は同じ3次メッシュに入る
+        assert grid.cell(35.6812, 139.7671) == grid.cell(35.6830, 139.7700)
+        assert grid.cell(35.6812, 139.7671) != grid.cell(35.6950, 139.7671)
+
+    def test_snap_is_idempotent(self):
+        grid = MeshGrid()
+        snapped = grid.snap(35.6812, 139.7671)
+        assert grid.snap(*snapped) == snapped
+        assert grid.cell(*snapped) == grid.cell(35.6812, 139.7671)
+
+
+class TestGridForecastCache:
+    """GridForecastCacheのテストクラス"""
+
+    def test_concurrent_async_requests_share_one_upstream_call(self, grid_cache):
+        calls = []
+
+        async def fetch(lat, lon):
+            calls.append((lat, lon))
+            await asyncio.sleep(0.01)
+            return make_collection(lat, lon)
+
+        async def run():
+            return await asyncio.gather(
+                grid_cache.aget_or_fetch("next_day", 35.6812, 139.7671, fetch, location_id="東京駅"),
+                grid_cache.aget_or_fetch("next_day", 35.6830, 139.7700, fetch, location_id="大手町"),
+                grid_cache.aget_or_fetch("next_day", 34.7025, 135.4959, fetch, location_id="大阪"),
+            )
+
+        tokyo, otemachi, osaka = asyncio.run(run())
+
+        assert len(calls) == 2
+        assert calls[0] == MeshGrid().snap(35.6812, 139.7671)
+        assert [tokyo.location_id, otemachi.location_id, osaka.location_id] == ["東京駅", "大手町", "大阪"]
+        assert [f.location_id for f in otemachi.forecasts] == ["大手町"]
+        # 地点ごとに別のオブジェクトを返す
+        assert tokyo.forecasts[0] is not otemachi.forecasts[0]
+
+        stats = grid_cache.get_stats()
+        assert stats["upstream_calls"] == 2
+        assert stats["coalesced"] == 1
+        assert stats["saved_upstream_calls"] == 1
+
+        # 2回目以降はキャッシュから返す
+        again = asyncio.run(grid_cache.aget_or_fetch("next_day", 35.6812, 139.7671, fetch, location_id="丸の内"))
+        assert again.location_id == "丸の内"
+        assert len(calls) == 2
+        assert diff_grid_stats(stats, grid_cache.get_stats())["cache_hits"] == 1
+
+    def test_sync_requests_are_coalesced_across_threads(self, grid_cache):
+        release = threading.Event()
+        calls = []
+
+        def fetch(lat, lon):
+            calls.append((lat, lon))
+            release.wait(5)
+            return make_collection(lat, lon)
+
+        results = {}
+
+        def worker(name):
+            results[name] = grid_cache.get_or_fetch("forecast", 35.6812, 139.7671, fetch, 24, location_id=name)
+
+        threads = [threading.Thread(target=worker, args=(f"地点{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        while grid_cache.get_stats()["requests"] < 4:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert sorted(result.location_id for result in results.values()) == [f"地点{i}" for i in range(4)]
+        assert grid_cache.get_stats()["coalesced"] == 3
+
+    def test_errors_propagate_and_are_not_cached(self, grid_cache):
+        calls = []
+
+        async def failing(lat, lon):
+            calls.append((lat, lon))
+            await asyncio.sleep(0.01)
+            raise ConnectionError("upstream down")
+
+        async def run():
+            return await asyncio.gather(
+                grid_cache.aget_or_fetch("next_day", 35.6812, 139.7671, failing),
+                grid_cache.aget_or_fetch("next_day", 35.6812, 139.7671, failing),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, ConnectionError) for r in results)
+        assert len(calls) == 1
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(grid_cache.aget_or_fetch("next_day", 35.6812, 139.7671, failing))
+        assert len(calls) == 2
+        assert grid_cache.get_stats()["errors"] == 2
+
+
+def expire_all(grid_cache):
+    """キャッシュしている予報を期限切れにする"""
+    for entry in grid_cache._cache._cache.values():
+        entry["expire_at"] = time.time() - 1
+
+
+class TestStaleForecasts:
+    """期限切れの予報の提供（stale-while-revalidate / stale-if-error）のテストクラス"""
+
+    @pytest.fixture
+    def stale_cache(self):
+        cache = GridForecastCache(stale_ttl=3600)
+        yield cache
+        cache.close()
+
+    def test_stale_forecast_is_served_while_one_refresh_runs(self, stale_cache):
+        release = threading.Event()
+        calls = []
+
+        def fetch(lat, lon):
+            calls.append((lat, lon))
+            if len(calls) > 1:
+                release.wait(5)
+            return make_collection(lat, lon)
+
+        stale_cache.get_or_fetch("forecast", 35.6812, 139.7671, fetch, 24)
+        expire_all(stale_cache)
+
+        # 再取得が終わるまでの要求は待たずに期限切れの予報を受け取り、再取得は1回だけ行う
+        first = stale_cache.get_or_fetch("forecast", 35.6812, 139.7671, fetch, 24, location_id="東京駅")
+        second = stale_cache.get_or_fetch("forecast", 35.6812, 139.7671, fetch, 24, location_id="大手町")
+        assert not is_fresh(first) and not is_fresh(second)
+        assert describe_freshness(first)["cache_status"] == "stale"
+        release.set()
+        while stale_cache.get_stats()["in_flight"] or stale_cache._revalidating:
+            time.sleep(0.001)
+
+        refreshed = stale_cache.get_or_fetch("forecast", 35.6812, 139.7671, fetch, 24)
+        assert is_fresh(refreshed)
+        assert len(calls) == 2
+        stats = stale_cache.get_stats()
+        assert (stats["stale_served"], stats["revalidations"], stats["cache_hits"]) == (2, 1, 1)
+
+    def test_stale_forecast_is_served_when_upstream_fails(self):
+        cache = GridForecastCache(stale_ttl=3600, stale_while_revalidate=False)
+        responses = [make_collection(35.0, 139.0), ConnectionError("upstream down")]
+
+        async def fetch(lat, lon):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        try:
+            asyncio.run(cache.aget_or_fetch("next_day", 35.6812, 139.7671, fetch))
+            expire_all(cache)
+
+            result = asyncio.run(cache.aget_or_fetch("next_day", 35.6812, 139.7671, fetch))
+            assert describe_freshness(result)["cache_status"] == "stale_if_error"
+            assert cache.get_stats()["stale_if_error"] == 1
+
+            # 保持期間を過ぎた予報は返さない
+            cache._cache.stale_ttl = 0
+            responses.append(ConnectionError("upstream down"))
+            with pytest.raises(ConnectionError):
+                asyncio.run(cache.aget_or_fetch("next_day", 35.6812, 139.7671, fetch))
+        finally:
+            cache.close()
+
+    def test_client_cache_does_not_keep_stale_results(self, stale_cache, monkeypatch):
+        calls = []
+
+        def fake_fetch(self, lat, lon, forecast_hours, target_date, target_hours):
+            calls.append((lat, lon))
+            if len(calls) > 1:
+                raise ConnectionError("upstream down")
+            return make_collection(lat, lon)
+
+        monkeypatch.setattr("src.apis.wxtech.client.WxTechAPIClient.get_forecast_for_hours", fake_fetch)
+        stale_cache.stale_while_revalidate = False
+        client = CachedWxTechAPIClient("test_key", grid_cache=stale_cache)
+
+        client.get_forecast_for_next_day_hours_optimized(35.6812, 139.7671)
+        client.clear_cache()
+        expire_all(stale_cache)
+
+        stale = client.get_forecast_for_next_day_hours_optimized(35.6812, 139.7671)
+        assert not is_fresh(stale)
+        assert client.get_cache_stats()["size"] == 0
+
+
+class TestCachedClientPrefetch:
+    """CachedWxTechAPIClientの一括先読みのテストクラス"""
+
+    def test_prefetch_fans_out_to_each_location(self, grid_cache, monkeypatch):
+        calls = []
+
+        async def fake_fetch(self, lat, lon, forecast_hours, target_date, target_hours):
+            calls.append((lat, lon))
+            await asyncio.sleep(0.01)
+            return make_collection(lat, lon)
+
+        monkeypatch.setattr(
+            "src.apis.wxtech.client.WxTechAPIClient.async_get_forecast_for_hours", fake_fetch
+        )
+        client = CachedWxTechAPIClient("test_key", grid_cache=grid_cache)
+        locations = [
+            ("東京駅", 35.6812, 139.7671),
+            ("大手町", 35.6830, 139.7700),
+            ("大阪", 34.7025, 135.4959),
+        ]
+
+        fetched = asyncio.run(client.prefetch_locations_async(locations))
+
+        assert len(calls) == 2
+        assert {name: result.location_id for name, result in fetched.items()} == {
+            "東京駅": "東京駅", "大手町": "大手町", "大阪": "大阪"
+        }
+        assert client.get_grid_stats()["saved_upstream_calls"] == 1
+
+    def test_sync_request_reuses_async_prefetch(self, grid_cache, monkeypatch):
+        upstream = []
+
+        async def fake_async_fetch(self, lat, lon, forecast_hours, target_date, target_hours):
+            upstream.append("async")
+            return make_collection(lat, lon)
+
+        def fake_sync_fetch(self, lat, lon, forecast_hours, target_date, target_hours):
+            upstream.append("sync")
+            return make_collection(lat, lon)
+
+        monkeypatch.setattr(
+            "src.apis.wxtech.client.WxTechAPIClient.async_get_forecast_for_hours", fake_async_fetch
+        )
+        monkeypatch.setattr("src.apis.wxtech.client.WxTechAPIClient.get_forecast_for_hours", fake_sync_fetch)
+        client = CachedWxTechAPIClient("test_key", grid_cache=grid_cache)
+
+        asyncio.run(client.prefetch_locations_async([("東京駅", 35.6812, 139.7671)]))
+        forecast = client.get_forecast_for_next_day_hours_optimized(35.6830, 139.7700)
+
+        # 非同期の先読みと同期の取得は同じメッシュキャッシュのキーを使う
+        assert upstream == ["async"]
+        assert forecast.forecasts
+
+    @pytest.mark.parametrize("hour, expected_day, expected_hours", [(3, 2, 17), (12, 3, 32)])
+    def test_next_day_window_follows_date_boundary(self, grid_cache, monkeypatch, hour, expected_day,
+                                                   expected_hours):
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return tz.localize(datetime(2025, 7, 2, hour, 0))
+
+        monkeypatch.setattr("src.apis.wxtech.client.datetime", FrozenDatetime)
+        monkeypatch.setattr("src.apis.wxtech.client.load_date_boundary_hour", lambda: 6)
+        client = CachedWxTechAPIClient("test_key", grid_cache=grid_cache)
+
+        # 天気予報ノードと同じく、日付境界（6時）より前は当日の予報を対象にする
+        # 取得範囲は対象日の8時から19時まで
+        assert client._next_day_window() == (expected_hours, datetime(2025, 7, expected_day).date())
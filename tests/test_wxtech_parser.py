@@ -0,0 +1,76 @@
+"""
+WxTech レスポンス解析のテスト
+"""
+
+import json
+from datetime import date, datetime
+
+import pytest
+
+from src.apis.wxtech.parser import loads_response, parse_forecast_response
+from src.data.weather_data import WeatherCondition
+
+
+def make_row(dt, wx="100", temp=20.0, **extra):
+    return {"date": dt, "wx": wx, "temp": temp, "prec": 0.0, "rhum": 60.0, "wndspd": 2.0, "wnddir": 3, **extra}
+
+
+def make_response():
+    srf = [make_row(f"2025-07-01T{hour:02d}:00:00+09:00") for hour in range(20, 24)]
+    srf += [make_row(f"2025-07-02T{hour:02d}:00:00+09:00", wx="300" if hour >= 15 else "100", temp=float(hour))
+            for hour in range(0, 20)]
+    mrf = [{"date": "2025-07-03T00:00:00+09:00", "wx": "200", "maxtemp": 28.0, "mintemp": 20.0}]
+    return {"wxdata": [{"srf": srf, "mrf": mrf}]}
+
+
+class TestParseForecastResponse:
+    """parse_forecast_responseのテストクラス"""
+
+    def test_full_parse_keeps_order_and_lookups(self):
+        collection = parse_forecast_response(make_response(), "東京")
+
+        assert len(collection.forecasts) == 25
+        daily = collection.forecasts[-1]
+        assert (daily.temperature, daily.weather_condition) == (28.0, WeatherCondition.CLOUDY)
+        rainy = collection.forecasts[4 + 15]
+        assert (rainy.weather_condition, rainy.weather_description) == (WeatherCondition.RAIN, "雨")
+
+    def test_target_hours_select_closest_forecasts(self):
+        collection = parse_forecast_response(
+            make_response(), "東京", target_date=date(2025, 7, 2), target_hours=(9, 12, 15, 18)
+        )
+
+        assert [f.datetime.hour for f in collection.forecasts] == [9, 12, 15, 18]
+        assert [f.temperature for f in collection.forecasts] == [9.0, 12.0, 15.0, 18.0]
+
+    def test_missing_or_invalid_hours_fall_back_to_next_closest(self):
+        raw = make_response()
+        srf = raw["wxdata"][0]["srf"]
+        # 12時は欠落、15時は検証エラー（湿度が範囲外）
+        srf[:] = [row for row in srf if not row["date"].startswith("2025-07-02T12")]
+        next(row for row in srf if row["date"].startswith("2025-07-02T15"))["rhum"] = 500.0
+
+        with pytest.warns(UserWarning):
+            collection = parse_forecast_response(
+                raw, "東京", target_date=date(2025, 7, 2), target_hours=(12, 15)
+            )
+
+        # 差が同じ場合は先に現れる予報を選ぶ
+        assert [f.datetime.hour for f in collection.forecasts] == [11, 14]
+
+    def test_target_date_without_hours_returns_whole_day(self):
+        collection = parse_forecast_response(make_response(), "東京", target_date=date(2025, 7, 2))
+
+        assert len(collection.forecasts) == 20
+        assert all(f.datetime.date() == date(2025, 7, 2) for f in collection.forecasts)
+
+
+def test_loads_response_accepts_bytes_and_str():
+    body = json.dumps(make_response(), ensure_ascii=False)
+
+    assert loads_response(body.encode()) == loads_response(body) == json.loads(body)
+    with pytest.raises(json.JSONDecodeError):
+        loads_response(b"not json")
+    assert isinstance(
+        parse_forecast_response(loads_response(body), "東京").forecasts[0].datetime, datetime
+    )
@@ -0,0 +1,96 @@
+"""キーワード照合エンジンのテスト"""
+
+import random
+
+import pytest
+
+from src.constants.content_constants import FORBIDDEN_PHRASES
+from src.nodes.helpers.ng_words import check_ng_words, get_ng_words
+from src.utils.keyword_matcher import KeywordMatcher, get_keyword_matcher
+from src.utils.weather_comment_filter import WeatherCommentFilter
+
+
+@pytest.fixture
+def matcher():
+    return KeywordMatcher({
+        "rain": ["雨", "にわか雨", "雨具"],
+        "sun": ["日差し", "強い日差し", "晴"],
+        "overlap": ["he", "she", "his", "hers"],
+    })
+
+
+class TestKeywordMatcher:
+    """KeywordMatcher のテスト"""
+
+    def test_finds_overlapping_keywords(self, matcher):
+        matches = matcher.scan("ushers")
+        assert set(matches.positions) == {"she", "he", "hers"}
+        assert matches.position("she") == 1
+        assert matches.position("hers") == 2
+
+    def test_positions_match_str_index(self, matcher):
+        text = "強い日差しのあと、にわか雨。雨具を"
+        matches = matcher.scan(text)
+        for keyword in matches.positions:
+            assert matches.position(keyword) == text.index(keyword)
+
+    def test_categories(self, matcher):
+        matches = matcher.scan("にわか雨に注意")
+        assert matches.categories == frozenset({"rain"})
+        assert matches.in_category("rain") == ["雨", "にわか雨"]
+        assert matches.in_category("sun") == []
+        assert not matcher.scan("くもり").categories
+
+    def test_first_respects_given_order(self, matcher):
+        matches = matcher.scan("にわか雨")
+        assert matches.first(["にわか雨", "雨"]) == "にわか雨"
+        assert matches.first(["雨", "にわか雨"]) == "雨"
+        assert matches.first(["晴"]) is None
+
+    def test_unknown_keywords_fall_back_to_substring_search(self, matcher):
+        matches = matcher.scan("雷が鳴る")
+        assert "雷" in matches
+        assert matches.position("雷") == 0
+        assert matches.found(["雨", "雷"]) == ["雷"]
+
+    def test_matches_naive_search_on_random_texts(self):
+        keywords = ["あ", "あい", "いう", "あいう", "うえお", "お"]
+        matcher = KeywordMatcher({"all": keywords}, cache_size=0)
+        rng = random.Random(0)
+        for _ in range(200):
+            text = "".join(rng.choice("あいうえおか") for _ in range(rng.randint(0, 12)))
+            matches = matcher.scan(text)
+            assert matches.found(keywords) == [k for k in keywords if k in text]
+            for keyword in matches.positions:
+                assert matches.position(keyword) == text.index(keyword)
+
+    def test_scan_results_are_cached(self, matcher):
+        assert matcher.scan("雨") is matcher.scan("雨")
+        assert matcher.get_stats()["cache_hits"] == 1
+
+
+class TestDefaultKeywordMatcher:
+    """既定のキーワードカテゴリで構築した照合エンジンのテスト"""
+
+    def test_registers_config_and_constant_lists(self):
+        matcher = get_keyword_matcher()
+        assert matcher.keywords_of("forbidden_phrases") == tuple(dict.fromkeys(FORBIDDEN_PHRASES))
+        assert set(matcher.keywords_of("ng_words")) == set(get_ng_words())
+        assert "weather_filter.sunny" in matcher.category_names
+        assert "weather_validator.rain.weather_comment" in matcher.category_names
+
+    def test_check_ng_words(self):
+        result = check_ng_words("絶対に最悪な天気")
+        assert not result["is_valid"]
+        assert set(result["found_words"]) == {"絶対", "最悪"}
+        assert check_ng_words("穏やかな一日")["is_valid"]
+
+    def test_weather_filter_reports_first_keyword_in_list_order(self):
+        weather_filter = WeatherCommentFilter()
+        ok, reason = weather_filter.is_comment_appropriate("にわか雨で傘が必要", "晴れ")
+        assert not ok
+        # 禁止リストの定義順で最初に一致した「雨」が理由になる
+        assert reason == "晴れ時に「雨」は不適切"
+
+        ok, _ = weather_filter.is_comment_appropriate("雨具の準備を", "曇り", precipitation=1.0)
+        assert ok
@@ -0,0 +1,111 @@
+"""CompiledWorkflowRegistryのテスト"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.workflows.workflow_registry import (
+    CompiledWorkflowRegistry,
+    WorkflowVariant,
+    get_compiled_workflow,
+    get_workflow_registry,
+)
+
+
+class TestCompiledWorkflowRegistry:
+    """CompiledWorkflowRegistryのテストクラス"""
+
+    def test_compiles_once_per_variant(self):
+        """同じ種類のワークフローは一度だけコンパイルされる"""
+        registry = CompiledWorkflowRegistry()
+        factory = MagicMock(return_value=object())
+
+        first = registry.get(WorkflowVariant.UNIFIED, factory)
+        second = registry.get("unified", factory)
+
+        assert first is second
+        factory.assert_called_once()
+        stats = registry.get_stats()
+        assert stats["compilations"] == 1
+        assert stats["hits"] == 1
+        assert stats["compiled_variants"] == ["unified"]
+
+    def test_variants_are_isolated(self):
+        """種類ごとに別のワークフローが保持される"""
+        registry = CompiledWorkflowRegistry()
+        legacy = registry.get(WorkflowVariant.LEGACY, lambda: "legacy")
+        unified = registry.get(WorkflowVariant.UNIFIED, lambda: "unified")
+
+        assert legacy == "legacy"
+        assert unified == "unified"
+
+    def test_recompiles_when_factory_changes(self):
+        """ファクトリが差し替えられた場合は再コンパイルされる"""
+        registry = CompiledWorkflowRegistry()
+        registry.get(WorkflowVariant.LEGACY, lambda: "old")
+
+        assert registry.get(WorkflowVariant.LEGACY, lambda: "new") == "new"
+
+    def test_invalid_variant(self):
+        """不明な種類はValueError"""
+        registry = CompiledWorkflowRegistry()
+        with pytest.raises(ValueError):
+            registry.get("unknown", lambda: None)
+
+    def test_concurrent_access_compiles_once(self):
+        """複数スレッドから同時に取得してもコンパイルは一度だけ"""
+        registry = CompiledWorkflowRegistry()
+        barrier = threading.Barrier(8)
+        call_count = 0
+
+        def factory():
+            nonlocal call_count
+            call_count += 1
+            return object()
+
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(registry.get(WorkflowVariant.UNIFIED, factory))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert call_count == 1
+        assert len({id(result) for result in results}) == 1
+
+
+class TestGetCompiledWorkflow:
+    """get_compiled_workflowのテストクラス"""
+
+    def test_returns_shared_compiled_graph(self):
+        """実際のワークフローがプロセス全体で共有される"""
+        get_workflow_registry().clear()
+
+        first = get_compiled_workflow(WorkflowVariant.UNIFIED)
+        second = get_compiled_workflow(WorkflowVariant.UNIFIED)
+
+        assert first is second
+        assert hasattr(first, "invoke")
+
+    def test_run_comment_generation_reuses_workflow(self):
+        """run_comment_generationはリクエストごとにワークフローを構築しない"""
+        from src.workflows.comment_generation_workflow import run_comment_generation
+
+        mock_workflow = MagicMock()
+        mock_workflow.invoke.return_value = {"final_comment": "テスト", "errors": []}
+
+        with patch(
+            "src.workflows.comment_generation_workflow.create_comment_generation_workflow",
+            return_value=mock_workflow,
+        ) as mock_create:
+            run_comment_generation(location_name="東京", llm_provider="openai")
+            run_comment_generation(location_name="大阪", llm_provider="openai")
+
+        mock_create.assert_called_once()
+        assert mock_workflow.invoke.call_count == 2